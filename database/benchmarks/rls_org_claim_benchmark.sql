@@ -0,0 +1,131 @@
+-- ==============================================================================
+-- BENCHMARK: RLS com lookup em users vs claim do JWT
+-- ==============================================================================
+-- Compara três variantes da policy de isolamento em uma tabela
+-- financial_transactions com 1M linhas (50 organizações, ~20k por org):
+--
+--   A. organization_id = legacy_org_id()        -- lookup em users por linha
+--   B. organization_id = claim_org_id()         -- claim do JWT, sem wrap
+--   C. organization_id = (SELECT claim_org_id()) -- claim do JWT em InitPlan
+--
+-- Roda em um schema isolado (rls_bench) dentro de uma transação com ROLLBACK,
+-- então pode ser executado no banco local do Supabase sem deixar resíduos:
+--
+--   psql "$DATABASE_URL" -f database/benchmarks/rls_org_claim_benchmark.sql
+--
+-- O que observar no EXPLAIN:
+--   A/B: "Filter: (organization_id = legacy_org_id())" sem InitPlan — a função
+--        é chamada para cada linha varrida (A faz um SELECT em users por linha).
+--   C:   "InitPlan 1 (returns $0)" e "Index Cond: (organization_id = $0)" — a
+--        função roda uma vez e o índice por organização é usado.
+-- ==============================================================================
+
+BEGIN;
+
+CREATE SCHEMA rls_bench;
+
+CREATE TABLE rls_bench.users (
+  id TEXT PRIMARY KEY,
+  organization_id TEXT NOT NULL
+);
+
+CREATE TABLE rls_bench.financial_transactions (
+  id TEXT PRIMARY KEY DEFAULT gen_random_uuid()::text,
+  organization_id TEXT NOT NULL,
+  type TEXT NOT NULL,
+  status TEXT NOT NULL,
+  amount NUMERIC(12,2) NOT NULL,
+  transaction_date TIMESTAMPTZ NOT NULL
+);
+
+-- 1M linhas determinísticas distribuídas em 50 organizações
+INSERT INTO rls_bench.financial_transactions (organization_id, type, status, amount, transaction_date)
+SELECT
+  'org_bench_' || (g % 50),
+  CASE WHEN g % 3 = 0 THEN 'EXPENSE' ELSE 'INCOME' END,
+  CASE WHEN g % 5 = 0 THEN 'PENDING' ELSE 'PAID' END,
+  (g % 10000) / 10.0,
+  TIMESTAMPTZ '2024-01-01' + (g % 730) * INTERVAL '1 day'
+FROM generate_series(1, 1000000) AS g;
+
+CREATE INDEX ON rls_bench.financial_transactions (organization_id);
+CREATE INDEX ON rls_bench.financial_transactions (organization_id, transaction_date);
+
+INSERT INTO rls_bench.users (id, organization_id)
+VALUES ('00000000-0000-0000-0000-000000000001', 'org_bench_7');
+
+ANALYZE rls_bench.financial_transactions;
+ANALYZE rls_bench.users;
+
+-- Variante antiga: SECURITY DEFINER + SELECT em users
+CREATE FUNCTION rls_bench.legacy_org_id() RETURNS TEXT
+LANGUAGE sql STABLE SECURITY DEFINER AS $$
+  SELECT organization_id FROM rls_bench.users WHERE id = auth.uid()::text LIMIT 1;
+$$;
+
+-- Variante nova: claim do JWT
+CREATE FUNCTION rls_bench.claim_org_id() RETURNS TEXT
+LANGUAGE sql STABLE AS $$
+  SELECT NULLIF(auth.jwt() -> 'app_metadata' ->> 'organization_id', '');
+$$;
+
+GRANT USAGE ON SCHEMA rls_bench TO authenticated;
+GRANT SELECT ON ALL TABLES IN SCHEMA rls_bench TO authenticated;
+GRANT EXECUTE ON ALL FUNCTIONS IN SCHEMA rls_bench TO authenticated;
+ALTER TABLE rls_bench.financial_transactions ENABLE ROW LEVEL SECURITY;
+
+-- Sessão simulando um usuário autenticado com o claim no token
+SELECT set_config(
+  'request.jwt.claims',
+  '{"sub":"00000000-0000-0000-0000-000000000001","role":"authenticated","app_metadata":{"organization_id":"org_bench_7"}}',
+  true
+);
+
+-- ------------------------------------------------------------------------------
+-- A. Lookup em users (comportamento anterior)
+-- ------------------------------------------------------------------------------
+CREATE POLICY bench_policy ON rls_bench.financial_transactions
+FOR SELECT USING (organization_id = rls_bench.legacy_org_id());
+
+SET LOCAL ROLE authenticated;
+\echo '=== A. legacy_org_id() (lookup por linha) ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT type, status, SUM(amount)
+FROM rls_bench.financial_transactions
+WHERE transaction_date >= '2025-01-01'
+GROUP BY type, status;
+RESET ROLE;
+
+-- ------------------------------------------------------------------------------
+-- B. Claim do JWT, sem wrap
+-- ------------------------------------------------------------------------------
+DROP POLICY bench_policy ON rls_bench.financial_transactions;
+CREATE POLICY bench_policy ON rls_bench.financial_transactions
+FOR SELECT USING (organization_id = rls_bench.claim_org_id());
+
+SET LOCAL ROLE authenticated;
+\echo '=== B. claim_org_id() sem wrap ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT type, status, SUM(amount)
+FROM rls_bench.financial_transactions
+WHERE transaction_date >= '2025-01-01'
+GROUP BY type, status;
+RESET ROLE;
+
+-- ------------------------------------------------------------------------------
+-- C. Claim do JWT em (SELECT ...) — forma usada pelas policies
+-- ------------------------------------------------------------------------------
+DROP POLICY bench_policy ON rls_bench.financial_transactions;
+CREATE POLICY bench_policy ON rls_bench.financial_transactions
+FOR SELECT USING (organization_id = (SELECT rls_bench.claim_org_id()));
+
+SET LOCAL ROLE authenticated;
+\echo '=== C. (SELECT claim_org_id()) ==='
+EXPLAIN (ANALYZE, BUFFERS, COSTS OFF)
+SELECT type, status, SUM(amount)
+FROM rls_bench.financial_transactions
+WHERE transaction_date >= '2025-01-01'
+GROUP BY type, status;
+RESET ROLE;
+
+ROLLBACK;
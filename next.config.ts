@@ -2,6 +2,10 @@ import type { NextConfig } from 'next'
 
 const nextConfig: NextConfig = {
   typedRoutes: true,
+  // Worker do pool de PDFs é carregado por caminho (child_process.fork)
+  outputFileTracingIncludes: {
+    '/api/proposals/pdf': ['./src/lib/pdf/proposal-pdf.worker.mjs'],
+  },
 }
 
 export default nextConfig
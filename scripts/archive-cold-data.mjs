@@ -0,0 +1,137 @@
+#!/usr/bin/env node
+
+/**
+ * Arquivamento de dados frios (projetos concluídos e transações liquidadas).
+ *
+ * Chama a RPC archive_cold_data_batch em loop, um lote por chamada (cada lote
+ * é uma transação no banco), imprimindo o progresso. Pode ser interrompido a
+ * qualquer momento: a próxima execução retoma a mesma rodada (mesmo corte de
+ * data) a partir do que ainda não foi movido.
+ *
+ * Uso:
+ *   node scripts/archive-cold-data.mjs [--older-than-days 365] [--batch-size 100] [--max-batches N]
+ *
+ * Requer NEXT_PUBLIC_SUPABASE_URL e SUPABASE_SERVICE_ROLE_KEY (a RPC só é
+ * liberada para o service role). Padrões também via ARCHIVE_AFTER_DAYS e
+ * ARCHIVE_BATCH_SIZE.
+ */
+
+import { existsSync, readFileSync } from 'node:fs'
+import { join } from 'node:path'
+
+const ROOT = process.cwd()
+
+// Carrega .env.local/.env sem sobrescrever o ambiente
+for (const file of ['.env.local', '.env']) {
+  const path = join(ROOT, file)
+  if (!existsSync(path)) continue
+  for (const line of readFileSync(path, 'utf8').split(/\r?\n/)) {
+    const match = line.match(/^\s*([A-Z0-9_]+)\s*=\s*(.*)\s*$/)
+    if (match && process.env[match[1]] === undefined) {
+      process.env[match[1]] = match[2].replace(/^(['"])(.*)\1$/, '$2')
+    }
+  }
+}
+
+function parseArgs(argv) {
+  const args = {}
+  for (let i = 0; i < argv.length; i++) {
+    const match = argv[i].match(/^--([a-z-]+)(?:=(.*))?$/)
+    if (!match) continue
+    args[match[1]] = match[2] ?? argv[++i]
+  }
+  return args
+}
+
+function toPositiveInt(value, name) {
+  if (value === undefined) return undefined
+  const parsed = Number.parseInt(value, 10)
+  if (!Number.isFinite(parsed) || parsed < 1) {
+    console.error(`❌ ${name} inválido: ${value}`)
+    process.exit(1)
+  }
+  return parsed
+}
+
+const args = parseArgs(process.argv.slice(2))
+const olderThanDays = toPositiveInt(args['older-than-days'] ?? process.env.ARCHIVE_AFTER_DAYS ?? '365', '--older-than-days')
+const batchSize = toPositiveInt(args['batch-size'] ?? process.env.ARCHIVE_BATCH_SIZE ?? '100', '--batch-size')
+const maxBatches = toPositiveInt(args['max-batches'], '--max-batches') ?? Infinity
+
+const SUPABASE_URL = process.env.NEXT_PUBLIC_SUPABASE_URL
+const SERVICE_ROLE_KEY = process.env.SUPABASE_SERVICE_ROLE_KEY
+
+if (!SUPABASE_URL || !SERVICE_ROLE_KEY) {
+  console.error('❌ Defina NEXT_PUBLIC_SUPABASE_URL e SUPABASE_SERVICE_ROLE_KEY')
+  process.exit(1)
+}
+
+async function runBatch() {
+  const response = await fetch(`${SUPABASE_URL}/rest/v1/rpc/archive_cold_data_batch`, {
+    method: 'POST',
+    headers: {
+      apikey: SERVICE_ROLE_KEY,
+      Authorization: `Bearer ${SERVICE_ROLE_KEY}`,
+      'Content-Type': 'application/json',
+    },
+    body: JSON.stringify({ p_older_than_days: olderThanDays, p_batch_size: batchSize }),
+  })
+
+  if (!response.ok) {
+    throw new Error(`HTTP ${response.status}: ${await response.text()}`)
+  }
+  return response.json()
+}
+
+const percent = (done, total) => (total > 0 ? `${Math.min(100, Math.round((done / total) * 100))}%` : '—')
+
+console.log(`🗄️  Arquivando dados com mais de ${olderThanDays} dias (lotes de ${batchSize})`)
+
+let batches = 0
+let progress
+
+while (batches < maxBatches) {
+  try {
+    progress = await runBatch()
+  } catch (error) {
+    console.error(`❌ Lote falhou: ${error.message}`)
+    console.error('   Rode novamente para retomar de onde parou.')
+    process.exit(1)
+  }
+
+  if (progress.status === 'busy') {
+    console.error('⏳ Outra execução de arquivamento está em andamento. Tente mais tarde.')
+    process.exit(2)
+  }
+
+  // Lote desfeito no banco; a execução ficou como 'failed' em archive_runs
+  if (progress.status === 'failed') {
+    console.error(`❌ Lote falhou (run ${progress.run_id}): ${progress.error}`)
+    console.error('   A execução foi marcada como falha; rodar novamente inicia outra.')
+    process.exit(1)
+  }
+
+  batches++
+  const { projects, transactions, batch } = progress
+  console.log(
+    `[run ${progress.run_id} · lote ${progress.batches}] ` +
+    `projetos ${projects.archived}/${projects.total} (${percent(projects.archived, projects.total)}) · ` +
+    `transações ${transactions.archived}/${transactions.total} (${percent(transactions.archived, transactions.total)}) · ` +
+    `neste lote: +${batch.projects} projetos, +${batch.transactions} transações` +
+    (batch.skipped ? `, ${batch.skipped} ignorados` : '')
+  )
+
+  if (progress.status === 'done') break
+}
+
+if (progress?.status === 'done') {
+  console.log(`✅ Concluído em ${progress.batches} lotes. Linhas arquivadas por tabela:`)
+  for (const [table, count] of Object.entries(progress.rows || {})) {
+    console.log(`   ${table}: ${count}`)
+  }
+  if (progress.skipped > 0) {
+    console.log(`⚠️  ${progress.skipped} itens ignorados (ver archive_run_skips, run_id ${progress.run_id})`)
+  }
+} else {
+  console.log(`⏸️  Parado após ${batches} lotes. Rode novamente para continuar.`)
+}
@@ -0,0 +1,160 @@
+#!/usr/bin/env node
+
+/**
+ * Orçamento de JS por rota (first-load JS, gzip) após o `next build`.
+ *
+ * Soma os chunks compartilhados (rootMainFiles) com os chunks da página e dos
+ * layouts acima dela, compara com bundle-budget.json e falha o build quando
+ * alguma rota passa do limite. Os chunks de cada rota vêm do entryJSFiles dos
+ * client reference manifests (.next/server/app/**\/page_client-reference-manifest.js),
+ * escritos tanto pelo webpack quanto pelo Turbopack (padrão no Next 16), e do
+ * app-build-manifest.json quando o build ainda o gera. Sem nenhum manifest o
+ * orçamento é pulado com um aviso, sem quebrar o build.
+ *
+ * Uso: npm run build (roda como postbuild) ou node scripts/check-bundle-budget.mjs
+ * Relatório: .next/bundle-budget-report.json
+ */
+
+import { existsSync, readFileSync, readdirSync, writeFileSync } from 'node:fs'
+import { join } from 'node:path'
+import { runInNewContext } from 'node:vm'
+import { gzipSync } from 'node:zlib'
+
+const ROOT = process.cwd()
+const NEXT_DIR = join(ROOT, '.next')
+const BUDGET_FILE = join(ROOT, 'bundle-budget.json')
+const REPORT_FILE = join(NEXT_DIR, 'bundle-budget-report.json')
+
+function readJson(path) {
+  return JSON.parse(readFileSync(path, 'utf8'))
+}
+
+function findFiles(dir, match) {
+  if (!existsSync(dir)) return []
+  return readdirSync(dir, { withFileTypes: true }).flatMap((entry) => {
+    const path = join(dir, entry.name)
+    if (entry.isDirectory()) return findFiles(path, match)
+    return match(entry.name) ? [path] : []
+  })
+}
+
+// "/_next/static/chunks/a.js" e "static/chunks/a.js" -> caminho relativo a .next
+const toBuildPath = (file) => file.replace(/^\/?_next\//, '').replace(/^\//, '')
+
+// O manifest é um script que preenche globalThis.__RSC_MANIFEST[entrada];
+// entryJSFiles traz os chunks da página e dos layouts acima dela
+function readClientReferenceManifest(path) {
+  const context = {}
+  runInNewContext(readFileSync(path, 'utf8'), context)
+  return Object.entries(context.__RSC_MANIFEST || {}).map(([entry, manifest]) => [
+    entry,
+    Object.values(manifest.entryJSFiles || {}).flat().map(toBuildPath),
+  ])
+}
+
+function loadEntries() {
+  const entries = {}
+  const add = (entry, files) => {
+    entries[entry] = Array.from(new Set([...(entries[entry] || []), ...files]))
+  }
+
+  const serverApp = join(NEXT_DIR, 'server', 'app')
+  for (const path of findFiles(serverApp, (name) => name.endsWith('_client-reference-manifest.js'))) {
+    for (const [entry, files] of readClientReferenceManifest(path)) add(entry, files)
+  }
+
+  const buildManifests = [
+    join(NEXT_DIR, 'app-build-manifest.json'),
+    ...findFiles(serverApp, (name) => name === 'app-build-manifest.json'),
+  ]
+  for (const path of buildManifests) {
+    if (!existsSync(path)) continue
+    for (const [entry, files] of Object.entries(readJson(path).pages || {})) add(entry, files.map(toBuildPath))
+  }
+  return entries
+}
+
+// "/(dashboard)/projects/[id]/page" -> "/projects/[id]"
+function toRoute(entry) {
+  const route = entry
+    .replace(/\/page$/, '')
+    .split('/')
+    .filter((segment) => segment && !/^\(.*\)$/.test(segment))
+    .join('/')
+  return '/' + route
+}
+
+// Layouts que envolvem a página: "/layout", "/(dashboard)/layout", ...
+function layoutsFor(entry, entries) {
+  const segments = entry.replace(/\/page$/, '').split('/').filter(Boolean)
+  const layouts = []
+  for (let i = 0; i <= segments.length; i++) {
+    const layout = '/' + [...segments.slice(0, i), 'layout'].join('/')
+    if (entries[layout]) layouts.push(layout)
+  }
+  return layouts
+}
+
+const sizeCache = new Map()
+function gzipSize(file) {
+  if (!sizeCache.has(file)) {
+    const path = join(NEXT_DIR, file)
+    sizeCache.set(file, existsSync(path) ? gzipSync(readFileSync(path)).length : 0)
+  }
+  return sizeCache.get(file)
+}
+
+function main() {
+  if (!existsSync(NEXT_DIR)) {
+    console.error('Build não encontrado: rode `next build` antes do orçamento de bundle.')
+    return 1
+  }
+
+  const budget = readJson(BUDGET_FILE)
+  const defaultKb = Number(process.env.BUNDLE_BUDGET_KB) || budget.default
+  const buildManifestPath = join(NEXT_DIR, 'build-manifest.json')
+  const shared = existsSync(buildManifestPath)
+    ? (readJson(buildManifestPath).rootMainFiles || []).map(toBuildPath).filter((file) => file.endsWith('.js'))
+    : []
+  const entries = loadEntries()
+  const pages = Object.keys(entries).filter((entry) => entry.endsWith('/page')).sort()
+
+  // Formato de manifest desconhecido: avisa em vez de quebrar todo `npm run build`
+  if (pages.length === 0) {
+    console.warn('⚠️  Nenhuma rota encontrada nos manifests do build; orçamento de bundle não verificado.')
+    return 0
+  }
+
+  const routes = pages.map((entry) => {
+    const files = new Set(shared)
+    for (const source of [...layoutsFor(entry, entries), entry]) {
+      entries[source].filter((file) => file.endsWith('.js')).forEach((file) => files.add(file))
+    }
+    const route = toRoute(entry)
+    const kb = Array.from(files).reduce((acc, file) => acc + gzipSize(file), 0) / 1024
+    const limit = budget.routes?.[route] ?? defaultKb
+    return { route, firstLoadKb: Math.round(kb * 10) / 10, budgetKb: limit, chunks: files.size, over: kb > limit }
+  })
+
+  const width = Math.max(...routes.map((r) => r.route.length), 10) + 2
+  console.log(`\n${'Rota'.padEnd(width)}${'First load'.padStart(12)}${'Orçamento'.padStart(12)}`)
+  for (const r of routes) {
+    const mark = r.over ? '  ✗ acima do orçamento' : ''
+    console.log(`${r.route.padEnd(width)}${(r.firstLoadKb + ' kB').padStart(12)}${(r.budgetKb + ' kB').padStart(12)}${mark}`)
+  }
+
+  const over = routes.filter((r) => r.over)
+  writeFileSync(
+    REPORT_FILE,
+    JSON.stringify({ unit: 'kB gzip', sharedChunks: shared.length, routes, over: over.map((r) => r.route) }, null, 2)
+  )
+  console.log(`\nRelatório salvo em ${REPORT_FILE}`)
+
+  if (over.length > 0) {
+    console.error(`\n${over.length} rota(s) acima do orçamento de first-load JS: ${over.map((r) => r.route).join(', ')}`)
+    return 1
+  }
+  return 0
+}
+
+process.exit(main())
@@ -8,15 +8,16 @@
  */
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { invalidateCache } from '@/lib/cache/data-cache'
 import { upsertFreelancerPayable } from './financeiro'
 import type {
     ItemAssignment,
     ItemAssignmentWithFreelancer,
     CreateItemAssignmentData,
     UpdateItemAssignmentData,
-    FreelancerWorkHistoryItem,
+    FreelancerWorkHistoryPage,
     FreelancerFinancialSummary,
+    FreelancerMonthlyStats,
     ItemAssignmentStatus,
 } from '@/types/assignments'
 
@@ -79,14 +80,12 @@ export async function addItemAssignment(data: CreateItemAssignmentData) {
         throw new Error('Erro ao adicionar freelancer: ' + error.message)
     }
 
-    // Revalidar paths relevantes
-    if (data.proposal_item_id) {
-        revalidatePath('/proposals')
-    }
-    if (data.project_item_id) {
-        revalidatePath('/projects')
-    }
-    revalidatePath('/freelancers')
+    // Invalidar apenas as entidades afetadas
+    invalidateCache(organizationId, [
+        'freelancers',
+        ...(data.proposal_item_id ? ['proposals' as const] : []),
+        ...(data.project_item_id ? ['projects' as const] : []),
+    ])
 
     return assignment
 }
@@ -145,9 +144,7 @@ export async function updateItemAssignment(
         }
     }
 
-    revalidatePath('/proposals')
-    revalidatePath('/projects')
-    revalidatePath('/freelancers')
+    invalidateCache(organizationId, ['proposals', 'projects', 'freelancers', 'finances'])
 
     return assignment
 }
@@ -170,9 +167,7 @@ export async function removeItemAssignment(assignmentId: string) {
         throw new Error('Erro ao remover assignment: ' + error.message)
     }
 
-    revalidatePath('/proposals')
-    revalidatePath('/projects')
-    revalidatePath('/freelancers')
+    invalidateCache(organizationId, ['proposals', 'projects', 'freelancers'])
 }
 
 /**
@@ -231,6 +226,8 @@ export async function copyAssignmentsToProject(
             console.error('Error copying assignments to project:', error)
         }
     }
+
+    invalidateCache(organizationId, ['projects', 'proposals', 'freelancers'])
 }
 
 // ============================================
@@ -239,30 +236,55 @@ export async function copyAssignmentsToProject(
 
 /**
  * Buscar histórico de trabalhos de um freelancer
+ * Paginado por cursor (created_at, assignment_id) sobre o índice
+ * (freelancer_id, created_at): cada página lê só as suas linhas
  */
 export async function getFreelancerWorkHistory(
-    freelancerId: string
-): Promise<FreelancerWorkHistoryItem[]> {
+    freelancerId: string,
+    { limit = 50, cursor = null }: { limit?: number; cursor?: string | null } = {}
+): Promise<FreelancerWorkHistoryPage> {
     const supabase = await createClient()
     const organizationId = await getUserOrganization()
 
-    const { data, error } = await supabase
+    let query = supabase
         .from('freelancer_work_history')
         .select('*')
         .eq('freelancer_id', freelancerId)
         .eq('organization_id', organizationId)
+
+    if (cursor) {
+        const separator = cursor.lastIndexOf('|')
+        const createdAt = cursor.slice(0, separator)
+        const assignmentId = cursor.slice(separator + 1)
+        query = query.or(
+            `created_at.lt."${createdAt}",and(created_at.eq."${createdAt}",assignment_id.lt."${assignmentId}")`
+        )
+    }
+
+    // Uma linha a mais indica se existe próxima página
+    const { data, error } = await query
         .order('created_at', { ascending: false })
+        .order('assignment_id', { ascending: false })
+        .limit(limit + 1)
 
     if (error) {
         console.error('Error fetching freelancer work history:', error)
-        return []
+        return { items: [], next_cursor: null }
     }
 
-    return data || []
+    const rows = data || []
+    const items = rows.slice(0, limit)
+    const last = items[items.length - 1]
+
+    return {
+        items,
+        next_cursor: rows.length > limit && last ? `${last.created_at}|${last.assignment_id}` : null,
+    }
 }
 
 /**
  * Buscar resumo financeiro de um freelancer
+ * Lê os totais do rollup mensal (freelancer_rollup_totals)
  */
 export async function getFreelancerFinancialSummary(
     freelancerId: string
@@ -271,7 +293,7 @@ export async function getFreelancerFinancialSummary(
     const organizationId = await getUserOrganization()
 
     const { data, error } = await supabase
-        .from('freelancer_financial_summary')
+        .from('freelancer_rollup_totals')
         .select('*')
         .eq('freelancer_id', freelancerId)
         .eq('organization_id', organizationId)
@@ -282,7 +304,20 @@ export async function getFreelancerFinancialSummary(
         return null
     }
 
-    return data
+    return {
+        freelancer_id: data.freelancer_id,
+        freelancer_name: data.name,
+        daily_rate: data.daily_rate,
+        total_assignments: data.total_jobs,
+        completed_assignments: data.completed_jobs,
+        pending_assignments: data.pending_jobs,
+        total_agreed_fees: Number(data.total_agreed_fees),
+        completed_fees: Number(data.completed_fees),
+        total_paid: Number(data.total_paid),
+        pending_payment: Number(data.pending_payment),
+        projects_count: data.projects_count,
+        organization_id: data.organization_id,
+    }
 }
 
 /**
@@ -315,49 +350,54 @@ export async function getFreelancerUpcomingAssignments(
 }
 
 /**
- * Buscar ganhos mensais de um freelancer (últimos 12 meses)
+ * Buscar estatísticas mensais de um freelancer (rollup freelancer_monthly_stats)
  */
-export async function getFreelancerMonthlyEarnings(
-    freelancerId: string
-): Promise<Array<{ month: string; amount: number }>> {
+export async function getFreelancerMonthlyStats(
+    freelancerId: string,
+    months = 12
+): Promise<FreelancerMonthlyStats[]> {
     const supabase = await createClient()
     const organizationId = await getUserOrganization()
 
-    // Buscar transações pagas nos últimos 12 meses
-    const twelveMonthsAgo = new Date()
-    twelveMonthsAgo.setMonth(twelveMonthsAgo.getMonth() - 12)
+    const since = new Date()
+    since.setMonth(since.getMonth() - months)
+    const sinceMonth = `${since.getFullYear()}-${String(since.getMonth() + 1).padStart(2, '0')}-01`
 
     const { data, error } = await supabase
-        .from('financial_transactions')
-        .select('amount, payment_date')
+        .from('freelancer_monthly_stats')
+        .select('*')
         .eq('freelancer_id', freelancerId)
         .eq('organization_id', organizationId)
-        .eq('type', 'EXPENSE')
-        .eq('status', 'PAID')
-        .gte('payment_date', twelveMonthsAgo.toISOString())
-        .order('payment_date', { ascending: true })
+        .gte('month', sinceMonth)
+        .order('month', { ascending: true })
 
     if (error) {
-        console.error('Error fetching monthly earnings:', error)
+        console.error('Error fetching freelancer monthly stats:', error)
         return []
     }
 
-    // Agrupar por mês
-    const monthlyMap = new Map<string, number>()
+    return data || []
+}
 
-    data?.forEach((transaction) => {
-        if (transaction.payment_date) {
-            const date = new Date(transaction.payment_date)
-            const monthKey = `${date.getFullYear()}-${String(date.getMonth() + 1).padStart(2, '0')}`
-            const current = monthlyMap.get(monthKey) || 0
-            monthlyMap.set(monthKey, current + Number(transaction.amount))
-        }
-    })
+/**
+ * Converter o rollup mensal no formato de ganhos mensais (YYYY-MM)
+ */
+function toMonthlyEarnings(stats: FreelancerMonthlyStats[]) {
+    return stats
+        .filter((row) => Number(row.paid_amount) !== 0)
+        .map((row) => ({
+            month: row.month.slice(0, 7),
+            amount: Number(row.paid_amount),
+        }))
+}
 
-    // Converter para array ordenado
-    return Array.from(monthlyMap.entries())
-        .map(([month, amount]) => ({ month, amount }))
-        .sort((a, b) => a.month.localeCompare(b.month))
+/**
+ * Buscar ganhos mensais de um freelancer (últimos 12 meses)
+ */
+export async function getFreelancerMonthlyEarnings(
+    freelancerId: string
+): Promise<Array<{ month: string; amount: number }>> {
+    return toMonthlyEarnings(await getFreelancerMonthlyStats(freelancerId))
 }
 
 /**
@@ -381,19 +421,21 @@ export async function getFreelancerWithDetails(freelancerId: string) {
     }
 
     // Buscar dados agregados em paralelo
-    const [workHistory, financialSummary, upcomingAssignments, monthlyEarnings] =
+    const [workHistory, financialSummary, upcomingAssignments, monthlyStats] =
         await Promise.all([
             getFreelancerWorkHistory(freelancerId),
             getFreelancerFinancialSummary(freelancerId),
             getFreelancerUpcomingAssignments(freelancerId),
-            getFreelancerMonthlyEarnings(freelancerId),
+            getFreelancerMonthlyStats(freelancerId),
         ])
 
     return {
         ...freelancer,
-        work_history: workHistory,
+        work_history: workHistory.items,
+        work_history_cursor: workHistory.next_cursor,
         financial_summary: financialSummary,
         upcoming_assignments: upcomingAssignments,
-        monthly_earnings: monthlyEarnings,
+        monthly_earnings: toMonthlyEarnings(monthlyStats),
+        monthly_stats: monthlyStats,
     }
 }
@@ -5,10 +5,43 @@ import { revalidatePath } from 'next/cache'
 import { redirect } from 'next/navigation'
 import { createInitialCapitalTransaction } from './financeiro'
 
+/**
+ * Garante que o JWT carregue app_metadata.organization_id, lido pelas policies
+ * de RLS via auth_org_id(). O trigger sync_user_org_claim mantém o claim em dia;
+ * aqui cobrimos contas sem o claim e renovamos a sessão para emitir o token novo.
+ */
+async function ensureOrgClaim(
+  supabase: Awaited<ReturnType<typeof createClient>>,
+  user: { id: string; app_metadata?: Record<string, any> }
+) {
+  if (user.app_metadata?.organization_id) return
+
+  try {
+    const { createServiceClient } = await import('@/lib/supabase/server')
+    const serviceClient = await createServiceClient()
+
+    const { data: userData } = await serviceClient
+      .from('users')
+      .select('organization_id')
+      .eq('id', user.id)
+      .single()
+
+    if (!userData?.organization_id) return
+
+    await serviceClient.auth.admin.updateUserById(user.id, {
+      app_metadata: { organization_id: userData.organization_id },
+    })
+    await supabase.auth.refreshSession()
+  } catch (error) {
+    // Sem o claim, auth_org_id() ainda resolve via lookup em users
+    console.error('Erro ao sincronizar organization_id no token:', error)
+  }
+}
+
 export async function signIn(email: string, password: string) {
   const supabase = await createClient()
 
-  const { error } = await supabase.auth.signInWithPassword({
+  const { data, error } = await supabase.auth.signInWithPassword({
     email,
     password,
   })
@@ -17,6 +50,8 @@ export async function signIn(email: string, password: string) {
     throw new Error(error.message)
   }
 
+  await ensureOrgClaim(supabase, data.user)
+
   revalidatePath('/', 'layout')
   return { success: true }
 }
@@ -117,6 +152,12 @@ export async function signUp(
       throw new Error('Erro ao criar usuário. Tente novamente.')
     }
 
+    // O token da sessão foi emitido antes do vínculo com a organização:
+    // renovar para que ele já carregue o claim organization_id
+    if (authData.session) {
+      await ensureOrgClaim(supabase, { id: authData.user.id })
+    }
+
     // SPRINT 0: Criar transação de capital inicial se informado
     if (capitalInicial && capitalInicial > 0) {
       try {
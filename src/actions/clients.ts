@@ -1,24 +1,23 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
+import { databaseErrorCode, isDirectDataPath, withUserDb } from '@/lib/supabase/direct'
 
 export async function getClients() {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('clients')
-    .select('*')
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching clients:', error)
-    return []
-  }
+  return cachedRead('clients:list', { organizationId, tags: ['clients'], fallback: [] }, async () => {
+    const { data, error } = await supabase
+      .from('clients')
+      .select('*')
+      .eq('organization_id', organizationId)
+      .order('created_at', { ascending: false })
 
-  return data || []
+    if (error) throw error
+    return data || []
+  })
 }
 
 export async function addClient(formData: {
@@ -49,8 +48,7 @@ export async function addClient(formData: {
 
   console.log('Cliente criado com sucesso:', data)
 
-  revalidatePath('/clients')
-  revalidatePath('/proposals')
+  invalidateCache(organizationId, ['clients'])
   return data
 }
 
@@ -83,8 +81,7 @@ export async function updateClient(
     throw new Error('Erro ao atualizar cliente: ' + error.message)
   }
 
-  revalidatePath('/clients')
-  revalidatePath(`/clients/${id}`)
+  invalidateCache(organizationId, [{ entity: 'clients', id }])
   return data
 }
 
@@ -92,82 +89,98 @@ export async function getClient(id: string) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('clients')
-    .select('*')
-    .eq('id', id)
-    .eq('organization_id', organizationId)
-    .single()
-
-  if (error) {
-    console.error('Error fetching client:', error)
-    return null
-  }
+  return cachedRead(
+    'clients:detail',
+    { organizationId, tags: [{ entity: 'clients', id }], keyParts: [id], fallback: null },
+    async () => {
+      const { data, error } = await supabase
+        .from('clients')
+        .select('*')
+        .eq('id', id)
+        .eq('organization_id', organizationId)
+        .single()
 
-  return data
+      if (error) throw error
+      return data
+    }
+  )
 }
 
 export async function getClientProjects(clientId: string) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('projects')
-    .select('*')
-    .eq('client_id', clientId)
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching client projects:', error)
-    return []
-  }
+  return cachedRead(
+    'clients:projects',
+    { organizationId, tags: ['projects'], keyParts: [clientId], fallback: [] },
+    async () => {
+      // Histórico completo: inclui projetos arquivados (archived_at preenchido)
+      const { data, error } = await supabase
+        .from('projects_all')
+        .select('*')
+        .eq('client_id', clientId)
+        .eq('organization_id', organizationId)
+        .order('created_at', { ascending: false })
 
-  return data || []
+      if (error) throw error
+      return data || []
+    }
+  )
 }
 
 export async function getClientProposals(clientId: string) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('proposals')
-    .select('*')
-    .eq('client_id', clientId)
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching client proposals:', error)
-    return []
-  }
+  return cachedRead(
+    'clients:proposals',
+    { organizationId, tags: ['proposals'], keyParts: [clientId], fallback: [] },
+    async () => {
+      const { data, error } = await supabase
+        .from('proposals')
+        .select('*')
+        .eq('client_id', clientId)
+        .eq('organization_id', organizationId)
+        .order('created_at', { ascending: false })
 
-  return data || []
+      if (error) throw error
+      return data || []
+    }
+  )
 }
 
 export async function getClientFinancials(clientId: string) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('financial_transactions')
-    .select('*')
-    .eq('client_id', clientId)
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching client financials:', error)
-    return []
-  }
+  return cachedRead(
+    'clients:financials',
+    { organizationId, tags: ['finances'], keyParts: [clientId], fallback: [] },
+    async () => {
+      const { data, error } = await supabase
+        .from('financial_transactions_all')
+        .select('*')
+        .eq('client_id', clientId)
+        .eq('organization_id', organizationId)
+        .order('created_at', { ascending: false })
 
-  return data || []
+      if (error) throw error
+      return data || []
+    }
+  )
 }
 
 export async function deleteClient(id: string, forceDelete: boolean = false) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
+  // DATA_PATH=direct: a cascata inteira numa única transação (tudo ou nada)
+  if (forceDelete && isDirectDataPath()) {
+    await deleteClientCascadeDirect(id, organizationId)
+    invalidateCache(organizationId, [{ entity: 'clients', id }, 'projects', 'proposals', 'finances', 'calendar'])
+    return
+  }
+
   // Se forceDelete for true, deletar dependências primeiro
   if (forceDelete) {
     // A. Buscar IDs dos projetos
@@ -274,7 +287,81 @@ export async function deleteClient(id: string, forceDelete: boolean = false) {
     throw new Error('Erro ao deletar cliente')
   }
 
-  revalidatePath('/dashboard/clients')
+  invalidateCache(
+    organizationId,
+    forceDelete
+      ? [{ entity: 'clients', id }, 'projects', 'proposals', 'finances', 'calendar']
+      : [{ entity: 'clients', id }]
+  )
+}
+
+/**
+ * Mesma sequência do forceDelete acima pela conexão direta. Falha em qualquer
+ * passo desfaz tudo, em vez de deixar o cliente com metade das dependências.
+ * project_notes/project_team não existem no schema: no PostgREST o erro é
+ * ignorado, aqui abortaria a transação.
+ */
+async function deleteClientCascadeDirect(id: string, organizationId: string) {
+  try {
+    await withUserDb(async (db) => {
+      const projectIds = (
+        await db.query<{ id: string }>('projects')`
+          SELECT id FROM projects WHERE client_id = ${id} AND organization_id = ${organizationId}`
+      ).map((p) => p.id)
+      const proposalIds = (
+        await db.query<{ id: string }>('proposals')`
+          SELECT id FROM proposals WHERE client_id = ${id} AND organization_id = ${organizationId}`
+      ).map((p) => p.id)
+
+      await db.execute('DELETE', 'financial_transactions')`
+        DELETE FROM financial_transactions
+        WHERE organization_id = ${organizationId}
+          AND (client_id = ${id} OR project_id = ANY(${projectIds}::text[]) OR proposal_id = ANY(${proposalIds}::text[]))`
+
+      if (projectIds.length > 0) {
+        await db.execute('DELETE', 'item_assignments')`
+          DELETE FROM item_assignments
+          WHERE project_item_id IN (SELECT id FROM project_items WHERE project_id = ANY(${projectIds}::text[]))`
+        await db.execute('DELETE', 'project_items')`DELETE FROM project_items WHERE project_id = ANY(${projectIds}::text[])`
+        await db.execute('DELETE', 'calendar_events')`DELETE FROM calendar_events WHERE project_id = ANY(${projectIds}::text[])`
+        await db.execute('DELETE', 'project_tasks')`DELETE FROM project_tasks WHERE project_id = ANY(${projectIds}::text[])`
+        await db.execute('DELETE', 'project_finances')`DELETE FROM project_finances WHERE project_id = ANY(${projectIds}::text[])`
+      }
+
+      if (proposalIds.length > 0) {
+        await db.execute('DELETE', 'item_assignments')`
+          DELETE FROM item_assignments
+          WHERE proposal_item_id IN (SELECT id FROM proposal_items WHERE proposal_id = ANY(${proposalIds}::text[]))`
+        await db.execute('DELETE', 'proposal_items')`DELETE FROM proposal_items WHERE proposal_id = ANY(${proposalIds}::text[])`
+        await db.execute('DELETE', 'proposal_optionals')`DELETE FROM proposal_optionals WHERE proposal_id = ANY(${proposalIds}::text[])`
+        await db.execute('DELETE', 'proposal_videos')`DELETE FROM proposal_videos WHERE proposal_id = ANY(${proposalIds}::text[])`
+      }
+
+      if (projectIds.length > 0) {
+        await db.execute('DELETE', 'projects')`
+          DELETE FROM projects WHERE id = ANY(${projectIds}::text[]) AND organization_id = ${organizationId}`
+      }
+
+      if (proposalIds.length > 0) {
+        // Setar status para CANCELLED para evitar triggers de proteção se houver
+        await db.execute('UPDATE', 'proposals')`
+          UPDATE proposals SET status = 'CANCELLED' WHERE id = ANY(${proposalIds}::text[])`
+        await db.execute('DELETE', 'proposals')`
+          DELETE FROM proposals WHERE id = ANY(${proposalIds}::text[]) AND organization_id = ${organizationId}`
+      }
+
+      await db.execute('DELETE', 'clients')`
+        DELETE FROM clients WHERE id = ${id} AND organization_id = ${organizationId}`
+    })
+  } catch (error) {
+    console.error('Error deleting client:', error)
+
+    if (databaseErrorCode(error) === '23503') {
+      throw new Error('DEPENDENCY_ERROR: Este cliente possui Projetos ou Propostas vinculadas.')
+    }
+
+    throw new Error('Erro ao deletar cliente')
+  }
 }
 
 export async function transferAndDeleteClient(sourceClientId: string, targetClientId: string) {
@@ -317,7 +404,11 @@ export async function transferAndDeleteClient(sourceClientId: string, targetClie
 
   if (deleteError) throw new Error('Erro ao deletar cliente original: ' + deleteError.message)
 
-  revalidatePath('/dashboard/clients')
-  revalidatePath('/projects')
-  revalidatePath('/proposals')
+  invalidateCache(organizationId, [
+    { entity: 'clients', id: sourceClientId },
+    { entity: 'clients', id: targetClientId },
+    'projects',
+    'proposals',
+    'finances',
+  ])
 }
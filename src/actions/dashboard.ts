@@ -1,6 +1,7 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
+import { isDirectDataPath, withUserDb } from '@/lib/supabase/direct'
 import { getCurrentBalance } from './financeiro'
 import { startOfMonth, subMonths, format, startOfDay, eachMonthOfInterval, differenceInDays, eachDayOfInterval } from 'date-fns'
 import { ptBR } from 'date-fns/locale'
@@ -292,6 +293,14 @@ export async function getDashboardStats(dateRange?: { start: Date; end: Date }):
   }
 }
 
+/**
+ * Fluxo de caixa da organização do usuário (o mesmo do dashboard)
+ */
+export async function getCashFlow(dateRange?: { start: Date; end: Date }): Promise<CashFlowDataPoint[]> {
+  const organizationId = await getUserOrganization()
+  return getCashFlowData(organizationId, dateRange)
+}
+
 async function getCashFlowData(
   organizationId: string,
   dateRange?: { start: Date; end: Date }
@@ -329,31 +338,57 @@ async function getCashFlowData(
   // Ajustamos a query para pegar exatamente o range solicitado (com uma margem de segurança para fuso)
   const queryStartDate = isDaily ? startDate : startOfMonth(startDate)
 
-  const { data: transactions } = await supabase
-    .from('financial_transactions')
-    .select('type, amount, status, payment_date, created_at')
-    .eq('organization_id', organizationId)
-    .eq('status', 'PAID')
-    .or(`payment_date.gte.${queryStartDate.toISOString()},and(payment_date.is.null,created_at.gte.${queryStartDate.toISOString()})`)
-    .order('payment_date', { ascending: true, nullsFirst: false })
-
-  if (transactions && transactions.length > 0) {
-    transactions.forEach((tx) => {
-      // Ignorar transações após a data final (já que a query não filtra teto)
-      const txDate = new Date(tx.payment_date || tx.created_at)
-      if (txDate > endDate) return
-
-      const key = format(txDate, formatKey)
-
-      if (chartDataMap[key]) {
-        const amount = Math.abs(Number(tx.amount))
-        if (tx.type === 'INCOME' || tx.type === 'INITIAL_CAPITAL') {
-          chartDataMap[key].receitas += amount
-        } else if (tx.type === 'EXPENSE') {
-          chartDataMap[key].despesas += amount
-        }
+  // DATA_PATH=direct: soma por bucket no banco em vez de trazer cada transação
+  if (isDirectDataPath()) {
+    const timeZone = Intl.DateTimeFormat().resolvedOptions().timeZone
+    const totals = await withUserDb((db) =>
+      db.query<{ key: string; receitas: number | null; despesas: number | null }>('financial_transactions_all')`
+        SELECT
+          to_char(COALESCE(payment_date, created_at) AT TIME ZONE ${timeZone}, ${isDaily ? 'YYYY-MM-DD' : 'YYYY-MM'}) AS key,
+          SUM(ABS(amount)) FILTER (WHERE type IN ('INCOME', 'INITIAL_CAPITAL'))::float8 AS receitas,
+          SUM(ABS(amount)) FILTER (WHERE type = 'EXPENSE')::float8 AS despesas
+        FROM financial_transactions_all
+        WHERE organization_id = ${organizationId}
+          AND status = 'PAID'
+          AND (payment_date >= ${queryStartDate} OR (payment_date IS NULL AND created_at >= ${queryStartDate}))
+          AND COALESCE(payment_date, created_at) <= ${endDate}
+        GROUP BY 1`
+    )
+
+    totals.forEach((row) => {
+      if (chartDataMap[row.key]) {
+        chartDataMap[row.key].receitas += row.receitas || 0
+        chartDataMap[row.key].despesas += row.despesas || 0
       }
     })
+  } else {
+    // financial_transactions_all: períodos antigos podem estar no arquivo
+    const { data: transactions } = await supabase
+      .from('financial_transactions_all')
+      .select('type, amount, status, payment_date, created_at')
+      .eq('organization_id', organizationId)
+      .eq('status', 'PAID')
+      .or(`payment_date.gte.${queryStartDate.toISOString()},and(payment_date.is.null,created_at.gte.${queryStartDate.toISOString()})`)
+      .order('payment_date', { ascending: true, nullsFirst: false })
+
+    if (transactions && transactions.length > 0) {
+      transactions.forEach((tx) => {
+        // Ignorar transações após a data final (já que a query não filtra teto)
+        const txDate = new Date(tx.payment_date || tx.created_at)
+        if (txDate > endDate) return
+
+        const key = format(txDate, formatKey)
+
+        if (chartDataMap[key]) {
+          const amount = Math.abs(Number(tx.amount))
+          if (tx.type === 'INCOME' || tx.type === 'INITIAL_CAPITAL') {
+            chartDataMap[key].receitas += amount
+          } else if (tx.type === 'EXPENSE') {
+            chartDataMap[key].despesas += amount
+          }
+        }
+      })
+    }
   }
 
   // Converter para array com saldo acumulado
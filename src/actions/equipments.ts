@@ -1,7 +1,8 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
+import { isDirectDataPath, withUserDb } from '@/lib/supabase/direct'
 
 // ============================================
 // TIPOS
@@ -75,18 +76,21 @@ export async function getEquipments() {
   const organizationId = await getUserOrganization()
   const supabase = await createClient()
 
-  const { data, error } = await supabase
-    .from('equipments')
-    .select('*')
-    .eq('organization_id', organizationId)
-    .order('name', { ascending: true })
+  return cachedRead(
+    'equipments:list',
+    { organizationId, tags: ['equipments'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('equipments')
+        .select('*')
+        .eq('organization_id', organizationId)
+        .order('name', { ascending: true })
 
-  if (error) {
-    console.error('Error fetching equipments:', error)
-    return []
-  }
+      if (error) throw error
 
-  return data
+      return data
+    }
+  )
 }
 
 /**
@@ -151,7 +155,7 @@ export async function addEquipment(equipment: Equipment) {
     throw new Error('Erro ao adicionar equipamento: ' + error.message)
   }
 
-  revalidatePath('/inventory')
+  invalidateCache(organizationId, ['equipments'])
   return data
 }
 
@@ -175,7 +179,7 @@ export async function updateEquipment(id: string, updates: Partial<Equipment>) {
     throw new Error('Erro ao atualizar equipamento: ' + error.message)
   }
 
-  revalidatePath('/inventory')
+  invalidateCache(organizationId, [{ entity: 'equipments', id }])
   return data
 }
 
@@ -197,7 +201,7 @@ export async function deleteEquipment(id: string) {
     throw new Error('Erro ao deletar equipamento: ' + error.message)
   }
 
-  revalidatePath('/inventory')
+  invalidateCache(organizationId, [{ entity: 'equipments', id }])
 }
 
 // ============================================
@@ -211,18 +215,21 @@ export async function getEquipmentsWithAvailability() {
   const organizationId = await getUserOrganization()
   const supabase = await createClient()
 
-  const { data, error } = await supabase
-    .from('equipment_availability')
-    .select('*')
-    .eq('organization_id', organizationId)
-    .order('name', { ascending: true })
+  return cachedRead(
+    'equipments:availability',
+    { organizationId, tags: ['equipments', 'projects'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('equipment_availability')
+        .select('*')
+        .eq('organization_id', organizationId)
+        .order('name', { ascending: true })
 
-  if (error) {
-    console.error('Error fetching equipment availability:', error)
-    return []
-  }
+      if (error) throw error
 
-  return data
+      return data
+    }
+  )
 }
 
 /**
@@ -232,6 +239,20 @@ export async function getEquipmentsWithAvailability() {
  */
 export async function getEquipmentROIAnalysis() {
   const organizationId = await getUserOrganization()
+
+  // DATA_PATH=direct: a view agrega no banco; economiza o salto HTTP do PostgREST
+  if (isDirectDataPath()) {
+    return withUserDb((db) =>
+      db.json('equipment_roi_analysis')`
+        SELECT * FROM equipment_roi_analysis
+        WHERE organization_id = ${organizationId}
+        ORDER BY name ASC`
+    ).catch((error) => {
+      console.error('Error fetching equipment ROI analysis:', error)
+      return []
+    })
+  }
+
   const supabase = await createClient()
 
   const { data, error } = await supabase
@@ -297,6 +318,19 @@ export async function getEquipmentProjectHistory(equipmentId: string) {
  */
 export async function getEquipmentROISummary() {
   const organizationId = await getUserOrganization()
+
+  if (isDirectDataPath()) {
+    return withUserDb((db) =>
+      db.json('equipment_roi_summary')`
+        SELECT * FROM equipment_roi_summary
+        WHERE organization_id = ${organizationId}
+        ORDER BY category ASC`
+    ).catch((error) => {
+      console.error('Error fetching equipment ROI summary:', error)
+      return []
+    })
+  }
+
   const supabase = await createClient()
 
   const { data, error } = await supabase
@@ -385,8 +419,7 @@ export async function addEquipmentBooking(booking: EquipmentBooking) {
     throw new Error('Erro ao criar reserva: ' + error.message)
   }
 
-  revalidatePath('/inventory')
-  revalidatePath('/projects')
+  invalidateCache(organizationId, ['equipments', { entity: 'projects', id: booking.projectId }])
   return data
 }
 
@@ -468,8 +501,8 @@ export async function updateEquipmentBooking(id: string, updates: Partial<Equipm
     throw new Error('Erro ao atualizar reserva: ' + error.message)
   }
 
-  revalidatePath('/inventory')
-  revalidatePath('/projects')
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, ['equipments', { entity: 'projects', id: data.project_id }])
   return data
 }
 
@@ -543,7 +576,7 @@ export async function addMaintenanceLog(log: MaintenanceLog) {
     await updateEquipment(log.equipmentId, { status: 'MAINTENANCE' })
   }
 
-  revalidatePath('/inventory')
+  invalidateCache(organizationId, [{ entity: 'equipments', id: log.equipmentId }])
   return data
 }
 
@@ -572,7 +605,7 @@ export async function updateMaintenanceLog(id: string, updates: Partial<Maintena
     await updateEquipment(data.equipment_id, { status: 'AVAILABLE' })
   }
 
-  revalidatePath('/inventory')
+  invalidateCache(organizationId, ['equipments'])
   return data
 }
 
@@ -1,7 +1,7 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
 import { addMonths, format } from 'date-fns'
 
 // ============================================
@@ -76,18 +76,21 @@ export async function getFinancialOverview() {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('financial_overview')
-    .select('*')
-    .eq('organization_id', organizationId)
-    .single()
+  return cachedRead(
+    'finances:overview',
+    { organizationId, tags: ['finances'], fallback: null as any },
+    async () => {
+      const { data, error } = await supabase
+        .from('financial_overview')
+        .select('*')
+        .eq('organization_id', organizationId)
+        .single()
 
-  if (error) {
-    console.error('Error fetching financial overview:', error)
-    return null
-  }
+      if (error) throw error
 
-  return data
+      return data
+    }
+  )
 }
 
 /**
@@ -97,22 +100,25 @@ export async function getAccountsPayable() {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('accounts_payable')
-    .select(`
-      *,
-      projects:project_id(id, title),
-      freelancers:freelancer_id(id, name)
-    `)
-    .eq('organization_id', organizationId)
-    .order('due_date', { ascending: true })
+  return cachedRead(
+    'finances:payable',
+    { organizationId, tags: ['finances', 'projects', 'freelancers'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('accounts_payable')
+        .select(`
+          *,
+          projects:project_id(id, title),
+          freelancers:freelancer_id(id, name)
+        `)
+        .eq('organization_id', organizationId)
+        .order('due_date', { ascending: true })
 
-  if (error) {
-    console.error('Error fetching accounts payable:', error)
-    return []
-  }
+      if (error) throw error
 
-  return data
+      return data
+    }
+  )
 }
 
 /**
@@ -122,23 +128,26 @@ export async function getAccountsReceivable() {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('accounts_receivable')
-    .select(`
-      *,
-      projects:project_id(id, title),
-      clients:client_id(id, name),
-      proposals:proposal_id(id, title)
-    `)
-    .eq('organization_id', organizationId)
-    .order('due_date', { ascending: true })
+  return cachedRead(
+    'finances:receivable',
+    { organizationId, tags: ['finances', 'projects', 'clients', 'proposals'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('accounts_receivable')
+        .select(`
+          *,
+          projects:project_id(id, title),
+          clients:client_id(id, name),
+          proposals:proposal_id(id, title)
+        `)
+        .eq('organization_id', organizationId)
+        .order('due_date', { ascending: true })
 
-  if (error) {
-    console.error('Error fetching accounts receivable:', error)
-    return []
-  }
+      if (error) throw error
 
-  return data
+      return data
+    }
+  )
 }
 
 /**
@@ -191,7 +200,7 @@ export async function addTransaction(transaction: Transaction) {
     throw new Error('Erro ao adicionar transação: ' + error.message)
   }
 
-  revalidatePath('/financeiro')
+  invalidateCache(data.organization_id, ['finances'])
   return data
 }
 
@@ -246,7 +255,7 @@ export async function updateTransaction(id: string, updates: Partial<Transaction
     // Don't fail the transaction update if audit fails, but log it critical
   }
 
-  revalidatePath('/financeiro')
+  invalidateCache(organizationId, ['finances'])
   return data
 }
 
@@ -309,7 +318,7 @@ export async function markAsPaid(id: string, paymentDate?: string, paymentMethod
     // Não lança erro pro usuário, pois o pagamento já foi confirmado. Apenas loga.
   }
 
-  revalidatePath('/financeiro')
+  invalidateCache(organizationId, ['finances'])
   return data
 }
 
@@ -333,7 +342,7 @@ export async function cancelTransaction(id: string) {
     throw new Error('Erro ao cancelar transação: ' + error.message)
   }
 
-  revalidatePath('/financeiro')
+  invalidateCache(organizationId, ['finances'])
   return data
 }
 
@@ -355,7 +364,7 @@ export async function deleteTransaction(id: string) {
     throw new Error('Erro ao deletar transação: ' + error.message)
   }
 
-  revalidatePath('/financeiro')
+  invalidateCache(organizationId, ['finances'])
 }
 
 // ============================================
@@ -440,8 +449,7 @@ export async function createInitialCapitalTransaction(
       // Não falhar se a organização não for atualizada, a transação já foi criada
     }
 
-    revalidatePath('/dashboard')
-    revalidatePath('/financeiro')
+    invalidateCache(organizationId, ['finances', 'organization'])
 
     return {
       success: true,
@@ -511,8 +519,18 @@ export async function getCurrentBalance(organizationId: string): Promise<number>
 
     const totalDespesas = despesasData?.reduce((sum, item) => sum + Math.abs(Number(item.amount)), 0) || 0
 
+    // Receitas/despesas pagas já movidas para o arquivo (archive_cold_data_batch)
+    const { data: arquivadoData } = await supabase
+      .from('financial_archive_totals')
+      .select('income_paid, expense_paid')
+      .eq('organization_id', organizationId)
+      .maybeSingle()
+
+    const receitasArquivadas = Number(arquivadoData?.income_paid || 0)
+    const despesasArquivadas = Number(arquivadoData?.expense_paid || 0)
+
     // Calcular saldo: Capital Inicial + Receitas - Despesas
-    const saldoAtual = capitalInicial + totalReceitas - totalDespesas
+    const saldoAtual = capitalInicial + totalReceitas + receitasArquivadas - totalDespesas - despesasArquivadas
 
     return saldoAtual
   } catch (error) {
@@ -611,7 +629,7 @@ export async function upsertFreelancerPayable(data: {
       throw new Error('Erro ao atualizar pagamento do freelancer')
     }
 
-    revalidatePath('/financeiro')
+    invalidateCache(data.organizationId, ['finances'])
     return { id: existing.id, updated: true }
   } else {
     // Criar nova transação
@@ -638,7 +656,7 @@ export async function upsertFreelancerPayable(data: {
       throw new Error('Erro ao criar pagamento do freelancer')
     }
 
-    revalidatePath('/financeiro')
+    invalidateCache(data.organizationId, ['finances'])
     return { id: newTransaction.id, updated: false }
   }
 }
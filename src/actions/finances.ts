@@ -1,7 +1,7 @@
 'use server'
 
 import { createClient } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { invalidateCache } from '@/lib/cache/data-cache'
 
 // Buscar resumo financeiro do projeto
 export async function getProjectFinancialSummary(projectId: string) {
@@ -120,7 +120,7 @@ export async function addExpense(formData: {
     throw new Error('Erro ao criar despesa')
   }
 
-  revalidatePath(`/projects/${formData.project_id}`)
+  invalidateCache(financeData.organization_id, [{ entity: 'projects', id: formData.project_id }, 'finances'])
   return data
 }
 
@@ -150,7 +150,7 @@ export async function updateExpense(
     throw new Error('Erro ao atualizar despesa')
   }
 
-  revalidatePath('/projects')
+  invalidateCache(data.organization_id, [{ entity: 'projects', id: data.project_id }, 'finances'])
   return data
 }
 
@@ -158,17 +158,21 @@ export async function updateExpense(
 export async function deleteExpense(expenseId: string) {
   const supabase = await createClient()
 
-  const { error } = await supabase
+  const { data: deleted, error } = await supabase
     .from('project_expenses')
     .delete()
     .eq('id', expenseId)
+    .select('project_id, organization_id')
+    .maybeSingle()
 
   if (error) {
     console.error('Error deleting expense:', error)
     throw new Error('Erro ao deletar despesa')
   }
 
-  revalidatePath('/projects')
+  if (deleted) {
+    invalidateCache(deleted.organization_id, [{ entity: 'projects', id: deleted.project_id }, 'finances'])
+  }
 }
 
 // Atualizar valores de receita
@@ -194,6 +198,6 @@ export async function updateProjectRevenue(
     throw new Error('Erro ao atualizar receita')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  invalidateCache(data.organization_id, [{ entity: 'projects', id: projectId }, 'finances'])
   return data
 }
@@ -1,48 +1,61 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
+import {
+  searchFreelancerAvailability,
+  type AvailabilitySearch,
+  type AvailableFreelancer,
+} from '@/lib/freelancer-availability'
 
 export async function getFreelancers() {
   const supabase = await createClient()
 
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('freelancers')
-    .select('*')
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching freelancers:', error)
-    return []
-  }
-
-  return data || []
+  return cachedRead(
+    'freelancers:list',
+    { organizationId, tags: ['freelancers'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('freelancers')
+        .select('*')
+        .eq('organization_id', organizationId)
+        .order('created_at', { ascending: false })
+
+      if (error) throw error
+
+      return data || []
+    }
+  )
 }
 
 /**
  * Buscar freelancers com estatísticas completas
- * Inclui média diária REAL baseada em projetos executados
+ * Lê os totais do rollup mensal (freelancer_rollup_totals): uma leitura indexada
+ * por organização, sem trafegar o histórico de assignments/transações
  */
 export async function getFreelancersWithStatistics() {
   const supabase = await createClient()
 
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('freelancer_statistics')
-    .select('*')
-    .eq('organization_id', organizationId)
-    .order('name', { ascending: true })
-
-  if (error) {
-    console.error('Error fetching freelancer statistics:', error)
-    return []
-  }
-
-  return data || []
+  return cachedRead(
+    'freelancers:statistics',
+    { organizationId, tags: ['freelancers', 'projects', 'finances'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('freelancer_rollup_totals')
+        .select('*')
+        .eq('organization_id', organizationId)
+        .order('created_at', { ascending: false })
+
+      if (error) throw error
+
+      // Mesmo formato da linha de freelancers (id), com os totais do rollup
+      return (data || []).map((row: any) => ({ ...row, id: row.freelancer_id }))
+    }
+  )
 }
 
 export type CreateFreelancerData = {
@@ -83,7 +96,7 @@ export async function createFreelancer(data: CreateFreelancerData) {
     throw new Error('Erro ao criar freelancer')
   }
 
-  revalidatePath('/freelancers')
+  invalidateCache(organizationId, ['freelancers'])
   return freelancer
 }
 
@@ -103,7 +116,7 @@ export async function updateFreelancerRate(id: string, daily_rate: number) {
     throw new Error('Erro ao atualizar taxa diária')
   }
 
-  revalidatePath('/freelancers')
+  invalidateCache(organizationId, [{ entity: 'freelancers', id }])
 }
 
 export async function updateFreelancer(id: string, data: Partial<CreateFreelancerData>) {
@@ -132,7 +145,22 @@ export async function updateFreelancer(id: string, data: Partial<CreateFreelance
     throw new Error('Erro ao atualizar freelancer')
   }
 
-  revalidatePath('/freelancers')
-  revalidatePath(`/freelancers/${id}`)
+  invalidateCache(organizationId, [{ entity: 'freelancers', id }])
   return updatedFreelancer
 }
+
+/**
+ * Buscar freelancers disponíveis por habilidade, período e teto de diária
+ * Retorna também quem está ocupado (com os conflitos), depois dos disponíveis
+ */
+export async function searchAvailableFreelancers(search: AvailabilitySearch): Promise<AvailableFreelancer[]> {
+  const supabase = await createClient()
+  const organizationId = await getUserOrganization()
+
+  try {
+    return await searchFreelancerAvailability(supabase, organizationId, search)
+  } catch (error) {
+    console.error('Error searching freelancer availability:', error)
+    return []
+  }
+}
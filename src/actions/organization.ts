@@ -1,7 +1,7 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
 import { z } from 'zod'
 
 const organizationSchema = z.object({
@@ -27,18 +27,21 @@ export async function getOrganization() {
     const supabase = await createClient()
     const organizationId = await getUserOrganization()
 
-    const { data, error } = await supabase
-        .from('organizations')
-        .select('*')
-        .eq('id', organizationId)
-        .single()
+    return cachedRead(
+        'organization:detail',
+        { organizationId, tags: ['organization'], fallback: null as any },
+        async () => {
+            const { data, error } = await supabase
+                .from('organizations')
+                .select('*')
+                .eq('id', organizationId)
+                .single()
 
-    if (error) {
-        console.error('Error fetching organization:', error)
-        return null
-    }
+            if (error) throw error
 
-    return data
+            return data
+        }
+    )
 }
 
 export async function updateOrganization(data: OrganizationFormData) {
@@ -71,6 +74,5 @@ export async function updateOrganization(data: OrganizationFormData) {
         throw new Error('Error updating organization: ' + error.message)
     }
 
-    revalidatePath('/settings/company')
-    revalidatePath('/proposals')
+    invalidateCache(organizationId, ['organization'])
 }
@@ -0,0 +1,111 @@
+'use server'
+
+/**
+ * ============================================
+ * RENTABILIDADE
+ * Leitura do cubo project_profitability_cube (mantido por triggers) via
+ * profitability_query: ranking entre projetos/clientes/meses/categorias e
+ * drill-down de um projeto sem varrer transações.
+ * ============================================
+ */
+
+import { createClient, getUserOrganization } from '@/lib/supabase/server'
+import { cachedRead } from '@/lib/cache/data-cache'
+
+export type ProfitabilityDimension = 'project' | 'client' | 'month' | 'category'
+
+export interface ProfitabilityQuery {
+  groupBy?: ProfitabilityDimension[]
+  startDate?: string // YYYY-MM-DD
+  endDate?: string
+  projectId?: string
+  clientId?: string
+  category?: string
+  orderBy?: 'profit' | 'margin' | 'revenue' | 'cost' | 'contracted' | 'month'
+  ascending?: boolean
+  limit?: number
+}
+
+export interface ProfitabilityRow {
+  project_id: string | null
+  project_title: string | null
+  client_id: string | null
+  client_name: string | null
+  month: string | null
+  category: string | null
+  revenue: number
+  revenue_paid: number
+  cost: number
+  cost_paid: number
+  contracted: number
+  profit: number
+  margin_percent: number | null
+  transactions: number
+}
+
+export interface ProjectProfitability {
+  totals: ProfitabilityRow | null
+  byMonth: ProfitabilityRow[]
+  byCategory: ProfitabilityRow[]
+}
+
+const DIMENSIONS: ProfitabilityDimension[] = ['project', 'client', 'month', 'category']
+
+// Agregação consultável sobre o cubo: ranking e drill-down pela mesma chamada
+export async function getProfitability(query: ProfitabilityQuery = {}): Promise<ProfitabilityRow[]> {
+  const supabase = await createClient()
+  const organizationId = await getUserOrganization()
+
+  // Chave estável: mesma consulta com dimensões em outra ordem usa o mesmo cache
+  const groupBy = DIMENSIONS.filter((dimension) => (query.groupBy ?? ['project']).includes(dimension))
+  const params = {
+    p_organization_id: organizationId,
+    p_group_by: groupBy,
+    p_start: query.startDate ?? null,
+    p_end: query.endDate ?? null,
+    p_project_id: query.projectId ?? null,
+    p_client_id: query.clientId ?? null,
+    p_category: query.category ?? null,
+    p_order_by: query.orderBy ?? 'profit',
+    p_ascending: query.ascending ?? false,
+    p_limit: query.limit ?? 50,
+  }
+
+  return cachedRead(
+    'profitability:query',
+    { organizationId, tags: ['finances', 'projects'], keyParts: [JSON.stringify(params)], fallback: [] },
+    async () => {
+      const { data, error } = await supabase.rpc('profitability_query', params)
+
+      if (error) throw error
+      return ((data || []) as any[]).map((row) => ({
+        ...row,
+        revenue: Number(row.revenue) || 0,
+        revenue_paid: Number(row.revenue_paid) || 0,
+        cost: Number(row.cost) || 0,
+        cost_paid: Number(row.cost_paid) || 0,
+        contracted: Number(row.contracted) || 0,
+        profit: Number(row.profit) || 0,
+        margin_percent: row.margin_percent === null ? null : Number(row.margin_percent),
+      }))
+    }
+  )
+}
+
+// Drill-down de um projeto: totais, evolução mensal e quebra por categoria
+export async function getProjectProfitability(
+  projectId: string,
+  range: { startDate?: string; endDate?: string } = {}
+): Promise<ProjectProfitability> {
+  const [totals, byMonth, byCategory] = await Promise.all([
+    getProfitability({ ...range, projectId, groupBy: ['project'], limit: 1 }),
+    getProfitability({ ...range, projectId, groupBy: ['month'], orderBy: 'month', ascending: true, limit: 120 }),
+    getProfitability({ ...range, projectId, groupBy: ['category'], orderBy: 'cost', limit: 100 }),
+  ])
+
+  return {
+    totals: totals[0] ?? null,
+    byMonth,
+    byCategory,
+  }
+}
@@ -1,7 +1,8 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
+import { isDirectDataPath, withUserDb } from '@/lib/supabase/direct'
 import type {
   CreateProjectData,
   MinimalProjectData,
@@ -16,8 +17,10 @@ import type {
   ProjectTeamSummary,
   KanbanBoardData,
   ProjectStats,
+  ProjectFinancials,
 } from '@/types/projects'
 import { upsertFreelancerPayable, deleteTransaction } from '@/actions/financeiro'
+import { getProjectProfitability } from '@/actions/profitability'
 
 // ============================================
 // PROJECTS CRUD
@@ -27,245 +30,292 @@ export async function getProjects(): Promise<ProjectWithClient[]> {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('projects')
-    .select('*, clients(id, name, company)')
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching projects:', error)
-    return []
-  }
+  return cachedRead('projects:list', { organizationId, tags: ['projects', 'clients'], fallback: [] }, async () => {
+    const { data, error } = await supabase
+      .from('projects')
+      .select('*, clients(id, name, company)')
+      .eq('organization_id', organizationId)
+      .order('created_at', { ascending: false })
 
-  return data || []
+    if (error) throw error
+    return data || []
+  })
 }
 
 export async function getProjectsForKanban(): Promise<KanbanBoardData> {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  // 1. Buscar projetos
-  const { data: projects, error } = await supabase
-    .from('projects')
-    .select('*, clients(id, name, company)')
-    .eq('organization_id', organizationId)
-    .neq('status', 'ARCHIVED') // Kanban não mostra arquivados geralmente
-    .order('created_at', { ascending: false })
-
-  if (error) {
-    console.error('Error fetching projects for kanban:', error)
-    return { columns: [] }
-  }
-
-  // 2. Buscar próximas gravações para esses projetos
+  // "today" entra na chave: a próxima gravação muda com a data
   const today = new Date().toISOString().split('T')[0]
-  const projectIds = projects?.map(p => p.id) || []
-
-  let shootingDatesMap: Record<string, string> = {}
-  let taskProgressMap: Record<string, { total: number; completed: number }> = {}
-  let nextTaskMap: Record<string, string> = {}
-
-  if (projectIds.length > 0) {
-    // Buscar próximas gravações
-    const { data: nextShoots } = await supabase
-      .from('shooting_dates')
-      .select('projectId, date')
-      .in('projectId', projectIds)
-      .gte('date', today)
-      .order('date', { ascending: true })
 
-    // Pegar apenas a PRÓXIMA data de cada projeto (o primeiro da lista já que ordenamos asc)
-    nextShoots?.forEach(shoot => {
-      // Como está ordenado por data ASC, o primeiro que aparecer para o projeto é o mais próximo
-      if (!shootingDatesMap[shoot.projectId]) {
-        shootingDatesMap[shoot.projectId] = shoot.date
-      }
-    })
+  return cachedRead(
+    'projects:kanban',
+    { organizationId, tags: ['projects', 'clients'], keyParts: [today], fallback: { columns: [] } },
+    async (): Promise<KanbanBoardData> => {
+      // 1. Buscar projetos
+      const { data: projects, error } = await supabase
+        .from('projects')
+        .select('*, clients(id, name, company)')
+        .eq('organization_id', organizationId)
+        .neq('status', 'ARCHIVED') // Kanban não mostra arquivados geralmente
+        .order('created_at', { ascending: false })
+
+      if (error) throw error
+
+      // 2. Buscar próximas gravações para esses projetos
+      const projectIds = projects?.map(p => p.id) || []
+
+      let shootingDatesMap: Record<string, string> = {}
+      let taskProgressMap: Record<string, { total: number; completed: number }> = {}
+      let nextTaskMap: Record<string, string> = {}
+
+      if (projectIds.length > 0) {
+        // Buscar próximas gravações
+        const { data: nextShoots } = await supabase
+          .from('shooting_dates')
+          .select('projectId, date')
+          .in('projectId', projectIds)
+          .gte('date', today)
+          .order('date', { ascending: true })
+
+        // Pegar apenas a PRÓXIMA data de cada projeto (o primeiro da lista já que ordenamos asc)
+        nextShoots?.forEach(shoot => {
+          // Como está ordenado por data ASC, o primeiro que aparecer para o projeto é o mais próximo
+          if (!shootingDatesMap[shoot.projectId]) {
+            shootingDatesMap[shoot.projectId] = shoot.date
+          }
+        })
 
-    // Buscar tarefas para contagem e próxima tarefa pendente
-    const { data: allTasks, error: tasksError } = await supabase
-      .from('project_tasks')
-      .select('project_id, title, completed, order')
-      .in('project_id', projectIds)
-      .order('order', { ascending: true })
+        // Buscar tarefas para contagem e próxima tarefa pendente
+        const { data: allTasks, error: tasksError } = await supabase
+          .from('project_tasks')
+          .select('project_id, title, completed, order')
+          .in('project_id', projectIds)
+          .order('order', { ascending: true })
 
-    if (tasksError) {
-      console.error('Error fetching tasks for kanban:', tasksError)
-    }
+        if (tasksError) {
+          console.error('Error fetching tasks for kanban:', tasksError)
+        }
 
-    if (allTasks) {
-      allTasks.forEach((task) => {
-        // Inicializar contadores se não existir
-        if (!taskProgressMap[task.project_id]) {
-          taskProgressMap[task.project_id] = { total: 0, completed: 0 }
+        if (allTasks) {
+          allTasks.forEach((task) => {
+            // Inicializar contadores se não existir
+            if (!taskProgressMap[task.project_id]) {
+              taskProgressMap[task.project_id] = { total: 0, completed: 0 }
+            }
+
+            // Contar total
+            taskProgressMap[task.project_id].total++
+
+            if (task.completed) {
+              // Contar completed
+              taskProgressMap[task.project_id].completed++
+            } else {
+              // Primeira tarefa não completa = próxima tarefa
+              if (!nextTaskMap[task.project_id]) {
+                nextTaskMap[task.project_id] = task.title
+              }
+            }
+          })
         }
+      }
 
-        // Contar total
-        taskProgressMap[task.project_id].total++
+      const columns: KanbanBoardData['columns'] = [
+        { id: 'BRIEFING', title: 'Briefing', projects: [] },
+        { id: 'PRE_PROD', title: 'Pré-Produção', projects: [] },
+        { id: 'SHOOTING', title: 'Gravação', projects: [] },
+        { id: 'POST_PROD', title: 'Pós-Produção', projects: [] },
+        { id: 'REVIEW', title: 'Revisão', projects: [] },
+        { id: 'DONE', title: 'Concluído', projects: [] },
+      ]
+
+      projects?.forEach((project) => {
+        // Injetar próxima gravação e progresso de tarefas no objeto do projeto
+        const taskProgress = taskProgressMap[project.id] || { total: 0, completed: 0 }
+        const projectWithEvent = {
+          ...project,
+          next_shooting: shootingDatesMap[project.id] || null,
+          tasks_total: taskProgress.total,
+          tasks_completed: taskProgress.completed,
+          next_task: nextTaskMap[project.id] || null,
+        }
 
-        if (task.completed) {
-          // Contar completed
-          taskProgressMap[task.project_id].completed++
-        } else {
-          // Primeira tarefa não completa = próxima tarefa
-          if (!nextTaskMap[task.project_id]) {
-            nextTaskMap[task.project_id] = task.title
-          }
+        const column = columns.find((col) => col.id === project.status)
+        if (column) {
+          column.projects.push(projectWithEvent)
         }
       })
-    }
-  }
 
-  const columns: KanbanBoardData['columns'] = [
-    { id: 'BRIEFING', title: 'Briefing', projects: [] },
-    { id: 'PRE_PROD', title: 'Pré-Produção', projects: [] },
-    { id: 'SHOOTING', title: 'Gravação', projects: [] },
-    { id: 'POST_PROD', title: 'Pós-Produção', projects: [] },
-    { id: 'REVIEW', title: 'Revisão', projects: [] },
-    { id: 'DONE', title: 'Concluído', projects: [] },
-  ]
-
-  projects?.forEach((project) => {
-    // Injetar próxima gravação e progresso de tarefas no objeto do projeto
-    const taskProgress = taskProgressMap[project.id] || { total: 0, completed: 0 }
-    const projectWithEvent = {
-      ...project,
-      next_shooting: shootingDatesMap[project.id] || null,
-      tasks_total: taskProgress.total,
-      tasks_completed: taskProgress.completed,
-      next_task: nextTaskMap[project.id] || null,
+      return { columns }
     }
+  )
+}
 
-    const column = columns.find((col) => col.id === project.status)
-    if (column) {
-      column.projects.push(projectWithEvent)
-    }
-  })
+// Datas vêm de tabelas legadas (camelCase) que podem não existir em todos os ambientes,
+// por isso ficam fora do select embutido e são buscadas em paralelo
+async function getProjectDates(
+  supabase: Awaited<ReturnType<typeof createClient>>,
+  table: 'shooting_dates' | 'delivery_dates',
+  projectId: string
+): Promise<any[]> {
+  try {
+    const { data, error } = await supabase
+      .from(table)
+      .select('*')
+      .eq('projectId', projectId)
+      .order('date', { ascending: true })
+
+    if (error || !data) return []
 
-  return { columns }
+    return data.map(({ projectId: _projectId, createdAt, updatedAt, ...row }) => ({
+      ...row,
+      project_id: projectId,
+      created_at: createdAt || row.created_at,
+      updated_at: updatedAt || row.updated_at,
+    }))
+  } catch (e) {
+    // Tabela pode não existir ainda
+    return []
+  }
 }
 
 export async function getProject(projectId: string): Promise<ProjectWithRelations | null> {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  // Primeiro, buscar o projeto com os relacionamentos básicos
-  const { data, error } = await supabase
-    .from('projects')
-    .select(
+  return cachedRead(
+    'projects:detail',
+    {
+      organizationId,
+      tags: [{ entity: 'projects', id: projectId }, 'clients', 'freelancers'],
+      keyParts: [projectId],
+      fallback: null,
+    },
+    () => loadProjectGraph(supabase, organizationId, projectId)
+  )
+}
+
+async function loadProjectGraph(
+  supabase: Awaited<ReturnType<typeof createClient>>,
+  organizationId: string,
+  projectId: string
+): Promise<ProjectWithRelations | null> {
+  // Grafo do projeto em um único select embutido; datas em paralelo
+  const [projectResult, shootingDates, deliveryDates] = await Promise.all([
+    supabase
+      .from('projects')
+      .select(
+        `
+        *,
+        clients(id, name, company, email, phone),
+        users(id, name, email, role),
+        project_members(
+          id,
+          role,
+          status,
+          agreed_fee,
+          freelancers(id, name, email, phone, daily_rate)
+        ),
+        project_items(*),
+        project_tasks(*)
       `
-      *,
-      clients(id, name, company, email, phone),
-      users(id, name, email, role),
-      project_members(
-        id,
-        role,
-        status,
-        agreed_fee,
-        freelancers(id, name, email, phone, daily_rate)
       )
-    `
-    )
-    .eq('id', projectId)
-    .eq('organization_id', organizationId)
-    .single()
+      .eq('id', projectId)
+      .eq('organization_id', organizationId)
+      .order('order', { referencedTable: 'project_items', ascending: true })
+      .order('order', { referencedTable: 'project_tasks', ascending: true })
+      .single(),
+    getProjectDates(supabase, 'shooting_dates', projectId),
+    getProjectDates(supabase, 'delivery_dates', projectId),
+  ])
+
+  const { data, error } = projectResult
 
   if (error) {
     // PGRST116 = "no rows returned" - não é um erro real, apenas projeto não encontrado
-    if (error.code !== 'PGRST116') {
-      console.error('Error fetching project:', error)
-    }
-    return null
+    if (error.code === 'PGRST116') return null
+    throw error
   }
 
-  // Buscar shooting_dates separadamente (para evitar erro se tabela não existir)
-  let shootingDates: any[] = []
-  try {
-    const { data: sdData, error: sdError } = await supabase
-      .from('shooting_dates')
-      .select('*')
-      .eq('projectId', projectId)
-      .order('date', { ascending: true })
+  const { project_items, project_tasks, ...project } = data
 
-    if (!sdError && sdData) {
-      shootingDates = sdData.map(sd => ({
-        id: sd.id,
-        date: sd.date,
-        time: sd.time,
-        location: sd.location,
-        notes: sd.notes,
-        project_id: projectId,
-        created_at: sd.createdAt || sd.created_at,
-        updated_at: sd.updatedAt || sd.updated_at,
-      }))
-    }
-  } catch (e) {
-    // Tabela pode não existir ainda
+  return {
+    ...project,
+    shooting_dates: shootingDates,
+    delivery_dates: deliveryDates,
+    items: project_items || [],
+    tasks: project_tasks || [],
   }
+}
 
-  // Buscar delivery_dates separadamente
-  let deliveryDates: any[] = []
-  try {
-    const { data: ddData, error: ddError } = await supabase
-      .from('delivery_dates')
-      .select('*')
-      .eq('projectId', projectId)
-      .order('date', { ascending: true })
-
-    if (!ddError && ddData) {
-      deliveryDates = ddData.map(dd => ({
-        id: dd.id,
-        date: dd.date,
-        description: dd.description,
-        completed: dd.completed,
-        project_id: projectId,
-        created_at: dd.createdAt || dd.created_at,
-        updated_at: dd.updatedAt || dd.updated_at,
-      }))
-    }
-  } catch (e) {
-    // Tabela pode não existir ainda
-  }
+/**
+ * Dados financeiros do detalhe do projeto (reservas, despesas, resumo e cubo de
+ * rentabilidade).
+ * Separado de getProject para que a página possa renderizar o cabeçalho e as
+ * abas principais sem esperar por estas relações, que chegam via streaming.
+ */
+export async function getProjectFinancialData(projectId: string): Promise<ProjectFinancials> {
+  const supabase = await createClient()
+  const organizationId = await getUserOrganization()
 
-  // Buscar project_items separadamente (SPRINT 2)
-  let items: any[] = []
-  try {
-    const { data: itemsData, error: itemsError } = await supabase
-      .from('project_items')
-      .select('*')
-      .eq('project_id', projectId)
-      .order('order', { ascending: true })
+  const [relations, profitability] = await Promise.all([
+    cachedRead(
+      'projects:financials',
+      {
+        organizationId,
+        tags: [{ entity: 'projects', id: projectId }, 'equipments', 'finances'],
+        keyParts: [projectId],
+        fallback: { financialSummary: null, expenses: [], equipmentBookings: [] },
+      },
+      () => loadProjectFinancials(supabase, organizationId, projectId)
+    ),
+    getProjectProfitability(projectId),
+  ])
 
-    if (!itemsError && itemsData) {
-      items = itemsData
-    }
-  } catch (e) {
-    // Tabela pode não existir ainda
-  }
+  return { ...relations, profitability }
+}
 
-  // Buscar project_tasks (To-Do List)
-  let tasks: any[] = []
-  try {
-    const { data: tasksData, error: tasksError } = await supabase
-      .from('project_tasks')
+async function loadProjectFinancials(
+  supabase: Awaited<ReturnType<typeof createClient>>,
+  organizationId: string,
+  projectId: string
+): Promise<Omit<ProjectFinancials, 'profitability'>> {
+  const [relationsResult, summaryResult] = await Promise.all([
+    supabase
+      .from('projects')
+      .select(
+        `
+        id,
+        equipment_bookings(
+          *,
+          equipments:equipment_id(id, name, category, status, serial_number, daily_rate)
+        ),
+        project_expenses(
+          *,
+          freelancers(id, name)
+        )
+      `
+      )
+      .eq('id', projectId)
+      .eq('organization_id', organizationId)
+      .order('start_date', { referencedTable: 'equipment_bookings', ascending: true })
+      .order('created_at', { referencedTable: 'project_expenses', ascending: false })
+      .maybeSingle(),
+    supabase
+      .from('project_financial_summary')
       .select('*')
       .eq('project_id', projectId)
-      .order('order', { ascending: true })
+      .maybeSingle(),
+  ])
 
-    if (!tasksError && tasksData) {
-      tasks = tasksData
-    }
-  } catch (e) {
-    // Tabela pode não existir ainda
-  }
+  if (relationsResult.error) throw relationsResult.error
 
   return {
-    ...data,
-    shooting_dates: shootingDates,
-    delivery_dates: deliveryDates,
-    items: items,
-    tasks: tasks,
+    // View pode não existir em todos os ambientes: ausência vira null
+    financialSummary: summaryResult.error ? null : summaryResult.data,
+    expenses: relationsResult.data?.project_expenses || [],
+    equipmentBookings: relationsResult.data?.equipment_bookings || [],
   }
 }
 
@@ -314,7 +364,7 @@ export async function createProject(formData: MinimalProjectData) {
     target_margin_percent: 30,
   })
 
-  revalidatePath('/projects')
+  invalidateCache(organizationId, ['projects'])
   return data
 }
 
@@ -382,7 +432,7 @@ export async function createProjectFromProposal(formData: CreateProjectFromPropo
     }
   }
 
-  revalidatePath('/projects')
+  invalidateCache(organizationId, ['projects', 'proposals', 'finances'])
   return project
 }
 
@@ -434,8 +484,7 @@ export async function updateProject(projectId: string, formData: UpdateProjectDa
     }
   }
 
-  revalidatePath('/projects')
-  revalidatePath(`/projects/${projectId}`)
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }, 'finances'])
   return data
 }
 
@@ -443,6 +492,47 @@ export async function updateProjectStatus(projectId: string, status: ProjectStat
   return updateProject(projectId, { status })
 }
 
+/**
+ * Aplica várias mudanças de status de uma vez (fila de mutações do kanban).
+ * Um UPDATE por status de destino e uma única invalidação de cache.
+ * Retorna os ids efetivamente atualizados; os ausentes falharam e o cliente
+ * desfaz só esses.
+ */
+export async function updateProjectStatuses(
+  changes: Array<{ projectId: string; status: ProjectStatus }>
+): Promise<string[]> {
+  if (changes.length === 0) return []
+
+  const supabase = await createClient()
+  const organizationId = await getUserOrganization()
+
+  const byStatus = new Map<ProjectStatus, string[]>()
+  for (const { projectId, status } of changes) {
+    byStatus.set(status, [...(byStatus.get(status) || []), projectId])
+  }
+
+  const results = await Promise.all(
+    [...byStatus].map(([status, ids]) =>
+      supabase
+        .from('projects')
+        .update({ status })
+        .in('id', ids)
+        .eq('organization_id', organizationId)
+        .select('id')
+    )
+  )
+
+  for (const result of results) {
+    if (result.error) console.error('Error updating project statuses:', result.error)
+  }
+
+  const updated = results.flatMap((result) => (result.data || []).map((row: { id: string }) => row.id))
+  if (updated.length > 0) {
+    invalidateCache(organizationId, ['projects', ...updated.map((id) => ({ entity: 'projects' as const, id }))])
+  }
+  return updated
+}
+
 export async function deleteProject(projectId: string, deleteLinkedProposal: boolean = false) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
@@ -491,8 +581,12 @@ export async function deleteProject(projectId: string, deleteLinkedProposal: boo
     throw new Error('Erro ao deletar projeto')
   }
 
-  revalidatePath('/projects')
-  revalidatePath('/proposals')
+  invalidateCache(organizationId, [
+    { entity: 'projects', id: projectId },
+    'proposals',
+    'finances',
+    'calendar',
+  ])
 }
 
 // ============================================
@@ -541,8 +635,6 @@ export async function addProjectMember(formData: AddProjectMemberData) {
     throw new Error('Erro ao adicionar membro ao projeto')
   }
 
-  revalidatePath(`/projects/${formData.project_id}`)
-
   // INTEGRAÇÃO FINANCEIRA: Criar despesa se houver valor acordado
   if (formData.agreed_fee && formData.agreed_fee > 0) {
     const { data: freelancer } = await supabase
@@ -567,6 +659,7 @@ export async function addProjectMember(formData: AddProjectMemberData) {
     }
   }
 
+  invalidateCache(organizationId, [{ entity: 'projects', id: formData.project_id }, 'freelancers', 'finances'])
   return data
 }
 
@@ -597,8 +690,6 @@ export async function updateProjectMember(
     throw new Error('Erro ao atualizar membro do projeto')
   }
 
-  revalidatePath('/projects')
-
   // INTEGRAÇÃO FINANCEIRA: Atualizar ou criar despesa
   if (formData.agreed_fee !== undefined) {
     // Buscar freelancer info e project_id do member atual (pois updateProjectMember recebe memberId)
@@ -631,6 +722,7 @@ export async function updateProjectMember(
     }
   }
 
+  invalidateCache(organizationId, [{ entity: 'projects', id: data.project_id }, 'freelancers', 'finances'])
   return data
 }
 
@@ -674,7 +766,12 @@ export async function removeProjectMember(memberId: string) {
     throw new Error('Erro ao remover membro do projeto')
   }
 
-  revalidatePath('/projects')
+  invalidateCache(
+    organizationId,
+    memberToDelete
+      ? [{ entity: 'projects', id: memberToDelete.project_id }, 'freelancers', 'finances']
+      : ['projects', 'freelancers', 'finances']
+  )
 
   // INTEGRAÇÃO FINANCEIRA: Remover despesa associada
   // Buscar transação associada ao freelancer neste projeto
@@ -861,7 +958,8 @@ export async function addShootingDate(projectId: string, shootingDate: {
     throw new Error('Erro ao adicionar data de gravação')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
   return data
 }
 
@@ -891,7 +989,8 @@ export async function addDeliveryDate(projectId: string, deliveryDate: {
     throw new Error('Erro ao adicionar data de entrega')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
   return data
 }
 
@@ -908,7 +1007,8 @@ export async function deleteShootingDate(shootingDateId: string, projectId: stri
     throw new Error('Erro ao remover data de gravação')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
 
 export async function deleteDeliveryDate(deliveryDateId: string, projectId: string) {
@@ -924,7 +1024,8 @@ export async function deleteDeliveryDate(deliveryDateId: string, projectId: stri
     throw new Error('Erro ao remover data de entrega')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
 
 export async function getProjectShootingDates(projectId: string) {
@@ -958,7 +1059,8 @@ export async function toggleDeliveryComplete(deliveryDateId: string, projectId:
     throw new Error('Erro ao atualizar entrega')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
 
 
@@ -985,17 +1087,26 @@ export async function getOrganizationUsers() {
 export async function toggleProjectItemStatus(itemId: string, projectId: string, status: 'PENDING' | 'DONE') {
   const supabase = await createClient()
 
-  const { error } = await supabase
-    .from('project_items')
-    .update({ status })
-    .eq('id', itemId)
+  // DATA_PATH=direct: mesmo UPDATE pela conexão direta (lib/supabase/direct)
+  const { error } = isDirectDataPath()
+    ? await withUserDb((db) =>
+        db.execute('UPDATE', 'project_items')`UPDATE project_items SET status = ${status} WHERE id = ${itemId}`
+      ).then(
+        () => ({ error: null }),
+        (failure: unknown) => ({ error: failure })
+      )
+    : await supabase
+        .from('project_items')
+        .update({ status })
+        .eq('id', itemId)
 
   if (error) {
     console.error('Error updating project item:', error)
     throw new Error('Erro ao atualizar item')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
 
 /**
@@ -1116,11 +1227,10 @@ export async function addProjectItem(projectId: string, item: {
     throw new Error('Erro ao adicionar item')
   }
 
-  revalidatePath(`/projects/${projectId}`)
-
   // INTEGRAÇÃO FINANCEIRA
   const organizationId = await getUserOrganization()
   await recalculateProjectRevenue(projectId, organizationId)
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }, 'finances'])
 }
 
 export async function updateProjectItem(itemId: string, projectId: string, updates: {
@@ -1163,11 +1273,10 @@ export async function updateProjectItem(itemId: string, projectId: string, updat
     throw new Error('Erro ao atualizar item')
   }
 
-  revalidatePath(`/projects/${projectId}`)
-
   // INTEGRAÇÃO FINANCEIRA
   const organizationId = await getUserOrganization()
   await recalculateProjectRevenue(projectId, organizationId)
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }, 'finances'])
 }
 
 export async function deleteProjectItem(itemId: string, projectId: string) {
@@ -1183,11 +1292,10 @@ export async function deleteProjectItem(itemId: string, projectId: string) {
     throw new Error('Erro ao deletar item')
   }
 
-  revalidatePath(`/projects/${projectId}`)
-
   // INTEGRAÇÃO FINANCEIRA
   const organizationId = await getUserOrganization()
   await recalculateProjectRevenue(projectId, organizationId)
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }, 'finances'])
 }
 
 // ============================================
@@ -1248,7 +1356,8 @@ export async function addProjectTask(projectId: string, title: string) {
     throw new Error('Erro ao adicionar tarefa')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
   return data
 }
 
@@ -1265,7 +1374,51 @@ export async function toggleProjectTask(taskId: string, projectId: string, compl
     throw new Error('Erro ao atualizar tarefa')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
+}
+
+/**
+ * Marca/desmarca várias tarefas do mesmo projeto de uma vez (fila de mutações).
+ * No máximo dois UPDATEs (concluídas e pendentes) e uma invalidação de cache.
+ * Retorna os ids atualizados, como updateProjectStatuses.
+ */
+export async function setProjectTasksCompleted(
+  projectId: string,
+  changes: Array<{ taskId: string; completed: boolean }>
+): Promise<string[]> {
+  if (changes.length === 0) return []
+
+  const supabase = await createClient()
+
+  const groups = [true, false]
+    .map((completed) => ({
+      completed,
+      ids: changes.filter((change) => change.completed === completed).map((change) => change.taskId),
+    }))
+    .filter((group) => group.ids.length > 0)
+
+  const results = await Promise.all(
+    groups.map(({ completed, ids }) =>
+      supabase
+        .from('project_tasks')
+        .update({ completed })
+        .in('id', ids)
+        .eq('project_id', projectId)
+        .select('id')
+    )
+  )
+
+  for (const result of results) {
+    if (result.error) console.error('Error toggling project tasks:', result.error)
+  }
+
+  const updated = results.flatMap((result) => (result.data || []).map((row: { id: string }) => row.id))
+  if (updated.length > 0) {
+    const organizationId = await getUserOrganization()
+    invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
+  }
+  return updated
 }
 
 export async function deleteProjectTask(taskId: string, projectId: string) {
@@ -1281,7 +1434,8 @@ export async function deleteProjectTask(taskId: string, projectId: string) {
     throw new Error('Erro ao remover tarefa')
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
 
 export async function updateProjectTask(taskId: string, projectId: string, title: string) {
@@ -1297,8 +1451,8 @@ export async function updateProjectTask(taskId: string, projectId: string, title
     throw new Error('Erro ao atualizar tarefa')
   }
 
-  revalidatePath(`/projects/${projectId}`)
-  revalidatePath('/projects') // Refresh kanban too
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
 
 export async function initializeDefaultTasks(projectId: string) {
@@ -1328,5 +1482,6 @@ export async function initializeDefaultTasks(projectId: string) {
     console.error('Error initializing default tasks:', error)
   }
 
-  revalidatePath(`/projects/${projectId}`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'projects', id: projectId }])
 }
@@ -21,24 +21,44 @@
  */
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
-import { revalidatePath } from 'next/cache'
-import { createNotificationInternal } from '@/actions/notifications'
+import { cachedRead, invalidateCache } from '@/lib/cache/data-cache'
+
+// =============================================
+// HELPER: Resultado do aceite (accept_proposal_v2)
+// =============================================
+
+function toAcceptanceResult(data: any) {
+  return {
+    projectId: data.project_id as string | null,
+    alreadyAccepted: Boolean(data.already_accepted),
+    calendarEventsCreated: (data.calendar_event_ids || []).length as number,
+    financialTransactionsCreated: (data.transaction_ids || []).length as number,
+    ids: {
+      projectFinanceId: data.project_finance_id as string | null,
+      projectItemIds: (data.project_item_ids || []) as string[],
+      assignmentIds: (data.assignment_ids || []) as string[],
+      transactionIds: (data.transaction_ids || []) as string[],
+      calendarEventIds: (data.calendar_event_ids || []) as string[],
+      notificationId: data.notification_id as string | null,
+    },
+  }
+}
 
 // =============================================
 // HELPER: Recalcular valores da proposta
 // =============================================
 
-async function recalculateProposalValues(proposalId: string) {
+async function recalculateProposalValues(proposalId: string): Promise<string | null> {
   const supabase = await createClient()
 
   // 1. Buscar proposta (para pegar desconto)
   const { data: proposal } = await supabase
     .from('proposals')
-    .select('discount')
+    .select('discount, organization_id')
     .eq('id', proposalId)
     .single()
 
-  if (!proposal) return
+  if (!proposal) return null
 
   // 2. Buscar itens (somar total)
   const { data: items } = await supabase
@@ -69,6 +89,9 @@ async function recalculateProposalValues(proposalId: string) {
       total_value: totalValue,
     })
     .eq('id', proposalId)
+
+  // Organização da proposta, para invalidar o cache também em fluxos públicos
+  return proposal.organization_id as string
 }
 
 // =============================================
@@ -83,18 +106,21 @@ export async function getProposals() {
 
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('proposals')
-    .select('*, clients(id, name, company)')
-    .eq('organization_id', organizationId)
-    .order('created_at', { ascending: false })
+  return cachedRead(
+    'proposals:list',
+    { organizationId, tags: ['proposals', 'clients'], fallback: [] as any[] },
+    async () => {
+      const { data, error } = await supabase
+        .from('proposals')
+        .select('*, clients(id, name, company)')
+        .eq('organization_id', organizationId)
+        .order('created_at', { ascending: false })
 
-  if (error) {
-    console.error('Error fetching proposals:', error)
-    return []
-  }
+      if (error) throw error
 
-  return data || []
+      return data || []
+    }
+  )
 }
 
 /**
@@ -104,27 +130,35 @@ export async function getProposal(proposalId: string) {
   const supabase = await createClient()
   const organizationId = await getUserOrganization()
 
-  const { data, error } = await supabase
-    .from('proposals')
-    .select(`
-      *,
-      clients (id, name, company, email, phone),
-      organizations (id, name, logo, email, phone, website, max_discount),
-      items:proposal_items (*),
-      optionals:proposal_optionals (*),
-      videos:proposal_videos (*),
-      paymentSchedule:payment_schedule (*)
-    `)
-    .eq('id', proposalId)
-    .eq('organization_id', organizationId)
-    .single()
+  return cachedRead(
+    'proposals:detail',
+    {
+      organizationId,
+      tags: [{ entity: 'proposals', id: proposalId }, 'clients', 'organization'],
+      keyParts: [proposalId],
+      fallback: null as any,
+    },
+    async () => {
+      const { data, error } = await supabase
+        .from('proposals')
+        .select(`
+          *,
+          clients (id, name, company, email, phone),
+          organizations (id, name, logo, email, phone, website, max_discount),
+          items:proposal_items (*),
+          optionals:proposal_optionals (*),
+          videos:proposal_videos (*),
+          paymentSchedule:payment_schedule (*)
+        `)
+        .eq('id', proposalId)
+        .eq('organization_id', organizationId)
+        .single()
 
-  if (error) {
-    console.error('Error fetching proposal:', error)
-    return null
-  }
+      if (error) throw error
 
-  return data
+      return data
+    }
+  )
 }
 
 /**
@@ -248,7 +282,7 @@ export async function addProposal(formData: {
     throw new Error('Erro ao criar proposta')
   }
 
-  revalidatePath('/proposals')
+  invalidateCache(organizationId, ['proposals'])
   return data
 }
 
@@ -320,6 +354,7 @@ export async function updateProposal(
   }
 
   // SINCRO: Se o titulo mudou, atualizar o nome do projeto vinculado (se existir)
+  let linkedProjectId: string | null = null
   if (formData.title) {
     // Tenta encontrar projeto vinculado pelo proposal_id
     const { data: linkedProject } = await supabase
@@ -333,11 +368,17 @@ export async function updateProposal(
         .from('projects')
         .update({ title: formData.title })
         .eq('id', linkedProject.id)
+      linkedProjectId = linkedProject.id
     }
   }
 
-  revalidatePath('/proposals')
-  revalidatePath(`/proposals/${proposalId}/edit`)
+  const organizationId = await getUserOrganization()
+  // O detalhe do projeto só tem a tag do registro: invalidar o projeto vinculado
+  invalidateCache(organizationId, [
+    { entity: 'proposals', id: proposalId },
+    linkedProjectId ? { entity: 'projects', id: linkedProjectId } : 'projects',
+    'finances',
+  ])
   return data
 }
 
@@ -366,7 +407,7 @@ export async function sendProposal(proposalId: string) {
   // const link = `${process.env.NEXT_PUBLIC_APP_URL}/p/${data.token}`
   // await sendProposalEmail(data.clients.email, link)
 
-  revalidatePath('/proposals')
+  invalidateCache(data.organization_id, [{ entity: 'proposals', id: proposalId }])
   return data
 }
 
@@ -393,9 +434,13 @@ export async function approveProposal(proposalId: string) {
 
   // 🔔 RPC já cria projeto, finanças e transações
 
-  revalidatePath('/proposals')
-  revalidatePath('/projects')
-  revalidatePath('/financeiro')
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [
+    { entity: 'proposals', id: proposalId },
+    'projects',
+    'finances',
+    'calendar',
+  ])
   return {
     projectId: data.project_id
   }
@@ -422,7 +467,7 @@ export async function rejectProposal(proposalId: string, reason?: string) {
     throw new Error('Erro ao rejeitar proposta: ' + error.message)
   }
 
-  revalidatePath('/proposals')
+  invalidateCache(data.organization_id, [{ entity: 'proposals', id: proposalId }])
   return data
 }
 
@@ -451,6 +496,7 @@ export async function deleteProposal(proposalId: string, deleteLinkedProject: bo
   }
 
   // 3. Deletar projeto vinculado se solicitado
+  let deletedProjectId: string | null = null
   if (deleteLinkedProject) {
     const { data: linkedProject } = await supabase
       .from('projects')
@@ -473,6 +519,7 @@ export async function deleteProposal(proposalId: string, deleteLinkedProject: bo
         .delete()
         .eq('id', linkedProject.id)
         .eq('organization_id', organizationId)
+      deletedProjectId = linkedProject.id
     }
   }
 
@@ -487,8 +534,12 @@ export async function deleteProposal(proposalId: string, deleteLinkedProject: bo
     throw new Error('Erro ao deletar proposta: ' + error.message)
   }
 
-  revalidatePath('/proposals')
-  revalidatePath('/projects')
+  invalidateCache(organizationId, [
+    { entity: 'proposals', id: proposalId },
+    deletedProjectId ? { entity: 'projects', id: deletedProjectId } : 'projects',
+    'finances',
+    'calendar',
+  ])
 }
 
 /**
@@ -626,7 +677,7 @@ export async function duplicateProposal(proposalId: string) {
     .eq('id', newProposal.id)
     .single()
 
-  revalidatePath('/proposals')
+  invalidateCache(organizationId, ['proposals'])
   return completeProposal || newProposal
 }
 
@@ -654,10 +705,12 @@ export async function toggleProposalOptional(
     throw new Error('Erro ao atualizar opcional: ' + error.message)
   }
 
-  // Recalcular valores
-  await recalculateProposalValues(proposalId)
+  // Recalcular valores (página pública: a organização vem da própria proposta)
+  const organizationId = await recalculateProposalValues(proposalId)
 
-  revalidatePath(`/p/*`)
+  if (organizationId) {
+    invalidateCache(organizationId, [{ entity: 'proposals', id: proposalId }])
+  }
 }
 
 /**
@@ -666,66 +719,28 @@ export async function toggleProposalOptional(
 export async function acceptProposalPublic(token: string) {
   const supabase = await createClient()
 
-  // Buscar proposta pelo token
-  const { data: proposal } = await supabase
-    .from('proposals')
-    .select('id, title, status, valid_until, organization_id, clients (name)')
-    .eq('token', token)
-    .single()
-
-  if (!proposal) {
-    throw new Error('Proposta não encontrada')
-  }
-
-  // Verificar se proposta está expirada
-  if (proposal.valid_until && new Date(proposal.valid_until) < new Date()) {
-    throw new Error('Esta proposta está expirada')
-  }
-
-  // Verificar se já foi aceita
-  if (proposal.status === 'ACCEPTED') {
-    throw new Error('Esta proposta já foi aceita')
-  }
-
-  // Aprovar usando o fluxo unificado via RPC (Blindada)
-  // Como é público, não temos user logged in para 'assigned_to', enviamos null (que é o default na RPC agora)
-  const { data, error } = await supabase.rpc('accept_proposal_v1', {
-    p_proposal_id: proposal.id,
-    p_user_id: null
+  // Conversão inteira (projeto, itens, calendário, recebíveis e notificação) em
+  // uma transação idempotente: aceites repetidos devolvem os mesmos ids
+  const { data, error } = await supabase.rpc('accept_proposal_v2', {
+    p_token: token,
   })
 
   if (error) {
-    console.error('Erro RPC accept_proposal_v1 (Public):', error)
+    console.error('Erro RPC accept_proposal_v2 (Public):', error)
     throw new Error(error.message)
   }
 
-  const result = {
-    projectId: data.project_id
-  }
-
-  // Notificar Dono da Organização (Assumindo admin)
-  const { data: orgUsers } = await supabase
-    .from('user_roles')
-    .select('user_id')
-    .eq('organization_id', proposal.organization_id)
-    .eq('role', 'admin')
-    .limit(1)
-
-  if (orgUsers && orgUsers.length > 0) {
-    const recipientId = orgUsers[0].user_id
-    const clientName = (proposal.clients as any)?.name || 'Cliente'
+  const result = toAcceptanceResult(data)
 
-    await createNotificationInternal(recipientId, {
-      title: '🎉 Proposta Aceita!',
-      message: `O cliente ${clientName} aceitou a proposta "${proposal.title}".`,
-      type: 'SUCCESS',
-      action_link: `/proposals/${proposal.id}/edit`
-    })
+  if (!result.alreadyAccepted) {
+    invalidateCache(data.organization_id, [
+      { entity: 'proposals', id: data.proposal_id },
+      'projects',
+      'finances',
+      'calendar',
+    ])
   }
 
-  revalidatePath('/proposals')
-  revalidatePath('/financeiro')
-
   return result
 }
 
@@ -790,6 +805,7 @@ export async function addProposalItem(
     .eq('id', proposalId)
     .single()
 
+  let syncedProjectId: string | null = null
   if (proposal?.status === 'ACCEPTED') {
     // Buscar projeto vinculado
     const { data: project } = await supabase
@@ -799,6 +815,8 @@ export async function addProposalItem(
       .single()
 
     if (project) {
+      syncedProjectId = project.id
+
       // 1. Criar Item do Projeto
       const { data: projectItem } = await supabase
         .from('project_items')
@@ -881,10 +899,12 @@ export async function addProposalItem(
   // Recalcular valores
   await recalculateProposalValues(proposalId)
 
-  revalidatePath(`/proposals/${proposalId}/edit`)
-  revalidatePath('/proposals')
-  revalidatePath('/projects')
-  revalidatePath('/calendar')
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [
+    { entity: 'proposals', id: proposalId },
+    syncedProjectId ? { entity: 'projects', id: syncedProjectId } : 'projects',
+    'calendar',
+  ])
   return data
 }
 
@@ -937,7 +957,8 @@ export async function updateProposalItem(
   // Recalcular valores
   await recalculateProposalValues(currentItem.proposal_id)
 
-  revalidatePath(`/proposals`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: currentItem.proposal_id }])
   return data
 }
 
@@ -969,7 +990,8 @@ export async function deleteProposalItem(itemId: string) {
 
   await recalculateProposalValues(item.proposal_id)
 
-  revalidatePath(`/proposals`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: item.proposal_id }])
 }
 
 /**
@@ -989,7 +1011,8 @@ export async function reorderProposalItems(proposalId: string, itemIds: string[]
 
   await Promise.all(updates)
 
-  revalidatePath(`/proposals/${proposalId}/edit`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: proposalId }])
 }
 
 // =============================================
@@ -1042,8 +1065,8 @@ export async function addProposalOptional(
   // Recalcular valores
   await recalculateProposalValues(proposalId)
 
-  revalidatePath(`/proposals/${proposalId}/edit`)
-  revalidatePath('/proposals')
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: proposalId }])
   return data
 }
 
@@ -1082,7 +1105,11 @@ export async function updateProposalOptional(
     await recalculateProposalValues(currentOptional.proposal_id)
   }
 
-  revalidatePath(`/proposals`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(
+    organizationId,
+    currentOptional ? [{ entity: 'proposals', id: currentOptional.proposal_id }] : ['proposals']
+  )
   return data
 }
 
@@ -1112,7 +1139,11 @@ export async function deleteProposalOptional(optionalId: string) {
     await recalculateProposalValues(optional.proposal_id)
   }
 
-  revalidatePath(`/proposals`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(
+    organizationId,
+    optional ? [{ entity: 'proposals', id: optional.proposal_id }] : ['proposals']
+  )
 }
 
 /**
@@ -1131,6 +1162,9 @@ export async function reorderProposalOptionals(proposalId: string, optionalIds:
   )
 
   await Promise.all(updates)
+
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: proposalId }])
 }
 
 // =============================================
@@ -1175,7 +1209,8 @@ export async function addProposalVideo(
     throw new Error('Erro ao adicionar vídeo: ' + error.message)
   }
 
-  revalidatePath(`/proposals/${proposalId}/edit`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: proposalId }])
   return data
 }
 
@@ -1185,16 +1220,22 @@ export async function addProposalVideo(
 export async function deleteProposalVideo(videoId: string) {
   const supabase = await createClient()
 
-  const { error } = await supabase
+  const { data: deleted, error } = await supabase
     .from('proposal_videos')
     .delete()
     .eq('id', videoId)
+    .select('proposal_id')
+    .maybeSingle()
 
   if (error) {
     throw new Error('Erro ao deletar vídeo: ' + error.message)
   }
 
-  revalidatePath(`/proposals`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(
+    organizationId,
+    deleted ? [{ entity: 'proposals', id: deleted.proposal_id }] : ['proposals']
+  )
 }
 
 /**
@@ -1213,7 +1254,8 @@ export async function reorderProposalVideos(proposalId: string, videoIds: string
 
   await Promise.all(updates)
 
-  revalidatePath(`/proposals/${proposalId}/edit`)
+  const organizationId = await getUserOrganization()
+  invalidateCache(organizationId, [{ entity: 'proposals', id: proposalId }])
 }
 
 // =============================================
@@ -1232,25 +1274,27 @@ export async function acceptProposalManual(proposalId: string) {
     throw new Error('Usuário não autenticado')
   }
 
-  // Chamar RPC blindada
-  const { data, error } = await supabase.rpc('accept_proposal_v1', {
+  // Mesma RPC idempotente do aceite público, chaveada pelo id da proposta
+  const { data, error } = await supabase.rpc('accept_proposal_v2', {
     p_proposal_id: proposalId,
     p_user_id: user.id
   })
 
   if (error) {
-    console.error('Erro RPC accept_proposal_v1:', error)
+    console.error('Erro RPC accept_proposal_v2:', error)
     throw new Error(error.message)
   }
 
-  revalidatePath('/proposals')
-  revalidatePath('/projects')
-  revalidatePath('/calendar')
-  revalidatePath('/financeiro')
+  const result = toAcceptanceResult(data)
 
-  return {
-    projectId: data.project_id,
-    calendarEventsCreated: 0,
-    financialTransactionsCreated: 0
+  if (!result.alreadyAccepted) {
+    invalidateCache(data.organization_id, [
+      { entity: 'proposals', id: proposalId },
+      'projects',
+      'finances',
+      'calendar',
+    ])
   }
+
+  return result
 }
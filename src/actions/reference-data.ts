@@ -0,0 +1,89 @@
+'use server'
+
+/**
+ * ============================================
+ * DADOS DE REFERÊNCIA - DELTAS
+ * Sincronização da cópia local (lib/reference-store) de clientes, freelancers
+ * e equipamentos: linhas com updated_at depois do cursor + tombstones de
+ * exclusões. Sem cursor, devolve a coleção inteira.
+ * ============================================
+ */
+
+import { createClient, getUserOrganization } from '@/lib/supabase/server'
+import type { ReferenceCollection } from '@/lib/reference-store'
+
+const COLLECTIONS: ReferenceCollection[] = ['clients', 'freelancers', 'equipments']
+
+const PAGE_SIZE = 1000
+
+// Transação que começou antes do cursor e confirmou depois ainda entra no delta
+const OVERLAP_MS = 60_000
+
+export interface ReferenceDelta {
+  collection: ReferenceCollection
+  full: boolean
+  rows: any[]
+  deleted: string[]
+  cursor: string | null
+}
+
+export async function syncReferenceData(
+  cursors: Partial<Record<ReferenceCollection, string | null>>
+): Promise<{ organizationId: string; deltas: ReferenceDelta[] }> {
+  const supabase = await createClient()
+  const organizationId = await getUserOrganization()
+
+  const deltas = await Promise.all(
+    COLLECTIONS.filter((collection) => collection in cursors).map(async (collection): Promise<ReferenceDelta> => {
+      const since = cursors[collection] ? new Date(new Date(cursors[collection]!).getTime() - OVERLAP_MS).toISOString() : null
+
+      const rows: any[] = []
+      for (let from = 0; ; from += PAGE_SIZE) {
+        let query = supabase
+          .from(collection)
+          .select('*')
+          .eq('organization_id', organizationId)
+          .order('updated_at', { ascending: true })
+          .order('id', { ascending: true })
+          .range(from, from + PAGE_SIZE - 1)
+        if (since) query = query.gt('updated_at', since)
+
+        const { data, error } = await query
+        if (error) {
+          console.error(`Error syncing ${collection}:`, error)
+          throw new Error('Erro ao sincronizar dados: ' + error.message)
+        }
+        rows.push(...(data || []))
+        if (!data || data.length < PAGE_SIZE) break
+      }
+
+      let deleted: string[] = []
+      let lastDeletedAt: string | null = null
+      if (since) {
+        const { data, error } = await supabase
+          .from('reference_tombstones')
+          .select('record_id, deleted_at')
+          .eq('organization_id', organizationId)
+          .eq('collection', collection)
+          .gt('deleted_at', since)
+          .order('deleted_at', { ascending: true })
+
+        if (error) {
+          console.error(`Error syncing ${collection} tombstones:`, error)
+          throw new Error('Erro ao sincronizar dados: ' + error.message)
+        }
+        deleted = (data || []).map((tombstone) => tombstone.record_id)
+        lastDeletedAt = data?.length ? data[data.length - 1].deleted_at : null
+      }
+
+      const cursor = [cursors[collection], rows.length ? rows[rows.length - 1].updated_at : null, lastDeletedAt]
+        .filter(Boolean)
+        .sort((a, b) => new Date(a!).getTime() - new Date(b!).getTime())
+        .pop() ?? null
+
+      return { collection, full: !since, rows, deleted, cursor }
+    })
+  )
+
+  return { organizationId, deltas }
+}
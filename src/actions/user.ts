@@ -1,6 +1,7 @@
 'use server'
 
 import { createClient, getUserOrganization } from '@/lib/supabase/server'
+import { invalidateCache } from '@/lib/cache/data-cache'
 import { revalidatePath } from 'next/cache'
 import { z } from 'zod'
 
@@ -58,5 +59,9 @@ export async function updateUserProfile(data: UserProfileFormData) {
         throw new Error('Error updating profile: ' + error.message)
     }
 
+    // Nome/avatar aparecem nas leituras cacheadas da organização
+    const organizationId = await getUserOrganization()
+    invalidateCache(organizationId, ['organization'])
+
     revalidatePath('/settings/profile')
 }
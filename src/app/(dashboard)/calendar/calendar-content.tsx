@@ -2,12 +2,22 @@
 
 import { useState, useCallback } from 'react'
 import { useRouter } from 'next/navigation'
+import dynamic from 'next/dynamic'
 import { motion } from 'framer-motion'
 import { Calendar } from 'lucide-react'
-import { CalendarView } from '@/components/calendar/calendar-view'
 import { CreateEventModal } from '@/components/calendar/create-event-modal'
+import { SubscribeCalendar } from '@/components/calendar/subscribe-calendar'
 import type { CalendarEvent } from '@/actions/calendar'
 
+// Grade do calendário em chunk próprio; o cabeçalho da página renderiza antes
+const CalendarView = dynamic(
+  () => import('@/components/calendar/calendar-view').then((mod) => mod.CalendarView),
+  {
+    ssr: false,
+    loading: () => <div className="h-[640px] w-full animate-pulse rounded-2xl bg-secondary/40" />,
+  }
+)
+
 interface CalendarContentProps {
   initialEvents: CalendarEvent[]
 }
@@ -39,16 +49,19 @@ export function CalendarContent({ initialEvents }: CalendarContentProps) {
         animate={{ opacity: 1, y: 0 }}
         className="mb-6"
       >
-        <div className="flex items-center gap-3">
-          <div className="rounded-xl bg-gradient-to-br from-accent-500 to-purple-600 p-3">
-            <Calendar className="h-6 w-6 text-white" />
-          </div>
-          <div>
-            <h1 className="text-2xl font-bold text-white">Calendário</h1>
-            <p className="text-sm text-zinc-400">
-              Gravações, entregas e compromissos
-            </p>
+        <div className="flex items-center justify-between gap-3">
+          <div className="flex items-center gap-3">
+            <div className="rounded-xl bg-gradient-to-br from-accent-500 to-purple-600 p-3">
+              <Calendar className="h-6 w-6 text-white" />
+            </div>
+            <div>
+              <h1 className="text-2xl font-bold text-white">Calendário</h1>
+              <p className="text-sm text-zinc-400">
+                Gravações, entregas e compromissos
+              </p>
+            </div>
           </div>
+          <SubscribeCalendar />
         </div>
       </motion.div>
 
@@ -1,8 +1,8 @@
-import { getFreelancers } from '@/actions/freelancers'
+import { getFreelancersWithStatistics } from '@/actions/freelancers'
 import { FreelancersGrid } from '@/components/freelancers/freelancers-grid'
 
 export default async function FreelancersPage() {
-  const freelancers = await getFreelancers()
+  const freelancers = await getFreelancersWithStatistics()
 
   return <FreelancersGrid initialFreelancers={freelancers} />
 }
@@ -1,6 +1,7 @@
 import { Sidebar } from '@/components/layout/sidebar'
 import { Header } from '@/components/layout/header'
-import { AIChatWidget } from '@/components/ai/ai-chat-widget'
+import { AIChatLauncher } from '@/components/ai/ai-chat-launcher'
+import { RoutePrefetcher } from '@/components/layout/route-prefetcher'
 
 export default function DashboardLayout({
   children,
@@ -22,7 +23,8 @@ export default function DashboardLayout({
         </main>
       </div>
 
-      <AIChatWidget />
+      <AIChatLauncher />
+      <RoutePrefetcher />
     </div>
   )
 }
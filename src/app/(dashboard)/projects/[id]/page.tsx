@@ -1,6 +1,4 @@
-import { getProject } from '@/actions/projects'
-import { getProjectFinancialSummary, getProjectExpenses } from '@/actions/finances'
-import { getProjectEquipmentBookings } from '@/actions/equipments'
+import { getProject, getProjectFinancialData } from '@/actions/projects'
 import { ProjectDetailTabs } from '@/components/projects/project-detail-tabs'
 import { notFound } from 'next/navigation'
 
@@ -16,16 +14,10 @@ export default async function ProjectDetailPage({
     notFound()
   }
 
-  const financialSummary = await getProjectFinancialSummary(id)
-  const expenses = await getProjectExpenses(id)
-  const equipmentBookings = await getProjectEquipmentBookings(id)
+  // Dispara as relações financeiras sem aguardar (só depois do notFound, para
+  // não deixar a promise solta): as abas de equipamentos e financeiro recebem
+  // a promise e fazem streaming via Suspense
+  const financials = getProjectFinancialData(id)
 
-  return (
-    <ProjectDetailTabs
-      project={project}
-      financialSummary={financialSummary}
-      expenses={expenses}
-      equipmentBookings={equipmentBookings}
-    />
-  )
+  return <ProjectDetailTabs project={project} financials={financials} />
 }
@@ -0,0 +1,132 @@
+/**
+ * ============================================
+ * BENCHMARK
+ * Executa um hot path e devolve tempo, round trips e bytes trafegados com o
+ * banco. Usado pela suíte em tests/testsprite_tests/benchmark.
+ *
+ * ?path=rest|direct força o caminho de dados (PostgREST ou conexão direta,
+ * lib/supabase/direct) nos alvos que têm os dois, para comparação lado a lado.
+ *
+ * Só responde com BENCHMARK_ROUTES=1 (nunca habilitar em produção).
+ * ============================================
+ */
+
+import { NextRequest, NextResponse } from 'next/server'
+import { createClient, getUserOrganization } from '@/lib/supabase/server'
+import { measureQueries } from '@/lib/supabase/query-trace'
+import { isDirectDataPathAvailable, withDataPath, type DataPath } from '@/lib/supabase/direct'
+import { invalidateCache, type CacheTarget } from '@/lib/cache/data-cache'
+import { getDashboardStats, getCashFlow } from '@/actions/dashboard'
+import { getProjectsForKanban, toggleProjectItemStatus } from '@/actions/projects'
+import { getEquipmentROIAnalysis, getEquipmentROISummary } from '@/actions/equipments'
+import { getCalendarEvents } from '@/actions/calendar'
+import { getProposalByToken } from '@/actions/proposals'
+import { GET as search } from '@/app/api/search/route'
+
+const ENABLED = process.env.BENCHMARK_ROUTES === '1'
+
+interface BenchTarget {
+  run: (params: URLSearchParams, request: NextRequest) => Promise<unknown>
+  // Entidades do data cache descartadas com ?cold=1
+  cache?: CacheTarget[]
+  // Não exige sessão (página pública da proposta)
+  public?: boolean
+  // Tem implementação pela conexão direta (aceita ?path=direct)
+  direct?: boolean
+}
+
+const dateRange = (params: URLSearchParams) => {
+  const start = params.get('start')
+  const end = params.get('end')
+  return start && end ? { start: new Date(start), end: new Date(end) } : undefined
+}
+
+const TARGETS: Record<string, BenchTarget> = {
+  dashboard: { run: (params) => getDashboardStats(dateRange(params)) },
+  kanban: { run: () => getProjectsForKanban(), cache: ['projects'] },
+  calendar: {
+    run: (params) => {
+      const range = dateRange(params)
+      return getCalendarEvents(range?.start, range?.end)
+    },
+  },
+  search: { run: async (_params, request) => (await search(request)).json() },
+  proposal: { run: (params) => getProposalByToken(params.get('token') || ''), public: true },
+  cashflow: { run: (params) => getCashFlow(dateRange(params)), direct: true },
+  roi: { run: () => Promise.all([getEquipmentROIAnalysis(), getEquipmentROISummary()]), direct: true },
+  // Grava o status informado (a suíte manda o status atual: o dado não muda)
+  'item-status': {
+    run: (params) =>
+      toggleProjectItemStatus(
+        params.get('item') || '',
+        params.get('project') || '',
+        params.get('status') === 'DONE' ? 'DONE' : 'PENDING'
+      ),
+    direct: true,
+  },
+}
+
+export async function GET(request: NextRequest, { params }: { params: Promise<{ target: string }> }) {
+  if (!ENABLED) {
+    return NextResponse.json({ error: 'Not found' }, { status: 404 })
+  }
+
+  const { target } = await params
+  const bench = TARGETS[target]
+
+  if (!bench) {
+    return NextResponse.json({ error: `Unknown target: ${target}` }, { status: 404 })
+  }
+
+  if (!bench.public) {
+    const supabase = await createClient()
+    const { data: { user } } = await supabase.auth.getUser()
+
+    if (!user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+  }
+
+  const searchParams = request.nextUrl.searchParams
+  const path: DataPath = searchParams.get('path') === 'direct' ? 'direct' : 'rest'
+
+  if (path === 'direct' && (!bench.direct || !isDirectDataPathAvailable())) {
+    return NextResponse.json(
+      { error: bench.direct ? 'DATA_PATH_DATABASE_URL not configured' : `No direct path for ${target}` },
+      { status: 400 }
+    )
+  }
+
+  // cold=1 mede o caminho até o banco em vez do hit no data cache
+  if (bench.cache && searchParams.get('cold') === '1') {
+    invalidateCache(await getUserOrganization(), bench.cache)
+  }
+
+  try {
+    const started = performance.now()
+    const { result, summary } = await measureQueries(() =>
+      withDataPath(path, () => bench.run(searchParams, request))
+    )
+    const wallMs = performance.now() - started
+
+    return NextResponse.json(
+      {
+        target,
+        path,
+        wallMs: Math.round(wallMs * 10) / 10,
+        roundTrips: summary.roundTrips,
+        dbMs: summary.totalMs,
+        rows: summary.rows,
+        bytes: summary.bytes,
+        payloadBytes: Buffer.byteLength(JSON.stringify(result ?? null)),
+        errors: summary.errors,
+        warnings: summary.warnings,
+        breakdown: summary.breakdown,
+      },
+      { headers: { 'Cache-Control': 'no-store' } }
+    )
+  } catch (error) {
+    console.error(`Error in benchmark ${target}:`, error)
+    return NextResponse.json({ error: 'Benchmark failed' }, { status: 500 })
+  }
+}
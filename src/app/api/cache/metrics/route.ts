@@ -0,0 +1,17 @@
+import { NextResponse } from 'next/server'
+import { createClient } from '@/lib/supabase/server'
+import { getDataCacheMetrics } from '@/lib/cache/data-cache'
+
+// Hit rate do data cache das server actions (por instância do servidor)
+export async function GET() {
+  const supabase = await createClient()
+  const { data: { user } } = await supabase.auth.getUser()
+
+  if (!user) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  return NextResponse.json(getDataCacheMetrics(), {
+    headers: { 'Cache-Control': 'no-store' },
+  })
+}
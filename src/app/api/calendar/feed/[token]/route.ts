@@ -0,0 +1,64 @@
+/**
+ * ============================================
+ * FEED ICS DO CALENDÁRIO
+ * GET /api/calendar/feed/<token>.ics   Assinatura do calendário (sem login)
+ * Poll sem mudança: uma consulta (calendar_feed_lookup) e 304.
+ * ============================================
+ */
+
+import { NextRequest, NextResponse } from 'next/server'
+import { createServiceClient } from '@/lib/supabase/server'
+import { calendarFeedValidators, getCalendarFeed, isCalendarFeedFresh } from '@/lib/calendar-feed'
+
+export const runtime = 'nodejs'
+export const dynamic = 'force-dynamic'
+
+export async function GET(request: NextRequest, { params }: { params: Promise<{ token: string }> }) {
+  const { token: raw } = await params
+  const token = raw.replace(/\.ics$/i, '')
+
+  if (!/^[a-f0-9]{16,128}$/.test(token)) {
+    return NextResponse.json({ error: 'Link inválido' }, { status: 404 })
+  }
+
+  const supabase = await createServiceClient()
+  const { data: feed, error } = await supabase.rpc('calendar_feed_lookup', { p_token: token }).maybeSingle()
+
+  if (error) {
+    console.error('Error looking up calendar feed:', error)
+    return NextResponse.json({ error: 'Erro ao buscar calendário' }, { status: 500 })
+  }
+  if (!feed) {
+    return NextResponse.json({ error: 'Link inválido' }, { status: 404 })
+  }
+
+  const version = {
+    organizationId: (feed as any).organization_id as string,
+    changedAt: new Date((feed as any).changed_at),
+  }
+  const { etag, lastModified } = calendarFeedValidators(version)
+  const headers = {
+    ETag: etag,
+    'Last-Modified': lastModified.toUTCString(),
+    'Cache-Control': 'private, no-cache',
+  }
+
+  if (isCalendarFeedFresh(request.headers, etag, lastModified)) {
+    return new NextResponse(null, { status: 304, headers })
+  }
+
+  try {
+    const { body } = await getCalendarFeed(supabase, version)
+
+    return new NextResponse(body, {
+      headers: {
+        ...headers,
+        'Content-Type': 'text/calendar; charset=utf-8',
+        'Content-Disposition': 'inline; filename="calendario.ics"',
+      },
+    })
+  } catch (error) {
+    console.error('Error building calendar feed:', error)
+    return NextResponse.json({ error: 'Erro ao gerar calendário' }, { status: 500 })
+  }
+}
@@ -1,16 +1,21 @@
-import OpenAI from 'openai';
 import { OpenAIStream, StreamingTextResponse } from 'ai';
 import { createClient, getUserOrganization } from '@/lib/supabase/server';
-import { getToolsDefinitions, executeTool } from '@/lib/ai/tools';
+import { getToolsSpec, executeToolCalls } from '@/lib/ai/tools';
+import { getOpenAIClient } from '@/lib/ai/client';
 import { SYSTEM_PROMPT } from '@/lib/ai/prompts';
+import {
+    DEFAULT_CONTEXT_BUDGET,
+    buildContextWindow,
+    compactToolResult,
+    estimateMessagesTokens,
+    estimateTokens,
+    getChatMetricsSummary,
+    recordChatMetrics,
+} from '@/lib/ai/context';
 
 export const maxDuration = 60;
 // Desabilitar body parser padrão se necessário, mas em App Router geralmente não precisa.
 
-const openai = new OpenAI({
-    apiKey: process.env.OPENAI_API_KEY,
-});
-
 export async function POST(req: Request) {
     try {
         // 1. Auth & Context
@@ -25,53 +30,95 @@ export async function POST(req: Request) {
             return new Response('No Org Context', { status: 403 });
         }
 
-        const { messages } = await req.json();
+        const startedAt = Date.now();
+        const { messages: fullHistory } = await req.json();
+        const openai = getOpenAIClient();
+
+        const systemMessage = {
+            role: 'system' as const,
+            content: `${SYSTEM_PROMPT}\n\nDATA ATUAL: ${new Date().toLocaleDateString('pt-BR', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' })}. Use esta data como referência absoluta para "hoje".`
+        };
+        const tools = getToolsSpec();
+
+        // Histórico ajustado ao orçamento de tokens (mensagens antigas viram resumo)
+        const fixedTokens = estimateTokens(systemMessage.content) + estimateTokens(JSON.stringify(tools));
+        const context = buildContextWindow(fullHistory, Math.max(DEFAULT_CONTEXT_BUDGET - fixedTokens, 1_000));
+        const messages = context.messages;
+
+        let promptTokens = fixedTokens + context.tokens;
+        let completionText = '';
+        let toolCallCount = 0;
+        let firstTokenAt: number | null = null;
 
         // 2. Primeira Chamada para OpenAI
         const response = await openai.chat.completions.create({
             model: 'gpt-4o',
             stream: true,
-            messages: [
-                {
-                    role: 'system',
-                    content: `${SYSTEM_PROMPT}\n\nDATA ATUAL: ${new Date().toLocaleDateString('pt-BR', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' })}. Use esta data como referência absoluta para "hoje".`
-                },
-                ...messages
-            ],
-            functions: getToolsDefinitions(),
-            function_call: 'auto',
+            messages: [systemMessage, ...messages],
+            tools,
+            tool_choice: 'auto',
+            parallel_tool_calls: true,
         });
 
-        // 3. Streaming com Suporte a Functions (Tool Calling Manual)
+        // 3. Streaming com Suporte a Tools (várias chamadas por turno, executadas em paralelo)
         const stream = OpenAIStream(response as any, {
-            experimental_onFunctionCall: async (
-                { name, arguments: args },
-                createFunctionCallMessages
+            experimental_onToolCall: async (
+                { tools: toolCalls },
+                appendToolCallMessage
             ) => {
-                // Callback quando a IA decide chamar uma função
-                const result = await executeTool(name, args, supabase, organizationId);
+                toolCallCount += toolCalls.length;
+                const results = await executeToolCalls(
+                    toolCalls.map((call) => ({ id: call.id, name: call.func.name, args: call.func.arguments })),
+                    supabase,
+                    organizationId
+                );
 
-                // Injeta o resultado da função de volta no histórico
-                const newMessages = createFunctionCallMessages(result);
+                // Injeta todos os resultados de volta no histórico
+                let newMessages: any[] = [];
+                for (const { id, name, result } of results) {
+                    newMessages = appendToolCallMessage({
+                        tool_call_id: id,
+                        function_name: name,
+                        tool_call_result: compactToolResult(name, result),
+                    });
+                }
 
-                // Faz a segunda chamada para a IA gerar a resposta final
+                promptTokens += fixedTokens + context.tokens + estimateMessagesTokens(newMessages);
+
+                // Segunda chamada: a IA pode responder ou pedir novas tools
                 return openai.chat.completions.create({
                     model: 'gpt-4o',
                     stream: true,
-                    messages: [
-                        {
-                            role: 'system',
-                            content: `${SYSTEM_PROMPT}\n\nDATA ATUAL: ${new Date().toLocaleDateString('pt-BR', { weekday: 'long', year: 'numeric', month: 'long', day: 'numeric' })}. Use esta data como referência absoluta para "hoje".`
-                        },
-                        ...messages,
-                        ...newMessages
-                    ],
-                    functions: getToolsDefinitions(),
+                    messages: [systemMessage, ...messages, ...newMessages],
+                    tools,
+                    tool_choice: 'auto',
+                    parallel_tool_calls: true,
                 }) as any;
             },
+            onToken: (token) => {
+                if (firstTokenAt === null) firstTokenAt = Date.now();
+                completionText += token;
+            },
+            onFinal: () => {
+                recordChatMetrics({
+                    organizationId,
+                    promptTokens,
+                    completionTokens: estimateTokens(completionText),
+                    toolCalls: toolCallCount,
+                    droppedMessages: context.droppedCount,
+                    latencyMs: Date.now() - startedAt,
+                    timeToFirstTokenMs: firstTokenAt === null ? null : firstTokenAt - startedAt,
+                    at: new Date().toISOString(),
+                });
+            },
         });
 
-        return new StreamingTextResponse(stream);
+        return new StreamingTextResponse(stream, {
+            headers: {
+                'X-Context-Tokens': String(fixedTokens + context.tokens),
+                'X-Context-Dropped-Messages': String(context.droppedCount),
+            },
+        });
 
     } catch (error: any) {
         console.error('AI Error:', error);
@@ -81,3 +128,17 @@ export async function POST(req: Request) {
         });
     }
 }
+
+// Métricas do assistente (tokens e latência) da organização atual
+export async function GET() {
+    const supabase = await createClient();
+    const { data: { user } } = await supabase.auth.getUser();
+    if (!user) return new Response('Unauthorized', { status: 401 });
+
+    try {
+        const organizationId = await getUserOrganization();
+        return Response.json(getChatMetricsSummary(organizationId));
+    } catch {
+        return new Response('No Org Context', { status: 403 });
+    }
+}
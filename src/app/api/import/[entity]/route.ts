@@ -0,0 +1,76 @@
+/**
+ * ============================================
+ * IMPORTAÇÃO EM MASSA (CSV)
+ * POST /api/import/{clients|freelancers|equipments}[?dryRun=1]
+ * Corpo: o arquivo CSV (text/csv), lido em streaming.
+ * Resposta: NDJSON com eventos progress / issue (erro ou duplicado por linha)
+ * e um done final com os totais. Erro fatal (cabeçalho inválido, banco fora)
+ * vem como {"type":"error"}.
+ * ============================================
+ */
+
+import { NextRequest, NextResponse } from 'next/server'
+import { createClient, getUserOrganization } from '@/lib/supabase/server'
+import { invalidateCache } from '@/lib/cache/data-cache'
+import { parseCsv } from '@/lib/import/csv'
+import { IMPORT_SPECS, type ImportEntity } from '@/lib/import/entities'
+import { runImport, type ImportEvent } from '@/lib/import/pipeline'
+
+export const maxDuration = 300
+
+export async function POST(request: NextRequest, { params }: { params: Promise<{ entity: string }> }) {
+  const { entity } = await params
+  const spec = IMPORT_SPECS[entity as ImportEntity]
+
+  if (!spec) {
+    return NextResponse.json({ error: `Entidade não suportada: ${entity}` }, { status: 404 })
+  }
+
+  const supabase = await createClient()
+  const { data: { user } } = await supabase.auth.getUser()
+
+  if (!user) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  if (!request.body) {
+    return NextResponse.json({ error: 'Envie o arquivo CSV no corpo da requisição' }, { status: 400 })
+  }
+
+  const organizationId = await getUserOrganization()
+  const dryRun = request.nextUrl.searchParams.get('dryRun') === '1'
+  const body = request.body
+  const encoder = new TextEncoder()
+
+  const stream = new ReadableStream<Uint8Array>({
+    async start(controller) {
+      const send = (event: ImportEvent | { type: 'error'; message: string }) =>
+        controller.enqueue(encoder.encode(JSON.stringify(event) + '\n'))
+
+      try {
+        await runImport({
+          supabase,
+          organizationId,
+          spec,
+          records: parseCsv(body),
+          emit: send,
+          dryRun,
+        })
+      } catch (error) {
+        console.error(`Error importing ${entity}:`, error)
+        send({ type: 'error', message: error instanceof Error ? error.message : 'Erro na importação' })
+      } finally {
+        // Lotes já gravados continuam valendo mesmo se a importação parar no meio
+        if (!dryRun) invalidateCache(organizationId, [spec.cache])
+        controller.close()
+      }
+    },
+  })
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'application/x-ndjson; charset=utf-8',
+      'Cache-Control': 'no-store',
+    },
+  })
+}
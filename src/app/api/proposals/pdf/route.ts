@@ -0,0 +1,157 @@
+/**
+ * ============================================
+ * PDF DE PROPOSTAS
+ * GET  /api/proposals/pdf?token=...        PDF pelo link público (sem login)
+ * GET  /api/proposals/pdf?id=...           PDF de uma proposta da organização
+ * POST /api/proposals/pdf  { ids: [...] }  Exportação em lote (.zip)
+ * Renderização em pool de processos com cache por hash (lib/pdf/proposal-pdf).
+ * ETag = hash do conteúdo: repetir o download de algo inalterado devolve 304.
+ * ============================================
+ */
+
+import { NextRequest, NextResponse } from 'next/server'
+import { createClient, createServiceClient, getUserOrganization } from '@/lib/supabase/server'
+import { PoolQueueFullError } from '@/lib/pdf/pool'
+import {
+  PROPOSAL_PDF_SELECT,
+  buildProposalPdfDocument,
+  getProposalPdf,
+  getProposalPdfs,
+  proposalPdfHash,
+} from '@/lib/pdf/proposal-pdf'
+import { createZip } from '@/lib/pdf/zip'
+
+export const runtime = 'nodejs'
+export const maxDuration = 300
+
+const MAX_BATCH = 100
+
+const busyResponse = () =>
+  NextResponse.json(
+    { error: 'Muitos PDFs sendo gerados no momento, tente novamente em instantes' },
+    { status: 503, headers: { 'Retry-After': '5' } }
+  )
+
+export async function GET(request: NextRequest) {
+  const token = request.nextUrl.searchParams.get('token')
+  const id = request.nextUrl.searchParams.get('id')
+  const supabase = await createClient()
+
+  let query = supabase.from('proposals').select(PROPOSAL_PDF_SELECT)
+
+  if (token) {
+    query = query.eq('token', token)
+  } else if (id) {
+    const { data: { user } } = await supabase.auth.getUser()
+    if (!user) {
+      return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+    }
+    query = query.eq('id', id).eq('organization_id', await getUserOrganization())
+  } else {
+    return NextResponse.json({ error: 'Informe token ou id' }, { status: 400 })
+  }
+
+  const { data: proposal, error } = await query.maybeSingle()
+
+  if (error) {
+    console.error('Error fetching proposal for PDF:', error)
+    return NextResponse.json({ error: 'Erro ao buscar proposta' }, { status: 500 })
+  }
+  if (!proposal) {
+    return NextResponse.json({ error: 'Proposta não encontrada' }, { status: 404 })
+  }
+
+  // Conteúdo igual ao que o cliente já tem: nem lê o arquivo
+  const etag = `"${proposalPdfHash(buildProposalPdfDocument(proposal))}"`
+  if (request.headers.get('if-none-match') === etag) {
+    return new NextResponse(null, { status: 304, headers: { ETag: etag } })
+  }
+
+  try {
+    const { pdf, fileName, source } = await getProposalPdf(await createServiceClient(), proposal)
+    const disposition = request.nextUrl.searchParams.get('download') === '1' ? 'attachment' : 'inline'
+
+    return new NextResponse(Buffer.from(pdf), {
+      headers: {
+        'Content-Type': 'application/pdf',
+        'Content-Disposition': `${disposition}; filename="${fileName}"`,
+        'Cache-Control': 'private, no-cache',
+        ETag: etag,
+        'X-PDF-Cache': source,
+      },
+    })
+  } catch (error) {
+    if (error instanceof PoolQueueFullError) return busyResponse()
+    console.error('Error rendering proposal PDF:', error)
+    return NextResponse.json({ error: 'Erro ao gerar PDF' }, { status: 500 })
+  }
+}
+
+export async function POST(request: NextRequest) {
+  const supabase = await createClient()
+  const { data: { user } } = await supabase.auth.getUser()
+
+  if (!user) {
+    return NextResponse.json({ error: 'Unauthorized' }, { status: 401 })
+  }
+
+  const body = await request.json().catch(() => null)
+  const ids: string[] = Array.isArray(body?.ids) ? [...new Set<string>(body.ids.filter((id: unknown) => typeof id === 'string'))] : []
+
+  if (ids.length === 0) {
+    return NextResponse.json({ error: 'Informe as propostas em ids' }, { status: 400 })
+  }
+  if (ids.length > MAX_BATCH) {
+    return NextResponse.json({ error: `Máximo de ${MAX_BATCH} propostas por exportação` }, { status: 400 })
+  }
+
+  const organizationId = await getUserOrganization()
+  const { data: proposals, error } = await supabase
+    .from('proposals')
+    .select(PROPOSAL_PDF_SELECT)
+    .in('id', ids)
+    .eq('organization_id', organizationId)
+
+  if (error) {
+    console.error('Error fetching proposals for PDF export:', error)
+    return NextResponse.json({ error: 'Erro ao buscar propostas' }, { status: 500 })
+  }
+  if (!proposals || proposals.length === 0) {
+    return NextResponse.json({ error: 'Nenhuma proposta encontrada' }, { status: 404 })
+  }
+
+  const results = await getProposalPdfs(await createServiceClient(), proposals)
+  const rendered = results.filter((entry) => entry.result)
+
+  if (rendered.length === 0) {
+    return busyResponse()
+  }
+
+  // Nomes únicos dentro do .zip
+  const used = new Map<string, number>()
+  const entries = rendered.map(({ result }) => {
+    const base = result!.fileName.replace(/\.pdf$/, '')
+    const count = used.get(base) ?? 0
+    used.set(base, count + 1)
+    return { name: count ? `${base}-${count + 1}.pdf` : `${base}.pdf`, data: result!.pdf }
+  })
+
+  const failed = results.filter((entry) => entry.error)
+  if (failed.length > 0) {
+    const report = failed.map((entry) => `${entry.proposal.title} (${entry.proposal.id}): ${entry.error}`).join('\n')
+    entries.push({ name: 'erros.txt', data: new TextEncoder().encode(report + '\n') })
+  }
+
+  const zip = createZip(entries)
+  const stamp = new Date().toISOString().slice(0, 10)
+
+  return new NextResponse(new Uint8Array(zip), {
+    headers: {
+      'Content-Type': 'application/zip',
+      'Content-Disposition': `attachment; filename="propostas-${stamp}.zip"`,
+      'Cache-Control': 'no-store',
+      'X-PDF-Rendered': String(rendered.length),
+      'X-PDF-Failed': String(failed.length),
+    },
+  })
+}
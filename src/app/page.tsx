@@ -20,7 +20,20 @@ import {
 } from 'lucide-react'
 import Link from 'next/link'
 import { useRef, useEffect } from 'react'
-import { CrmSimulator } from '@/components/landing/CrmSimulator'
+import dynamic from 'next/dynamic'
+import { LazyMount } from '@/components/ui/lazy-mount'
+
+// Simulador é o bloco mais pesado da landing: carrega ao se aproximar da tela
+const simulatorSkeleton = (
+  <div className="relative w-full max-w-[1400px] mx-auto mt-20 px-4">
+    <div className="h-[600px] md:h-[800px] rounded-xl border border-zinc-800 bg-[#09090b]" />
+  </div>
+)
+
+const CrmSimulator = dynamic(
+  () => import('@/components/landing/CrmSimulator').then((mod) => mod.CrmSimulator),
+  { ssr: false, loading: () => simulatorSkeleton }
+)
 
 export default function Home() {
   const containerRef = useRef(null)
@@ -135,7 +148,9 @@ export default function Home() {
             animate={{ opacity: 1, scale: 1 }}
             transition={{ duration: 1, ease: "easeOut", delay: 0.2 }}
           >
-            <CrmSimulator />
+            <LazyMount fallback={simulatorSkeleton}>
+              <CrmSimulator />
+            </LazyMount>
           </motion.div>
         </section>
       </section>
@@ -0,0 +1,38 @@
+'use client';
+
+import { useState } from 'react';
+import dynamic from 'next/dynamic';
+import { Sparkles } from 'lucide-react';
+import { Button } from '@/components/ui/button';
+
+// O widget (ai sdk, markdown, animações) só é baixado na primeira interação
+const loadWidget = () => import('./ai-chat-widget').then((mod) => mod.AIChatWidget);
+
+const AIChatWidget = dynamic(loadWidget, { ssr: false });
+
+/**
+ * Botão leve no lugar do AIChatWidget: pré-carrega o chunk ao passar o mouse
+ * ou focar e monta o widget (já aberto) no clique.
+ */
+export function AIChatLauncher() {
+    const [activated, setActivated] = useState(false);
+
+    if (activated) {
+        return <AIChatWidget defaultOpen />;
+    }
+
+    return (
+        <div className="fixed bottom-6 right-6 z-[9999] font-sans">
+            <Button
+                onClick={() => setActivated(true)}
+                onPointerEnter={loadWidget}
+                onFocus={loadWidget}
+                size="lg"
+                aria-label="Abrir assistente"
+                className="h-14 w-14 rounded-full shadow-[0_4px_20px_rgba(0,0,0,0.1)] border bg-white/90 backdrop-blur-md text-zinc-800 border-white/20 hover:bg-white"
+            >
+                <Sparkles strokeWidth={2} className="h-6 w-6 text-indigo-600 fill-indigo-100" />
+            </Button>
+        </div>
+    );
+}
@@ -13,8 +13,13 @@ import { Input } from '@/components/ui/input';
 import { ScrollArea } from '@/components/ui/scroll-area';
 import { Card, CardContent, CardFooter, CardHeader, CardTitle } from '@/components/ui/card';
 
-export function AIChatWidget() {
-    const [isOpen, setIsOpen] = useState(false);
+interface AIChatWidgetProps {
+    // Abre já expandido (montado pelo AIChatLauncher após o clique)
+    defaultOpen?: boolean;
+}
+
+export function AIChatWidget({ defaultOpen = false }: AIChatWidgetProps) {
+    const [isOpen, setIsOpen] = useState(defaultOpen);
     const [inputValue, setInputValue] = useState('');
     const { messages, append, isLoading, stop, setMessages } = useChat({
         api: '/api/chat',
@@ -0,0 +1,79 @@
+'use client'
+
+import { useState } from 'react'
+import { CalendarPlus, Copy, RefreshCw } from 'lucide-react'
+import { Popover, PopoverContent, PopoverTrigger } from '@/components/ui/popover'
+import { getCalendarFeedPath } from '@/actions/calendar'
+
+// Link ICS pessoal para assinar o calendário no celular (Google, Apple, Outlook)
+export function SubscribeCalendar() {
+  const [url, setUrl] = useState<string | null>(null)
+  const [isLoading, setIsLoading] = useState(false)
+
+  const loadUrl = async (rotate = false) => {
+    setIsLoading(true)
+    try {
+      const path = await getCalendarFeedPath({ rotate })
+      setUrl(`${window.location.origin}${path}`)
+    } catch (error) {
+      console.error('Error loading calendar feed link:', error)
+      alert('Erro ao gerar link do calendário')
+    } finally {
+      setIsLoading(false)
+    }
+  }
+
+  const handleRotate = () => {
+    if (confirm('Gerar um novo link? Os calendários que usam o link atual param de atualizar.')) {
+      loadUrl(true)
+    }
+  }
+
+  return (
+    <Popover onOpenChange={(open) => open && !url && loadUrl()}>
+      <PopoverTrigger asChild>
+        <button className="flex items-center gap-2 rounded-xl border border-white/10 bg-white/5 px-4 py-2 text-sm font-medium text-zinc-300 transition-colors hover:bg-white/10 hover:text-white">
+          <CalendarPlus className="h-4 w-4" />
+          Assinar no celular
+        </button>
+      </PopoverTrigger>
+      <PopoverContent align="end" className="w-80 border-white/10 bg-zinc-900 text-zinc-200">
+        <p className="text-sm font-medium text-white">Assinar calendário</p>
+        <p className="mt-1 text-xs text-zinc-400">
+          Adicione este link como calendário por URL. Gravações, entregas e eventos aparecem e se atualizam sozinhos.
+        </p>
+
+        {url ? (
+          <>
+            <button
+              onClick={() => {
+                navigator.clipboard.writeText(url)
+                alert('Link copiado!')
+              }}
+              className="mt-3 flex w-full items-center gap-2 rounded-lg border border-white/10 bg-black/30 p-2 text-left text-xs text-blue-400 hover:underline"
+            >
+              <Copy className="h-3.5 w-3.5 flex-shrink-0" />
+              <span className="truncate">{url}</span>
+            </button>
+            <div className="mt-3 flex items-center justify-between text-xs">
+              <a href={url.replace(/^https?:/, 'webcal:')} className="text-accent-400 hover:underline">
+                Abrir no app de calendário
+              </a>
+              <button
+                onClick={handleRotate}
+                disabled={isLoading}
+                className="flex items-center gap-1 text-zinc-500 hover:text-zinc-300 disabled:opacity-50"
+              >
+                <RefreshCw className="h-3 w-3" />
+                Novo link
+              </button>
+            </div>
+            <p className="mt-3 text-[11px] text-zinc-500">Não compartilhe: quem tiver o link vê a agenda da produtora.</p>
+          </>
+        ) : (
+          <p className="mt-3 text-xs text-zinc-500">{isLoading ? 'Gerando link...' : ''}</p>
+        )}
+      </PopoverContent>
+    </Popover>
+  )
+}
@@ -2,7 +2,7 @@
 
 import { Modal } from '@/components/ui/modal'
 import { useState, useEffect } from 'react'
-import { updateClient } from '@/actions/clients'
+import { saveReferenceRecord } from '@/lib/reference-store'
 import { motion } from 'framer-motion'
 import { useRouter } from 'next/navigation'
 
@@ -51,12 +51,17 @@ export function ClientEditModal({ isOpen, onClose, client, onSuccess }: ClientEd
     setIsLoading(true)
 
     try {
-      await updateClient(client.id, {
-        name: formData.name,
-        email: formData.email,
-        phone: formData.phone || null,
-        company: formData.company || null,
-        notes: formData.notes || null,
+      // Sem conexão, fica na fila local e é enviado quando a conexão voltar
+      await saveReferenceRecord('clients', {
+        type: 'update',
+        id: client.id,
+        data: {
+          name: formData.name,
+          email: formData.email,
+          phone: formData.phone || null,
+          company: formData.company || null,
+          notes: formData.notes || null,
+        },
       })
       onSuccess?.()
       onClose()
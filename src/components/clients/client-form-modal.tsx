@@ -2,7 +2,7 @@
 
 import { Modal } from '@/components/ui/modal'
 import { useState } from 'react'
-import { addClient } from '@/actions/clients'
+import { saveReferenceRecord } from '@/lib/reference-store'
 import { motion } from 'framer-motion'
 
 interface ClientFormModalProps {
@@ -26,7 +26,8 @@ export function ClientFormModal({ isOpen, onClose, onSuccess }: ClientFormModalP
     setIsLoading(true)
 
     try {
-      const newClient = await addClient(formData)
+      // Sem conexão, fica na fila local e é enviado quando a conexão voltar
+      const newClient = await saveReferenceRecord('clients', { type: 'create', data: formData })
       setFormData({ name: '', email: '', phone: '', company: '', notes: '' })
       onSuccess(newClient)
       onClose()
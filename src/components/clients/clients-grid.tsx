@@ -7,6 +7,7 @@ import { deleteClient } from '@/actions/clients'
 import { ClientFormModal } from './client-form-modal'
 import { ClientTransferModal } from './client-transfer-modal'
 import { useRouter } from 'next/navigation'
+import { CsvImportButton } from '@/components/import/csv-import-button'
 
 type Client = {
   id: string
@@ -139,17 +140,20 @@ export function ClientsGrid({ initialClients }: ClientsGridProps) {
           </motion.p>
         </div>
 
-        <motion.button
-          initial={{ opacity: 0, scale: 0.9 }}
-          animate={{ opacity: 1, scale: 1 }}
-          whileHover={{ scale: 1.05 }}
-          whileTap={{ scale: 0.95 }}
-          onClick={() => setIsModalOpen(true)}
-          className="flex items-center gap-2 rounded-xl bg-primary px-6 py-3 text-sm font-medium text-primary-foreground transition-all hover:opacity-90"
-        >
-          <Plus className="h-4 w-4" />
-          Novo Cliente
-        </motion.button>
+        <div className="flex items-center gap-3">
+          <CsvImportButton entity="clients" />
+          <motion.button
+            initial={{ opacity: 0, scale: 0.9 }}
+            animate={{ opacity: 1, scale: 1 }}
+            whileHover={{ scale: 1.05 }}
+            whileTap={{ scale: 0.95 }}
+            onClick={() => setIsModalOpen(true)}
+            className="flex items-center gap-2 rounded-xl bg-primary px-6 py-3 text-sm font-medium text-primary-foreground transition-all hover:opacity-90"
+          >
+            <Plus className="h-4 w-4" />
+            Novo Cliente
+          </motion.button>
+        </div>
       </div>
 
       {/* Search */}
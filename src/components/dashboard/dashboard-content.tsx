@@ -20,10 +20,19 @@ import {
 import { format, isPast, isToday, differenceInDays } from 'date-fns'
 import { ptBR } from 'date-fns/locale'
 import Link from 'next/link'
+import dynamic from 'next/dynamic'
 import { getDashboardStats, type DashboardStats } from '@/actions/dashboard'
-import { CashFlowChart } from '@/components/charts/cash-flow-chart'
+import { LazyMount } from '@/components/ui/lazy-mount'
 import { DateRangePicker } from './date-range-picker'
 
+// recharts só é baixado quando o gráfico se aproxima da tela
+const chartSkeleton = <div className="h-[280px] w-full animate-pulse rounded-xl bg-secondary/40" />
+
+const CashFlowChart = dynamic(
+  () => import('@/components/charts/cash-flow-chart').then((mod) => mod.CashFlowChart),
+  { ssr: false, loading: () => chartSkeleton }
+)
+
 interface DashboardContentProps {
   stats: DashboardStats
 }
@@ -272,7 +281,9 @@ export function DashboardContent({ initialStats }: { initialStats?: DashboardSta
             </button>
           </div>
         </div>
-        <CashFlowChart data={stats.cashFlowData} variant={chartVariant} />
+        <LazyMount fallback={chartSkeleton}>
+          <CashFlowChart data={stats.cashFlowData} variant={chartVariant} />
+        </LazyMount>
       </motion.div>
 
       <div className="grid gap-6 lg:grid-cols-3">
@@ -8,30 +8,29 @@ import {
   Target,
   AlertTriangle,
 } from 'lucide-react'
+import type { ProjectProfitability } from '@/actions/profitability'
 
-type FinancialSummary = {
-  total_revenue: number
-  total_estimated_cost: number
-  total_actual_cost: number
-  estimated_profit: number
-  actual_profit: number
-  estimated_margin_percent: number
-  actual_margin_percent: number
-  target_margin_percent: number
-  margin_alert: boolean
-  estimated_crew_cost: number
-  estimated_equipment_cost: number
-  estimated_logistics_cost: number
-  actual_crew_cost: number
-  actual_equipment_cost: number
-  actual_logistics_cost: number
+interface ProfitabilityPanelProps {
+  // Leitura do cubo project_profitability_cube (getProjectProfitability)
+  profitability: ProjectProfitability
+  targetMarginPercent?: number
 }
 
-interface ProfitabilityPanelProps {
-  summary: FinancialSummary
+const CATEGORY_LABELS: Record<string, string> = {
+  CONTRACT: 'Contratado',
+  CREW_TALENT: 'Equipe/Talento',
+  EQUIPMENT: 'Equipamentos',
+  EQUIPMENT_RENTAL: 'Aluguel Equip.',
+  LOCATION: 'Locação',
+  LOGISTICS: 'Logística',
+  FOOD: 'Alimentação',
+  POST_PRODUCTION: 'Pós-produção',
+  PRODUCTION: 'Produção',
+  OTHER: 'Outros',
+  OTHER_EXPENSE: 'Outros',
 }
 
-export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
+export function ProfitabilityPanel({ profitability, targetMarginPercent = 30 }: ProfitabilityPanelProps) {
   const formatCurrency = (value: number) => {
     return new Intl.NumberFormat('pt-BR', {
       style: 'currency',
@@ -43,7 +42,18 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
     return `${value.toFixed(1)}%`
   }
 
-  const isHealthy = summary.actual_margin_percent >= summary.target_margin_percent
+  const totals = profitability.totals
+  const revenue = totals?.revenue ?? 0
+  const cost = totals?.cost ?? 0
+  const profit = totals?.profit ?? 0
+  const margin = totals?.margin_percent ?? 0
+  const contracted = totals?.contracted ?? 0
+
+  // Só categorias com custo entram na quebra (CONTRACT é receita contratada)
+  const costByCategory = profitability.byCategory.filter((row) => row.cost > 0)
+
+  const isHealthy = margin >= targetMarginPercent
+  const marginAlert = revenue > 0 && !isHealthy
   const profitColor = isHealthy ? 'text-green-400' : 'text-red-400'
   const profitBg = isHealthy ? 'bg-green-500/10' : 'bg-red-500/10'
   const profitBorder = isHealthy ? 'border-green-500/20' : 'border-red-500/20'
@@ -51,7 +61,7 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
   return (
     <div className="space-y-6">
       {/* Alerta de margem */}
-      {summary.margin_alert && (
+      {marginAlert && (
         <motion.div
           initial={{ opacity: 0, y: -10 }}
           animate={{ opacity: 1, y: 0 }}
@@ -63,8 +73,8 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
               Margem abaixo da meta!
             </p>
             <p className="text-xs text-red-400/70">
-              Margem atual: {formatPercent(summary.actual_margin_percent)} |
-              Meta: {formatPercent(summary.target_margin_percent)}
+              Margem atual: {formatPercent(margin)} |
+              Meta: {formatPercent(targetMarginPercent)}
             </p>
           </div>
         </motion.div>
@@ -82,7 +92,10 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
             <div>
               <p className="text-xs text-zinc-500">Faturamento</p>
               <p className="mt-1 text-xl font-bold text-white">
-                {formatCurrency(summary.total_revenue)}
+                {formatCurrency(revenue)}
+              </p>
+              <p className="mt-1 text-xs text-zinc-500">
+                {formatCurrency(totals?.revenue_paid ?? 0)} recebido
               </p>
             </div>
             <div className="rounded-lg bg-blue-500/20 p-2">
@@ -91,7 +104,7 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
           </div>
         </motion.div>
 
-        {/* Custo Estimado */}
+        {/* Contratado */}
         <motion.div
           initial={{ opacity: 0, scale: 0.9 }}
           animate={{ opacity: 1, scale: 1 }}
@@ -100,9 +113,9 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
         >
           <div className="flex items-center justify-between">
             <div>
-              <p className="text-xs text-zinc-500">Custo Estimado</p>
+              <p className="text-xs text-zinc-500">Contratado</p>
               <p className="mt-1 text-xl font-bold text-orange-400">
-                {formatCurrency(summary.total_estimated_cost)}
+                {formatCurrency(contracted)}
               </p>
             </div>
             <div className="rounded-lg bg-orange-500/20 p-2">
@@ -111,7 +124,7 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
           </div>
         </motion.div>
 
-        {/* Custo Realizado */}
+        {/* Custos */}
         <motion.div
           initial={{ opacity: 0, scale: 0.9 }}
           animate={{ opacity: 1, scale: 1 }}
@@ -120,15 +133,13 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
         >
           <div className="flex items-center justify-between">
             <div>
-              <p className="text-xs text-zinc-500">Custo Realizado</p>
+              <p className="text-xs text-zinc-500">Custos</p>
               <p className="mt-1 text-xl font-bold text-white">
-                {formatCurrency(summary.total_actual_cost)}
+                {formatCurrency(cost)}
+              </p>
+              <p className="mt-1 text-xs text-zinc-500">
+                {formatCurrency(totals?.cost_paid ?? 0)} pago
               </p>
-              {summary.total_actual_cost > summary.total_estimated_cost && (
-                <p className="mt-1 text-xs text-red-400">
-                  +{formatCurrency(summary.total_actual_cost - summary.total_estimated_cost)} acima
-                </p>
-              )}
             </div>
             <div className="rounded-lg bg-purple-500/20 p-2">
               <TrendingDown className="h-5 w-5 text-purple-400" />
@@ -147,10 +158,10 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
             <div>
               <p className="text-xs text-zinc-500">Margem de Lucro</p>
               <p className={`mt-1 text-2xl font-bold ${profitColor}`}>
-                {formatPercent(summary.actual_margin_percent)}
+                {formatPercent(margin)}
               </p>
               <p className={`text-lg font-bold ${profitColor}`}>
-                {formatCurrency(summary.actual_profit)}
+                {formatCurrency(profit)}
               </p>
             </div>
             <div className={`rounded-lg ${isHealthy ? 'bg-green-500/20' : 'bg-red-500/20'} p-2`}>
@@ -164,71 +175,32 @@ export function ProfitabilityPanel({ summary }: ProfitabilityPanelProps) {
         </motion.div>
       </div>
 
-      {/* Breakdown de custos */}
-      <div className="grid gap-4 md:grid-cols-3">
-        {/* Crew & Talents */}
-        <div className="rounded-xl border border-white/10 bg-white/5 p-4">
-          <h4 className="mb-3 text-sm font-medium text-zinc-400">
-            Crew & Talents
-          </h4>
-          <div className="space-y-2">
-            <div className="flex justify-between text-sm">
-              <span className="text-zinc-500">Estimado</span>
-              <span className="font-medium text-orange-400">
-                {formatCurrency(summary.estimated_crew_cost)}
-              </span>
-            </div>
-            <div className="flex justify-between text-sm">
-              <span className="text-zinc-500">Realizado</span>
-              <span className="font-medium text-white">
-                {formatCurrency(summary.actual_crew_cost)}
-              </span>
+      {/* Breakdown de custos por categoria */}
+      {costByCategory.length > 0 && (
+        <div className="grid gap-4 md:grid-cols-3">
+          {costByCategory.map((row) => (
+            <div key={row.category} className="rounded-xl border border-white/10 bg-white/5 p-4">
+              <h4 className="mb-3 text-sm font-medium text-zinc-400">
+                {CATEGORY_LABELS[row.category ?? ''] || row.category}
+              </h4>
+              <div className="space-y-2">
+                <div className="flex justify-between text-sm">
+                  <span className="text-zinc-500">Total</span>
+                  <span className="font-medium text-orange-400">
+                    {formatCurrency(row.cost)}
+                  </span>
+                </div>
+                <div className="flex justify-between text-sm">
+                  <span className="text-zinc-500">Pago</span>
+                  <span className="font-medium text-white">
+                    {formatCurrency(row.cost_paid)}
+                  </span>
+                </div>
+              </div>
             </div>
-          </div>
+          ))}
         </div>
-
-        {/* Equipamentos */}
-        <div className="rounded-xl border border-white/10 bg-white/5 p-4">
-          <h4 className="mb-3 text-sm font-medium text-zinc-400">
-            Equipamentos
-          </h4>
-          <div className="space-y-2">
-            <div className="flex justify-between text-sm">
-              <span className="text-zinc-500">Estimado</span>
-              <span className="font-medium text-orange-400">
-                {formatCurrency(summary.estimated_equipment_cost)}
-              </span>
-            </div>
-            <div className="flex justify-between text-sm">
-              <span className="text-zinc-500">Realizado</span>
-              <span className="font-medium text-white">
-                {formatCurrency(summary.actual_equipment_cost)}
-              </span>
-            </div>
-          </div>
-        </div>
-
-        {/* Logística */}
-        <div className="rounded-xl border border-white/10 bg-white/5 p-4">
-          <h4 className="mb-3 text-sm font-medium text-zinc-400">
-            Logística & Diversos
-          </h4>
-          <div className="space-y-2">
-            <div className="flex justify-between text-sm">
-              <span className="text-zinc-500">Estimado</span>
-              <span className="font-medium text-orange-400">
-                {formatCurrency(summary.estimated_logistics_cost)}
-              </span>
-            </div>
-            <div className="flex justify-between text-sm">
-              <span className="text-zinc-500">Realizado</span>
-              <span className="font-medium text-white">
-                {formatCurrency(summary.actual_logistics_cost)}
-              </span>
-            </div>
-          </div>
-        </div>
-      </div>
+      )}
     </div>
   )
 }
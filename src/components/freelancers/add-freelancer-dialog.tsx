@@ -11,7 +11,8 @@ import {
   DialogTitle,
   DialogTrigger,
 } from '@/components/ui/dialog'
-import { createFreelancer, updateFreelancer, type CreateFreelancerData } from '@/actions/freelancers'
+import type { CreateFreelancerData } from '@/actions/freelancers'
+import { saveReferenceRecord } from '@/lib/reference-store'
 
 import { FREELANCER_ROLES, FREELANCER_SPECIALTIES } from '@/constants/freelancers'
 
@@ -75,14 +76,16 @@ export function AddFreelancerDialog({ onSuccess, freelancer, trigger }: AddFreel
       let result
 
       if (freelancer) {
-        result = await updateFreelancer(freelancer.id, {
-          ...formData,
-          specialty: selectedSpecialties,
+        result = await saveReferenceRecord('freelancers', {
+          type: 'update',
+          id: freelancer.id,
+          data: { ...formData, specialty: selectedSpecialties },
         })
       } else {
-        result = await createFreelancer({
-          ...formData,
-          specialty: selectedSpecialties,
+        // Sem conexão, fica na fila local e é enviado quando a conexão voltar
+        result = await saveReferenceRecord('freelancers', {
+          type: 'create',
+          data: { ...formData, specialty: selectedSpecialties },
         })
       }
 
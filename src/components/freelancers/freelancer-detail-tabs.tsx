@@ -18,8 +18,10 @@ import {
     CheckCircle2,
     FileText,
     ExternalLink,
+    Loader2,
 } from 'lucide-react'
 import Link from 'next/link'
+import { getFreelancerWorkHistory } from '@/actions/assignments'
 import type { FreelancerWithDetails } from '@/types/assignments'
 import {
     ASSIGNMENT_STATUS_LABELS,
@@ -32,6 +34,22 @@ interface FreelancerDetailTabsProps {
 
 export function FreelancerDetailTabs({ freelancer }: FreelancerDetailTabsProps) {
     const [activeTab, setActiveTab] = useState<'overview' | 'history' | 'financial' | 'schedule'>('overview')
+    const [workHistory, setWorkHistory] = useState(freelancer.work_history || [])
+    const [historyCursor, setHistoryCursor] = useState(freelancer.work_history_cursor ?? null)
+    const [isLoadingHistory, setIsLoadingHistory] = useState(false)
+
+    // Próxima página do histórico a partir do cursor da última carregada
+    async function loadMoreHistory() {
+        if (!historyCursor) return
+        setIsLoadingHistory(true)
+        try {
+            const page = await getFreelancerWorkHistory(freelancer.id, { cursor: historyCursor })
+            setWorkHistory((prev) => [...prev, ...page.items])
+            setHistoryCursor(page.next_cursor)
+        } finally {
+            setIsLoadingHistory(false)
+        }
+    }
 
     const tabs = [
         { id: 'overview', label: 'Resumo', icon: LayoutDashboard },
@@ -388,9 +406,9 @@ export function FreelancerDetailTabs({ freelancer }: FreelancerDetailTabsProps)
                         <h3 className="mb-4 text-lg font-semibold text-white">
                             Histórico Completo de Trabalhos
                         </h3>
-                        {freelancer.work_history && freelancer.work_history.length > 0 ? (
+                        {workHistory.length > 0 ? (
                             <div className="space-y-3">
-                                {freelancer.work_history.map((work) => (
+                                {workHistory.map((work) => (
                                     <div
                                         key={work.assignment_id}
                                         className="flex items-center justify-between rounded-lg border border-white/5 bg-white/5 p-4"
@@ -451,6 +469,16 @@ export function FreelancerDetailTabs({ freelancer }: FreelancerDetailTabsProps)
                                         </div>
                                     </div>
                                 ))}
+                                {historyCursor && (
+                                    <button
+                                        onClick={loadMoreHistory}
+                                        disabled={isLoadingHistory}
+                                        className="flex w-full items-center justify-center gap-2 rounded-lg border border-white/10 py-3 text-sm text-zinc-400 transition-all hover:bg-white/5 hover:text-white disabled:opacity-50"
+                                    >
+                                        {isLoadingHistory && <Loader2 className="h-4 w-4 animate-spin" />}
+                                        Carregar mais
+                                    </button>
+                                )}
                             </div>
                         ) : (
                             <div className="py-12 text-center">
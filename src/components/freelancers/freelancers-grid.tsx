@@ -3,8 +3,9 @@
 import { motion } from 'framer-motion'
 import { Camera, Mic, Video, Edit, Music, Star, ExternalLink, Check, X } from 'lucide-react'
 import Link from 'next/link'
-import { useState, useCallback } from 'react'
+import { useState, useCallback, useEffect } from 'react'
 import { AddFreelancerDialog } from './add-freelancer-dialog'
+import { CsvImportButton } from '@/components/import/csv-import-button'
 import { updateFreelancerRate } from '@/actions/freelancers'
 
 type Freelancer = {
@@ -16,6 +17,9 @@ type Freelancer = {
   daily_rate: number
   rating: number
   status: string
+  // Totais do rollup (freelancer_rollup_totals)
+  total_jobs?: number
+  projects_count?: number
 }
 
 
@@ -147,13 +151,19 @@ export function FreelancersGrid({ initialFreelancers }: FreelancersGridProps) {
   const [freelancers, setFreelancers] = useState(initialFreelancers)
   const [searchTerm, setSearchTerm] = useState('')
 
+  // Lista nova do servidor (router.refresh após importação)
+  useEffect(() => {
+    setFreelancers(initialFreelancers)
+  }, [initialFreelancers])
+
   // Callback para atualizar lista quando novo freelancer é criado
   const handleFreelancerCreated = useCallback((newFreelancer: Freelancer) => {
     setFreelancers((prev) => [newFreelancer, ...prev])
   }, [])
 
   const handleFreelancerUpdated = useCallback((updatedFreelancer: Freelancer) => {
-    setFreelancers((prev) => prev.map((f) => (f.id === updatedFreelancer.id ? updatedFreelancer : f)))
+    // Mantém os totais do rollup, que não vêm na linha atualizada
+    setFreelancers((prev) => prev.map((f) => (f.id === updatedFreelancer.id ? { ...f, ...updatedFreelancer } : f)))
   }, [])
 
   const filteredFreelancers = freelancers.filter((freelancer) =>
@@ -207,7 +217,9 @@ export function FreelancersGrid({ initialFreelancers }: FreelancersGridProps) {
         <motion.div
           initial={{ opacity: 0, scale: 0.9 }}
           animate={{ opacity: 1, scale: 1 }}
+          className="flex items-center gap-3"
         >
+          <CsvImportButton entity="freelancers" />
           <AddFreelancerDialog onSuccess={handleFreelancerCreated} />
         </motion.div>
       </div>
@@ -289,6 +301,11 @@ export function FreelancersGrid({ initialFreelancers }: FreelancersGridProps) {
                         <span className="text-sm font-medium text-warning">
                           {freelancer.rating?.toFixed(1) ?? '0.0'}
                         </span>
+                        {freelancer.total_jobs !== undefined && (
+                          <span className="ml-2 text-xs text-text-tertiary">
+                            {freelancer.projects_count ?? 0} projetos · {freelancer.total_jobs} trabalhos
+                          </span>
+                        )}
                       </div>
                     </div>
                   </div>
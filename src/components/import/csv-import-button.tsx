@@ -0,0 +1,175 @@
+'use client'
+
+import { useRef, useState } from 'react'
+import { useRouter } from 'next/navigation'
+import { Upload, FileSpreadsheet, AlertCircle } from 'lucide-react'
+import { Button } from '@/components/ui/button'
+import { Modal } from '@/components/ui/modal'
+import type { ImportEntity } from '@/lib/import/entities'
+import type { ImportEvent, ImportIssue, ImportProgress } from '@/lib/import/pipeline'
+
+// Linhas com problema exibidas no modal (o total aparece nos contadores)
+const MAX_VISIBLE_ISSUES = 100
+
+const HINTS: Record<ImportEntity, string> = {
+  clients: 'Colunas: nome, email, telefone, empresa, observacoes. Duplicados por e-mail.',
+  freelancers: 'Colunas: nome, email, telefone, funcao, especialidades (separadas por |), diaria, status. Duplicados por e-mail.',
+  equipments: 'Colunas: nome, marca, modelo, categoria, numero_de_serie, status, data_de_compra, valor_de_compra, diaria. Duplicados por número de série.',
+}
+
+interface CsvImportButtonProps {
+  entity: ImportEntity
+  label?: string
+}
+
+/**
+ * Envia o CSV para /api/import/{entity} em streaming e acompanha o progresso
+ * (eventos NDJSON) sem esperar o arquivo inteiro ser processado.
+ */
+export function CsvImportButton({ entity, label = 'Importar CSV' }: CsvImportButtonProps) {
+  const router = useRouter()
+  const inputRef = useRef<HTMLInputElement>(null)
+  const [isOpen, setIsOpen] = useState(false)
+  const [file, setFile] = useState<File | null>(null)
+  const [isImporting, setIsImporting] = useState(false)
+  const [progress, setProgress] = useState<ImportProgress | null>(null)
+  const [issues, setIssues] = useState<ImportIssue[]>([])
+  const [error, setError] = useState<string | null>(null)
+  const [finished, setFinished] = useState(false)
+
+  const reset = () => {
+    setFile(null)
+    setProgress(null)
+    setIssues([])
+    setError(null)
+    setFinished(false)
+    if (inputRef.current) inputRef.current.value = ''
+  }
+
+  const handleEvent = (event: ImportEvent | { type: 'error'; message: string }) => {
+    if (event.type === 'issue') {
+      setIssues((current) => (current.length < MAX_VISIBLE_ISSUES ? [...current, event] : current))
+    } else if (event.type === 'error') {
+      setError(event.message)
+    } else {
+      setProgress(event)
+      if (event.type === 'done') setFinished(true)
+    }
+  }
+
+  const handleImport = async () => {
+    if (!file) return
+    setIsImporting(true)
+    setProgress(null)
+    setIssues([])
+    setError(null)
+    setFinished(false)
+
+    try {
+      const response = await fetch(`/api/import/${entity}`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'text/csv' },
+        body: file,
+      })
+
+      if (!response.ok || !response.body) {
+        const body = await response.json().catch(() => null)
+        throw new Error(body?.error || 'Erro ao enviar arquivo')
+      }
+
+      // NDJSON: um evento por linha, processado conforme chega
+      const reader = response.body.pipeThrough(new TextDecoderStream()).getReader()
+      let buffer = ''
+      while (true) {
+        const { value, done } = await reader.read()
+        if (done) break
+        buffer += value
+        const lines = buffer.split('\n')
+        buffer = lines.pop() ?? ''
+        for (const line of lines) {
+          if (line.trim()) handleEvent(JSON.parse(line))
+        }
+      }
+
+      router.refresh()
+    } catch (err) {
+      setError(err instanceof Error ? err.message : 'Erro na importação')
+    } finally {
+      setIsImporting(false)
+    }
+  }
+
+  const handleClose = () => {
+    if (isImporting) return
+    setIsOpen(false)
+    reset()
+  }
+
+  return (
+    <>
+      <Button variant="secondary" onClick={() => setIsOpen(true)}>
+        <Upload className="h-4 w-4" />
+        {label}
+      </Button>
+
+      <Modal isOpen={isOpen} onClose={handleClose} title={label}>
+        <div className="space-y-4">
+          <p className="text-sm text-text-tertiary">{HINTS[entity]}</p>
+
+          <label className="flex cursor-pointer items-center gap-3 rounded-lg border border-dashed border-border bg-secondary p-4 text-sm text-text-secondary hover:border-text-tertiary">
+            <FileSpreadsheet className="h-5 w-5" />
+            <span className="flex-1 truncate">{file ? file.name : 'Selecionar arquivo .csv'}</span>
+            <input
+              ref={inputRef}
+              type="file"
+              accept=".csv,text/csv"
+              className="hidden"
+              disabled={isImporting}
+              onChange={(e) => {
+                reset()
+                setFile(e.target.files?.[0] ?? null)
+              }}
+            />
+          </label>
+
+          {progress && (
+            <div className="grid grid-cols-2 gap-2 rounded-lg bg-secondary p-3 text-sm text-text-secondary">
+              <span>Linhas lidas: <strong className="text-text-primary">{progress.processed}</strong></span>
+              <span>Importadas: <strong className="text-green-500">{progress.inserted}</strong></span>
+              <span>Duplicadas: <strong className="text-text-primary">{progress.duplicates}</strong></span>
+              <span>Com erro: <strong className="text-red-500">{progress.invalid + progress.failed}</strong></span>
+            </div>
+          )}
+
+          {error && (
+            <div className="flex items-center gap-2 rounded-lg bg-red-500/10 p-3 text-sm text-red-500">
+              <AlertCircle className="h-4 w-4" />
+              {error}
+            </div>
+          )}
+
+          {issues.length > 0 && (
+            <div className="max-h-48 space-y-1 overflow-y-auto rounded-lg border border-border p-2 text-xs">
+              {issues.map((issue, i) => (
+                <div key={i} className={issue.kind === 'duplicate' ? 'text-text-tertiary' : 'text-red-500'}>
+                  Linha {issue.line}: {issue.message}
+                </div>
+              ))}
+            </div>
+          )}
+
+          <div className="flex justify-end gap-2">
+            <Button variant="ghost" onClick={handleClose} disabled={isImporting}>
+              {finished ? 'Fechar' : 'Cancelar'}
+            </Button>
+            {!finished && (
+              <Button onClick={handleImport} disabled={!file || isImporting}>
+                {isImporting ? 'Importando...' : 'Importar'}
+              </Button>
+            )}
+          </div>
+        </div>
+      </Modal>
+    </>
+  )
+}
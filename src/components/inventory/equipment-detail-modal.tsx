@@ -25,6 +25,7 @@ import {
   getEquipmentProjectHistory,
   getMaintenanceLogs,
 } from '@/actions/equipments'
+import { getResponsiveImageProps } from '@/lib/images/variants'
 
 interface Equipment {
   id: string
@@ -215,7 +216,7 @@ export function EquipmentDetailModal({
               <Card>
                 <CardContent className="p-4">
                   <img
-                    src={equipment.photo_url}
+                    {...getResponsiveImageProps(equipment.photo_url, 'medium', '(max-width: 768px) 100vw, 640px')}
                     alt={equipment.name}
                     className="w-full h-64 object-cover rounded-lg"
                   />
@@ -21,7 +21,8 @@ import {
 } from '@/components/ui/select'
 import { Label } from '@/components/ui/label'
 import { Textarea } from '@/components/ui/textarea'
-import { addEquipment, updateEquipment } from '@/actions/equipments'
+import { ImageUpload } from '@/components/ui/image-upload'
+import { saveReferenceRecord } from '@/lib/reference-store'
 import { Loader2 } from 'lucide-react'
 
 interface Equipment {
@@ -153,9 +154,10 @@ export function EquipmentFormModal({
 
       let result
       if (isEditing && equipment?.id) {
-        result = await updateEquipment(equipment.id, equipmentData)
+        result = await saveReferenceRecord('equipments', { type: 'update', id: equipment.id, data: equipmentData })
       } else {
-        result = await addEquipment(equipmentData)
+        // Sem conexão, fica na fila local e é enviado quando a conexão voltar
+        result = await saveReferenceRecord('equipments', { type: 'create', data: equipmentData })
       }
 
       onSuccess(result)
@@ -313,12 +315,14 @@ export function EquipmentFormModal({
             <h3 className="font-semibold">Informações Adicionais</h3>
 
             <div className="space-y-2">
-              <Label htmlFor="photo_url">URL da Foto</Label>
-              <Input
-                id="photo_url"
-                type="url"
-                placeholder="https://exemplo.com/foto.jpg"
-                {...register('photo_url')}
+              <Label htmlFor="photo_url">Foto</Label>
+              <ImageUpload
+                value={watch('photo_url')}
+                onChange={(url) => setValue('photo_url', url)}
+                onRemove={() => setValue('photo_url', '')}
+                bucket="public"
+                path="equipments"
+                label="Foto do Equipamento"
               />
             </div>
 
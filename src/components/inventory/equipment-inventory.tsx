@@ -1,6 +1,6 @@
 'use client'
 
-import { useState } from 'react'
+import { useState, useEffect } from 'react'
 import { Card, CardContent, CardDescription, CardHeader, CardTitle } from '@/components/ui/card'
 import { Button } from '@/components/ui/button'
 import { Input } from '@/components/ui/input'
@@ -36,6 +36,7 @@ import {
 } from 'lucide-react'
 import { EquipmentDetailModal } from './equipment-detail-modal'
 import { EquipmentFormModal } from './equipment-form-modal'
+import { CsvImportButton } from '@/components/import/csv-import-button'
 
 interface EquipmentData {
   id: string
@@ -104,6 +105,11 @@ const statusLabels: Record<string, string> = {
 
 export function EquipmentInventory({ initialData }: EquipmentInventoryProps) {
   const [equipments, setEquipments] = useState<EquipmentData[]>(initialData.equipments)
+
+  // Lista nova do servidor (router.refresh após importação)
+  useEffect(() => {
+    setEquipments(initialData.equipments)
+  }, [initialData.equipments])
   const [searchQuery, setSearchQuery] = useState('')
   const [categoryFilter, setCategoryFilter] = useState<string>('all')
   const [statusFilter, setStatusFilter] = useState<string>('all')
@@ -214,10 +220,13 @@ export function EquipmentInventory({ initialData }: EquipmentInventoryProps) {
                 <CardTitle>Inventário de Equipamentos</CardTitle>
                 <CardDescription>Gestão completa de equipamentos e disponibilidade</CardDescription>
               </div>
-              <Button onClick={handleAddNew}>
-                <Plus className="mr-2 h-4 w-4" />
-                Novo Equipamento
-              </Button>
+              <div className="flex items-center gap-2">
+                <CsvImportButton entity="equipments" />
+                <Button onClick={handleAddNew}>
+                  <Plus className="mr-2 h-4 w-4" />
+                  Novo Equipamento
+                </Button>
+              </div>
             </div>
 
             {/* Filters */}
@@ -7,6 +7,7 @@ import { signOut, getCurrentUserData } from '@/actions/auth'
 import { getNotifications, getUnreadCount, markAllAsRead, markAsRead, type Notification } from '@/actions/notifications'
 import { GlobalSearch } from '@/components/global-search'
 import { createClient } from '@/lib/supabase/client'
+import { bindReferenceRealtime } from '@/lib/reference-store'
 import { Popover, PopoverContent, PopoverTrigger } from '@/components/ui/popover'
 import { ScrollArea } from '@/components/ui/scroll-area'
 import { cn } from '@/lib/utils'
@@ -51,8 +52,8 @@ export function Header() {
     fetchNotifications()
 
     // 🔔 Realtime Subscription
-    const channel = supabase
-      .channel('notifications-header')
+    // O mesmo canal mantém a cópia local de clientes/freelancers/equipamentos
+    const channel = bindReferenceRealtime(supabase.channel('notifications-header'))
       .on(
         'postgres_changes',
         {
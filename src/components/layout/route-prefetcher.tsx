@@ -0,0 +1,52 @@
+'use client'
+
+import { useEffect } from 'react'
+import { usePathname, useRouter } from 'next/navigation'
+import type { Route } from 'next'
+
+// Próximas rotas mais prováveis a partir de cada seção (fluxo proposta -> projeto -> agenda/financeiro)
+const LIKELY_NEXT: Record<string, Route[]> = {
+  '/dashboard': ['/projects', '/proposals', '/financeiro', '/calendar'],
+  '/proposals': ['/projects', '/clients'],
+  '/projects': ['/calendar', '/freelancers', '/inventory'],
+  '/clients': ['/proposals', '/projects'],
+  '/calendar': ['/projects'],
+  '/financeiro': ['/dashboard', '/projects'],
+  '/freelancers': ['/projects', '/calendar'],
+  '/inventory': ['/projects', '/calendar'],
+}
+
+type NetworkInformation = { saveData?: boolean; effectiveType?: string }
+
+const canPrefetch = () => {
+  const connection = (navigator as Navigator & { connection?: NetworkInformation }).connection
+  return !connection?.saveData && !/2g/.test(connection?.effectiveType || '')
+}
+
+/**
+ * Pré-carrega, com o navegador ocioso, as rotas que costumam vir depois da
+ * atual. Complementa o prefetch dos links (que depende de visibilidade) e é
+ * desligado em conexões lentas ou com economia de dados.
+ */
+export function RoutePrefetcher() {
+  const pathname = usePathname()
+  const router = useRouter()
+
+  useEffect(() => {
+    const section = '/' + (pathname.split('/')[1] || '')
+    const targets = LIKELY_NEXT[section]
+    if (!targets || !canPrefetch()) return
+
+    const prefetch = () => targets.forEach((href) => router.prefetch(href))
+
+    if ('requestIdleCallback' in window) {
+      const handle = window.requestIdleCallback(prefetch, { timeout: 3000 })
+      return () => window.cancelIdleCallback(handle)
+    }
+
+    const timer = setTimeout(prefetch, 1500)
+    return () => clearTimeout(timer)
+  }, [pathname, router])
+
+  return null
+}
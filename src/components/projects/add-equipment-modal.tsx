@@ -4,8 +4,9 @@ import { useState, useEffect } from 'react'
 import { Modal } from '@/components/ui/modal'
 import { motion } from 'framer-motion'
 import { Package, Calendar, Check, X } from 'lucide-react'
-import { getEquipments, addEquipmentBooking } from '@/actions/equipments'
+import { addEquipmentBooking } from '@/actions/equipments'
 import { getProjectShootingDates } from '@/actions/projects'
+import { useReferenceData } from '@/lib/reference-store'
 import { useRouter } from 'next/navigation'
 import { cn } from '@/lib/utils'
 
@@ -22,6 +23,8 @@ interface Equipment {
   status: string
   daily_rate?: number
   serial_number?: string
+  // Criado offline, ainda sem id no servidor
+  _pending?: boolean
 }
 
 interface ShootingDate {
@@ -34,7 +37,11 @@ interface ShootingDate {
 export function AddEquipmentModal({ isOpen, onClose, projectId }: AddEquipmentModalProps) {
   const router = useRouter()
   const [isLoading, setIsLoading] = useState(false)
-  const [equipments, setEquipments] = useState<Equipment[]>([])
+  // Lista local (IndexedDB): abre sem esperar o servidor
+  const { rows } = useReferenceData('equipments', isOpen)
+  const equipments = (rows as Equipment[]).filter(
+    (e) => e.status === 'AVAILABLE' || e.status === 'IN_USE'
+  )
   const [shootingDates, setShootingDates] = useState<ShootingDate[]>([])
 
   const [formData, setFormData] = useState({
@@ -45,14 +52,6 @@ export function AddEquipmentModal({ isOpen, onClose, projectId }: AddEquipmentMo
 
   useEffect(() => {
     if (isOpen) {
-      // Carregar equipamentos
-      getEquipments().then((data) => {
-        const available = data.filter(
-          (e: Equipment) => e.status === 'AVAILABLE' || e.status === 'IN_USE'
-        )
-        setEquipments(available)
-      })
-
       // Carregar datas de gravação
       getProjectShootingDates(projectId).then((data) => {
         setShootingDates(data || [])
@@ -139,8 +138,8 @@ export function AddEquipmentModal({ isOpen, onClose, projectId }: AddEquipmentMo
           >
             <option value="">Selecione um equipamento</option>
             {equipments.map((equipment) => (
-              <option key={equipment.id} value={equipment.id} className="bg-card">
-                {equipment.name} ({categoryLabels[equipment.category] || equipment.category})
+              <option key={equipment.id} value={equipment.id} disabled={equipment._pending} className="bg-card">
+                {`${equipment.name} (${categoryLabels[equipment.category] || equipment.category})${equipment._pending ? ' - aguardando conexão' : ''}`}
               </option>
             ))}
           </select>
@@ -1,9 +1,9 @@
 'use client'
 
 import { Modal } from '@/components/ui/modal'
-import { useState, useEffect } from 'react'
+import { useState } from 'react'
 import { addProjectMember } from '@/actions/projects'
-import { getFreelancers } from '@/actions/freelancers'
+import { searchReference, useReferenceData } from '@/lib/reference-store'
 import { motion } from 'framer-motion'
 import { Search, User } from 'lucide-react'
 import { useRouter } from 'next/navigation'
@@ -23,6 +23,8 @@ type Freelancer = {
   phone?: string
   skills?: string
   daily_rate?: number
+  // Criado offline, ainda sem id no servidor
+  _pending?: boolean
 }
 
 
@@ -33,7 +35,9 @@ export function AddTeamMemberModal({
 }: AddTeamMemberModalProps) {
   const router = useRouter()
   const [isLoading, setIsLoading] = useState(false)
-  const [freelancers, setFreelancers] = useState<Freelancer[]>([])
+  // Lista local (IndexedDB): abre sem esperar o servidor e busca offline
+  const { rows } = useReferenceData('freelancers', isOpen)
+  const freelancers = rows as Freelancer[]
   const [searchTerm, setSearchTerm] = useState('')
   const [formData, setFormData] = useState({
     freelancer_id: '',
@@ -42,18 +46,7 @@ export function AddTeamMemberModal({
     notes: '',
   })
 
-  useEffect(() => {
-    if (isOpen) {
-      getFreelancers().then(setFreelancers)
-    }
-  }, [isOpen])
-
-  const filteredFreelancers = freelancers.filter(
-    (f) =>
-      f.name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      f.email?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-      f.skills?.toLowerCase().includes(searchTerm.toLowerCase())
-  )
+  const filteredFreelancers = (searchTerm ? searchReference('freelancers', searchTerm) : []) as Freelancer[]
 
   const selectedFreelancer = freelancers.find((f) => f.id === formData.freelancer_id)
 
@@ -123,7 +116,8 @@ export function AddTeamMemberModal({
                         key={freelancer.id}
                         type="button"
                         onClick={() => handleFreelancerSelect(freelancer.id)}
-                        className="flex w-full items-center gap-3 border-b border-border p-3 text-left transition-all hover:bg-bg-hover last:border-0"
+                        disabled={freelancer._pending}
+                        className="flex w-full items-center gap-3 border-b border-border p-3 text-left transition-all hover:bg-bg-hover last:border-0 disabled:opacity-50"
                       >
                         <div className="flex h-10 w-10 items-center justify-center rounded-full bg-secondary text-text-primary">
                           {freelancer.name.charAt(0).toUpperCase()}
@@ -136,6 +130,9 @@ export function AddTeamMemberModal({
                           {freelancer.skills && (
                             <p className="text-xs text-text-secondary">{freelancer.skills}</p>
                           )}
+                          {freelancer._pending && (
+                            <p className="text-xs text-amber-400">Aguardando conexão</p>
+                          )}
                         </div>
                         {freelancer.daily_rate && (
                           <p className="text-sm text-text-tertiary">
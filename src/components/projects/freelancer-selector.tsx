@@ -1,9 +1,11 @@
 'use client'
 
-import { useState } from 'react'
-import { Plus, X, User, DollarSign, Calendar, Edit2, Check } from 'lucide-react'
+import { useEffect, useState } from 'react'
+import { Plus, X, User, DollarSign, Calendar, Edit2, Check, AlertTriangle } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { motion, AnimatePresence } from 'framer-motion'
+import { searchAvailableFreelancers } from '@/actions/freelancers'
+import type { AvailabilityConflict } from '@/lib/freelancer-availability'
 
 interface Freelancer {
   id: string
@@ -32,6 +34,9 @@ interface FreelancerSelectorProps {
   onPayableUpdate?: (freelancerId: string, amount: number) => void // Callback para atualizar Contas a Pagar
 }
 
+// Limite de linhas por chamada de search_available_freelancers
+const AVAILABILITY_CHUNK_SIZE = 200
+
 // Componente separado para cada item da lista (para respeitar regras de hooks)
 interface AllocationItemProps {
   allocation: FreelancerAllocation
@@ -151,6 +156,60 @@ export function FreelancerSelector({
     customRate: null,
     notes: '',
   })
+  // Conflitos de agenda na data escolhida (freelancerId -> escalações/projetos)
+  const [conflicts, setConflicts] = useState<Record<string, AvailabilityConflict[]>>({})
+  const [isCheckingAvailability, setIsCheckingAvailability] = useState(false)
+  const freelancerIdsKey = availableFreelancers.map((f) => f.id).join(',')
+
+  useEffect(() => {
+    const freelancerIds = freelancerIdsKey ? freelancerIdsKey.split(',') : []
+    if (!newAllocation.date || freelancerIds.length === 0) {
+      setConflicts({})
+      return
+    }
+
+    // Só os ocupados entre os freelancers da lista, em blocos do limite da RPC
+    const chunks: string[][] = []
+    for (let i = 0; i < freelancerIds.length; i += AVAILABILITY_CHUNK_SIZE) {
+      chunks.push(freelancerIds.slice(i, i + AVAILABILITY_CHUNK_SIZE))
+    }
+
+    let cancelled = false
+    setIsCheckingAvailability(true)
+    Promise.all(
+      chunks.map((ids) =>
+        searchAvailableFreelancers({
+          startDate: newAllocation.date,
+          freelancerIds: ids,
+          onlyBusy: true,
+          limit: ids.length,
+        })
+      )
+    )
+      .then((pages) => {
+        if (cancelled) return
+        const busy: Record<string, AvailabilityConflict[]> = {}
+        for (const result of pages.flat()) {
+          // A alocação que está sendo editada não conta como conflito consigo mesma
+          const others = result.conflicts.filter((c) => !projectId || c.project_id !== projectId)
+          if (others.length > 0) busy[result.freelancer_id] = others
+        }
+        setConflicts(busy)
+      })
+      .finally(() => {
+        if (!cancelled) setIsCheckingAvailability(false)
+      })
+
+    return () => {
+      cancelled = true
+    }
+  }, [newAllocation.date, projectId, freelancerIdsKey])
+
+  // Com data escolhida, disponíveis primeiro
+  const sortedFreelancers = newAllocation.date
+    ? [...availableFreelancers].sort((a, b) => Number(a.id in conflicts) - Number(b.id in conflicts))
+    : availableFreelancers
+  const selectedConflicts = conflicts[newAllocation.freelancerId] || []
 
   const addAllocation = () => {
     if (newAllocation.freelancerId && newAllocation.date) {
@@ -241,14 +300,29 @@ export function FreelancerSelector({
                 className="w-full rounded-lg border border-white/10 bg-white/5 px-3 py-2 text-sm text-white transition-all focus:border-amber-500/50 focus:outline-none focus:ring-2 focus:ring-amber-500/20"
               >
                 <option value="">Selecione um freelancer</option>
-                {availableFreelancers.map((freelancer) => (
+                {sortedFreelancers.map((freelancer) => (
                   <option key={freelancer.id} value={freelancer.id} className="bg-zinc-900">
                     {freelancer.name}
                     {freelancer.dailyRate && ` - R$ ${freelancer.dailyRate}/dia`}
                     {freelancer.skills && ` (${freelancer.skills.slice(0, 2).join(', ')})`}
+                    {conflicts[freelancer.id] && ' — ocupado nesta data'}
                   </option>
                 ))}
               </select>
+              {isCheckingAvailability && (
+                <p className="mt-1 text-xs text-zinc-500">Verificando agenda...</p>
+              )}
+              {selectedConflicts.length > 0 && (
+                <div className="mt-2 flex items-start gap-2 rounded-lg border border-amber-500/30 bg-amber-500/10 p-2 text-xs text-amber-300">
+                  <AlertTriangle className="mt-0.5 h-3.5 w-3.5 shrink-0" />
+                  <span>
+                    Já escalado nesta data:{' '}
+                    {selectedConflicts
+                      .map((c) => `${c.project_title || 'sem projeto'}${c.role ? ` (${c.role})` : ''}`)
+                      .join(', ')}
+                  </span>
+                </div>
+              )}
             </div>
 
             <div className="grid grid-cols-2 gap-3">
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState } from 'react'
+import { Component, Suspense, use, useEffect, useState, type ReactNode } from 'react'
 import { motion } from 'framer-motion'
 import {
   ArrowLeft,
@@ -34,6 +34,7 @@ import {
 import Link from 'next/link'
 import {
   type ProjectWithRelations,
+  type ProjectFinancials,
   PROJECT_STATUS_LABELS,
   PROJECT_STATUS_COLORS,
 } from '@/types/projects'
@@ -41,23 +42,110 @@ import { EditProjectModal } from './edit-project-modal'
 import { AddTeamMemberModal } from './add-team-member-modal'
 import { AddEquipmentModal } from './add-equipment-modal'
 import { AddExpenseModal } from '@/components/finances/add-expense-modal'
-import { updateProjectMember, removeProjectMember, toggleProjectItemStatus, deleteProjectItem, deleteProject, addProjectTask, toggleProjectTask, deleteProjectTask, updateProjectTask, initializeDefaultTasks } from '@/actions/projects'
+import { ProfitabilityPanel } from '@/components/finances/profitability-panel'
+import { updateProjectMember, removeProjectMember, toggleProjectItemStatus, deleteProjectItem, deleteProject, addProjectTask, setProjectTasksCompleted, deleteProjectTask, updateProjectTask, initializeDefaultTasks } from '@/actions/projects'
 import { deleteExpense } from '@/actions/finances'
 import { useRouter } from 'next/navigation'
 import { ManageProjectItemModal } from './manage-project-item-modal'
+import { useMutationQueue } from '@/lib/mutation-queue'
 
 interface ProjectDetailTabsProps {
   project: ProjectWithRelations
-  financialSummary?: any
-  expenses?: any[]
-  equipmentBookings?: any[]
+  // Resolvida via streaming: só as abas de equipamentos e financeiro dependem dela
+  financials: Promise<ProjectFinancials>
+}
+
+// Cálculos financeiros
+function computeProjectFinancials(
+  project: ProjectWithRelations,
+  { financialSummary, expenses, equipmentBookings }: ProjectFinancials
+) {
+  const teamCosts = project.project_members?.reduce(
+    (acc, member) => acc + (member.agreed_fee || 0),
+    0
+  ) || 0
+
+  const manualExpensesTotal = expenses?.reduce(
+    (acc, expense) => acc + (expense.actual_cost || expense.estimated_cost || 0),
+    0
+  ) || 0
+
+  const equipmentCosts = equipmentBookings?.reduce((acc, booking) => {
+    if (!booking.equipments?.daily_rate || !booking.start_date || !booking.end_date) return acc
+    const start = new Date(booking.start_date)
+    const end = new Date(booking.end_date)
+    const diffTime = Math.abs(end.getTime() - start.getTime())
+    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24)) + 1
+    return acc + (Number(booking.equipments.daily_rate) * diffDays)
+  }, 0) || 0
+
+  const totalCosts = teamCosts + manualExpensesTotal + equipmentCosts
+
+  // Calcular total do escopo (itens)
+  const scopeTotal = project.items?.reduce(
+    (acc, item) => acc + Number(item.total_price),
+    0
+  ) || 0
+
+  // Se houver itens no escopo, usamos a soma deles como valor do projeto
+  // Caso contrário, usamos o valor aprovado/budget
+  const projectValue = scopeTotal > 0
+    ? scopeTotal
+    : (financialSummary?.total_revenue || financialSummary?.approved_value || Number(project.budget) || 0)
+
+  const profitMargin = projectValue > 0 ? ((projectValue - totalCosts) / projectValue) * 100 : 0
+  const profit = projectValue - totalCosts
+
+  return { teamCosts, manualExpensesTotal, equipmentCosts, totalCosts, projectValue, profit, profitMargin }
+}
+
+// Suspende até as relações financeiras chegarem e repassa os dados ao render prop
+function WithFinancials({
+  financials,
+  children,
+}: {
+  financials: Promise<ProjectFinancials>
+  children: (data: ProjectFinancials) => ReactNode
+}) {
+  return <>{children(use(financials))}</>
+}
+
+// Falha ao carregar as relações financeiras fica restrita à aba
+class FinancialsErrorBoundary extends Component<{ children: ReactNode }, { failed: boolean }> {
+  state = { failed: false }
+
+  static getDerivedStateFromError() {
+    return { failed: true }
+  }
+
+  componentDidCatch(error: unknown) {
+    console.error('Error loading project financials:', error)
+  }
+
+  render() {
+    if (!this.state.failed) return this.props.children
+    return (
+      <div className="flex items-center gap-3 rounded-xl border border-red-500/20 bg-red-500/5 p-4">
+        <AlertCircle className="h-5 w-5 text-red-400" />
+        <p className="text-sm text-text-tertiary">Não foi possível carregar os dados financeiros do projeto.</p>
+      </div>
+    )
+  }
+}
+
+function TabSectionSkeleton() {
+  return (
+    <div className="space-y-4 rounded-xl border border-border bg-card p-6 backdrop-blur-sm">
+      <div className="h-5 w-48 animate-pulse rounded bg-secondary" />
+      <div className="h-16 animate-pulse rounded-lg bg-secondary" />
+      <div className="h-16 animate-pulse rounded-lg bg-secondary" />
+    </div>
+  )
 }
 
 export function ProjectDetailTabs({
   project,
-  financialSummary,
-  expenses = [],
-  equipmentBookings = [],
+  financials,
 }: ProjectDetailTabsProps) {
   const router = useRouter()
   const [activeTab, setActiveTab] = useState<
@@ -200,13 +288,69 @@ export function ProjectDetailTabs({
     }
   }
 
-  const handleToggleTask = async (taskId: string, completed: boolean) => {
-    try {
-      await toggleProjectTask(taskId, project.id, completed)
-      router.refresh()
-    } catch (error) {
+  // Marcações de tarefas: otimistas, agrupadas em lote e sem router.refresh a cada clique
+  // taskOverrides: valores ainda não confirmados; confirmedTasks: já gravados,
+  // mas ainda não refletidos em project.tasks
+  const [taskOverrides, setTaskOverrides] = useState<Record<string, boolean>>({})
+  const [confirmedTasks, setConfirmedTasks] = useState<Record<string, boolean>>({})
+  const tasks: any[] = (project.tasks || []).map((task: any) =>
+    task.id in taskOverrides
+      ? { ...task, completed: taskOverrides[task.id] }
+      : task.id in confirmedTasks
+        ? { ...task, completed: confirmedTasks[task.id] }
+        : task
+  )
+
+  // Dados novos do servidor substituem o estado local
+  useEffect(() => {
+    setTaskOverrides({})
+    setConfirmedTasks({})
+  }, [project.tasks])
+
+  // Passa as chaves resolvidas de taskOverrides para confirmedTasks; o override
+  // só sai se ainda for o valor resolvido (um clique mais novo continua valendo)
+  const settleTasks = (changes: { key: string; value: boolean }[]) => {
+    setConfirmedTasks((current) => {
+      const next = { ...current }
+      for (const { key, value } of changes) next[key] = value
+      return next
+    })
+    setTaskOverrides((current) => {
+      const next = { ...current }
+      for (const { key, value } of changes) if (next[key] === value) delete next[key]
+      return next
+    })
+  }
+
+  const { queue: taskQueue } = useMutationQueue<boolean>({
+    commit: async (changes) => {
+      const confirmedKeys = await setProjectTasksCompleted(
+        project.id,
+        changes.map(({ key, value }) => ({ taskId: key, completed: value }))
+      )
+      const confirmed = new Set(confirmedKeys)
+      settleTasks(changes.filter(({ key }) => confirmed.has(key)))
+      return confirmedKeys
+    },
+    onRollback: (changes) => {
+      // Volta ao último valor confirmado de cada chave
+      setConfirmedTasks((current) => {
+        const next = { ...current }
+        for (const { key, value } of changes) next[key] = value
+        return next
+      })
+      setTaskOverrides((current) => {
+        const next = { ...current }
+        for (const { key } of changes) delete next[key]
+        return next
+      })
       alert('Erro ao atualizar tarefa')
-    }
+    },
+  })
+
+  const handleToggleTask = (taskId: string, completed: boolean) => {
+    setTaskOverrides((current) => ({ ...current, [taskId]: completed }))
+    taskQueue.enqueue(taskId, completed, !completed)
   }
 
   const handleDeleteTask = async (taskId: string) => {
@@ -249,42 +393,6 @@ export function ProjectDetailTabs({
     setEditingTaskTitle('')
   }
 
-  // Cálculos financeiros
-  const teamCosts = project.project_members?.reduce(
-    (acc, member) => acc + (member.agreed_fee || 0),
-    0
-  ) || 0
-
-  const manualExpensesTotal = expenses?.reduce(
-    (acc, expense) => acc + (expense.actual_cost || expense.estimated_cost || 0),
-    0
-  ) || 0
-
-  const equipmentCosts = equipmentBookings?.reduce((acc, booking) => {
-    if (!booking.equipments?.daily_rate || !booking.start_date || !booking.end_date) return acc
-    const start = new Date(booking.start_date)
-    const end = new Date(booking.end_date)
-    const diffTime = Math.abs(end.getTime() - start.getTime())
-    const diffDays = Math.ceil(diffTime / (1000 * 60 * 60 * 24)) + 1
-    return acc + (Number(booking.equipments.daily_rate) * diffDays)
-  }, 0) || 0
-
-  const totalCosts = teamCosts + manualExpensesTotal + equipmentCosts
-
-  // Calcular total do escopo (itens)
-  const scopeTotal = project.items?.reduce(
-    (acc, item) => acc + Number(item.total_price),
-    0
-  ) || 0
-
-  // Se houver itens no escopo, usamos a soma deles como valor do projeto
-  // Caso contrário, usamos o valor aprovado/budget
-  const projectValue = scopeTotal > 0
-    ? scopeTotal
-    : (financialSummary?.total_revenue || financialSummary?.approved_value || Number(project.budget) || 0)
-
-  const profitMargin = projectValue > 0 ? ((projectValue - totalCosts) / projectValue) * 100 : 0
-  const profit = projectValue - totalCosts
 
   return (
     <div className="space-y-6">
@@ -681,9 +789,9 @@ export function ProjectDetailTabs({
 
               {/* Task List */}
               <div className="space-y-2">
-                {project.tasks && project.tasks.length > 0 ? (
+                {tasks.length > 0 ? (
                   <>
-                    {project.tasks.map((task: any) => (
+                    {tasks.map((task: any) => (
                       <div
                         key={task.id}
                         className={`group flex items-center gap-3 rounded-lg border p-3 transition-all ${task.completed
@@ -762,14 +870,14 @@ export function ProjectDetailTabs({
                       <div className="flex items-center justify-between mb-2">
                         <span className="text-xs text-text-secondary">Progresso</span>
                         <span className="text-xs font-medium text-text-primary">
-                          {project.tasks.filter((t: any) => t.completed).length} / {project.tasks.length}
+                          {tasks.filter((t: any) => t.completed).length} / {tasks.length}
                         </span>
                       </div>
                       <div className="h-2 rounded-full bg-secondary overflow-hidden">
                         <div
                           className="h-full bg-gradient-to-r from-green-500 to-emerald-400 transition-all duration-500"
                           style={{
-                            width: `${(project.tasks.filter((t: any) => t.completed).length / project.tasks.length) * 100}%`,
+                            width: `${(tasks.filter((t: any) => t.completed).length / tasks.length) * 100}%`,
                           }}
                         />
                       </div>
@@ -1030,6 +1138,10 @@ export function ProjectDetailTabs({
 
         {
           activeTab === 'equipment' && (
+            <FinancialsErrorBoundary>
+            <Suspense fallback={<TabSectionSkeleton />}>
+            <WithFinancials financials={financials}>
+            {({ equipmentBookings }) => (
             <div className="rounded-xl border border-border bg-card backdrop-blur-sm">
               <div className="border-b border-border p-6">
                 <div className="flex items-center justify-between">
@@ -1104,11 +1216,31 @@ export function ProjectDetailTabs({
                 )}
               </div>
             </div>
+            )}
+            </WithFinancials>
+            </Suspense>
+            </FinancialsErrorBoundary>
           )
         }
 
         {
           activeTab === 'financial' && (
+            <FinancialsErrorBoundary>
+            <Suspense fallback={<TabSectionSkeleton />}>
+            <WithFinancials financials={financials}>
+            {(data) => {
+            const { expenses, financialSummary, profitability } = data
+            const {
+              teamCosts,
+              manualExpensesTotal,
+              equipmentCosts,
+              totalCosts,
+              projectValue,
+              profit,
+              profitMargin,
+            } = computeProjectFinancials(project, data)
+
+            return (
             <div className="space-y-6">
               {/* Summary Cards */}
               <div className="grid gap-4 md:grid-cols-4">
@@ -1185,6 +1317,17 @@ export function ProjectDetailTabs({
                 </div>
               )}
 
+              {/* Rentabilidade consolidada: receitas, despesas e contratado do cubo */}
+              <div className="rounded-xl border border-border bg-card p-6 backdrop-blur-sm">
+                <h3 className="mb-4 text-lg font-semibold text-text-primary">
+                  Rentabilidade por Lançamentos
+                </h3>
+                <ProfitabilityPanel
+                  profitability={profitability}
+                  targetMarginPercent={Number(financialSummary?.target_margin_percent) || undefined}
+                />
+              </div>
+
               {/* Custos da Equipe */}
               <div className="rounded-xl border border-border bg-card backdrop-blur-sm">
                 <div className="border-b border-border p-6">
@@ -1441,6 +1584,11 @@ export function ProjectDetailTabs({
                 </div>
               </div>
             </div>
+            )
+            }}
+            </WithFinancials>
+            </Suspense>
+            </FinancialsErrorBoundary>
           )
         }
       </motion.div >
@@ -3,7 +3,8 @@
 import { motion } from 'framer-motion'
 import { Plus, Clock, Calendar, AlertCircle, Eye, GripVertical } from 'lucide-react'
 import { useState, useMemo, useEffect } from 'react'
-import { updateProjectStatus } from '@/actions/projects'
+import { updateProjectStatuses } from '@/actions/projects'
+import { useMutationQueue } from '@/lib/mutation-queue'
 import { ProjectFormModal } from './project-form-modal'
 import Link from 'next/link'
 import type {
@@ -71,22 +72,29 @@ export function ProjectsKanban({ initialProjects }: ProjectsKanbanProps) {
     return projects.filter((p) => p.status === status)
   }
 
-  const handleStatusChange = async (projectId: string, newStatus: ProjectStatus) => {
-    setProjects(projects.map((p) => (p.id === projectId ? { ...p, status: newStatus } : p)))
-
-    try {
-      await updateProjectStatus(projectId, newStatus)
-    } catch (error) {
-      setProjects(initialProjects)
+  // Movimentos do kanban: otimistas, agrupados em lote e desfeitos card a card em caso de erro
+  const { queue: statusQueue, isSaving } = useMutationQueue<ProjectStatus>({
+    commit: (changes) =>
+      updateProjectStatuses(changes.map(({ key, value }) => ({ projectId: key, status: value }))),
+    onRollback: (changes) => {
+      const restore = new Map(changes.map(({ key, value }) => [key, value]))
+      setProjects((current) =>
+        current.map((p) => (restore.has(p.id) ? { ...p, status: restore.get(p.id)! } : p))
+      )
       alert('Erro ao atualizar projeto')
-    }
+    },
+  })
+
+  const handleStatusChange = (projectId: string, previousStatus: ProjectStatus, newStatus: ProjectStatus) => {
+    setProjects((current) => current.map((p) => (p.id === projectId ? { ...p, status: newStatus } : p)))
+    statusQueue.enqueue(projectId, newStatus, previousStatus)
   }
 
   const handleDragStart = (event: DragStartEvent) => {
     setActiveId(event.active.id as string)
   }
 
-  const handleDragEnd = async (event: DragEndEvent) => {
+  const handleDragEnd = (event: DragEndEvent) => {
     const { active, over } = event
     setActiveId(null)
 
@@ -100,7 +108,7 @@ export function ProjectsKanban({ initialProjects }: ProjectsKanbanProps) {
 
     if (project && project.status !== newStatus) {
       // Se soltou em uma coluna diferente, atualiza
-      await handleStatusChange(projectId, newStatus)
+      handleStatusChange(projectId, project.status, newStatus)
     }
   }
 
@@ -132,6 +140,7 @@ export function ProjectsKanban({ initialProjects }: ProjectsKanbanProps) {
             className="mt-2 text-text-tertiary"
           >
             Pipeline de produção audiovisual
+            {isSaving && <span className="ml-2 text-xs">· Salvando...</span>}
           </motion.p>
         </div>
 
@@ -259,8 +259,10 @@ export function ProposalEditor({ proposal: initialProposal }: ProposalEditorProp
         status: 'ACCEPTED',
       })
 
-      let message = 'Proposta aceita com sucesso!'
-      if (result.projectId) {
+      let message = result.alreadyAccepted
+        ? 'Esta proposta já havia sido aceita.'
+        : 'Proposta aceita com sucesso!'
+      if (result.projectId && !result.alreadyAccepted) {
         message += `\n\nProjeto criado.`
       }
       if (result.calendarEventsCreated > 0) {
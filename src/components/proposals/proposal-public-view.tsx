@@ -5,6 +5,7 @@ import { motion } from 'framer-motion'
 import { CheckCircle, Check, ChevronRight, Download, Mail, Phone, Globe } from 'lucide-react'
 import { formatCurrency } from '@/lib/utils'
 import { toggleProposalOptional, acceptProposalPublic } from '@/actions/proposals'
+import { getResponsiveImageProps } from '@/lib/images/variants'
 
 type ProposalPublicData = {
   id: string
@@ -120,7 +121,8 @@ export function ProposalPublicView({ proposal: initialProposal }: ProposalPublic
   }
 
   const handleDownloadPDF = () => {
-    window.print()
+    // PDF gerado no servidor (cacheado por conteúdo)
+    window.location.href = `/api/proposals/pdf?token=${encodeURIComponent(proposal.token)}&download=1`
   }
 
   // Extract video ID from URLs
@@ -205,7 +207,7 @@ export function ProposalPublicView({ proposal: initialProposal }: ProposalPublic
         {proposal.cover_image && (
           <div className="h-64 w-full md:h-80 relative overflow-hidden">
             <img
-              src={proposal.cover_image}
+              {...getResponsiveImageProps(proposal.cover_image, 'full', '100vw')}
               alt="Capa da Proposta"
               className="w-full h-full object-cover"
             />
@@ -220,7 +222,7 @@ export function ProposalPublicView({ proposal: initialProposal }: ProposalPublic
               <div className="flex items-center gap-3">
                 {proposal.organizations?.logo ? (
                   <img
-                    src={proposal.organizations.logo}
+                    {...getResponsiveImageProps(proposal.organizations.logo, 'thumb', '160px')}
                     alt={proposal.organizations.name}
                     className="h-10 w-auto rounded-md bg-white/10 p-1 backdrop-blur-sm"
                   />
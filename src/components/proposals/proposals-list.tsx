@@ -1,7 +1,7 @@
 'use client'
 
 import { motion } from 'framer-motion'
-import { Plus, FileText, Eye, CheckCircle, XCircle, Clock, Edit, Trash2, CheckCircle2, Grid, List } from 'lucide-react'
+import { Plus, FileText, Eye, CheckCircle, XCircle, Clock, Edit, Trash2, CheckCircle2, Grid, List, Download } from 'lucide-react'
 import { useState, useEffect, useCallback } from 'react'
 import { formatCurrency } from '@/lib/utils'
 import { useRouter } from 'next/navigation'
@@ -32,6 +32,9 @@ const statusMap: Record<string, { label: string; icon: any; color: string }> = {
   EXPIRED: { label: 'Expirada', icon: Clock, color: 'text-warning' },
 }
 
+// Limite do POST /api/proposals/pdf
+const EXPORT_LIMIT = 100
+
 interface ProposalsListProps {
   initialProposals: Proposal[]
 }
@@ -41,6 +44,7 @@ export function ProposalsList({ initialProposals }: ProposalsListProps) {
   const [isModalOpen, setIsModalOpen] = useState(false)
   const [proposals, setProposals] = useState(initialProposals)
   const [viewMode, setViewMode] = useState<'grid' | 'client'>('grid')
+  const [isExporting, setIsExporting] = useState(false)
 
   // Sincronizar com dados do servidor quando mudam
   useEffect(() => {
@@ -118,6 +122,45 @@ export function ProposalsList({ initialProposals }: ProposalsListProps) {
     }
   }
 
+  // Exportação em lote: PDFs gerados no servidor, baixados em um .zip
+  const handleExportPdfs = async () => {
+    const ids = proposals.slice(0, EXPORT_LIMIT).map((proposal) => proposal.id)
+    if (ids.length === 0) return
+    if (proposals.length > EXPORT_LIMIT) {
+      alert(`Serão exportadas as ${EXPORT_LIMIT} propostas mais recentes.`)
+    }
+
+    setIsExporting(true)
+    try {
+      const response = await fetch('/api/proposals/pdf', {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ ids }),
+      })
+
+      if (!response.ok) {
+        const data = await response.json().catch(() => null)
+        throw new Error(data?.error || 'Erro ao exportar PDFs')
+      }
+
+      const url = URL.createObjectURL(await response.blob())
+      const link = document.createElement('a')
+      link.href = url
+      link.download = response.headers.get('Content-Disposition')?.match(/filename="(.+)"/)?.[1] || 'propostas.zip'
+      link.click()
+      URL.revokeObjectURL(url)
+
+      const failed = Number(response.headers.get('X-PDF-Failed') || 0)
+      if (failed > 0) {
+        alert(`${failed} proposta(s) não puderam ser geradas. Veja erros.txt no arquivo.`)
+      }
+    } catch (error: any) {
+      alert(error?.message || 'Erro ao exportar PDFs')
+    } finally {
+      setIsExporting(false)
+    }
+  }
+
   const groupedProposals = proposals.reduce((acc, proposal) => {
     const clientName = proposal.clients?.name || 'Sem Cliente'
     if (!acc[clientName]) {
@@ -269,6 +312,16 @@ export function ProposalsList({ initialProposals }: ProposalsListProps) {
             </button>
           </div>
 
+          <button
+            onClick={handleExportPdfs}
+            disabled={isExporting || proposals.length === 0}
+            className="flex items-center gap-2 rounded-xl border border-[rgb(var(--border))] bg-secondary px-4 py-3 text-sm font-medium text-text-primary transition-all hover:bg-bg-hover disabled:opacity-50"
+            title="Exportar PDFs das propostas (.zip)"
+          >
+            <Download className="h-4 w-4" />
+            {isExporting ? 'Gerando PDFs...' : 'Exportar PDFs'}
+          </button>
+
           <motion.button
             initial={{ opacity: 0, scale: 0.9 }}
             animate={{ opacity: 1, scale: 1 }}
@@ -3,9 +3,9 @@
 import { Modal } from '@/components/ui/modal'
 import { useState, useEffect } from 'react'
 import { addProposal } from '@/actions/proposals'
-import { getClients, addClient } from '@/actions/clients'
+import { saveReferenceRecord, searchReference, useReferenceData } from '@/lib/reference-store'
 import { motion } from 'framer-motion'
-import { Plus, X, ArrowRight, User } from 'lucide-react'
+import { Plus, X, ArrowRight, User, Search } from 'lucide-react'
 import { useRouter } from 'next/navigation'
 
 interface SelectClientModalProps {
@@ -13,16 +13,12 @@ interface SelectClientModalProps {
   onClose: () => void
 }
 
-type Client = {
-  id: string
-  name: string
-  company?: string | null
-}
-
 export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
   const router = useRouter()
   const [isLoading, setIsLoading] = useState(false)
-  const [clients, setClients] = useState<Client[]>([])
+  // Lista local (IndexedDB): abre sem esperar o servidor e busca offline
+  const { rows, ready } = useReferenceData('clients', isOpen)
+  const [search, setSearch] = useState('')
   const [showNewClientForm, setShowNewClientForm] = useState(false)
   const [selectedClientId, setSelectedClientId] = useState('')
   const [newClientData, setNewClientData] = useState({
@@ -36,19 +32,18 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
     if (isOpen) {
       setSelectedClientId('')
       setNewClientData({ name: '', email: '', phone: '', company: '' })
-      loadClients()
+      setSearch('')
+      setShowNewClientForm(false)
     }
   }, [isOpen])
 
-  const loadClients = async () => {
-    const data = await getClients()
-    setClients(data)
-    if (data.length === 0) {
+  useEffect(() => {
+    if (isOpen && ready && rows.length === 0) {
       setShowNewClientForm(true)
-    } else {
-      setShowNewClientForm(false)
     }
-  }
+  }, [isOpen, ready, rows.length])
+
+  const clients = search ? searchReference('clients', search) : rows
 
   const handleCreateClient = async () => {
     if (!newClientData.name || !newClientData.email) {
@@ -58,15 +53,21 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
 
     setIsLoading(true)
     try {
-      const newClient = await addClient({
-        name: newClientData.name,
-        email: newClientData.email,
-        phone: newClientData.phone || undefined,
-        company: newClientData.company || undefined,
+      const newClient = await saveReferenceRecord('clients', {
+        type: 'create',
+        data: {
+          name: newClientData.name,
+          email: newClientData.email,
+          phone: newClientData.phone || undefined,
+          company: newClientData.company || undefined,
+        },
       })
 
-      setClients([newClient, ...clients])
-      setSelectedClientId(newClient.id)
+      if (newClient?._pending) {
+        alert('Sem conexão: o cliente foi salvo e será enviado quando a conexão voltar.')
+      } else if (newClient) {
+        setSelectedClientId(newClient.id)
+      }
       setNewClientData({ name: '', email: '', phone: '', company: '' })
       setShowNewClientForm(false)
     } catch (error) {
@@ -101,7 +102,7 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
     }
   }
 
-  const selectedClient = clients.find(c => c.id === selectedClientId)
+  const selectedClient = rows.find(c => c.id === selectedClientId)
 
   return (
     <Modal isOpen={isOpen} onClose={onClose} title="Nova Proposta">
@@ -116,7 +117,7 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
             <label className="text-sm font-medium text-zinc-300">
               Cliente
             </label>
-            {clients.length > 0 && (
+            {rows.length > 0 && (
               <button
                 type="button"
                 onClick={() => setShowNewClientForm(!showNewClientForm)}
@@ -209,6 +210,18 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
             </div>
           ) : !selectedClientId ? (
             <div className="space-y-2">
+              {rows.length > 5 && (
+                <div className="relative">
+                  <Search className="absolute left-3 top-1/2 h-4 w-4 -translate-y-1/2 text-zinc-500" />
+                  <input
+                    type="text"
+                    value={search}
+                    onChange={(e) => setSearch(e.target.value)}
+                    placeholder="Buscar cliente..."
+                    className="w-full rounded-lg border border-white/10 bg-white/5 py-2 pl-9 pr-3 text-sm text-white placeholder-zinc-500"
+                  />
+                </div>
+              )}
               {clients.length > 0 ? (
                 <div className="max-h-60 overflow-y-auto space-y-2">
                   {clients.map((client) => (
@@ -216,7 +229,8 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
                       key={client.id}
                       type="button"
                       onClick={() => setSelectedClientId(client.id)}
-                      className="w-full flex items-center gap-3 p-3 rounded-lg border border-white/10 bg-white/5 hover:bg-white/10 transition-colors text-left"
+                      disabled={client._pending}
+                      className="w-full flex items-center gap-3 p-3 rounded-lg border border-white/10 bg-white/5 hover:bg-white/10 transition-colors text-left disabled:opacity-50"
                     >
                       <div className="w-10 h-10 rounded-full bg-white/10 flex items-center justify-center">
                         <User className="h-5 w-5 text-zinc-400" />
@@ -226,13 +240,16 @@ export function SelectClientModal({ isOpen, onClose }: SelectClientModalProps) {
                         {client.company && (
                           <p className="text-sm text-zinc-400">{client.company}</p>
                         )}
+                        {client._pending && (
+                          <p className="text-xs text-amber-400">Aguardando conexão</p>
+                        )}
                       </div>
                     </button>
                   ))}
                 </div>
               ) : (
                 <p className="text-sm text-zinc-500 text-center py-4">
-                  Nenhum cliente cadastrado.
+                  {!ready ? 'Carregando...' : search ? 'Nenhum cliente encontrado.' : 'Nenhum cliente cadastrado.'}
                 </p>
               )}
             </div>
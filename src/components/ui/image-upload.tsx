@@ -6,6 +6,9 @@ import { Upload, X, Loader2, Image as ImageIcon } from 'lucide-react'
 import { Button } from '@/components/ui/button'
 import { cn } from '@/lib/utils'
 import Image from 'next/image'
+import { compressImage } from '@/lib/images/compress'
+import { uploadToStorage } from '@/lib/images/upload'
+import { getResponsiveImageProps } from '@/lib/images/variants'
 
 interface ImageUploadProps {
     value?: string | null
@@ -27,6 +30,7 @@ export function ImageUpload({
     label = 'Upload de Imagem'
 }: ImageUploadProps) {
     const [isUploading, setIsUploading] = useState(false)
+    const [progress, setProgress] = useState(0)
     const fileInputRef = useRef<HTMLInputElement>(null)
     const supabase = createClient()
 
@@ -35,22 +39,58 @@ export function ImageUpload({
         if (!file) return
 
         setIsUploading(true)
+        setProgress(0)
         try {
-            const fileExt = file.name.split('.').pop()
-            const fileName = `${path}/${Date.now()}-${Math.random().toString(36).substring(2)}.${fileExt}`
+            const uploadId = `${Date.now()}-${Math.random().toString(36).substring(2)}`
+            const fingerprint = `${bucket}:${path}:${file.name}:${file.size}:${file.lastModified}`
 
-            const { data, error } = await supabase.storage
-                .from(bucket)
-                .upload(fileName, file)
+            // 1. Comprimir e gerar variantes (thumb/medium/full) no Web Worker
+            const variants = await compressImage(file)
+
+            let objectPath: string
+
+            if (variants) {
+                // 2a. Enviar variantes em paralelo: uploads/<id>/<variant>.webp (ou .jpg)
+                const totalBytes = variants.reduce((sum, v) => sum + v.blob.size, 0)
+                const uploaded = new Map<string, number>()
 
-            if (error) {
-                throw new Error(error.message)
+                const paths = await Promise.all(
+                    variants.map((variant) =>
+                        uploadToStorage({
+                            supabase,
+                            bucket,
+                            objectPath: `${path}/${uploadId}/${variant.variant}.${variant.extension}`,
+                            blob: variant.blob,
+                            contentType: variant.blob.type,
+                            onProgress: (bytes) => {
+                                uploaded.set(variant.variant, bytes)
+                                const sent = Array.from(uploaded.values()).reduce((sum, b) => sum + b, 0)
+                                setProgress(Math.round((sent / totalBytes) * 100))
+                            },
+                        })
+                    )
+                )
+
+                objectPath = paths[variants.findIndex((v) => v.variant === 'full')]
+            } else {
+                // 2b. Sem compressão (SVG/GIF ou navegador sem suporte): original,
+                // em chunks resumíveis se for grande
+                const fileExt = file.name.split('.').pop()
+                objectPath = await uploadToStorage({
+                    supabase,
+                    bucket,
+                    objectPath: `${path}/${uploadId}.${fileExt}`,
+                    blob: file,
+                    contentType: file.type,
+                    fingerprint,
+                    onProgress: (bytes, total) => setProgress(Math.round((bytes / total) * 100)),
+                })
             }
 
             // Get public URL
             const { data: { publicUrl } } = supabase.storage
                 .from(bucket)
-                .getPublicUrl(fileName)
+                .getPublicUrl(objectPath)
 
             onChange(publicUrl)
         } catch (error) {
@@ -58,6 +98,7 @@ export function ImageUpload({
             alert('Erro ao fazer upload da imagem. Verifique se o bucket existe.')
         } finally {
             setIsUploading(false)
+            if (fileInputRef.current) fileInputRef.current.value = ''
         }
     }
 
@@ -67,7 +108,7 @@ export function ImageUpload({
                 <div className="relative aspect-video w-40 overflow-hidden rounded-lg border bg-muted">
                     {/* eslint-disable-next-line @next/next/no-img-element */}
                     <img
-                        src={value}
+                        {...getResponsiveImageProps(value, 'thumb', '160px')}
                         alt="Upload"
                         className="h-full w-full object-cover"
                     />
@@ -85,7 +126,12 @@ export function ImageUpload({
                     className="flex aspect-video w-40 cursor-pointer flex-col items-center justify-center gap-2 rounded-lg border-2 border-dashed border-muted-foreground/25 hover:bg-muted/50 transition-colors"
                 >
                     {isUploading ? (
-                        <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
+                        <>
+                            <Loader2 className="h-6 w-6 animate-spin text-muted-foreground" />
+                            {progress > 0 && (
+                                <span className="text-xs text-muted-foreground">{progress}%</span>
+                            )}
+                        </>
                     ) : (
                         <>
                             <ImageIcon className="h-6 w-6 text-muted-foreground" />
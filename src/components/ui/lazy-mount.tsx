@@ -0,0 +1,50 @@
+'use client'
+
+import { useEffect, useRef, useState, type ReactNode } from 'react'
+
+interface LazyMountProps {
+  children: ReactNode
+  // Placeholder com a altura do conteúdo final (evita layout shift)
+  fallback: ReactNode
+  // Antecedência em relação à área visível
+  rootMargin?: string
+  className?: string
+}
+
+/**
+ * Só monta `children` quando o bloco se aproxima da área visível. Com um
+ * componente de next/dynamic dentro, o chunk só é baixado nesse momento.
+ */
+export function LazyMount({ children, fallback, rootMargin = '200px', className }: LazyMountProps) {
+  const ref = useRef<HTMLDivElement>(null)
+  const [visible, setVisible] = useState(false)
+
+  useEffect(() => {
+    const node = ref.current
+    if (!node || visible) return
+
+    if (typeof IntersectionObserver === 'undefined') {
+      setVisible(true)
+      return
+    }
+
+    const observer = new IntersectionObserver(
+      (entries) => {
+        if (entries.some((entry) => entry.isIntersecting)) {
+          setVisible(true)
+          observer.disconnect()
+        }
+      },
+      { rootMargin }
+    )
+
+    observer.observe(node)
+    return () => observer.disconnect()
+  }, [visible, rootMargin])
+
+  return (
+    <div ref={ref} className={className}>
+      {visible ? children : fallback}
+    </div>
+  )
+}
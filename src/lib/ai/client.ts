@@ -0,0 +1,21 @@
+import OpenAI from 'openai';
+
+// Cliente OpenAI compartilhado entre /api/chat e as tools (embeddings).
+// OPENAI_BASE_URL permite apontar para um servidor fake local em testes;
+// setOpenAIClient permite injetar um cliente diretamente.
+
+let client: OpenAI | null = null;
+
+export const getOpenAIClient = (): OpenAI => {
+    if (!client) {
+        client = new OpenAI({
+            apiKey: process.env.OPENAI_API_KEY,
+            baseURL: process.env.OPENAI_BASE_URL || undefined,
+        });
+    }
+    return client;
+};
+
+export const setOpenAIClient = (override: OpenAI | null) => {
+    client = override;
+};
@@ -0,0 +1,199 @@
+// Gerenciador de janela de contexto do assistente.
+// - Estima tokens (heurística ~4 caracteres/token, sem dependência de tokenizer)
+// - Mantém as mensagens mais recentes dentro de um orçamento e resume as antigas
+// - Compacta resultados de tools (campos projetados + limite de linhas)
+// - Registra métricas por requisição (tokens de prompt/resposta e latência)
+
+const CHARS_PER_TOKEN = 4;
+const MESSAGE_OVERHEAD_TOKENS = 4;
+
+export const DEFAULT_CONTEXT_BUDGET = Number(process.env.AI_CONTEXT_TOKEN_BUDGET) || 12_000;
+const SUMMARY_MAX_TOKENS = 600;
+const MIN_RECENT_MESSAGES = 2;
+
+const TOOL_RESULT_MAX_ROWS = 20;
+const TOOL_RESULT_MAX_STRING = 300;
+
+// Campos relevantes por tool (linhas de arrays são projetadas nestes campos)
+const TOOL_RESULT_FIELDS: Record<string, string[]> = {
+    search_projects: ['id', 'title', 'status', 'deadline', 'budget', 'clients'],
+    get_financial_summary: ['period', 'summary', 'total_income', 'total_expenses', 'net_balance', 'transactions', 'type', 'amount', 'category', 'description', 'date', 'status'],
+    list_freelancers: ['id', 'name', 'role', 'daily_rate', 'status', 'tags', 'available', 'conflicts'],
+    check_equipment_availability: ['name', 'status'],
+    list_proposals: ['id', 'title', 'total_value', 'status', 'created_at', 'clients'],
+    get_client_info: ['id', 'name', 'email', 'phone', 'company', 'notes'],
+};
+
+export type ChatMessage = {
+    role: string;
+    content?: string | null;
+    [key: string]: unknown;
+};
+
+export const estimateTokens = (text: string | null | undefined) =>
+    text ? Math.ceil(text.length / CHARS_PER_TOKEN) : 0;
+
+export const estimateMessageTokens = (message: ChatMessage) => {
+    let tokens = MESSAGE_OVERHEAD_TOKENS + estimateTokens(message.content ?? '');
+    if (message.tool_calls) tokens += estimateTokens(JSON.stringify(message.tool_calls));
+    if (message.function_call) tokens += estimateTokens(JSON.stringify(message.function_call));
+    return tokens;
+};
+
+export const estimateMessagesTokens = (messages: ChatMessage[]) =>
+    messages.reduce((sum, message) => sum + estimateMessageTokens(message), 0);
+
+const truncate = (text: string, maxChars: number) =>
+    text.length > maxChars ? `${text.slice(0, maxChars)}…` : text;
+
+/**
+ * Resumo extrativo das mensagens descartadas (sem chamada extra ao modelo).
+ */
+const summarizeMessages = (messages: ChatMessage[]) => {
+    const maxChars = SUMMARY_MAX_TOKENS * CHARS_PER_TOKEN;
+    const perMessage = Math.max(80, Math.floor(maxChars / Math.max(messages.length, 1)));
+
+    const lines = messages
+        .filter((m) => (m.role === 'user' || m.role === 'assistant') && m.content)
+        .map((m) => `- ${m.role === 'user' ? 'Usuário' : 'Assistente'}: ${truncate(String(m.content).replace(/\s+/g, ' '), perMessage)}`);
+
+    return truncate(lines.join('\n'), maxChars);
+};
+
+/**
+ * Ajusta o histórico ao orçamento de tokens.
+ * Mantém as mensagens mais recentes; as anteriores viram um único resumo.
+ */
+export const buildContextWindow = (
+    messages: ChatMessage[],
+    budget = DEFAULT_CONTEXT_BUDGET
+) => {
+    const kept: ChatMessage[] = [];
+    let used = 0;
+
+    for (let i = messages.length - 1; i >= 0; i--) {
+        const tokens = estimateMessageTokens(messages[i]);
+        if (used + tokens > budget && kept.length >= MIN_RECENT_MESSAGES) break;
+        kept.unshift(messages[i]);
+        used += tokens;
+    }
+
+    // Mensagens de tool precisam da mensagem do assistente que as originou (tool_calls):
+    // traz de volta as anteriores até ela, mesmo passando do orçamento; sem origem, descarta
+    while (kept.length > 0 && (kept[0].role === 'tool' || kept[0].role === 'function')) {
+        const previous = messages.length - kept.length - 1;
+        if (previous >= 0) {
+            kept.unshift(messages[previous]);
+            used += estimateMessageTokens(messages[previous]);
+        } else {
+            used -= estimateMessageTokens(kept.shift()!);
+        }
+    }
+
+    const dropped = messages.slice(0, messages.length - kept.length);
+    if (dropped.length === 0) {
+        return { messages: kept, droppedCount: 0, tokens: used };
+    }
+
+    const summary: ChatMessage = {
+        role: 'system',
+        content: `RESUMO DA CONVERSA ANTERIOR (${dropped.length} mensagens):\n${summarizeMessages(dropped)}`,
+    };
+
+    return {
+        messages: [summary, ...kept],
+        droppedCount: dropped.length,
+        tokens: used + estimateMessageTokens(summary),
+    };
+};
+
+// container: objeto/array do envelope do resultado; row: linha de um array do envelope
+// (projetada nos campos da tool); nested: dentro de uma linha (relações como clients { name })
+type CompactLevel = 'container' | 'row' | 'nested';
+
+const compactValue = (
+    value: unknown,
+    fields: string[] | undefined,
+    depth = 0,
+    level: CompactLevel = 'container'
+): unknown => {
+    if (typeof value === 'string') return truncate(value, TOOL_RESULT_MAX_STRING);
+    if (value === null || typeof value !== 'object') return value;
+    if (depth > 3) return '[...]';
+
+    if (Array.isArray(value)) {
+        const rowLevel = level === 'container' ? 'row' : 'nested';
+        const rows = value.slice(0, TOOL_RESULT_MAX_ROWS).map((row) => compactValue(row, fields, depth + 1, rowLevel));
+        if (value.length > TOOL_RESULT_MAX_ROWS) {
+            rows.push(`(+${value.length - TOOL_RESULT_MAX_ROWS} resultados omitidos)`);
+        }
+        return rows;
+    }
+
+    const result: Record<string, unknown> = {};
+    for (const [key, child] of Object.entries(value as Record<string, unknown>)) {
+        if (fields && level === 'row' && !fields.includes(key)) continue;
+        if (child === null || child === undefined) continue;
+        result[key] = compactValue(child, fields, depth + 1, level === 'container' ? 'container' : 'nested');
+    }
+    return result;
+};
+
+/**
+ * Compacta o resultado de uma tool antes de enviá-lo ao modelo.
+ * Resultados em texto simples (mensagens) passam direto.
+ */
+export const compactToolResult = (toolName: string, result: string) => {
+    let parsed: unknown;
+    try {
+        parsed = JSON.parse(result);
+    } catch {
+        return truncate(result, TOOL_RESULT_MAX_STRING * 10);
+    }
+    return JSON.stringify(compactValue(parsed, TOOL_RESULT_FIELDS[toolName]));
+};
+
+// ============================================
+// MÉTRICAS
+// ============================================
+
+export type ChatRequestMetrics = {
+    organizationId: string;
+    promptTokens: number;
+    completionTokens: number;
+    toolCalls: number;
+    droppedMessages: number;
+    latencyMs: number;
+    timeToFirstTokenMs: number | null;
+    at: string;
+};
+
+const MAX_METRICS = 200;
+const metrics: ChatRequestMetrics[] = [];
+
+export const recordChatMetrics = (entry: ChatRequestMetrics) => {
+    metrics.push(entry);
+    if (metrics.length > MAX_METRICS) metrics.shift();
+    console.info('[ai-chat]', JSON.stringify(entry));
+};
+
+const percentile = (values: number[], p: number) => {
+    if (values.length === 0) return 0;
+    const sorted = [...values].sort((a, b) => a - b);
+    return sorted[Math.min(sorted.length - 1, Math.floor((p / 100) * sorted.length))];
+};
+
+export const getChatMetricsSummary = (organizationId?: string) => {
+    const rows = organizationId ? metrics.filter((m) => m.organizationId === organizationId) : metrics;
+    const latencies = rows.map((m) => m.latencyMs);
+
+    return {
+        requests: rows.length,
+        prompt_tokens: rows.reduce((sum, m) => sum + m.promptTokens, 0),
+        completion_tokens: rows.reduce((sum, m) => sum + m.completionTokens, 0),
+        avg_prompt_tokens: rows.length ? Math.round(rows.reduce((sum, m) => sum + m.promptTokens, 0) / rows.length) : 0,
+        latency_p50_ms: percentile(latencies, 50),
+        latency_p95_ms: percentile(latencies, 95),
+        recent: rows.slice(-20),
+    };
+};
@@ -0,0 +1,145 @@
+// Cache de resultados das tools da IA, por organização.
+// Chave: organização + tool + argumentos normalizados.
+// Invalidação: cada tool de leitura declara as tabelas de que depende; cada
+// tabela tem um contador de versão por organização. Escritas (tools de escrita
+// ou invalidateToolCache) incrementam a versão e as entradas antigas deixam
+// de valer. O TTL cobre mudanças feitas fora desse caminho.
+
+const DEFAULT_TTL_MS = 60_000;
+const MAX_ENTRIES = 500;
+
+// Tabelas lidas por cada tool (apenas tools listadas aqui são cacheadas)
+export const TOOL_READ_TABLES: Record<string, string[]> = {
+    search_projects: ['projects', 'clients'],
+    get_financial_summary: ['financial_transactions'],
+    list_freelancers: ['freelancers', 'freelancer_tags', 'item_assignments', 'project_members', 'projects'],
+    get_project_details: ['projects', 'clients', 'project_items', 'project_members', 'freelancers'],
+    check_equipment_availability: ['equipments', 'equipment_bookings', 'projects'],
+    list_proposals: ['proposals', 'clients'],
+    get_client_info: ['clients'],
+    search_client_history: ['agent_memory', 'clients', 'projects'],
+};
+
+// Tabelas alteradas por cada tool de escrita
+export const TOOL_WRITE_TABLES: Record<string, string[]> = {
+    update_proposal_status: ['proposals'],
+    schedule_calendar_event: ['calendar_events'],
+    memorize_fact: ['agent_memory'],
+};
+
+// Argumentos comparados com ilike (case-insensitive) podem ser normalizados em minúsculas
+const CASE_INSENSITIVE_ARGS = new Set(['query', 'name', 'clientName', 'equipmentName', 'role']);
+
+type CacheEntry = {
+    value: string;
+    expiresAt: number;
+    versions: number[];
+};
+
+const entries = new Map<string, CacheEntry>();
+const tableVersions = new Map<string, number>();
+const stats = { hits: 0, misses: 0, invalidations: 0 };
+
+const versionKey = (organizationId: string, table: string) => `${organizationId}:${table}`;
+
+const currentVersions = (organizationId: string, tables: string[]) =>
+    tables.map((table) => tableVersions.get(versionKey(organizationId, table)) || 0);
+
+export const normalizeToolArgs = (args: unknown): Record<string, unknown> => {
+    if (!args || typeof args !== 'object') return {};
+
+    const normalized: Record<string, unknown> = {};
+    for (const key of Object.keys(args as Record<string, unknown>).sort()) {
+        let value = (args as Record<string, unknown>)[key];
+        if (value === undefined || value === null) continue;
+        if (typeof value === 'string') {
+            value = value.trim();
+            if (value === '') continue;
+            if (CASE_INSENSITIVE_ARGS.has(key)) value = (value as string).toLowerCase();
+        }
+        normalized[key] = value;
+    }
+    return normalized;
+};
+
+export const toolCacheKey = (organizationId: string, toolName: string, args: unknown) =>
+    `${organizationId}:${toolName}:${JSON.stringify(normalizeToolArgs(args))}`;
+
+export const isCacheableTool = (toolName: string) => toolName in TOOL_READ_TABLES;
+
+export const getCachedToolResult = (
+    organizationId: string,
+    toolName: string,
+    args: unknown
+): string | undefined => {
+    const tables = TOOL_READ_TABLES[toolName];
+    if (!tables) return undefined;
+
+    const key = toolCacheKey(organizationId, toolName, args);
+    const entry = entries.get(key);
+    if (!entry) {
+        stats.misses++;
+        return undefined;
+    }
+
+    const versions = currentVersions(organizationId, tables);
+    const stale = entry.expiresAt < Date.now() || entry.versions.some((v, i) => v !== versions[i]);
+    if (stale) {
+        entries.delete(key);
+        stats.misses++;
+        return undefined;
+    }
+
+    // LRU: reinserir no fim
+    entries.delete(key);
+    entries.set(key, entry);
+    stats.hits++;
+    return entry.value;
+};
+
+export const setCachedToolResult = (
+    organizationId: string,
+    toolName: string,
+    args: unknown,
+    value: string,
+    ttlMs = DEFAULT_TTL_MS
+) => {
+    const tables = TOOL_READ_TABLES[toolName];
+    if (!tables) return;
+
+    const key = toolCacheKey(organizationId, toolName, args);
+    entries.delete(key);
+    entries.set(key, {
+        value,
+        expiresAt: Date.now() + ttlMs,
+        versions: currentVersions(organizationId, tables),
+    });
+
+    while (entries.size > MAX_ENTRIES) {
+        const oldest = entries.keys().next().value;
+        if (oldest === undefined) break;
+        entries.delete(oldest);
+    }
+};
+
+/**
+ * Invalida os resultados que dependem das tabelas informadas.
+ * Chamado pelas tools de escrita e disponível para server actions.
+ */
+export const invalidateToolCache = (organizationId: string, tables: string[]) => {
+    for (const table of tables) {
+        const key = versionKey(organizationId, table);
+        tableVersions.set(key, (tableVersions.get(key) || 0) + 1);
+    }
+    stats.invalidations++;
+};
+
+export const getToolCacheStats = () => ({ ...stats, size: entries.size });
+
+export const clearToolCache = () => {
+    entries.clear();
+    tableVersions.clear();
+    stats.hits = 0;
+    stats.misses = 0;
+    stats.invalidations = 0;
+};
@@ -1,10 +1,13 @@
 
 import { SupabaseClient } from '@supabase/supabase-js';
-import OpenAI from 'openai';
-
-const openai = new OpenAI({
-    apiKey: process.env.OPENAI_API_KEY,
-});
+import { getOpenAIClient } from './client';
+import {
+    TOOL_WRITE_TABLES,
+    getCachedToolResult,
+    setCachedToolResult,
+    invalidateToolCache,
+} from './tool-cache';
+import { searchFreelancerAvailability } from '../freelancer-availability';
 
 // Definições de tools compatíveis com OpenAI Standard (JSON Schema)
 // Isso substitui o uso de 'tool()' do SDK AI novo que requer versão 4+
@@ -40,12 +43,14 @@ export const getToolsDefinitions = () => [
     },
     {
         name: 'list_freelancers',
-        description: 'Lista freelancers cadastrados, opcionalmente filtrando por disponibilidade ou habilidade.',
+        description: 'Lista freelancers cadastrados, opcionalmente filtrando por habilidade, disponibilidade em uma data/período e diária máxima. Com data, traz os conflitos de agenda de quem está ocupado.',
         parameters: {
             type: 'object',
             properties: {
-                role: { type: 'string', description: 'Habilidade ou tag (ex: Camera, Editor)' },
-                available_date: { type: 'string', description: 'Data (YYYY-MM-DD)' }
+                role: { type: 'string', description: 'Habilidade ou tag (ex: Camera, Editor). Várias separadas por vírgula' },
+                available_date: { type: 'string', description: 'Data (YYYY-MM-DD) ou início do período' },
+                end_date: { type: 'string', description: 'Fim do período (YYYY-MM-DD), inclusivo' },
+                max_rate: { type: 'number', description: 'Diária máxima (R$)' }
             },
         },
     },
@@ -148,45 +153,84 @@ export const getToolsDefinitions = () => [
     },
 ];
 
+// Formato "tools" (permite parallel tool calls no mesmo turno)
+export const getToolsSpec = () =>
+    getToolsDefinitions().map((fn) => ({ type: 'function' as const, function: fn }));
+
 // Implementação das Tools (Execução)
+// Resultados de tools de leitura são cacheados por organização (ver tool-cache.ts)
 export const executeTool = async (
     toolName: string,
     args: any,
     supabase: SupabaseClient,
     organizationId: string
 ) => {
+    const cached = getCachedToolResult(organizationId, toolName, args);
+    if (cached !== undefined) return cached;
+
     try {
-        switch (toolName) {
-            case 'search_projects':
-                return await searchProjects(args, supabase, organizationId);
-            case 'get_financial_summary':
-                return await getFinancialSummary(args, supabase, organizationId);
-            case 'list_freelancers':
-                return await listFreelancers(args, supabase, organizationId);
-            case 'get_project_details':
-                return await getProjectDetails(args, supabase, organizationId);
-            case 'check_equipment_availability':
-                return await checkEquipmentAvailability(args, supabase, organizationId);
-            case 'list_proposals':
-                return await listProposals(args, supabase, organizationId);
-            case 'get_client_info':
-                return await getClientInfo(args, supabase, organizationId);
-            case 'update_proposal_status':
-                return await updateProposalStatus(args, supabase, organizationId);
-            case 'schedule_calendar_event':
-                return await scheduleCalendarEvent(args, supabase, organizationId);
-            case 'search_client_history':
-                return await searchKnowledgeBase(args, supabase, organizationId);
-            case 'memorize_fact':
-                return await memorizeFact(args, supabase, organizationId);
-            default:
-                return 'Ferramenta não encontrada.';
+        const result = await runTool(toolName, args, supabase, organizationId);
+
+        if (TOOL_WRITE_TABLES[toolName]) {
+            invalidateToolCache(organizationId, TOOL_WRITE_TABLES[toolName]);
+        } else if (!result.startsWith('Erro')) {
+            setCachedToolResult(organizationId, toolName, args, result);
         }
+
+        return result;
     } catch (err: any) {
         return `Erro ao executar ferramenta: ${err.message}`;
     }
 };
 
+// Executa várias tool calls do mesmo turno em paralelo
+export const executeToolCalls = async (
+    calls: { id: string; name: string; args: any }[],
+    supabase: SupabaseClient,
+    organizationId: string
+) =>
+    Promise.all(
+        calls.map(async (call) => ({
+            id: call.id,
+            name: call.name,
+            result: await executeTool(call.name, call.args, supabase, organizationId),
+        }))
+    );
+
+const runTool = async (
+    toolName: string,
+    args: any,
+    supabase: SupabaseClient,
+    organizationId: string
+): Promise<string> => {
+    switch (toolName) {
+        case 'search_projects':
+            return await searchProjects(args, supabase, organizationId);
+        case 'get_financial_summary':
+            return await getFinancialSummary(args, supabase, organizationId);
+        case 'list_freelancers':
+            return await listFreelancers(args, supabase, organizationId);
+        case 'get_project_details':
+            return await getProjectDetails(args, supabase, organizationId);
+        case 'check_equipment_availability':
+            return await checkEquipmentAvailability(args, supabase, organizationId);
+        case 'list_proposals':
+            return await listProposals(args, supabase, organizationId);
+        case 'get_client_info':
+            return await getClientInfo(args, supabase, organizationId);
+        case 'update_proposal_status':
+            return await updateProposalStatus(args, supabase, organizationId);
+        case 'schedule_calendar_event':
+            return await scheduleCalendarEvent(args, supabase, organizationId);
+        case 'search_client_history':
+            return await searchKnowledgeBase(args, supabase, organizationId);
+        case 'memorize_fact':
+            return await memorizeFact(args, supabase, organizationId);
+        default:
+            return 'Ferramenta não encontrada.';
+    }
+};
+
 // --- Funções Internas ---
 
 async function searchProjects({ query, status, limit = 10 }: any, supabase: SupabaseClient, organizationId: string) {
@@ -226,21 +270,64 @@ async function getFinancialSummary({ startDate, endDate, view }: any, supabase:
     return JSON.stringify({ summary: { total_income: income, total_expenses: expenses, net_balance: balance }, transactions: transactions.slice(0, 15) });
 }
 
-async function listFreelancers({ role, available_date }: any, supabase: SupabaseClient, organizationId: string) {
-    let { data: freelancers, error } = await supabase
+async function listFreelancers({ role, available_date, end_date, max_rate }: any, supabase: SupabaseClient, organizationId: string) {
+    const skills = role ? String(role).split(',').map((s: string) => s.trim()).filter(Boolean) : [];
+
+    // Com data: busca indexada de disponibilidade (escalações e equipes de projeto no período)
+    if (available_date) {
+        const results = await searchFreelancerAvailability(supabase, organizationId, {
+            startDate: available_date,
+            endDate: end_date || available_date,
+            skills,
+            maxRate: max_rate ?? null,
+            limit: 30,
+        });
+        if (results.length === 0) return 'Nenhum freelancer encontrado.';
+        return JSON.stringify(results.map((f) => ({
+            id: f.freelancer_id,
+            name: f.name,
+            email: f.email,
+            role: f.role,
+            tags: f.tags,
+            daily_rate: f.daily_rate,
+            available: f.available,
+            conflicts: f.conflicts.map((c) => `${c.project_title || 'Sem projeto'} (${c.start.slice(0, 10)})`),
+        })));
+    }
+
+    let query = supabase
         .from('freelancers')
-        .select(`id, name, email, daily_rate, status, tags:freelancer_tags(name)`)
+        .select(`id, name, email, role, daily_rate, status, tags:freelancer_tags(name)`)
         .eq('organization_id', organizationId)
-        .eq('status', 'ACTIVE');
+        .not('status', 'in', '(INACTIVE,BLACKLISTED)');
 
-    if (error) throw error;
-    let results = freelancers || [];
+    if (max_rate) query = query.lte('daily_rate', max_rate);
 
-    if (role) {
-        results = results.filter(f =>
-            f.tags && Array.isArray(f.tags) && f.tags.some((t: any) => t.name.toLowerCase().includes(role.toLowerCase()))
-        );
+    // Filtro de função/tags no banco, antes do limite (senão quem vem depois dos 50 primeiros nomes some)
+    if (skills.length > 0) {
+        const patterns = skills
+            .map((s: string) => s.replace(/[",()\\%_*]/g, '').trim())
+            .filter(Boolean)
+            .map((s: string) => `"%${s}%"`);
+        if (patterns.length === 0) return 'Nenhum freelancer encontrado.';
+
+        const { data: tagged, error: tagsError } = await supabase
+            .from('freelancer_tags')
+            .select('freelancer_id')
+            .or(patterns.map((p: string) => `name.ilike.${p}`).join(','));
+
+        if (tagsError) throw tagsError;
+        const taggedIds = [...new Set((tagged || []).map((t: any) => t.freelancer_id))];
+
+        const filters = patterns.map((p: string) => `role.ilike.${p}`);
+        if (taggedIds.length > 0) filters.push(`id.in.(${taggedIds.join(',')})`);
+        query = query.or(filters.join(','));
     }
+
+    const { data: freelancers, error } = await query.order('name').limit(50);
+
+    if (error) throw error;
+    const results = freelancers || [];
     return results.length > 0 ? JSON.stringify(results) : 'Nenhum freelancer encontrado.';
 }
 
@@ -349,7 +436,7 @@ async function scheduleCalendarEvent({ title, description, startDate, endDate, t
 async function searchKnowledgeBase({ query }: any, supabase: SupabaseClient, organizationId: string) {
     // 1. Vector Search (RAG Real)
     try {
-        const embeddingResponse = await openai.embeddings.create({
+        const embeddingResponse = await getOpenAIClient().embeddings.create({
             model: 'text-embedding-3-small',
             input: query,
         });
@@ -407,7 +494,7 @@ async function searchKnowledgeBase({ query }: any, supabase: SupabaseClient, org
 async function memorizeFact({ content, category }: any, supabase: SupabaseClient, organizationId: string) {
     try {
         // Gerar Embedding
-        const embeddingResponse = await openai.embeddings.create({
+        const embeddingResponse = await getOpenAIClient().embeddings.create({
             model: 'text-embedding-3-small',
             input: content,
         });
@@ -0,0 +1,183 @@
+/**
+ * ============================================
+ * DATA CACHE
+ * Cache das leituras das server actions (Next data cache), chaveado por
+ * organização e marcado com tags por entidade e por registro. Mutações
+ * invalidam apenas as tags afetadas, em vez de revalidatePath em rotas inteiras.
+ * ============================================
+ */
+
+import { unstable_cache, updateTag, revalidateTag } from 'next/cache'
+import { invalidateToolCache } from '@/lib/ai/tool-cache'
+
+export type CacheEntity =
+  | 'clients'
+  | 'projects'
+  | 'proposals'
+  | 'finances'
+  | 'equipments'
+  | 'freelancers'
+  | 'calendar'
+  | 'organization'
+
+// Entidade inteira (listas, agregados) ou um registro específico
+export type CacheTarget = CacheEntity | { entity: CacheEntity; id: string }
+
+// TTL de segurança para mudanças feitas fora das server actions (triggers, SQL manual)
+export const DEFAULT_REVALIDATE_SECONDS = Number(process.env.DATA_CACHE_TTL_SECONDS) || 300
+
+// Tabelas por entidade, para invalidar também o cache das tools da IA
+const ENTITY_TABLES: Record<CacheEntity, string[]> = {
+  clients: ['clients'],
+  projects: ['projects', 'project_items', 'project_members', 'project_tasks', 'item_assignments'],
+  proposals: ['proposals'],
+  finances: ['financial_transactions'],
+  equipments: ['equipments', 'equipment_bookings'],
+  freelancers: ['freelancers', 'freelancer_tags'],
+  calendar: ['calendar_events'],
+  organization: [],
+}
+
+export const entityTag = (organizationId: string, entity: CacheEntity) =>
+  `org:${organizationId}:${entity}`
+
+export const recordTag = (organizationId: string, entity: CacheEntity, id: string) =>
+  `org:${organizationId}:${entity}:${id}`
+
+const targetTag = (organizationId: string, target: CacheTarget) =>
+  typeof target === 'string'
+    ? entityTag(organizationId, target)
+    : recordTag(organizationId, target.entity, target.id)
+
+// ============================================
+// MÉTRICAS
+// ============================================
+
+type QueryStats = { calls: number; misses: number; errors: number }
+
+const queryStats = new Map<string, QueryStats>()
+const invalidationStats = new Map<CacheEntity, number>()
+
+const statsFor = (name: string) => {
+  let stats = queryStats.get(name)
+  if (!stats) {
+    stats = { calls: 0, misses: 0, errors: 0 }
+    queryStats.set(name, stats)
+  }
+  return stats
+}
+
+/**
+ * Hits/misses por leitura desde o início do processo (por instância).
+ * Misses incluem recargas em background após o TTL.
+ */
+export function getDataCacheMetrics() {
+  const queries = Array.from(queryStats.entries())
+    .map(([name, { calls, misses, errors }]) => {
+      const hits = Math.max(calls - misses, 0)
+      return { name, calls, hits, misses, errors, hitRate: calls ? hits / calls : 0 }
+    })
+    .sort((a, b) => b.calls - a.calls)
+
+  const calls = queries.reduce((acc, query) => acc + query.calls, 0)
+  const hits = queries.reduce((acc, query) => acc + query.hits, 0)
+
+  return {
+    ttlSeconds: DEFAULT_REVALIDATE_SECONDS,
+    calls,
+    hits,
+    misses: calls - hits,
+    hitRate: calls ? hits / calls : 0,
+    queries,
+    invalidations: Object.fromEntries(invalidationStats),
+  }
+}
+
+// ============================================
+// LEITURA
+// ============================================
+
+interface CachedReadOptions<T> {
+  organizationId: string
+  // Entidades/registros lidos: qualquer mutação neles invalida esta leitura
+  tags: CacheTarget[]
+  // Parâmetros que diferenciam a leitura (ids, filtros)
+  keyParts?: Array<string | number | boolean | null | undefined>
+  revalidate?: number
+  // Valor devolvido (e não cacheado) quando o loader falha
+  fallback: T
+}
+
+/**
+ * Executa uma leitura através do data cache do Next.
+ *
+ * O loader recebe o client já criado fora do escopo do cache (cookies não
+ * podem ser lidos lá dentro) e deve lançar erro em falha: erros não são
+ * cacheados e viram `fallback`. O resultado precisa ser serializável em JSON.
+ */
+export async function cachedRead<T>(
+  name: string,
+  { organizationId, tags, keyParts = [], revalidate = DEFAULT_REVALIDATE_SECONDS, fallback }: CachedReadOptions<T>,
+  loader: () => Promise<T>
+): Promise<T> {
+  const stats = statsFor(name)
+  stats.calls++
+
+  const cached = unstable_cache(
+    async () => {
+      stats.misses++
+      return loader()
+    },
+    [name, organizationId, ...keyParts.map((part) => String(part ?? ''))],
+    {
+      tags: tags.map((target) => targetTag(organizationId, target)),
+      revalidate,
+    }
+  )
+
+  try {
+    return await cached()
+  } catch (error) {
+    stats.errors++
+    console.error(`Error in cached read ${name}:`, error)
+    return fallback
+  }
+}
+
+// ============================================
+// INVALIDAÇÃO
+// ============================================
+
+/**
+ * Invalida as tags afetadas por uma mutação.
+ *
+ * Um registro invalida a própria tag e a da entidade (listas que o contêm).
+ * Em server actions usa updateTag (a próxima leitura já vê a escrita); fora
+ * delas, expira a tag imediatamente com revalidateTag.
+ */
+export function invalidateCache(organizationId: string, targets: CacheTarget[]) {
+  const tags = new Set<string>()
+  const entities = new Set<CacheEntity>()
+
+  for (const target of targets) {
+    const entity = typeof target === 'string' ? target : target.entity
+    entities.add(entity)
+    tags.add(entityTag(organizationId, entity))
+    if (typeof target !== 'string') tags.add(targetTag(organizationId, target))
+  }
+
+  for (const tag of tags) {
+    try {
+      updateTag(tag)
+    } catch {
+      revalidateTag(tag, { expire: 0 })
+    }
+  }
+
+  entities.forEach((entity) => {
+    invalidationStats.set(entity, (invalidationStats.get(entity) || 0) + 1)
+  })
+
+  const tables = Array.from(entities).flatMap((entity) => ENTITY_TABLES[entity])
+  if (tables.length > 0) invalidateToolCache(organizationId, tables)
+}
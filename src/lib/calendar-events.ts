@@ -0,0 +1,224 @@
+/**
+ * ============================================
+ * EVENTOS DO CALENDÁRIO
+ * Junção das fontes do calendário (gravações, entregas, itens com prazo e
+ * eventos manuais) de uma organização, compartilhada pela server action e
+ * pelo feed ICS (que roda sem sessão, com o client de service role).
+ * ============================================
+ */
+
+import type { SupabaseClient } from '@supabase/supabase-js'
+
+export type CalendarEventType = 'shooting' | 'delivery' | 'meeting' | 'other'
+
+export type CalendarEvent = {
+  id: string
+  title: string
+  description?: string | null
+  start: string
+  end: string
+  allDay: boolean
+  type: CalendarEventType
+  color: string
+  projectId?: string | null
+  projectTitle?: string | null
+  clientName?: string | null
+  location?: string | null
+}
+
+export const eventColors: Record<CalendarEventType, string> = {
+  shooting: '#8b5cf6', // purple
+  delivery: '#22c55e', // green
+  meeting: '#3b82f6', // blue
+  other: '#6b7280', // gray
+}
+
+export async function loadCalendarEvents(
+  supabase: SupabaseClient,
+  organizationId: string,
+  start: Date,
+  end: Date
+): Promise<CalendarEvent[]> {
+  const events: CalendarEvent[] = []
+
+  // 1. Buscar datas de gravação dos projetos (shooting_date principal)
+  const { data: projectsWithShooting } = await supabase
+    .from('projects')
+    .select('id, title, shooting_date, shooting_time, location, clients(name)')
+    .eq('organization_id', organizationId)
+    .not('shooting_date', 'is', null)
+    .gte('shooting_date', start.toISOString())
+    .lte('shooting_date', end.toISOString())
+
+  if (projectsWithShooting) {
+    projectsWithShooting.forEach((project) => {
+      if (project.shooting_date) {
+        const shootingDate = new Date(project.shooting_date)
+        events.push({
+          id: `shooting-${project.id}`,
+          title: `Gravação: ${project.title}`,
+          description: project.location || null,
+          start: project.shooting_date,
+          end: project.shooting_date,
+          allDay: !project.shooting_time,
+          type: 'shooting',
+          color: eventColors.shooting,
+          projectId: project.id,
+          projectTitle: project.title,
+          clientName: (project.clients as any)?.name || null,
+          location: project.location,
+        })
+      }
+    })
+  }
+
+  // 2. Buscar múltiplas datas de gravação (shooting_dates)
+  const { data: shootingDates } = await supabase
+    .from('shooting_dates')
+    .select('id, date, time, location, notes, project_id, projects!inner(id, title, clients(name))')
+    .eq('projects.organization_id', organizationId)
+    .gte('date', start.toISOString())
+    .lte('date', end.toISOString())
+
+  if (shootingDates) {
+    shootingDates.forEach((sd) => {
+      const project = sd.projects as any
+      if (project) {
+        events.push({
+          id: `shooting-date-${sd.id}`,
+          title: `Gravação: ${project.title}`,
+          description: sd.notes || null,
+          start: sd.date,
+          end: sd.date,
+          allDay: !sd.time,
+          type: 'shooting',
+          color: eventColors.shooting,
+          projectId: project.id,
+          projectTitle: project.title,
+          clientName: project.clients?.name || null,
+          location: sd.location,
+        })
+      }
+    })
+  }
+
+  // 3. Buscar deadlines dos projetos
+  const { data: projectsWithDeadline } = await supabase
+    .from('projects')
+    .select('id, title, deadline, clients(name)')
+    .eq('organization_id', organizationId)
+    .not('deadline', 'is', null)
+    .gte('deadline', start.toISOString())
+    .lte('deadline', end.toISOString())
+
+  if (projectsWithDeadline) {
+    projectsWithDeadline.forEach((project) => {
+      if (project.deadline) {
+        events.push({
+          id: `deadline-${project.id}`,
+          title: `Entrega: ${project.title}`,
+          description: null,
+          start: project.deadline,
+          end: project.deadline,
+          allDay: true,
+          type: 'delivery',
+          color: eventColors.delivery,
+          projectId: project.id,
+          projectTitle: project.title,
+          clientName: (project.clients as any)?.name || null,
+          location: null,
+        })
+      }
+    })
+  }
+
+  // 4. Buscar múltiplas datas de entrega (delivery_dates)
+  const { data: deliveryDates } = await supabase
+    .from('delivery_dates')
+    .select('id, date, description, completed, project_id, projects!inner(id, title, clients(name))')
+    .eq('projects.organization_id', organizationId)
+    .gte('date', start.toISOString())
+    .lte('date', end.toISOString())
+
+  if (deliveryDates) {
+    deliveryDates.forEach((dd) => {
+      const project = dd.projects as any
+      if (project) {
+        events.push({
+          id: `delivery-date-${dd.id}`,
+          title: `Entrega: ${dd.description || project.title}`,
+          description: dd.description || null,
+          start: dd.date,
+          end: dd.date,
+          allDay: true,
+          type: 'delivery',
+          color: dd.completed ? '#4ade80' : eventColors.delivery,
+          projectId: project.id,
+          projectTitle: project.title,
+          clientName: project.clients?.name || null,
+          location: null,
+        })
+      }
+    })
+  }
+
+  // 5. Buscar itens de escopo com prazo (project_items)
+  const { data: projectItems } = await supabase
+    .from('project_items')
+    .select('id, description, due_date, status, project_id, projects!inner(id, title, clients(name))')
+    .eq('projects.organization_id', organizationId)
+    .not('due_date', 'is', null)
+    .gte('due_date', start.toISOString())
+    .lte('due_date', end.toISOString())
+
+  if (projectItems) {
+    projectItems.forEach((item) => {
+      const project = item.projects as any
+      if (project && item.due_date) {
+        events.push({
+          id: `item-${item.id}`,
+          title: `Entrega Item: ${item.description}`,
+          description: `Item do projeto: ${item.description}`,
+          start: item.due_date,
+          end: item.due_date,
+          allDay: true,
+          type: 'delivery',
+          color: item.status === 'DONE' ? '#4ade80' : '#10b981', // Verde claro se feito, verde normal se pendente
+          projectId: project.id,
+          projectTitle: project.title,
+          clientName: project.clients?.name || null,
+          location: null,
+        })
+      }
+    })
+  }
+
+  // 6. Buscar eventos manuais (calendar_events table)
+  const { data: manualEvents } = await supabase
+    .from('calendar_events')
+    .select('*')
+    .eq('organization_id', organizationId)
+    .gte('start_date', start.toISOString())
+    .lte('start_date', end.toISOString())
+
+  if (manualEvents) {
+    manualEvents.forEach((event) => {
+      events.push({
+        id: `manual-${event.id}`,
+        title: event.title,
+        description: event.description,
+        start: event.start_date,
+        end: event.end_date || event.start_date,
+        allDay: event.all_day,
+        type: event.type || 'other',
+        color: eventColors[event.type as CalendarEventType] || eventColors.other,
+        projectId: null,
+        projectTitle: null,
+        clientName: null,
+        location: event.location,
+      })
+    })
+  }
+
+  return events
+}
@@ -0,0 +1,225 @@
+/**
+ * ============================================
+ * FEED ICS DO CALENDÁRIO
+ * Calendário da organização em iCalendar (RFC 5545) para assinatura por link.
+ * A versão do feed (calendar_feed_state.changed_at, mantida por triggers) vira
+ * ETag/Last-Modified: poll sem mudança responde 304 sem tocar nas fontes.
+ * Quando muda, o feed é remontado uma vez por processo (pedidos simultâneos
+ * compartilham o build) e os VEVENT de eventos inalterados são reaproveitados.
+ * ============================================
+ */
+
+import { randomBytes } from 'node:crypto'
+import type { SupabaseClient } from '@supabase/supabase-js'
+import { addMonths, endOfMonth, startOfMonth, subMonths } from 'date-fns'
+import { loadCalendarEvents, type CalendarEvent } from './calendar-events'
+
+// Mudou o formato gerado? Incrementar força os apps a baixarem de novo
+const FEED_FORMAT_VERSION = 1
+
+// Janela publicada: 3 meses para trás, 12 para frente
+const MONTHS_BEFORE = 3
+const MONTHS_AFTER = 12
+
+export interface CalendarFeedVersion {
+  organizationId: string
+  changedAt: Date
+}
+
+export interface CalendarFeed {
+  body: string
+  etag: string
+  lastModified: Date
+}
+
+export const createCalendarFeedToken = () => randomBytes(24).toString('hex')
+
+/**
+ * Janela atual e validadores HTTP. A janela anda todo início de mês, então o
+ * Last-Modified nunca é anterior ao começo do mês corrente.
+ */
+export function calendarFeedValidators(version: CalendarFeedVersion, now = new Date()) {
+  const monthStart = startOfMonth(now)
+  const start = subMonths(monthStart, MONTHS_BEFORE)
+  const end = endOfMonth(addMonths(monthStart, MONTHS_AFTER))
+  const windowKey = start.toISOString().slice(0, 7)
+
+  const lastModified = new Date(Math.max(version.changedAt.getTime(), monthStart.getTime()))
+  // Precisão de segundos, como no header HTTP
+  lastModified.setMilliseconds(0)
+
+  return {
+    start,
+    end,
+    etag: `"cal-v${FEED_FORMAT_VERSION}-${windowKey}-${version.changedAt.getTime().toString(36)}"`,
+    lastModified,
+  }
+}
+
+/** O cliente já tem esta versão? (If-None-Match tem prioridade sobre If-Modified-Since) */
+export function isCalendarFeedFresh(headers: Headers, etag: string, lastModified: Date) {
+  const ifNoneMatch = headers.get('if-none-match')
+  if (ifNoneMatch) {
+    return ifNoneMatch.split(',').some((tag) => tag.trim().replace(/^W\//, '') === etag || tag.trim() === '*')
+  }
+
+  const ifModifiedSince = headers.get('if-modified-since')
+  if (ifModifiedSince) {
+    const since = Date.parse(ifModifiedSince)
+    return !Number.isNaN(since) && lastModified.getTime() <= since
+  }
+
+  return false
+}
+
+// Estado em globalThis: sobrevive ao HMR e é único por processo
+const state = ((globalThis as any).__calendarFeed ??= {
+  feeds: new Map<string, CalendarFeed>(),
+  fragments: new Map<string, Map<string, string>>(),
+  inflight: new Map<string, Promise<CalendarFeed>>(),
+}) as {
+  // organizationId → último feed montado
+  feeds: Map<string, CalendarFeed>
+  // organizationId → (assinatura do evento → VEVENT)
+  fragments: Map<string, Map<string, string>>
+  inflight: Map<string, Promise<CalendarFeed>>
+}
+
+/**
+ * Feed da organização na versão informada. `supabase` lê sem sessão: usar o
+ * client de service role (loadCalendarEvents filtra pela organização).
+ */
+export async function getCalendarFeed(
+  supabase: SupabaseClient,
+  version: CalendarFeedVersion
+): Promise<CalendarFeed> {
+  const { start, end, etag, lastModified } = calendarFeedValidators(version)
+
+  const cached = state.feeds.get(version.organizationId)
+  if (cached?.etag === etag) return cached
+
+  const pending = state.inflight.get(etag + version.organizationId)
+  if (pending) return pending
+
+  const job = (async (): Promise<CalendarFeed> => {
+    const [events, { data: organization }] = await Promise.all([
+      loadCalendarEvents(supabase, version.organizationId, start, end),
+      supabase.from('organizations').select('name').eq('id', version.organizationId).maybeSingle(),
+    ])
+
+    const previous = state.fragments.get(version.organizationId) ?? new Map<string, string>()
+    const fragments = new Map<string, string>()
+    const stamp = formatDateTime(version.changedAt)
+
+    for (const event of events) {
+      const key = JSON.stringify(event)
+      fragments.set(key, previous.get(key) ?? renderEvent(event, stamp))
+    }
+
+    const feed = {
+      body: renderCalendar(organization?.name || 'Zooming CRM', fragments.values()),
+      etag,
+      lastModified,
+    }
+
+    state.fragments.set(version.organizationId, fragments)
+    state.feeds.set(version.organizationId, feed)
+    return feed
+  })()
+
+  state.inflight.set(etag + version.organizationId, job)
+  try {
+    return await job
+  } finally {
+    state.inflight.delete(etag + version.organizationId)
+  }
+}
+
+/* ---------- iCalendar ---------- */
+
+const pad = (value: number) => String(value).padStart(2, '0')
+
+function formatDate(date: Date) {
+  return `${date.getUTCFullYear()}${pad(date.getUTCMonth() + 1)}${pad(date.getUTCDate())}`
+}
+
+function formatDateTime(date: Date) {
+  return `${formatDate(date)}T${pad(date.getUTCHours())}${pad(date.getUTCMinutes())}${pad(date.getUTCSeconds())}Z`
+}
+
+function escapeText(value: string) {
+  return value
+    .replace(/\\/g, '\\\\')
+    .replace(/;/g, '\\;')
+    .replace(/,/g, '\\,')
+    .replace(/\r?\n/g, '\\n')
+}
+
+// Linhas de no máximo 75 octetos, continuação com espaço (RFC 5545 3.1)
+function foldLine(line: string) {
+  const bytes = Buffer.from(line, 'utf8')
+  if (bytes.length <= 75) return line
+
+  const parts: string[] = []
+  let current = ''
+  let size = 0
+  for (const char of line) {
+    const charSize = Buffer.byteLength(char, 'utf8')
+    if (size + charSize > (parts.length === 0 ? 75 : 74)) {
+      parts.push(current)
+      current = ''
+      size = 0
+    }
+    current += char
+    size += charSize
+  }
+  parts.push(current)
+  return parts.join('\r\n ')
+}
+
+function renderEvent(event: CalendarEvent, stamp: string) {
+  const start = new Date(event.start)
+  const end = new Date(event.end || event.start)
+
+  const lines = ['BEGIN:VEVENT', `UID:${event.id}@zoomingcrm`, `DTSTAMP:${stamp}`]
+
+  if (event.allDay) {
+    // Datas de dia inteiro são gravadas ao meio-dia UTC: o dia UTC é o dia local
+    const lastDay = end.getTime() > start.getTime() ? end : start
+    const exclusiveEnd = new Date(lastDay.getTime() + 24 * 60 * 60 * 1000)
+    lines.push(`DTSTART;VALUE=DATE:${formatDate(start)}`, `DTEND;VALUE=DATE:${formatDate(exclusiveEnd)}`)
+  } else {
+    const timedEnd = end.getTime() > start.getTime() ? end : new Date(start.getTime() + 60 * 60 * 1000)
+    lines.push(`DTSTART:${formatDateTime(start)}`, `DTEND:${formatDateTime(timedEnd)}`)
+  }
+
+  lines.push(`SUMMARY:${escapeText(event.title)}`)
+
+  const details = [
+    event.description,
+    event.projectTitle ? `Projeto: ${event.projectTitle}` : null,
+    event.clientName ? `Cliente: ${event.clientName}` : null,
+  ].filter(Boolean) as string[]
+  if (details.length > 0) lines.push(`DESCRIPTION:${escapeText(details.join('\n'))}`)
+
+  if (event.location) lines.push(`LOCATION:${escapeText(event.location)}`)
+  lines.push(`CATEGORIES:${event.type.toUpperCase()}`, 'TRANSP:TRANSPARENT', 'END:VEVENT')
+
+  return lines.map(foldLine).join('\r\n')
+}
+
+function renderCalendar(name: string, events: Iterable<string>) {
+  const header = [
+    'BEGIN:VCALENDAR',
+    'VERSION:2.0',
+    'PRODID:-//Zooming CRM//Calendario//PT-BR',
+    'CALSCALE:GREGORIAN',
+    'METHOD:PUBLISH',
+    `X-WR-CALNAME:${escapeText(name)}`,
+    'X-WR-TIMEZONE:America/Sao_Paulo',
+    'REFRESH-INTERVAL;VALUE=DURATION:PT15M',
+    'X-PUBLISHED-TTL:PT15M',
+  ].map(foldLine)
+
+  return [...header, ...events, 'END:VCALENDAR', ''].join('\r\n')
+}
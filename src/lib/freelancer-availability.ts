@@ -0,0 +1,96 @@
+/**
+ * ============================================
+ * DISPONIBILIDADE DE FREELANCERS
+ * Chamada da RPC search_available_freelancers (índices de datas e tags no
+ * banco), compartilhada pela server action e pela tool da IA.
+ * ============================================
+ */
+
+import type { SupabaseClient } from '@supabase/supabase-js'
+
+export interface AvailabilityConflict {
+  type: 'assignment' | 'project'
+  start: string
+  end: string
+  project_id: string | null
+  project_title: string | null
+  role: string | null
+}
+
+export interface AvailableFreelancer {
+  freelancer_id: string
+  name: string
+  email: string | null
+  phone: string | null
+  role: string | null
+  specialty: string[]
+  tags: string[]
+  daily_rate: number | null
+  rating: number | null
+  matched_skills: number
+  available: boolean
+  conflicts: AvailabilityConflict[]
+}
+
+export interface AvailabilitySearch {
+  // Datas YYYY-MM-DD, ambas inclusivas (endDate padrão = startDate)
+  startDate: string
+  endDate?: string
+  skills?: string[]
+  maxRate?: number | null
+  onlyAvailable?: boolean
+  // Só os ocupados (com conflito) entre estes ids
+  freelancerIds?: string[]
+  onlyBusy?: boolean
+  limit?: number
+}
+
+const DATE_PATTERN = /^\d{4}-\d{2}-\d{2}$/
+
+const nextDay = (date: string) => {
+  const d = new Date(`${date}T00:00:00Z`)
+  d.setUTCDate(d.getUTCDate() + 1)
+  return d.toISOString().slice(0, 10)
+}
+
+export async function searchFreelancerAvailability(
+  supabase: SupabaseClient,
+  organizationId: string,
+  {
+    startDate,
+    endDate = startDate,
+    skills,
+    maxRate,
+    onlyAvailable = false,
+    freelancerIds,
+    onlyBusy = false,
+    limit = 50,
+  }: AvailabilitySearch
+): Promise<AvailableFreelancer[]> {
+  if (!DATE_PATTERN.test(startDate) || !DATE_PATTERN.test(endDate)) {
+    throw new Error('Datas devem estar no formato AAAA-MM-DD')
+  }
+  if (endDate < startDate) {
+    throw new Error('A data final deve ser igual ou posterior à inicial')
+  }
+
+  const { data, error } = await supabase.rpc('search_available_freelancers', {
+    p_organization_id: organizationId,
+    p_start: `${startDate}T00:00:00`,
+    p_end: `${nextDay(endDate)}T00:00:00`,
+    p_skills: skills && skills.length > 0 ? skills : null,
+    p_max_rate: maxRate ?? null,
+    p_only_available: onlyAvailable,
+    p_limit: limit,
+    p_freelancer_ids: freelancerIds ?? null,
+    p_only_busy: onlyBusy,
+  })
+
+  if (error) throw error
+
+  return (data || []).map((row: any) => ({
+    ...row,
+    daily_rate: row.daily_rate === null ? null : Number(row.daily_rate),
+    rating: row.rating === null ? null : Number(row.rating),
+  }))
+}
@@ -0,0 +1,89 @@
+/**
+ * ============================================
+ * IMAGE COMPRESSION (client-side)
+ * Redimensiona e re-encoda imagens em um Web Worker antes do upload
+ * ============================================
+ */
+
+import { IMAGE_VARIANTS, IMAGE_VARIANT_ORDER, type ImageVariant } from './variants'
+
+export interface CompressedImage {
+  variant: ImageVariant
+  blob: Blob
+  width: number
+  height: number
+  extension: string
+}
+
+// Formatos que não devem ser re-encodados (vetor / animação)
+const PASSTHROUGH_TYPES = new Set(['image/svg+xml', 'image/gif'])
+
+// Extensão pelo tipo que o worker realmente gerou
+const EXTENSIONS: Record<string, string> = {
+  'image/webp': 'webp',
+  'image/jpeg': 'jpg',
+}
+
+let worker: Worker | null = null
+let requestId = 0
+const pending = new Map<number, { resolve: (value: any) => void; reject: (error: Error) => void }>()
+
+function getWorker(): Worker | null {
+  if (typeof window === 'undefined' || typeof Worker === 'undefined' || typeof OffscreenCanvas === 'undefined') {
+    return null
+  }
+
+  if (!worker) {
+    worker = new Worker(new URL('./compress.worker.ts', import.meta.url), { type: 'module' })
+    worker.onmessage = (event) => {
+      const { id, results, error } = event.data
+      const request = pending.get(id)
+      if (!request) return
+      pending.delete(id)
+      if (error) request.reject(new Error(error))
+      else request.resolve(results)
+    }
+    worker.onerror = (event) => {
+      pending.forEach((request) => request.reject(new Error(event.message || 'Erro no worker de imagens')))
+      pending.clear()
+      worker?.terminate()
+      worker = null
+    }
+  }
+
+  return worker
+}
+
+/**
+ * Gera as variantes (thumb, medium, full) de uma imagem.
+ * Retorna null quando a compressão não se aplica (formato não suportado ou
+ * navegador sem OffscreenCanvas) — o chamador deve enviar o arquivo original.
+ */
+export async function compressImage(file: File): Promise<CompressedImage[] | null> {
+  if (!file.type.startsWith('image/') || PASSTHROUGH_TYPES.has(file.type)) return null
+
+  const compressor = getWorker()
+  if (!compressor) return null
+
+  const id = ++requestId
+  const variants = IMAGE_VARIANT_ORDER.map((name) => ({ name, ...IMAGE_VARIANTS[name] }))
+
+  try {
+    const results: Array<{ name: ImageVariant; blob: Blob; width: number; height: number }> =
+      await new Promise((resolve, reject) => {
+        pending.set(id, { resolve, reject })
+        compressor.postMessage({ id, file, variants })
+      })
+
+    return results.map((result) => ({
+      variant: result.name,
+      blob: result.blob,
+      width: result.width,
+      height: result.height,
+      extension: EXTENSIONS[result.blob.type],
+    }))
+  } catch (error) {
+    console.error('Error compressing image:', error)
+    return null
+  }
+}
@@ -0,0 +1,73 @@
+/**
+ * Web Worker de compressão de imagens.
+ * Decodifica uma vez, redimensiona para cada variante e re-encoda em WebP
+ * (JPEG onde não há encoder WebP, ex.: Safari) com OffscreenCanvas, fora da
+ * thread principal.
+ */
+
+type CompressRequest = {
+  id: number
+  file: Blob
+  variants: Array<{ name: string; width: number; quality: number }>
+}
+
+type CompressedVariant = {
+  name: string
+  blob: Blob
+  width: number
+  height: number
+}
+
+// tsconfig usa a lib "dom"; tipamos só o que o worker usa do escopo global
+const ctx = self as unknown as {
+  onmessage: ((event: MessageEvent<CompressRequest>) => void) | null
+  postMessage: (message: unknown) => void
+}
+
+// Em ordem de preferência
+const OUTPUT_FORMATS = ['image/webp', 'image/jpeg']
+
+// Sem encoder para o tipo pedido, convertToBlob devolve PNG em silêncio: só
+// aceita o blob se o tipo bater. `formats` começa no formato já escolhido para
+// que todas as variantes saiam com a mesma extensão.
+async function encode(canvas: OffscreenCanvas, formats: string[], quality: number): Promise<Blob> {
+  for (const format of formats) {
+    const blob = await canvas.convertToBlob({ type: format, quality })
+    if (blob.type === format) return blob
+  }
+  throw new Error('Nenhum encoder de imagem disponível')
+}
+
+ctx.onmessage = async (event: MessageEvent<CompressRequest>) => {
+  const { id, file, variants } = event.data
+
+  try {
+    const bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' })
+    const results: CompressedVariant[] = []
+    let formats = OUTPUT_FORMATS
+
+    for (const variant of variants) {
+      const scale = Math.min(1, variant.width / bitmap.width)
+      const width = Math.max(1, Math.round(bitmap.width * scale))
+      const height = Math.max(1, Math.round(bitmap.height * scale))
+
+      const canvas = new OffscreenCanvas(width, height)
+      const context = canvas.getContext('2d')
+      if (!context) throw new Error('OffscreenCanvas 2D indisponível')
+
+      context.imageSmoothingQuality = 'high'
+      context.drawImage(bitmap, 0, 0, width, height)
+
+      const blob = await encode(canvas, formats, variant.quality)
+      formats = [blob.type]
+      results.push({ name: variant.name, blob, width, height })
+    }
+
+    bitmap.close()
+    ctx.postMessage({ id, results })
+  } catch (error) {
+    ctx.postMessage({ id, error: (error as Error).message })
+  }
+}
+
+export {}
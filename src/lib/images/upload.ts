@@ -0,0 +1,183 @@
+/**
+ * ============================================
+ * STORAGE UPLOAD
+ * Upload simples para arquivos pequenos e upload resumível (TUS, em chunks)
+ * para arquivos grandes, direto no endpoint do Supabase Storage
+ * ============================================
+ */
+
+import type { SupabaseClient } from '@supabase/supabase-js'
+
+// O Supabase Storage exige chunks de exatamente 6MB no protocolo TUS
+export const RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+export const RESUMABLE_THRESHOLD = RESUMABLE_CHUNK_SIZE
+
+// Variantes têm caminho único por upload: podem ser cacheadas indefinidamente
+const CACHE_CONTROL = '31536000'
+const RETRY_DELAYS = [0, 1000, 3000, 5000]
+const RESUME_STORAGE_PREFIX = 'tus-upload:'
+
+export type UploadProgress = (uploadedBytes: number, totalBytes: number) => void
+
+interface UploadOptions {
+  supabase: SupabaseClient
+  bucket: string
+  objectPath: string
+  blob: Blob
+  contentType: string
+  onProgress?: UploadProgress
+  // Identifica o arquivo de origem para retomar um upload interrompido
+  fingerprint?: string
+}
+
+/**
+ * Envia um blob para o Storage, escolhendo upload simples ou resumível pelo tamanho.
+ * Retorna o caminho final do objeto (pode ser o de um upload retomado).
+ */
+export async function uploadToStorage(options: UploadOptions): Promise<string> {
+  if (options.blob.size > RESUMABLE_THRESHOLD) {
+    return resumableUpload(options)
+  }
+
+  const { supabase, bucket, objectPath, blob, contentType, onProgress } = options
+  const { error } = await supabase.storage.from(bucket).upload(objectPath, blob, {
+    contentType,
+    cacheControl: CACHE_CONTROL,
+  })
+
+  if (error) {
+    throw new Error(error.message)
+  }
+
+  onProgress?.(blob.size, blob.size)
+  return objectPath
+}
+
+const wait = (ms: number) => new Promise((resolve) => setTimeout(resolve, ms))
+
+const encodeMetadata = (metadata: Record<string, string>) =>
+  Object.entries(metadata)
+    .map(([key, value]) => `${key} ${btoa(unescape(encodeURIComponent(value)))}`)
+    .join(',')
+
+function readResumeState(fingerprint?: string): { uploadUrl: string; objectPath: string } | null {
+  if (!fingerprint || typeof localStorage === 'undefined') return null
+  try {
+    const raw = localStorage.getItem(RESUME_STORAGE_PREFIX + fingerprint)
+    return raw ? JSON.parse(raw) : null
+  } catch {
+    return null
+  }
+}
+
+function writeResumeState(fingerprint: string | undefined, state: { uploadUrl: string; objectPath: string } | null) {
+  if (!fingerprint || typeof localStorage === 'undefined') return
+  if (state) localStorage.setItem(RESUME_STORAGE_PREFIX + fingerprint, JSON.stringify(state))
+  else localStorage.removeItem(RESUME_STORAGE_PREFIX + fingerprint)
+}
+
+async function resumableUpload({
+  supabase,
+  bucket,
+  objectPath,
+  blob,
+  contentType,
+  onProgress,
+  fingerprint,
+}: UploadOptions): Promise<string> {
+  const { data: { session } } = await supabase.auth.getSession()
+  if (!session) throw new Error('Sessão expirada. Faça login novamente.')
+
+  const endpoint = `${process.env.NEXT_PUBLIC_SUPABASE_URL}/storage/v1/upload/resumable`
+  const baseHeaders = {
+    authorization: `Bearer ${session.access_token}`,
+    apikey: process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!,
+    'tus-resumable': '1.0.0',
+  }
+
+  const createUpload = async (path: string) => {
+    const response = await fetch(endpoint, {
+      method: 'POST',
+      headers: {
+        ...baseHeaders,
+        'upload-length': String(blob.size),
+        'upload-metadata': encodeMetadata({
+          bucketName: bucket,
+          objectName: path,
+          contentType,
+          cacheControl: CACHE_CONTROL,
+        }),
+      },
+    })
+    const location = response.headers.get('location')
+    if (!response.ok || !location) {
+      throw new Error(`Erro ao iniciar upload (${response.status})`)
+    }
+    return location
+  }
+
+  // Retomar upload anterior do mesmo arquivo, se existir
+  const resumed = readResumeState(fingerprint)
+  let finalPath = resumed?.objectPath || objectPath
+  let uploadUrl = resumed?.uploadUrl || null
+  let offset = 0
+
+  if (uploadUrl) {
+    const head = await fetch(uploadUrl, { method: 'HEAD', headers: baseHeaders })
+    if (head.ok) {
+      offset = Number(head.headers.get('upload-offset') || 0)
+    } else {
+      uploadUrl = null
+      finalPath = objectPath
+    }
+  }
+
+  if (!uploadUrl) {
+    uploadUrl = await createUpload(finalPath)
+    offset = 0
+  }
+  writeResumeState(fingerprint, { uploadUrl, objectPath: finalPath })
+  onProgress?.(offset, blob.size)
+
+  while (offset < blob.size) {
+    const chunk = blob.slice(offset, offset + RESUMABLE_CHUNK_SIZE)
+    let lastError: Error | null = null
+
+    for (const delay of RETRY_DELAYS) {
+      if (delay) await wait(delay)
+      try {
+        const response = await fetch(uploadUrl, {
+          method: 'PATCH',
+          headers: {
+            ...baseHeaders,
+            'upload-offset': String(offset),
+            'content-type': 'application/offset+octet-stream',
+          },
+          body: chunk,
+        })
+
+        if (response.status === 409) {
+          // Offset divergente: perguntar ao servidor onde parou
+          const head = await fetch(uploadUrl, { method: 'HEAD', headers: baseHeaders })
+          offset = Number(head.headers.get('upload-offset') || offset)
+          lastError = null
+          break
+        }
+
+        if (!response.ok) throw new Error(`Erro no upload (${response.status})`)
+
+        offset = Number(response.headers.get('upload-offset') || offset + chunk.size)
+        lastError = null
+        break
+      } catch (error) {
+        lastError = error as Error
+      }
+    }
+
+    if (lastError) throw lastError
+    onProgress?.(offset, blob.size)
+  }
+
+  writeResumeState(fingerprint, null)
+  return finalPath
+}
@@ -0,0 +1,59 @@
+/**
+ * ============================================
+ * IMAGE VARIANTS
+ * Tamanhos gerados no upload e helpers para servir a variante certa
+ * ============================================
+ *
+ * Layout no Storage: `${path}/${id}/${variant}.${ext}` (ex: uploads/abc123/thumb.webp)
+ * URLs antigas (arquivo original, sem variantes) continuam funcionando: os
+ * helpers devolvem a própria URL quando ela não segue o layout.
+ */
+
+export type ImageVariant = 'thumb' | 'medium' | 'full'
+
+export const IMAGE_VARIANTS: Record<ImageVariant, { width: number; quality: number }> = {
+  thumb: { width: 320, quality: 0.75 },
+  medium: { width: 960, quality: 0.8 },
+  full: { width: 1920, quality: 0.82 },
+}
+
+export const IMAGE_VARIANT_ORDER: ImageVariant[] = ['thumb', 'medium', 'full']
+
+const VARIANT_URL_PATTERN = /\/(thumb|medium|full)\.(webp|jpe?g|png)(\?.*)?$/
+
+export function hasImageVariants(url?: string | null): boolean {
+  return !!url && VARIANT_URL_PATTERN.test(url)
+}
+
+/**
+ * URL de uma variante específica (ou a URL original, se não houver variantes)
+ */
+export function getImageVariantUrl(url: string, variant: ImageVariant): string {
+  if (!hasImageVariants(url)) return url
+  return url.replace(VARIANT_URL_PATTERN, (_match, _current, ext, query = '') => `/${variant}.${ext}${query}`)
+}
+
+/**
+ * srcSet com todas as variantes, para o navegador escolher pelo tamanho exibido
+ */
+export function getImageSrcSet(url?: string | null): string | undefined {
+  if (!url || !hasImageVariants(url)) return undefined
+  return IMAGE_VARIANT_ORDER
+    .map((variant) => `${getImageVariantUrl(url, variant)} ${IMAGE_VARIANTS[variant].width}w`)
+    .join(', ')
+}
+
+/**
+ * Props prontas para <img>: src na variante pedida + srcSet/sizes quando disponíveis
+ */
+export function getResponsiveImageProps(
+  url: string,
+  variant: ImageVariant,
+  sizes?: string
+): { src: string; srcSet?: string; sizes?: string } {
+  const srcSet = getImageSrcSet(url)
+  return {
+    src: getImageVariantUrl(url, variant),
+    ...(srcSet ? { srcSet, sizes: sizes || `${IMAGE_VARIANTS[variant].width}px` } : {}),
+  }
+}
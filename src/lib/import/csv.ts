@@ -0,0 +1,147 @@
+/**
+ * ============================================
+ * CSV EM STREAMING
+ * Lê o corpo da requisição em pedaços e devolve um registro por vez, sem
+ * carregar o arquivo inteiro: a memória depende do tamanho de uma linha,
+ * não do arquivo. Aceita aspas (com "" e quebras de linha dentro do campo),
+ * CRLF, BOM e os separadores , ; e TAB (o Excel em pt-BR exporta com ;).
+ * ============================================
+ */
+
+export interface CsvRecord {
+  // Linha do arquivo onde o registro começa (1 = cabeçalho)
+  line: number
+  fields: string[]
+}
+
+// Campo que nunca fecha as aspas não pode crescer sem limite
+const MAX_FIELD_LENGTH = 64 * 1024
+
+const DELIMITERS = [',', ';', '\t']
+
+export function detectDelimiter(sample: string) {
+  const firstLine = sample.split(/\r?\n/, 1)[0]
+  let best = ','
+  let bestCount = 0
+  for (const delimiter of DELIMITERS) {
+    const count = firstLine.split(delimiter).length - 1
+    if (count > bestCount) {
+      best = delimiter
+      bestCount = count
+    }
+  }
+  return best
+}
+
+export const stripAccents = (value: string) => value.normalize('NFD').replace(/[\u0300-\u036f]/g, '')
+
+/**
+ * Chave de cabeçalho normalizada: sem acento, minúscula, só [a-z0-9_]
+ * ("Número de Série" -> "numero_de_serie").
+ */
+export function normalizeHeader(header: string) {
+  return stripAccents(header)
+    .toLowerCase()
+    .trim()
+    .replace(/[^a-z0-9]+/g, '_')
+    .replace(/^_|_$/g, '')
+}
+
+export async function* parseCsv(
+  stream: ReadableStream<Uint8Array>,
+  options: { delimiter?: string } = {}
+): AsyncGenerator<CsvRecord> {
+  const reader = stream.pipeThrough(new TextDecoderStream()).getReader()
+
+  let delimiter = options.delimiter
+  let fields: string[] = []
+  let field = ''
+  let inQuotes = false
+  // Aspas lidas no fim de um pedaço: pode ser "" (escape) partido entre pedaços
+  let pendingQuote = false
+  let line = 1
+  let recordLine = 1
+
+  const endField = () => {
+    fields.push(field)
+    field = ''
+  }
+
+  const endRecord = (): CsvRecord | null => {
+    endField()
+    const record = fields
+    fields = []
+    // Linhas em branco não viram registro
+    if (record.length === 1 && record[0] === '') return null
+    return { line: recordLine, fields: record }
+  }
+
+  // Cabeçalho acumulado até a primeira quebra de linha, para detectar o separador
+  let head = ''
+  let detecting = true
+
+  while (true) {
+    const { value, done } = await reader.read()
+    if (done && !head) break
+
+    let text = value ?? ''
+    if (detecting) {
+      head += text
+      if (!done && !head.includes('\n') && head.length < MAX_FIELD_LENGTH) continue
+      if (head.charCodeAt(0) === 0xfeff) head = head.slice(1)
+      delimiter ??= detectDelimiter(head)
+      text = head
+      head = ''
+      detecting = false
+    }
+
+    for (let i = 0; i < text.length; i++) {
+      const char = text[i]
+
+      if (pendingQuote) {
+        pendingQuote = false
+        if (char === '"') {
+          field += '"'
+          continue
+        }
+        inQuotes = false
+      }
+
+      if (inQuotes) {
+        if (char === '"') {
+          pendingQuote = true
+        } else {
+          if (char === '\n') line++
+          field += char
+          if (field.length > MAX_FIELD_LENGTH) {
+            throw new Error(`Campo entre aspas sem fechamento a partir da linha ${recordLine}`)
+          }
+        }
+        continue
+      }
+
+      if (char === '"' && field === '') {
+        inQuotes = true
+      } else if (char === delimiter) {
+        endField()
+      } else if (char === '\n') {
+        const record = endRecord()
+        line++
+        if (record) yield record
+        recordLine = line
+      } else if (char !== '\r') {
+        field += char
+        if (field.length > MAX_FIELD_LENGTH) {
+          throw new Error(`Campo muito longo na linha ${recordLine}`)
+        }
+      }
+    }
+    if (done) break
+  }
+
+  if (inQuotes && !pendingQuote) {
+    throw new Error(`Campo entre aspas sem fechamento a partir da linha ${recordLine}`)
+  }
+  const record = endRecord()
+  if (record) yield record
+}
@@ -0,0 +1,230 @@
+/**
+ * ============================================
+ * IMPORTAÇÃO - ENTIDADES
+ * Colunas aceitas (com apelidos em pt-BR e en), validação e chave de
+ * deduplicação de cada entidade importável por CSV.
+ * ============================================
+ */
+
+import type { CacheEntity } from '@/lib/cache/data-cache'
+import { stripAccents } from './csv'
+import type { EquipmentCategory, EquipmentStatus } from '@/actions/equipments'
+
+export type ImportEntity = 'clients' | 'freelancers' | 'equipments'
+
+export type ImportRecord = Record<string, string | number | string[] | null>
+
+export type BuildResult = { record: ImportRecord } | { error: string }
+
+export interface ImportSpec {
+  table: string
+  cache: CacheEntity
+  // Coluna usada para não duplicar registros (na planilha e no banco)
+  dedupeColumn: string
+  // Compara a chave sem diferenciar maiúsculas (lower(email) no banco)
+  dedupeCaseInsensitive?: boolean
+  // Coluna -> cabeçalhos aceitos (já normalizados, ver normalizeHeader)
+  columns: Record<string, string[]>
+  build: (row: Record<string, string>) => BuildResult
+}
+
+const EMAIL_PATTERN = /^[^\s@]+@[^\s@]+\.[^\s@]+$/
+
+const text = (value: string | undefined) => {
+  const trimmed = value?.trim()
+  return trimmed ? trimmed : null
+}
+
+const email = (value: string | undefined) => text(value)?.toLowerCase() ?? null
+
+// Aceita "1.234,56", "1234.56" e "R$ 1.234"
+export function parseAmount(value: string | undefined): number | null | undefined {
+  const raw = text(value)?.replace(/[R$\s]/g, '')
+  if (!raw) return null
+  const normalized = raw.includes(',') ? raw.replace(/\./g, '').replace(',', '.') : raw
+  const amount = Number(normalized)
+  return Number.isFinite(amount) && amount >= 0 ? amount : undefined
+}
+
+// Aceita AAAA-MM-DD e DD/MM/AAAA
+export function parseDate(value: string | undefined): string | null | undefined {
+  const raw = text(value)
+  if (!raw) return null
+  const br = raw.match(/^(\d{2})\/(\d{2})\/(\d{4})$/)
+  const iso = br ? `${br[3]}-${br[2]}-${br[1]}` : raw.slice(0, 10)
+  if (!/^\d{4}-\d{2}-\d{2}$/.test(iso) || Number.isNaN(new Date(iso).getTime())) return undefined
+  return iso
+}
+
+const lookup = <T extends string>(labels: Record<T, string[]>, value: string | undefined): T | null | undefined => {
+  const raw = text(value)
+  if (!raw) return null
+  const key = stripAccents(raw).toUpperCase()
+  for (const [code, aliases] of Object.entries(labels) as Array<[T, string[]]>) {
+    if (key === code || aliases.includes(key)) return code
+  }
+  return undefined
+}
+
+const EQUIPMENT_CATEGORIES: Record<EquipmentCategory, string[]> = {
+  CAMERA: ['CAMERA', 'CAMERAS'],
+  LENS: ['LENTE', 'LENTES', 'OBJETIVA'],
+  AUDIO: ['AUDIO', 'SOM', 'MICROFONE'],
+  LIGHTING: ['ILUMINACAO', 'LUZ', 'LUZES'],
+  GRIP: ['GRIP', 'MAQUINARIA'],
+  DRONE: ['DRONE', 'DRONES'],
+  ACCESSORY: ['ACESSORIO', 'ACESSORIOS'],
+  OTHER: ['OUTRO', 'OUTROS'],
+}
+
+const EQUIPMENT_STATUSES: Record<EquipmentStatus, string[]> = {
+  AVAILABLE: ['DISPONIVEL'],
+  IN_USE: ['EM USO', 'EM_USO'],
+  MAINTENANCE: ['MANUTENCAO', 'EM MANUTENCAO'],
+  RETIRED: ['APOSENTADO', 'DESATIVADO'],
+  LOST: ['PERDIDO', 'EXTRAVIADO'],
+}
+
+// Mesmos valores exibidos em freelancers-grid (Disponível / Ocupado)
+const FREELANCER_STATUSES: Record<'AVAILABLE' | 'BUSY', string[]> = {
+  AVAILABLE: ['DISPONIVEL', 'ATIVO'],
+  BUSY: ['OCUPADO', 'INDISPONIVEL'],
+}
+
+export const IMPORT_SPECS: Record<ImportEntity, ImportSpec> = {
+  clients: {
+    table: 'clients',
+    cache: 'clients',
+    dedupeColumn: 'email',
+    dedupeCaseInsensitive: true,
+    columns: {
+      name: ['name', 'nome', 'cliente', 'razao_social'],
+      email: ['email', 'e_mail'],
+      phone: ['phone', 'telefone', 'celular', 'whatsapp'],
+      company: ['company', 'empresa'],
+      notes: ['notes', 'observacoes', 'observacao', 'notas'],
+    },
+    build: (row) => {
+      const name = text(row.name)
+      if (!name) return { error: 'Nome é obrigatório' }
+      const address = email(row.email)
+      if (address && !EMAIL_PATTERN.test(address)) return { error: `E-mail inválido: ${address}` }
+      return {
+        record: {
+          name,
+          email: address,
+          phone: text(row.phone),
+          company: text(row.company),
+          notes: text(row.notes),
+        },
+      }
+    },
+  },
+
+  freelancers: {
+    table: 'freelancers',
+    cache: 'freelancers',
+    dedupeColumn: 'email',
+    dedupeCaseInsensitive: true,
+    columns: {
+      name: ['name', 'nome'],
+      email: ['email', 'e_mail'],
+      phone: ['phone', 'telefone', 'celular', 'whatsapp'],
+      role: ['role', 'funcao', 'cargo'],
+      specialty: ['specialty', 'especialidade', 'especialidades', 'skills'],
+      portfolio: ['portfolio', 'site'],
+      daily_rate: ['daily_rate', 'diaria', 'valor_diaria'],
+      status: ['status', 'situacao'],
+      notes: ['notes', 'observacoes', 'observacao', 'notas'],
+    },
+    build: (row) => {
+      const name = text(row.name)
+      if (!name) return { error: 'Nome é obrigatório' }
+      const address = email(row.email)
+      if (!address) return { error: 'E-mail é obrigatório' }
+      if (!EMAIL_PATTERN.test(address)) return { error: `E-mail inválido: ${address}` }
+      const dailyRate = parseAmount(row.daily_rate)
+      if (dailyRate === undefined) return { error: `Diária inválida: ${row.daily_rate}` }
+      const status = lookup(FREELANCER_STATUSES, row.status)
+      if (status === undefined) return { error: `Status inválido: ${row.status}` }
+      return {
+        record: {
+          name,
+          email: address,
+          phone: text(row.phone),
+          role: text(row.role) ?? 'Freelancer',
+          // Especialidades separadas por | ou / na mesma célula
+          specialty: (text(row.specialty) ?? '').split(/[|/]/).map((s) => s.trim()).filter(Boolean),
+          portfolio: text(row.portfolio),
+          daily_rate: dailyRate,
+          status: status ?? 'AVAILABLE',
+          notes: text(row.notes),
+          rating: 0,
+        },
+      }
+    },
+  },
+
+  equipments: {
+    table: 'equipments',
+    cache: 'equipments',
+    dedupeColumn: 'serial_number',
+    columns: {
+      name: ['name', 'nome', 'equipamento'],
+      brand: ['brand', 'marca'],
+      model: ['model', 'modelo'],
+      category: ['category', 'categoria', 'tipo'],
+      serial_number: ['serial_number', 'serial', 'numero_de_serie', 'n_serie', 'numero_serie'],
+      status: ['status', 'situacao'],
+      purchase_date: ['purchase_date', 'data_de_compra', 'data_compra'],
+      purchase_price: ['purchase_price', 'valor_de_compra', 'valor_compra', 'preco'],
+      daily_rate: ['daily_rate', 'diaria', 'valor_diaria'],
+      notes: ['notes', 'observacoes', 'observacao', 'notas'],
+    },
+    build: (row) => {
+      const name = text(row.name)
+      if (!name) return { error: 'Nome é obrigatório' }
+      const category = lookup(EQUIPMENT_CATEGORIES, row.category)
+      if (category === undefined) return { error: `Categoria inválida: ${row.category}` }
+      const status = lookup(EQUIPMENT_STATUSES, row.status)
+      if (status === undefined) return { error: `Status inválido: ${row.status}` }
+      const purchaseDate = parseDate(row.purchase_date)
+      if (purchaseDate === undefined) return { error: `Data de compra inválida: ${row.purchase_date}` }
+      const purchasePrice = parseAmount(row.purchase_price)
+      if (purchasePrice === undefined) return { error: `Valor de compra inválido: ${row.purchase_price}` }
+      const dailyRate = parseAmount(row.daily_rate)
+      if (dailyRate === undefined) return { error: `Diária inválida: ${row.daily_rate}` }
+      return {
+        record: {
+          name,
+          brand: text(row.brand),
+          model: text(row.model),
+          category: category ?? 'OTHER',
+          serial_number: text(row.serial_number),
+          status: status ?? 'AVAILABLE',
+          purchase_date: purchaseDate,
+          purchase_price: purchasePrice,
+          daily_rate: dailyRate,
+          notes: text(row.notes),
+        },
+      }
+    },
+  },
+}
+
+/**
+ * Índice de cada coluna conhecida no cabeçalho do arquivo. Cabeçalhos
+ * desconhecidos são ignorados; falta de uma coluna obrigatória é erro.
+ */
+export function mapHeader(spec: ImportSpec, header: string[]) {
+  const index: Record<string, number> = {}
+  header.forEach((name, i) => {
+    for (const [column, aliases] of Object.entries(spec.columns)) {
+      if (aliases.includes(name) && !(column in index)) index[column] = i
+    }
+  })
+  if (!('name' in index)) {
+    throw new Error(`Coluna "nome" não encontrada. Colunas aceitas: ${Object.keys(spec.columns).join(', ')}`)
+  }
+  return index
+}
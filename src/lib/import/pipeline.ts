@@ -0,0 +1,182 @@
+/**
+ * ============================================
+ * IMPORTAÇÃO - PIPELINE
+ * Consome os registros do CSV em lotes: valida, remove duplicados (no lote
+ * e contra o banco, pela coluna de deduplicação) e insere cada lote com um
+ * único INSERT de várias linhas. Só um lote fica em memória por vez; como
+ * cada lote é gravado antes do próximo ser checado, duplicados entre lotes
+ * também são encontrados pela consulta ao banco.
+ * ============================================
+ */
+
+import type { SupabaseClient } from '@supabase/supabase-js'
+import { normalizeHeader, type CsvRecord } from './csv'
+import { mapHeader, type ImportRecord, type ImportSpec } from './entities'
+
+export const IMPORT_CHUNK_SIZE = 500
+
+// Problemas por linha enviados individualmente; acima disso, só a contagem
+const MAX_REPORTED_ISSUES = 1000
+
+export type ImportIssueKind = 'invalid' | 'duplicate' | 'failed'
+
+export interface ImportIssue {
+  line: number
+  kind: ImportIssueKind
+  message: string
+}
+
+export interface ImportProgress {
+  processed: number
+  inserted: number
+  duplicates: number
+  invalid: number
+  failed: number
+}
+
+export type ImportEvent =
+  | ({ type: 'progress' } & ImportProgress)
+  | ({ type: 'issue' } & ImportIssue)
+  | ({ type: 'done'; dryRun: boolean; issuesTruncated: boolean } & ImportProgress)
+
+interface PendingRow {
+  line: number
+  record: ImportRecord
+}
+
+interface ImportOptions {
+  supabase: SupabaseClient
+  organizationId: string
+  spec: ImportSpec
+  records: AsyncIterable<CsvRecord>
+  emit: (event: ImportEvent) => void
+  chunkSize?: number
+  // Só valida e deduplica, sem gravar ("inserted" conta o que seria inserido;
+  // repetidos em lotes diferentes do arquivo só aparecem na importação real)
+  dryRun?: boolean
+}
+
+export async function runImport({
+  supabase,
+  organizationId,
+  spec,
+  records,
+  emit,
+  chunkSize = IMPORT_CHUNK_SIZE,
+  dryRun = false,
+}: ImportOptions): Promise<ImportProgress> {
+  const progress: ImportProgress = { processed: 0, inserted: 0, duplicates: 0, invalid: 0, failed: 0 }
+  let reported = 0
+
+  const report = (issue: ImportIssue) => {
+    progress[issue.kind === 'failed' ? 'failed' : issue.kind === 'duplicate' ? 'duplicates' : 'invalid']++
+    if (reported++ < MAX_REPORTED_ISSUES) emit({ type: 'issue', ...issue })
+  }
+
+  // Insere o lote; se o banco recusar, divide ao meio até isolar as linhas com erro
+  const insert = async (rows: PendingRow[]): Promise<void> => {
+    if (rows.length === 0) return
+    const { error } = await supabase
+      .from(spec.table)
+      .insert(rows.map((row) => ({ ...row.record, organization_id: organizationId })))
+
+    if (!error) {
+      progress.inserted += rows.length
+      return
+    }
+    if (rows.length === 1) {
+      report({ line: rows[0].line, kind: 'failed', message: error.message })
+      return
+    }
+    const middle = Math.ceil(rows.length / 2)
+    await insert(rows.slice(0, middle))
+    await insert(rows.slice(middle))
+  }
+
+  const processChunk = async (chunk: PendingRow[]) => {
+    const key = (row: PendingRow) => {
+      const value = row.record[spec.dedupeColumn] as string | null
+      return value && spec.dedupeCaseInsensitive ? value.toLowerCase() : value
+    }
+    const keys = [...new Set(chunk.map(key).filter((k): k is string => !!k))]
+
+    const existing = new Set<string>()
+    if (keys.length > 0 && spec.dedupeCaseInsensitive) {
+      // lower(email) = ANY(...) via função, usando o índice de expressão
+      const { data, error } = await supabase.rpc('import_existing_emails', {
+        p_table: spec.table,
+        p_organization_id: organizationId,
+        p_emails: keys,
+      })
+
+      if (error) throw new Error('Erro ao verificar duplicados: ' + error.message)
+      for (const value of (data || []) as string[]) existing.add(value)
+    } else if (keys.length > 0) {
+      const { data, error } = await supabase
+        .from(spec.table)
+        .select(spec.dedupeColumn)
+        .eq('organization_id', organizationId)
+        .in(spec.dedupeColumn, keys)
+
+      if (error) throw new Error('Erro ao verificar duplicados: ' + error.message)
+      for (const row of (data || []) as unknown as Record<string, string>[]) {
+        existing.add(row[spec.dedupeColumn])
+      }
+    }
+
+    const fresh: PendingRow[] = []
+    const seen = new Set<string>()
+    for (const row of chunk) {
+      const value = key(row)
+      if (value && (existing.has(value) || seen.has(value))) {
+        report({
+          line: row.line,
+          kind: 'duplicate',
+          message: existing.has(value) ? `${value} já cadastrado` : `${value} repetido no arquivo`,
+        })
+        continue
+      }
+      if (value) seen.add(value)
+      fresh.push(row)
+    }
+
+    if (dryRun) {
+      progress.inserted += fresh.length
+    } else {
+      await insert(fresh)
+    }
+    emit({ type: 'progress', ...progress })
+  }
+
+  let columns: Record<string, number> | null = null
+  let chunk: PendingRow[] = []
+
+  for await (const { line, fields } of records) {
+    if (!columns) {
+      columns = mapHeader(spec, fields.map(normalizeHeader))
+      continue
+    }
+
+    progress.processed++
+    const row: Record<string, string> = {}
+    for (const [column, index] of Object.entries(columns)) row[column] = fields[index] ?? ''
+
+    const result = spec.build(row)
+    if ('error' in result) {
+      report({ line, kind: 'invalid', message: result.error })
+    } else {
+      chunk.push({ line, record: result.record })
+    }
+
+    if (chunk.length >= chunkSize) {
+      await processChunk(chunk)
+      chunk = []
+    }
+  }
+
+  if (!columns) throw new Error('Arquivo vazio')
+  if (chunk.length > 0 || progress.processed === 0) await processChunk(chunk)
+
+  emit({ type: 'done', dryRun, issuesTruncated: reported > MAX_REPORTED_ISSUES, ...progress })
+  return progress
+}
@@ -0,0 +1,148 @@
+'use client'
+
+/**
+ * ============================================
+ * FILA DE MUTAÇÕES OTIMISTAS
+ * A UI aplica a mudança na hora e a fila envia ao servidor em lotes:
+ * mudanças seguidas na mesma chave (ex.: o mesmo card arrastado várias
+ * vezes) viram uma só, e voltar ao valor original cancela o envio.
+ * Se o servidor não confirmar uma chave, a UI volta ao último valor
+ * confirmado só daquela chave.
+ * ============================================
+ */
+
+import { useEffect, useRef, useState } from 'react'
+
+export type QueuedChange<V> = { key: string; value: V }
+
+export interface MutationQueueOptions<V> {
+  // Envia um lote; devolve as chaves confirmadas (as ausentes são desfeitas)
+  commit: (changes: QueuedChange<V>[]) => Promise<string[]>
+  // Valores a restaurar na UI (último estado confirmado de cada chave)
+  onRollback: (changes: QueuedChange<V>[]) => void
+  onPendingChange?: (pending: number) => void
+  // Espera após a última mudança antes de enviar
+  delay?: number
+  // Espera máxima desde a primeira mudança pendente
+  maxWait?: number
+}
+
+export class MutationQueue<V> {
+  private pending = new Map<string, V>()
+  private inFlight: Map<string, V> | null = null
+  // Último valor confirmado das chaves com mudanças pendentes ou em voo
+  private confirmed = new Map<string, V>()
+  private timer: ReturnType<typeof setTimeout> | null = null
+  private firstPendingAt = 0
+
+  constructor(private options: MutationQueueOptions<V>) {}
+
+  setOptions(options: MutationQueueOptions<V>) {
+    this.options = options
+  }
+
+  get size() {
+    return this.pending.size + (this.inFlight?.size ?? 0)
+  }
+
+  /**
+   * Registra a mudança já aplicada na UI. `previous` é o valor exibido antes
+   * dela; só é usado na primeira mudança da chave (vira o ponto de rollback).
+   */
+  enqueue(key: string, value: V, previous: V) {
+    if (!this.confirmed.has(key)) this.confirmed.set(key, previous)
+
+    // O servidor terá o valor em voo (se houver) ou o confirmado
+    const baseline = this.inFlight?.has(key) ? this.inFlight.get(key) : this.confirmed.get(key)
+    if (Object.is(value, baseline)) {
+      this.pending.delete(key)
+      if (!this.inFlight?.has(key)) this.confirmed.delete(key)
+    } else {
+      if (this.pending.size === 0) this.firstPendingAt = Date.now()
+      this.pending.set(key, value)
+    }
+
+    this.notify()
+    this.schedule()
+  }
+
+  private schedule() {
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+    if (this.pending.size === 0 || this.inFlight) return
+
+    const { delay = 400, maxWait = 2000 } = this.options
+    const wait = Math.max(0, Math.min(delay, this.firstPendingAt + maxWait - Date.now()))
+    this.timer = setTimeout(() => void this.flush(), wait)
+  }
+
+  /** Envia o que estiver pendente agora. Um lote por vez, na ordem das mudanças. */
+  async flush() {
+    if (this.timer) clearTimeout(this.timer)
+    this.timer = null
+    if (this.inFlight || this.pending.size === 0) return
+
+    const batch = this.pending
+    this.pending = new Map()
+    this.inFlight = batch
+
+    let confirmedKeys = new Set<string>()
+    try {
+      confirmedKeys = new Set(await this.options.commit([...batch].map(([key, value]) => ({ key, value }))))
+    } catch (error) {
+      console.error('Erro ao enviar lote de mutações:', error)
+    }
+
+    const rollback: QueuedChange<V>[] = []
+    for (const [key, value] of batch) {
+      if (confirmedKeys.has(key)) {
+        this.confirmed.set(key, value)
+      } else if (!this.pending.has(key)) {
+        // Mudanças mais novas da mesma chave seguem valendo; sem elas, desfaz
+        rollback.push({ key, value: this.confirmed.get(key) as V })
+      }
+      if (!this.pending.has(key)) this.confirmed.delete(key)
+    }
+
+    this.inFlight = null
+    if (this.pending.size > 0) this.firstPendingAt = Date.now()
+    this.notify()
+    if (rollback.length > 0) this.options.onRollback(rollback)
+    this.schedule()
+  }
+
+  private notify() {
+    this.options.onPendingChange?.(this.size)
+  }
+}
+
+/**
+ * Fila ligada ao ciclo de vida do componente: envia na hora ao esconder a
+ * aba ou desmontar, e expõe `isSaving` para indicar envio pendente.
+ */
+export function useMutationQueue<V>(options: MutationQueueOptions<V>) {
+  const [isSaving, setIsSaving] = useState(false)
+  const withPending = { ...options, onPendingChange: (pending: number) => setIsSaving(pending > 0) }
+
+  const queueRef = useRef<MutationQueue<V> | null>(null)
+  if (!queueRef.current) queueRef.current = new MutationQueue(withPending)
+
+  // Callbacks sempre atualizados (fecham sobre o estado do render atual)
+  useEffect(() => {
+    queueRef.current?.setOptions(withPending)
+  })
+
+  useEffect(() => {
+    const queue = queueRef.current
+    const flushWhenHidden = () => {
+      if (document.visibilityState === 'hidden') void queue?.flush()
+    }
+    document.addEventListener('visibilitychange', flushWhenHidden)
+    return () => {
+      document.removeEventListener('visibilitychange', flushWhenHidden)
+      void queue?.flush()
+    }
+  }, [])
+
+  return { queue: queueRef.current, isSaving }
+}
@@ -0,0 +1,148 @@
+/**
+ * ============================================
+ * POOL DE PROCESSOS
+ * Número fixo de processos filhos (child_process.fork) com fila limitada:
+ * trabalho pesado de CPU sai do processo do Next. Cada processo atende um job
+ * por vez; job que estoura o timeout derruba o processo (outro sobe no lugar).
+ * Processos ociosos são encerrados depois de um tempo.
+ * ============================================
+ */
+
+import { fork, type ChildProcess } from 'node:child_process'
+
+export interface ProcessPoolOptions {
+  script: string
+  size: number
+  maxQueue: number
+  timeoutMs: number
+  idleMs: number
+}
+
+interface Job<T> {
+  id: number
+  payload: unknown
+  resolve: (value: T) => void
+  reject: (error: Error) => void
+}
+
+interface Slot {
+  child: ChildProcess
+  job: Job<any> | null
+  timer: ReturnType<typeof setTimeout> | null
+}
+
+export class PoolQueueFullError extends Error {
+  constructor() {
+    super('Fila de processamento cheia, tente novamente em instantes')
+    this.name = 'PoolQueueFullError'
+  }
+}
+
+export class ProcessPool<T> {
+  private readonly slots: Slot[] = []
+  private readonly queue: Job<T>[] = []
+  private nextId = 1
+  private idleTimer: ReturnType<typeof setTimeout> | null = null
+
+  constructor(private readonly options: ProcessPoolOptions) {}
+
+  get stats() {
+    return {
+      workers: this.slots.length,
+      busy: this.slots.filter((slot) => slot.job).length,
+      queued: this.queue.length,
+    }
+  }
+
+  run(payload: unknown): Promise<T> {
+    if (this.queue.length >= this.options.maxQueue) {
+      return Promise.reject(new PoolQueueFullError())
+    }
+
+    return new Promise<T>((resolve, reject) => {
+      this.queue.push({ id: this.nextId++, payload, resolve, reject })
+      this.dispatch()
+    })
+  }
+
+  private dispatch() {
+    if (this.idleTimer) {
+      clearTimeout(this.idleTimer)
+      this.idleTimer = null
+    }
+
+    while (this.queue.length > 0) {
+      let slot = this.slots.find((candidate) => !candidate.job)
+      if (!slot) {
+        if (this.slots.length >= this.options.size) return
+        slot = this.spawn()
+      }
+
+      const job = this.queue.shift()!
+      slot.job = job
+      slot.timer = setTimeout(() => {
+        this.fail(slot!, new Error(`Tempo limite de ${this.options.timeoutMs}ms excedido`))
+      }, this.options.timeoutMs)
+      slot.child.send({ id: job.id, payload: job.payload })
+    }
+
+    this.scheduleIdle()
+  }
+
+  private spawn(): Slot {
+    // serialization advanced: Uint8Array trafega sem base64
+    const child = fork(this.options.script, [], { serialization: 'advanced', stdio: 'inherit' })
+    const slot: Slot = { child, job: null, timer: null }
+
+    child.on('message', (message: { id: number; ok: boolean; result?: T; error?: string }) => {
+      const job = slot.job
+      if (!job || job.id !== message.id) return
+      this.release(slot)
+      if (message.ok) job.resolve(message.result as T)
+      else job.reject(new Error(message.error || 'Falha no worker'))
+      this.dispatch()
+    })
+
+    child.on('exit', () => {
+      this.remove(slot)
+      if (slot.job) {
+        const job = slot.job
+        this.release(slot)
+        job.reject(new Error('Worker encerrado durante o processamento'))
+      }
+      this.dispatch()
+    })
+
+    this.slots.push(slot)
+    return slot
+  }
+
+  private release(slot: Slot) {
+    if (slot.timer) clearTimeout(slot.timer)
+    slot.timer = null
+    slot.job = null
+  }
+
+  private fail(slot: Slot, error: Error) {
+    const job = slot.job
+    this.release(slot)
+    this.remove(slot)
+    slot.child.kill()
+    job?.reject(error)
+    this.dispatch()
+  }
+
+  private remove(slot: Slot) {
+    const index = this.slots.indexOf(slot)
+    if (index >= 0) this.slots.splice(index, 1)
+  }
+
+  private scheduleIdle() {
+    if (this.queue.length > 0 || this.slots.some((slot) => slot.job) || this.slots.length === 0) return
+    this.idleTimer = setTimeout(() => {
+      for (const slot of this.slots.splice(0)) slot.child.kill()
+      this.idleTimer = null
+    }, this.options.idleMs)
+    this.idleTimer.unref?.()
+  }
+}
@@ -0,0 +1,275 @@
+/**
+ * ============================================
+ * PDF DE PROPOSTAS
+ * Renderização no servidor pelo pool de processos (proposal-pdf.worker.mjs),
+ * com cache pelo hash do conteúdo + marca da organização:
+ *   memória (LRU) → Storage (bucket proposal-pdfs) → render
+ * Proposta sem alteração nunca é renderizada de novo; pedidos simultâneos do
+ * mesmo conteúdo compartilham o mesmo render.
+ * ============================================
+ */
+
+import { createHash } from 'node:crypto'
+import { cpus } from 'node:os'
+import { join } from 'node:path'
+import type { SupabaseClient } from '@supabase/supabase-js'
+import { ProcessPool } from './pool'
+
+export const PROPOSAL_PDF_BUCKET = 'proposal-pdfs'
+
+// Mudou o layout do worker? Incrementar invalida todo o cache
+const RENDERER_VERSION = 1
+
+const MEMORY_CACHE_BYTES = 32 * 1024 * 1024
+
+export const PROPOSAL_PDF_SELECT = `
+  id, organization_id, token, title, description, discount, valid_until, status,
+  primary_color, payment_terms,
+  clients (name, company, email, phone),
+  organizations (name, logo, email, phone, website, cnpj, address, bank_name, agency, account_number, pix_key, primary_color, default_terms, show_bank_info),
+  items:proposal_items (description, quantity, unit_price, total, order),
+  optionals:proposal_optionals (title, description, price, is_selected, order)
+`
+
+export interface ProposalPdfDocument {
+  title: string
+  description: string | null
+  validUntil: string | null
+  discountPercent: number
+  paymentTerms: string | null
+  primaryColor: string
+  client: { name: string; company: string | null; email: string | null; phone: string | null } | null
+  organization: {
+    name: string
+    logo: string | null
+    cnpj: string | null
+    email: string | null
+    phone: string | null
+    website: string | null
+    showBankInfo: boolean
+    bankName: string | null
+    agency: string | null
+    accountNumber: string | null
+    pixKey: string | null
+    terms: string | null
+  }
+  items: Array<{ description: string; quantity: number; unitPrice: number; total: number }>
+  optionals: Array<{ title: string; description: string | null; price: number; selected: boolean }>
+  totals: { base: number; optionals: number; discount: number; total: number }
+}
+
+export interface ProposalPdf {
+  pdf: Uint8Array
+  hash: string
+  fileName: string
+  source: 'memory' | 'storage' | 'rendered'
+}
+
+const byOrder = (a: { order?: number | null }, b: { order?: number | null }) => (a.order ?? 0) - (b.order ?? 0)
+
+/**
+ * Normaliza a proposta (linha de PROPOSAL_PDF_SELECT) no documento que o worker
+ * desenha. Tudo que aparece no PDF passa por aqui, então o hash deste objeto
+ * identifica o arquivo. Totais iguais aos da página pública.
+ */
+export function buildProposalPdfDocument(proposal: any): ProposalPdfDocument {
+  const org = proposal.organizations || {}
+  const items = [...(proposal.items || [])].sort(byOrder).map((item: any) => ({
+    description: item.description || '',
+    quantity: Number(item.quantity) || 0,
+    unitPrice: Number(item.unit_price) || 0,
+    total: Number(item.total) || 0,
+  }))
+  const optionals = [...(proposal.optionals || [])].sort(byOrder).map((optional: any) => ({
+    title: optional.title || '',
+    description: optional.description || null,
+    price: Number(optional.price) || 0,
+    selected: !!optional.is_selected,
+  }))
+
+  const discountPercent = Number(proposal.discount) || 0
+  const base = items.reduce((sum, item) => sum + item.total, 0)
+  const optionalsTotal = optionals.filter((optional) => optional.selected).reduce((sum, optional) => sum + optional.price, 0)
+  const discount = base * (discountPercent / 100)
+
+  return {
+    title: proposal.title || 'Proposta',
+    description: proposal.description || null,
+    validUntil: proposal.valid_until || null,
+    discountPercent,
+    paymentTerms: proposal.payment_terms || null,
+    primaryColor: proposal.primary_color || org.primary_color || '#18181b',
+    client: proposal.clients
+      ? {
+          name: proposal.clients.name,
+          company: proposal.clients.company || null,
+          email: proposal.clients.email || null,
+          phone: proposal.clients.phone || null,
+        }
+      : null,
+    organization: {
+      name: org.name || '',
+      logo: org.logo || null,
+      cnpj: org.cnpj || null,
+      email: org.email || null,
+      phone: org.phone || null,
+      website: org.website || null,
+      showBankInfo: !!org.show_bank_info,
+      bankName: org.bank_name || null,
+      agency: org.agency || null,
+      accountNumber: org.account_number || null,
+      pixKey: org.pix_key || null,
+      terms: org.default_terms || null,
+    },
+    items,
+    optionals,
+    totals: { base, optionals: optionalsTotal, discount, total: base + optionalsTotal - discount },
+  }
+}
+
+export function proposalPdfHash(doc: ProposalPdfDocument): string {
+  return createHash('sha256').update(JSON.stringify([RENDERER_VERSION, doc])).digest('hex').slice(0, 32)
+}
+
+export function proposalPdfFileName(doc: ProposalPdfDocument): string {
+  const slug = doc.title
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .replace(/[^a-zA-Z0-9]+/g, '-')
+    .replace(/^-+|-+$/g, '')
+    .toLowerCase()
+    .slice(0, 80)
+  return `proposta-${slug || 'sem-titulo'}.pdf`
+}
+
+// Estado do módulo em globalThis: sobrevive ao HMR e é único por processo
+const state = ((globalThis as any).__proposalPdf ??= {
+  pool: null as ProcessPool<Uint8Array> | null,
+  memory: new Map<string, Uint8Array>(),
+  memoryBytes: 0,
+  inflight: new Map<string, Promise<ProposalPdf>>(),
+}) as {
+  pool: ProcessPool<Uint8Array> | null
+  memory: Map<string, Uint8Array>
+  memoryBytes: number
+  inflight: Map<string, Promise<ProposalPdf>>
+}
+
+function getPool() {
+  state.pool ??= new ProcessPool<Uint8Array>({
+    script: join(process.cwd(), 'src', 'lib', 'pdf', 'proposal-pdf.worker.mjs'),
+    size: Number(process.env.PDF_WORKERS) || Math.max(1, Math.min(4, cpus().length - 1)),
+    maxQueue: Number(process.env.PDF_MAX_QUEUE) || 200,
+    timeoutMs: 30_000,
+    idleMs: 60_000,
+  })
+  return state.pool
+}
+
+export function proposalPdfPoolStats() {
+  return state.pool?.stats ?? { workers: 0, busy: 0, queued: 0 }
+}
+
+function memoryGet(hash: string) {
+  const pdf = state.memory.get(hash)
+  if (pdf) {
+    // LRU: reinsere no fim
+    state.memory.delete(hash)
+    state.memory.set(hash, pdf)
+  }
+  return pdf
+}
+
+function memorySet(hash: string, pdf: Uint8Array) {
+  if (state.memory.has(hash) || pdf.byteLength > MEMORY_CACHE_BYTES / 4) return
+  state.memory.set(hash, pdf)
+  state.memoryBytes += pdf.byteLength
+  for (const [key, value] of state.memory) {
+    if (state.memoryBytes <= MEMORY_CACHE_BYTES) break
+    state.memory.delete(key)
+    state.memoryBytes -= value.byteLength
+  }
+}
+
+/**
+ * PDF de uma proposta (linha de PROPOSAL_PDF_SELECT).
+ * `storage` precisa gravar no bucket privado: usar o client de service role.
+ */
+export async function getProposalPdf(storage: SupabaseClient, proposal: any): Promise<ProposalPdf> {
+  const doc = buildProposalPdfDocument(proposal)
+  const hash = proposalPdfHash(doc)
+  const fileName = proposalPdfFileName(doc)
+
+  const cached = memoryGet(hash)
+  if (cached) return { pdf: cached, hash, fileName, source: 'memory' }
+
+  const pending = state.inflight.get(hash)
+  if (pending) return pending
+
+  const folder = `${proposal.organization_id}/${proposal.id}`
+  const objectPath = `${folder}/${hash}.pdf`
+
+  const job = (async (): Promise<ProposalPdf> => {
+    const bucket = storage.storage.from(PROPOSAL_PDF_BUCKET)
+
+    const { data: stored } = await bucket.download(objectPath)
+    if (stored) {
+      const pdf = new Uint8Array(await stored.arrayBuffer())
+      memorySet(hash, pdf)
+      return { pdf, hash, fileName, source: 'storage' }
+    }
+
+    const pdf = await getPool().run(doc)
+    memorySet(hash, pdf)
+
+    // Cache persistente é best-effort: falha de upload não impede a resposta
+    try {
+      const { error } = await bucket.upload(objectPath, pdf, { contentType: 'application/pdf', upsert: true })
+      if (error) throw error
+
+      // Versões anteriores da mesma proposta não serão mais pedidas
+      const { data: previous } = await bucket.list(folder)
+      const stale = (previous || []).filter((file) => file.name !== `${hash}.pdf`).map((file) => `${folder}/${file.name}`)
+      if (stale.length > 0) await bucket.remove(stale)
+    } catch (error) {
+      console.error('Error caching proposal PDF:', error)
+    }
+
+    return { pdf, hash, fileName, source: 'rendered' }
+  })()
+
+  state.inflight.set(hash, job)
+  try {
+    return await job
+  } finally {
+    state.inflight.delete(hash)
+  }
+}
+
+/**
+ * Lote: respeita a fila do pool enviando no máximo `concurrency` por vez.
+ * Falhas individuais voltam em `error` sem interromper o lote.
+ */
+export async function getProposalPdfs(
+  storage: SupabaseClient,
+  proposals: any[],
+  concurrency = 4
+): Promise<Array<{ proposal: any; result?: ProposalPdf; error?: string }>> {
+  const results: Array<{ proposal: any; result?: ProposalPdf; error?: string }> = new Array(proposals.length)
+  let next = 0
+
+  const worker = async () => {
+    while (next < proposals.length) {
+      const index = next++
+      const proposal = proposals[index]
+      try {
+        results[index] = { proposal, result: await getProposalPdf(storage, proposal) }
+      } catch (error: any) {
+        results[index] = { proposal, error: error?.message || 'Erro ao gerar PDF' }
+      }
+    }
+  }
+
+  await Promise.all(Array.from({ length: Math.min(concurrency, proposals.length) }, worker))
+  return results
+}
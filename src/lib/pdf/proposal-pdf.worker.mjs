@@ -0,0 +1,366 @@
+/**
+ * ============================================
+ * WORKER DE PDF DE PROPOSTAS
+ * Processo filho (child_process.fork) do pool em pool.ts. Recebe o documento
+ * já normalizado ({ id, payload }) por IPC e devolve { id, ok, result } com os
+ * bytes do PDF. JS puro (sem bundler): roda fora do servidor Next.
+ *
+ * Gerador mínimo de PDF 1.4: A4, Helvetica/Helvetica-Bold (WinAnsi, cobre os
+ * acentos do português), conteúdo comprimido com Flate, paginação automática.
+ * ============================================
+ */
+
+import { deflateSync } from 'node:zlib'
+
+const PAGE_WIDTH = 595.28
+const PAGE_HEIGHT = 841.89
+const MARGIN = 48
+const CONTENT_WIDTH = PAGE_WIDTH - MARGIN * 2
+const FOOTER_HEIGHT = 36
+
+// Larguras AFM (1/1000 em) dos caracteres 32..126
+const HELVETICA = [
+  278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+  556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+  1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+  667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+  333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+  556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+const HELVETICA_BOLD = [
+  278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+  556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+  975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+  667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+  333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+  611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+]
+
+// Unicode -> WinAnsi (faixa 0x80-0x9F)
+const WIN_ANSI_EXTRA = {
+  0x20ac: 0x80, 0x201a: 0x82, 0x0192: 0x83, 0x201e: 0x84, 0x2026: 0x85, 0x2020: 0x86,
+  0x2021: 0x87, 0x02c6: 0x88, 0x2030: 0x89, 0x0160: 0x8a, 0x2039: 0x8b, 0x0152: 0x8c,
+  0x017d: 0x8e, 0x2018: 0x91, 0x2019: 0x92, 0x201c: 0x93, 0x201d: 0x94, 0x2022: 0x95,
+  0x2013: 0x96, 0x2014: 0x97, 0x02dc: 0x98, 0x2122: 0x99, 0x0161: 0x9a, 0x203a: 0x9b,
+  0x0153: 0x9c, 0x017e: 0x9e, 0x0178: 0x9f,
+}
+
+function charWidth(char, bold) {
+  const table = bold ? HELVETICA_BOLD : HELVETICA
+  let code = char.charCodeAt(0)
+  if (code === 0xa0) code = 32
+  if (code >= 32 && code <= 126) return table[code - 32]
+  // Acentuados: largura da letra base
+  const base = char.normalize('NFD').charCodeAt(0)
+  if (base >= 32 && base <= 126) return table[base - 32]
+  return 556
+}
+
+function textWidth(text, size, bold = false) {
+  let total = 0
+  for (const char of text) total += charWidth(char, bold)
+  return (total * size) / 1000
+}
+
+// String literal PDF em WinAnsi (bytes > 126 em octal)
+function pdfString(text) {
+  let out = '('
+  for (const char of text) {
+    const code = char.codePointAt(0)
+    let byte = code <= 0xff && (code < 0x80 || code > 0x9f) ? code : WIN_ANSI_EXTRA[code]
+    if (byte === undefined || byte < 32) byte = code === 9 ? 32 : 63 // '?'
+    if (byte === 40 || byte === 41 || byte === 92) out += '\\' + String.fromCharCode(byte)
+    else if (byte > 126) out += '\\' + byte.toString(8).padStart(3, '0')
+    else out += String.fromCharCode(byte)
+  }
+  return out + ')'
+}
+
+function wrapText(text, size, maxWidth, bold = false) {
+  const lines = []
+  for (const paragraph of String(text ?? '').split(/\r?\n/)) {
+    let line = ''
+    for (const word of paragraph.split(/\s+/).filter(Boolean)) {
+      const candidate = line ? `${line} ${word}` : word
+      if (textWidth(candidate, size, bold) <= maxWidth) {
+        line = candidate
+        continue
+      }
+      if (line) lines.push(line)
+      // Palavra maior que a linha: quebra por caractere
+      line = ''
+      for (const char of word) {
+        if (textWidth(line + char, size, bold) > maxWidth && line) {
+          lines.push(line)
+          line = ''
+        }
+        line += char
+      }
+    }
+    lines.push(line)
+  }
+  return lines
+}
+
+function hexToRgb(hex) {
+  const match = /^#?([0-9a-f]{6}|[0-9a-f]{3})$/i.exec(String(hex || '').trim())
+  if (!match) return [0.094, 0.094, 0.106] // zinc-900
+  const value = match[1].length === 3 ? match[1].replace(/./g, '$&$&') : match[1]
+  return [0, 2, 4].map((i) => parseInt(value.slice(i, i + 2), 16) / 255)
+}
+
+const rgb = (color) => color.map((c) => c.toFixed(3)).join(' ')
+
+const currency = new Intl.NumberFormat('pt-BR', { style: 'currency', currency: 'BRL' })
+const formatMoney = (value) => currency.format(Number(value) || 0)
+
+function formatDate(value) {
+  if (!value) return ''
+  const date = new Date(value)
+  if (Number.isNaN(date.getTime())) return String(value)
+  return date.toLocaleDateString('pt-BR', { timeZone: 'UTC' })
+}
+
+/**
+ * Layout com cursor vertical; cada página guarda seus operadores de conteúdo.
+ */
+class Layout {
+  constructor() {
+    this.pages = []
+    this.addPage()
+  }
+
+  addPage() {
+    this.ops = []
+    this.pages.push(this.ops)
+    this.y = PAGE_HEIGHT - MARGIN
+  }
+
+  ensure(height) {
+    if (this.y - height < MARGIN + FOOTER_HEIGHT) this.addPage()
+  }
+
+  text(x, y, value, { size = 10, bold = false, color = [0.1, 0.1, 0.1] } = {}) {
+    this.ops.push(`BT /${bold ? 'F2' : 'F1'} ${size} Tf ${rgb(color)} rg ${x.toFixed(2)} ${y.toFixed(2)} Td ${pdfString(value)} Tj ET`)
+  }
+
+  textRight(xRight, y, value, options = {}) {
+    this.text(xRight - textWidth(value, options.size ?? 10, options.bold), y, value, options)
+  }
+
+  rect(x, y, width, height, color) {
+    this.ops.push(`${rgb(color)} rg ${x.toFixed(2)} ${y.toFixed(2)} ${width.toFixed(2)} ${height.toFixed(2)} re f`)
+  }
+
+  line(x1, y1, x2, y2, color = [0.85, 0.85, 0.85]) {
+    this.ops.push(`${rgb(color)} RG 0.5 w ${x1.toFixed(2)} ${y1.toFixed(2)} m ${x2.toFixed(2)} ${y2.toFixed(2)} l S`)
+  }
+
+  paragraph(value, { size = 10, bold = false, color, indent = 0, width = CONTENT_WIDTH } = {}) {
+    const leading = size * 1.4
+    for (const line of wrapText(value, size, width - indent, bold)) {
+      this.ensure(leading)
+      this.y -= leading
+      if (line) this.text(MARGIN + indent, this.y, line, { size, bold, color })
+    }
+  }
+
+  heading(value, color) {
+    this.ensure(40)
+    this.y -= 24
+    this.text(MARGIN, this.y, value.toUpperCase(), { size: 9, bold: true, color })
+    this.y -= 6
+    this.line(MARGIN, this.y, PAGE_WIDTH - MARGIN, this.y, color)
+  }
+}
+
+function renderProposal(doc) {
+  const layout = new Layout()
+  const primary = hexToRgb(doc.primaryColor)
+  const muted = [0.42, 0.42, 0.45]
+  const org = doc.organization || {}
+
+  // Cabeçalho com a cor da marca
+  const bandHeight = 96
+  layout.rect(0, PAGE_HEIGHT - bandHeight, PAGE_WIDTH, bandHeight, primary)
+  layout.text(MARGIN, PAGE_HEIGHT - 40, org.name || 'Proposta', { size: 18, bold: true, color: [1, 1, 1] })
+  const titleLines = wrapText(doc.title, 12, CONTENT_WIDTH)
+  layout.text(MARGIN, PAGE_HEIGHT - 62, titleLines[0] || '', { size: 12, color: [1, 1, 1] })
+  if (doc.validUntil) {
+    layout.text(MARGIN, PAGE_HEIGHT - 80, `Válida até ${formatDate(doc.validUntil)}`, { size: 9, color: [0.92, 0.92, 0.92] })
+  }
+  layout.y = PAGE_HEIGHT - bandHeight - 8
+
+  if (doc.client) {
+    layout.heading('Cliente', primary)
+    layout.paragraph(doc.client.name, { bold: true })
+    const contact = [doc.client.company, doc.client.email, doc.client.phone].filter(Boolean).join(' · ')
+    if (contact) layout.paragraph(contact, { size: 9, color: muted })
+  }
+
+  if (doc.description) {
+    layout.heading('Escopo', primary)
+    layout.paragraph(doc.description)
+  }
+
+  // Itens
+  const columns = { qty: MARGIN + CONTENT_WIDTH * 0.62, unit: MARGIN + CONTENT_WIDTH * 0.8, total: PAGE_WIDTH - MARGIN }
+  const descriptionWidth = CONTENT_WIDTH * 0.55
+  const tableHeader = () => {
+    layout.ensure(24)
+    layout.y -= 16
+    layout.text(MARGIN, layout.y, 'Descrição', { size: 8, bold: true, color: muted })
+    layout.textRight(columns.qty, layout.y, 'Qtd', { size: 8, bold: true, color: muted })
+    layout.textRight(columns.unit, layout.y, 'Valor unit.', { size: 8, bold: true, color: muted })
+    layout.textRight(columns.total, layout.y, 'Total', { size: 8, bold: true, color: muted })
+    layout.y -= 6
+    layout.line(MARGIN, layout.y, PAGE_WIDTH - MARGIN, layout.y)
+  }
+
+  layout.heading('Itens', primary)
+  tableHeader()
+  for (const item of doc.items) {
+    const lines = wrapText(item.description, 10, descriptionWidth)
+    const rowHeight = lines.length * 14 + 6
+    if (layout.y - rowHeight < MARGIN + FOOTER_HEIGHT) {
+      layout.addPage()
+      tableHeader()
+    }
+    const top = layout.y
+    lines.forEach((line, index) => layout.text(MARGIN, top - 14 * (index + 1), line))
+    layout.textRight(columns.qty, top - 14, String(item.quantity))
+    layout.textRight(columns.unit, top - 14, formatMoney(item.unitPrice))
+    layout.textRight(columns.total, top - 14, formatMoney(item.total), { bold: true })
+    layout.y = top - rowHeight
+    layout.line(MARGIN, layout.y, PAGE_WIDTH - MARGIN, layout.y, [0.93, 0.93, 0.93])
+  }
+
+  const optionals = doc.optionals.filter((optional) => optional.selected)
+  if (optionals.length > 0) {
+    layout.heading('Opcionais incluídos', primary)
+    for (const optional of optionals) {
+      layout.ensure(18)
+      layout.y -= 16
+      layout.text(MARGIN, layout.y, optional.title, { bold: true })
+      layout.textRight(PAGE_WIDTH - MARGIN, layout.y, formatMoney(optional.price))
+      if (optional.description) layout.paragraph(optional.description, { size: 9, color: muted })
+    }
+  }
+
+  // Totais
+  const totals = [
+    ['Subtotal', formatMoney(doc.totals.base)],
+    ...(doc.totals.optionals > 0 ? [['Opcionais', formatMoney(doc.totals.optionals)]] : []),
+    ...(doc.totals.discount > 0 ? [[`Desconto (${doc.discountPercent}%)`, `- ${formatMoney(doc.totals.discount)}`]] : []),
+  ]
+  layout.ensure(totals.length * 16 + 48)
+  layout.y -= 12
+  for (const [label, value] of totals) {
+    layout.y -= 16
+    layout.textRight(columns.unit, layout.y, label, { color: muted })
+    layout.textRight(columns.total, layout.y, value)
+  }
+  layout.y -= 10
+  layout.rect(columns.qty - 40, layout.y - 24, PAGE_WIDTH - MARGIN - columns.qty + 40, 28, primary)
+  layout.text(columns.qty - 30, layout.y - 15, 'Total', { size: 11, bold: true, color: [1, 1, 1] })
+  layout.textRight(columns.total - 8, layout.y - 15, formatMoney(doc.totals.total), { size: 12, bold: true, color: [1, 1, 1] })
+  layout.y -= 32
+
+  if (doc.paymentTerms) {
+    layout.heading('Condições de pagamento', primary)
+    layout.paragraph(doc.paymentTerms)
+  }
+
+  if (org.showBankInfo && (org.bankName || org.pixKey)) {
+    layout.heading('Dados para pagamento', primary)
+    if (org.bankName) layout.paragraph(`Banco: ${org.bankName}`)
+    if (org.agency || org.accountNumber) {
+      layout.paragraph([org.agency && `Agência: ${org.agency}`, org.accountNumber && `Conta: ${org.accountNumber}`].filter(Boolean).join('   '))
+    }
+    if (org.pixKey) layout.paragraph(`PIX: ${org.pixKey}`, { bold: true })
+  }
+
+  if (org.terms) {
+    layout.heading('Termos e condições', primary)
+    layout.paragraph(org.terms, { size: 8.5, color: muted })
+  }
+
+  // Rodapé em todas as páginas
+  const footer = [org.name, org.cnpj && `CNPJ ${org.cnpj}`, org.email, org.phone, org.website].filter(Boolean).join(' · ')
+  const total = layout.pages.length
+  layout.pages.forEach((ops, index) => {
+    ops.push(`${rgb([0.85, 0.85, 0.85])} RG 0.5 w ${MARGIN} ${MARGIN + 14} m ${PAGE_WIDTH - MARGIN} ${MARGIN + 14} l S`)
+    const footerLine = wrapText(footer, 7.5, CONTENT_WIDTH - 60)[0] || ''
+    ops.push(`BT /F1 7.5 Tf ${rgb(muted)} rg ${MARGIN} ${MARGIN} Td ${pdfString(footerLine)} Tj ET`)
+    const pageLabel = `${index + 1}/${total}`
+    ops.push(`BT /F1 7.5 Tf ${rgb(muted)} rg ${(PAGE_WIDTH - MARGIN - textWidth(pageLabel, 7.5)).toFixed(2)} ${MARGIN} Td ${pdfString(pageLabel)} Tj ET`)
+  })
+
+  return serialize(layout.pages, doc)
+}
+
+function serialize(pages, doc) {
+  const objects = []
+  const add = (body) => {
+    objects.push(body)
+    return objects.length
+  }
+
+  const catalogId = add(null)
+  const pagesId = add(null)
+  const fontRegular = add(Buffer.from('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>'))
+  const fontBold = add(Buffer.from('<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>'))
+
+  const pageIds = pages.map((ops) => {
+    const content = deflateSync(Buffer.from(ops.join('\n'), 'latin1'))
+    const contentId = add(Buffer.concat([
+      Buffer.from(`<< /Length ${content.length} /Filter /FlateDecode >>\nstream\n`),
+      content,
+      Buffer.from('\nendstream'),
+    ]))
+    return add(Buffer.from(
+      `<< /Type /Page /Parent ${pagesId} 0 R /MediaBox [0 0 ${PAGE_WIDTH} ${PAGE_HEIGHT}] ` +
+      `/Resources << /Font << /F1 ${fontRegular} 0 R /F2 ${fontBold} 0 R >> >> /Contents ${contentId} 0 R >>`
+    ))
+  })
+
+  objects[catalogId - 1] = Buffer.from(`<< /Type /Catalog /Pages ${pagesId} 0 R >>`)
+  objects[pagesId - 1] = Buffer.from(`<< /Type /Pages /Kids [${pageIds.map((id) => `${id} 0 R`).join(' ')}] /Count ${pageIds.length} >>`)
+  const infoId = add(Buffer.from(
+    `<< /Title ${pdfString(doc.title || 'Proposta')} /Author ${pdfString(doc.organization?.name || '')} /Producer (ZoomingCRM) >>`
+  ))
+
+  const chunks = [Buffer.from('%PDF-1.4\n%\xE2\xE3\xCF\xD3\n', 'latin1')]
+  const offsets = []
+  let length = chunks[0].length
+  objects.forEach((body, index) => {
+    offsets.push(length)
+    const chunk = Buffer.concat([Buffer.from(`${index + 1} 0 obj\n`), body, Buffer.from('\nendobj\n')])
+    chunks.push(chunk)
+    length += chunk.length
+  })
+
+  const xref = [
+    'xref',
+    `0 ${objects.length + 1}`,
+    '0000000000 65535 f ',
+    ...offsets.map((offset) => `${String(offset).padStart(10, '0')} 00000 n `),
+    'trailer',
+    `<< /Size ${objects.length + 1} /Root ${catalogId} 0 R /Info ${infoId} 0 R >>`,
+    'startxref',
+    String(length),
+    '%%EOF',
+  ].join('\n')
+  chunks.push(Buffer.from(xref + '\n'))
+
+  return Buffer.concat(chunks)
+}
+
+process.on('message', ({ id, payload }) => {
+  try {
+    const pdf = renderProposal(payload)
+    process.send({ id, ok: true, result: new Uint8Array(pdf) })
+  } catch (error) {
+    process.send({ id, ok: false, error: error?.message || String(error) })
+  }
+})
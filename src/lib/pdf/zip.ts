@@ -0,0 +1,90 @@
+/**
+ * ============================================
+ * ZIP
+ * Arquivo .zip mínimo (deflate, sem ZIP64) para exportação em lote.
+ * ============================================
+ */
+
+import { deflateRawSync } from 'node:zlib'
+
+export interface ZipEntry {
+  name: string
+  data: Uint8Array
+  date?: Date
+}
+
+const CRC_TABLE = (() => {
+  const table = new Uint32Array(256)
+  for (let n = 0; n < 256; n++) {
+    let c = n
+    for (let k = 0; k < 8; k++) c = c & 1 ? 0xedb88320 ^ (c >>> 1) : c >>> 1
+    table[n] = c >>> 0
+  }
+  return table
+})()
+
+function crc32(data: Uint8Array): number {
+  let crc = 0xffffffff
+  for (let i = 0; i < data.length; i++) crc = CRC_TABLE[(crc ^ data[i]) & 0xff] ^ (crc >>> 8)
+  return (crc ^ 0xffffffff) >>> 0
+}
+
+function dosDateTime(date: Date) {
+  const time = (date.getHours() << 11) | (date.getMinutes() << 5) | Math.floor(date.getSeconds() / 2)
+  const day = ((Math.max(date.getFullYear(), 1980) - 1980) << 9) | ((date.getMonth() + 1) << 5) | date.getDate()
+  return { time, day }
+}
+
+export function createZip(entries: ZipEntry[]): Buffer {
+  const local: Buffer[] = []
+  const central: Buffer[] = []
+  let offset = 0
+
+  for (const entry of entries) {
+    const name = Buffer.from(entry.name, 'utf8')
+    const compressed = deflateRawSync(entry.data)
+    const crc = crc32(entry.data)
+    const { time, day } = dosDateTime(entry.date ?? new Date())
+
+    const header = Buffer.alloc(30)
+    header.writeUInt32LE(0x04034b50, 0)
+    header.writeUInt16LE(20, 4) // versão necessária
+    header.writeUInt16LE(0x0800, 6) // nomes em UTF-8
+    header.writeUInt16LE(8, 8) // deflate
+    header.writeUInt16LE(time, 10)
+    header.writeUInt16LE(day, 12)
+    header.writeUInt32LE(crc, 14)
+    header.writeUInt32LE(compressed.length, 18)
+    header.writeUInt32LE(entry.data.length, 22)
+    header.writeUInt16LE(name.length, 26)
+    header.writeUInt16LE(0, 28)
+    local.push(header, name, compressed)
+
+    const record = Buffer.alloc(46)
+    record.writeUInt32LE(0x02014b50, 0)
+    record.writeUInt16LE(20, 4)
+    record.writeUInt16LE(20, 6)
+    record.writeUInt16LE(0x0800, 8)
+    record.writeUInt16LE(8, 10)
+    record.writeUInt16LE(time, 12)
+    record.writeUInt16LE(day, 14)
+    record.writeUInt32LE(crc, 16)
+    record.writeUInt32LE(compressed.length, 20)
+    record.writeUInt32LE(entry.data.length, 24)
+    record.writeUInt16LE(name.length, 28)
+    record.writeUInt32LE(offset, 42)
+    central.push(record, name)
+
+    offset += header.length + name.length + compressed.length
+  }
+
+  const centralSize = central.reduce((sum, chunk) => sum + chunk.length, 0)
+  const end = Buffer.alloc(22)
+  end.writeUInt32LE(0x06054b50, 0)
+  end.writeUInt16LE(entries.length, 8)
+  end.writeUInt16LE(entries.length, 10)
+  end.writeUInt32LE(centralSize, 12)
+  end.writeUInt32LE(offset, 16)
+
+  return Buffer.concat([...local, ...central, end])
+}
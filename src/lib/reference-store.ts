@@ -0,0 +1,492 @@
+'use client'
+
+/**
+ * ============================================
+ * DADOS DE REFERÊNCIA OFFLINE
+ * Cópia local (IndexedDB) de clientes, freelancers e equipamentos para os
+ * seletores abrirem na hora e buscarem sem rede:
+ *   - hidrata da IndexedDB e sincroniza por deltas (syncReferenceData:
+ *     updated_at + tombstones), com cursor por coleção
+ *   - mudanças de outros usuários chegam pelo canal realtime do header
+ *   - criações/edições sem conexão vão para uma fila persistida (outbox) e são
+ *     reenviadas na ordem quando a conexão volta
+ * ============================================
+ */
+
+import { useEffect, useState } from 'react'
+import type { RealtimeChannel } from '@supabase/supabase-js'
+import { syncReferenceData } from '@/actions/reference-data'
+import { addClient, updateClient } from '@/actions/clients'
+import { createFreelancer, updateFreelancer } from '@/actions/freelancers'
+import { addEquipment, deleteEquipment, updateEquipment } from '@/actions/equipments'
+
+export type ReferenceCollection = 'clients' | 'freelancers' | 'equipments'
+
+export type ReferenceRow = {
+  id: string
+  updated_at?: string | null
+  // Criado/alterado localmente e ainda não confirmado pelo servidor
+  _pending?: boolean
+  [key: string]: any
+}
+
+export type ReferenceMutation =
+  | { type: 'create'; data: Record<string, any> }
+  | { type: 'update'; id: string; data: Record<string, any> }
+  | { type: 'delete'; id: string }
+
+type OutboxEntry = {
+  seq?: number
+  collection: ReferenceCollection
+  mutation: ReferenceMutation
+  // Id local (criação) e linha antes da mudança (para desfazer se recusada)
+  localId?: string
+  previous?: ReferenceRow | null
+}
+
+const COLLECTIONS: ReferenceCollection[] = ['clients', 'freelancers', 'equipments']
+
+// Campos usados na busca local de cada coleção
+const SEARCH_FIELDS: Record<ReferenceCollection, string[]> = {
+  clients: ['name', 'company', 'email', 'phone'],
+  freelancers: ['name', 'email', 'phone', 'role', 'specialty', 'skills'],
+  equipments: ['name', 'brand', 'model', 'category', 'serial_number'],
+}
+
+// Ordem de exibição igual à das server actions de listagem
+const SORTERS: Record<ReferenceCollection, (a: ReferenceRow, b: ReferenceRow) => number> = {
+  clients: (a, b) => String(b.created_at ?? '').localeCompare(String(a.created_at ?? '')),
+  freelancers: (a, b) => String(b.created_at ?? '').localeCompare(String(a.created_at ?? '')),
+  equipments: (a, b) => String(a.name ?? '').localeCompare(String(b.name ?? ''), 'pt-BR'),
+}
+
+// Servidor: uma ação por tipo de mutação
+const EXECUTORS: Record<ReferenceCollection, Partial<Record<ReferenceMutation['type'], (mutation: any) => Promise<any>>>> = {
+  clients: {
+    create: (m) => addClient(m.data as any),
+    update: (m) => updateClient(m.id, m.data),
+  },
+  freelancers: {
+    create: (m) => createFreelancer(m.data as any),
+    update: (m) => updateFreelancer(m.id, m.data),
+  },
+  equipments: {
+    create: (m) => addEquipment(m.data as any),
+    update: (m) => updateEquipment(m.id, m.data),
+    delete: (m) => deleteEquipment(m.id),
+  },
+}
+
+const DB_NAME = 'zooming-reference'
+const DB_VERSION = 1
+const META_STORE = 'meta'
+const OUTBOX_STORE = 'outbox'
+
+// Sincronização automática no máximo a cada 30s (realtime cobre o intervalo)
+const SYNC_INTERVAL_MS = 30_000
+
+/* ---------- IndexedDB ---------- */
+
+let dbPromise: Promise<IDBDatabase | null> | null = null
+
+function openDb() {
+  dbPromise ??= new Promise<IDBDatabase | null>((resolve) => {
+    if (typeof indexedDB === 'undefined') return resolve(null)
+
+    const request = indexedDB.open(DB_NAME, DB_VERSION)
+    request.onupgradeneeded = () => {
+      const db = request.result
+      for (const collection of COLLECTIONS) {
+        if (!db.objectStoreNames.contains(collection)) db.createObjectStore(collection, { keyPath: 'id' })
+      }
+      if (!db.objectStoreNames.contains(META_STORE)) db.createObjectStore(META_STORE)
+      if (!db.objectStoreNames.contains(OUTBOX_STORE)) db.createObjectStore(OUTBOX_STORE, { keyPath: 'seq', autoIncrement: true })
+    }
+    request.onsuccess = () => resolve(request.result)
+    // Modo privado/cota: segue só em memória
+    request.onerror = () => {
+      console.error('Error opening reference store:', request.error)
+      resolve(null)
+    }
+  })
+  return dbPromise
+}
+
+function requestToPromise<T>(request: IDBRequest<T>) {
+  return new Promise<T>((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result)
+    request.onerror = () => reject(request.error)
+  })
+}
+
+async function withStores<T>(
+  names: string[],
+  mode: IDBTransactionMode,
+  run: (stores: Record<string, IDBObjectStore>) => Promise<T> | T
+): Promise<T | null> {
+  const db = await openDb()
+  if (!db) return null
+
+  const tx = db.transaction(names, mode)
+  const stores = Object.fromEntries(names.map((name) => [name, tx.objectStore(name)]))
+  const done = new Promise<void>((resolve, reject) => {
+    tx.oncomplete = () => resolve()
+    tx.onerror = () => reject(tx.error)
+    tx.onabort = () => reject(tx.error)
+  })
+  const result = await run(stores)
+  await done
+  return result
+}
+
+/* ---------- Estado em memória ---------- */
+
+const state = {
+  rows: Object.fromEntries(COLLECTIONS.map((c) => [c, new Map<string, ReferenceRow>()])) as Record<
+    ReferenceCollection,
+    Map<string, ReferenceRow>
+  >,
+  sorted: {} as Partial<Record<ReferenceCollection, ReferenceRow[]>>,
+  cursors: {} as Partial<Record<ReferenceCollection, string | null>>,
+  organizationId: null as string | null,
+  hydrated: null as Promise<void> | null,
+  syncing: null as Promise<void> | null,
+  lastSyncAt: 0,
+  replaying: null as Promise<void> | null,
+  listeners: new Set<() => void>(),
+  pending: 0,
+  onlineListener: false,
+}
+
+const searchText = new WeakMap<ReferenceRow, string>()
+
+function emit(collections: Iterable<ReferenceCollection>) {
+  for (const collection of collections) delete state.sorted[collection]
+  state.listeners.forEach((listener) => listener())
+}
+
+function subscribe(listener: () => void) {
+  state.listeners.add(listener)
+  return () => {
+    state.listeners.delete(listener)
+  }
+}
+
+function hydrate() {
+  state.hydrated ??= (async () => {
+    try {
+      await withStores([...COLLECTIONS, META_STORE, OUTBOX_STORE], 'readonly', async (stores) => {
+        // Todas as leituras de uma vez, na mesma transação
+        const [organizationId, pending, ...results] = await Promise.all([
+          requestToPromise(stores[META_STORE].get('organizationId')),
+          requestToPromise(stores[OUTBOX_STORE].count()),
+          ...COLLECTIONS.map((c) => requestToPromise(stores[c].getAll())),
+          ...COLLECTIONS.map((c) => requestToPromise(stores[META_STORE].get(`cursor:${c}`))),
+        ])
+        const collections = results.slice(0, COLLECTIONS.length)
+        const cursors = results.slice(COLLECTIONS.length)
+
+        state.organizationId = (organizationId as string) ?? null
+        state.pending = pending as number
+        COLLECTIONS.forEach((collection, index) => {
+          // Dados da memória (realtime antes da hidratação) têm prioridade
+          for (const row of collections[index] as ReferenceRow[]) {
+            if (!state.rows[collection].has(row.id)) state.rows[collection].set(row.id, row)
+          }
+          state.cursors[collection] = (cursors[index] as string) ?? null
+        })
+      })
+    } catch (error) {
+      console.error('Error loading reference store:', error)
+    }
+    emit(COLLECTIONS)
+  })()
+  return state.hydrated
+}
+
+async function persist(collection: ReferenceCollection, upserts: ReferenceRow[], deletes: string[]) {
+  try {
+    await withStores([collection], 'readwrite', (stores) => {
+      for (const row of upserts) stores[collection].put(row)
+      for (const id of deletes) stores[collection].delete(id)
+    })
+  } catch (error) {
+    console.error('Error saving reference store:', error)
+  }
+}
+
+function applyLocal(collection: ReferenceCollection, upserts: ReferenceRow[], deletes: string[]) {
+  const map = state.rows[collection]
+  for (const row of upserts) map.set(row.id, row)
+  for (const id of deletes) map.delete(id)
+  emit([collection])
+  return persist(collection, upserts, deletes)
+}
+
+/* ---------- Sincronização ---------- */
+
+/**
+ * Garante a cópia local: hidrata da IndexedDB e, se passou o intervalo (ou
+ * `force`), busca o delta de todas as coleções numa chamada.
+ */
+export function ensureReferenceData(options: { force?: boolean } = {}) {
+  return hydrate().then(() => {
+    if (state.syncing) return state.syncing
+    if (!options.force && Date.now() - state.lastSyncAt < SYNC_INTERVAL_MS) return
+    if (typeof navigator !== 'undefined' && !navigator.onLine) return
+
+    state.syncing = (async () => {
+      try {
+        let result = await syncReferenceData(
+          Object.fromEntries(COLLECTIONS.map((c) => [c, state.organizationId ? state.cursors[c] ?? null : null]))
+        )
+
+        // Outra organização (troca de conta): descarta a cópia (e a fila) anterior
+        if (state.organizationId && state.organizationId !== result.organizationId) {
+          await clearReferenceData()
+          result = await syncReferenceData(Object.fromEntries(COLLECTIONS.map((c) => [c, null])))
+        }
+
+        const { organizationId, deltas } = result
+        state.organizationId = organizationId
+        state.lastSyncAt = Date.now()
+
+        for (const delta of deltas) {
+          const map = state.rows[delta.collection]
+          // Linhas com mudança local pendente não são sobrescritas pelo delta
+          const rows = delta.rows.filter((row) => !map.get(row.id)?._pending)
+          let deletes = delta.deleted
+          if (delta.full) {
+            const present = new Set(delta.rows.map((row) => row.id))
+            deletes = Array.from(map.values()).filter((row) => !row._pending && !present.has(row.id)).map((row) => row.id)
+          }
+          await applyLocal(delta.collection, rows, deletes)
+          state.cursors[delta.collection] = delta.cursor
+        }
+
+        await withStores([META_STORE], 'readwrite', (stores) => {
+          stores[META_STORE].put(organizationId, 'organizationId')
+          for (const collection of COLLECTIONS) stores[META_STORE].put(state.cursors[collection] ?? null, `cursor:${collection}`)
+        })
+      } catch (error) {
+        // Sem rede: segue com a cópia local
+        console.error('Error syncing reference data:', error)
+      } finally {
+        state.syncing = null
+      }
+    })()
+
+    return state.syncing.then(() => replayReferenceMutations())
+  })
+}
+
+export async function clearReferenceData() {
+  for (const collection of COLLECTIONS) state.rows[collection].clear()
+  state.cursors = {}
+  state.organizationId = null
+  state.lastSyncAt = 0
+  state.pending = 0
+  try {
+    await withStores([...COLLECTIONS, META_STORE, OUTBOX_STORE], 'readwrite', (stores) => {
+      Object.values(stores).forEach((store) => store.clear())
+    })
+  } catch (error) {
+    console.error('Error clearing reference store:', error)
+  }
+  emit(COLLECTIONS)
+}
+
+/**
+ * Adiciona ao canal realtime (antes do .subscribe()) os listeners das
+ * coleções de referência. RLS limita os eventos à organização do usuário.
+ */
+export function bindReferenceRealtime(channel: RealtimeChannel) {
+  for (const collection of COLLECTIONS) {
+    channel.on('postgres_changes' as any, { event: '*', schema: 'public', table: collection }, (payload: any) => {
+      if (payload.eventType === 'DELETE') {
+        if (payload.old?.id) void applyLocal(collection, [], [payload.old.id])
+      } else if (payload.new?.id && !state.rows[collection].get(payload.new.id)?._pending) {
+        void applyLocal(collection, [payload.new], [])
+      }
+    })
+  }
+
+  if (typeof window !== 'undefined' && !state.onlineListener) {
+    state.onlineListener = true
+    window.addEventListener('online', () => void ensureReferenceData({ force: true }))
+  }
+  void ensureReferenceData()
+  return channel
+}
+
+/* ---------- Leitura e busca ---------- */
+
+export function getReferenceRows(collection: ReferenceCollection): ReferenceRow[] {
+  state.sorted[collection] ??= Array.from(state.rows[collection].values()).sort(SORTERS[collection])
+  return state.sorted[collection]!
+}
+
+const normalize = (value: string) =>
+  value
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+
+/** Busca local: todos os termos precisam aparecer em algum campo (sem acento/caixa) */
+export function searchReference(collection: ReferenceCollection, query: string, limit = 50): ReferenceRow[] {
+  const rows = getReferenceRows(collection)
+  const terms = normalize(query).split(/\s+/).filter(Boolean)
+  if (terms.length === 0) return rows.slice(0, limit)
+
+  const results: ReferenceRow[] = []
+  for (const row of rows) {
+    let text = searchText.get(row)
+    if (text === undefined) {
+      text = normalize(
+        SEARCH_FIELDS[collection]
+          .map((field) => (Array.isArray(row[field]) ? row[field].join(' ') : row[field] ?? ''))
+          .join(' ')
+      )
+      searchText.set(row, text)
+    }
+    if (terms.every((term) => text!.includes(term))) {
+      results.push(row)
+      if (results.length >= limit) break
+    }
+  }
+  return results
+}
+
+/** Linhas da coleção, atualizadas a cada mudança local/remota */
+export function useReferenceData(collection: ReferenceCollection, enabled = true) {
+  const [, setVersion] = useState(0)
+  const [ready, setReady] = useState(false)
+
+  useEffect(() => {
+    if (!enabled) return
+    const unsubscribe = subscribe(() => setVersion((version) => version + 1))
+    hydrate().then(() => setReady(true))
+    void ensureReferenceData()
+    return unsubscribe
+  }, [enabled])
+
+  return { rows: getReferenceRows(collection), ready, pendingMutations: state.pending }
+}
+
+/* ---------- Mutações (online ou fila) ---------- */
+
+const isNetworkError = (error: unknown) =>
+  (typeof navigator !== 'undefined' && !navigator.onLine) || error instanceof TypeError
+
+async function outboxAll(): Promise<OutboxEntry[]> {
+  return (await withStores([OUTBOX_STORE], 'readonly', (stores) => requestToPromise(stores[OUTBOX_STORE].getAll()))) ?? []
+}
+
+async function outboxPut(entry: OutboxEntry) {
+  await withStores([OUTBOX_STORE], 'readwrite', (stores) => {
+    stores[OUTBOX_STORE].put(entry)
+  })
+}
+
+async function outboxDelete(seq: number) {
+  await withStores([OUTBOX_STORE], 'readwrite', (stores) => {
+    stores[OUTBOX_STORE].delete(seq)
+  })
+}
+
+async function enqueue(collection: ReferenceCollection, mutation: ReferenceMutation, previous: ReferenceRow | null) {
+  const entries = await outboxAll()
+
+  // Mudança sobre um registro criado offline: funde na criação pendente
+  if (mutation.type !== 'create' && mutation.id.startsWith('local-')) {
+    const create = entries.find((entry) => entry.collection === collection && entry.localId === mutation.id)
+    if (create) {
+      if (mutation.type === 'delete') await outboxDelete(create.seq!)
+      else await outboxPut({ ...create, mutation: { type: 'create', data: { ...create.mutation.data, ...mutation.data } } })
+      state.pending = (await outboxAll()).length
+      emit([collection])
+      return
+    }
+  }
+
+  const localId = mutation.type === 'create' ? `local-${crypto.randomUUID()}` : undefined
+  await outboxPut({ collection, mutation, localId, previous })
+  state.pending = entries.length + 1
+  return localId
+}
+
+/**
+ * Salva um registro de referência. Online: chama o servidor e atualiza a cópia
+ * local com a resposta. Sem conexão: aplica localmente (marcado `_pending`) e
+ * enfileira para reenvio. Erros do servidor (validação, permissão) sobem.
+ */
+export async function saveReferenceRecord(collection: ReferenceCollection, mutation: ReferenceMutation): Promise<ReferenceRow | null> {
+  await hydrate()
+  const executor = EXECUTORS[collection][mutation.type]
+  if (!executor) throw new Error('Operação não suportada')
+
+  const previous = mutation.type === 'create' ? null : state.rows[collection].get(mutation.id) ?? null
+
+  try {
+    if (typeof navigator !== 'undefined' && !navigator.onLine) throw new TypeError('offline')
+    const result = await executor(mutation)
+    if (mutation.type === 'delete') await applyLocal(collection, [], [mutation.id])
+    else if (result?.id) await applyLocal(collection, [result], [])
+    return result ?? null
+  } catch (error) {
+    if (!isNetworkError(error)) throw error
+  }
+
+  const localId = await enqueue(collection, mutation, previous)
+  if (mutation.type === 'delete') {
+    await applyLocal(collection, [], [mutation.id])
+    return null
+  }
+
+  const row: ReferenceRow = {
+    ...(previous ?? { created_at: new Date().toISOString() }),
+    ...mutation.data,
+    id: mutation.type === 'create' ? localId! : mutation.id,
+    updated_at: new Date().toISOString(),
+    _pending: true,
+  }
+  await applyLocal(collection, [row], [])
+  return row
+}
+
+/** Reenvia a fila na ordem; para no primeiro erro de rede */
+export function replayReferenceMutations() {
+  state.replaying ??= (async () => {
+    try {
+      for (const entry of await outboxAll()) {
+        if (typeof navigator !== 'undefined' && !navigator.onLine) break
+        const executor = EXECUTORS[entry.collection][entry.mutation.type]!
+
+        try {
+          const result = await executor(entry.mutation)
+          const localId = entry.localId ?? (entry.mutation.type === 'create' ? undefined : entry.mutation.id)
+          if (entry.mutation.type === 'delete') {
+            await applyLocal(entry.collection, [], [entry.mutation.id])
+          } else if (result?.id) {
+            await applyLocal(entry.collection, [result], localId && localId !== result.id ? [localId] : [])
+          }
+        } catch (error) {
+          if (isNetworkError(error)) break
+          // Recusada pelo servidor: descarta e desfaz a mudança local
+          console.error('Reference mutation rejected:', entry, error)
+          if (entry.localId) await applyLocal(entry.collection, [], [entry.localId])
+          else if (entry.previous) await applyLocal(entry.collection, [entry.previous], [])
+        }
+
+        await outboxDelete(entry.seq!)
+        state.pending = Math.max(0, state.pending - 1)
+        emit([entry.collection])
+      }
+    } catch (error) {
+      console.error('Error replaying reference mutations:', error)
+    } finally {
+      state.replaying = null
+    }
+  })()
+  return state.replaying
+}
@@ -0,0 +1,151 @@
+/**
+ * ============================================
+ * CONEXÃO DIRETA AO POSTGRES (OPCIONAL)
+ * Caminho alternativo ao PostgREST para agregações e operações em lote: SQL
+ * parametrizado (prepared statements) por um pool em modo transação
+ * (Supavisor, porta 6543), pelo Prisma que já é dependência do projeto.
+ *
+ * Cada withUserDb() abre uma transação que assume o usuário da sessão: os
+ * claims do JWT (verificados com auth.getClaims) vão para request.jwt.claims e
+ * o role vira authenticated, como o PostgREST faz a cada requisição. As
+ * policies de RLS (auth.uid(), auth_org_id()) valem igual nos dois caminhos.
+ * Os settings são locais à transação: no modo transação a conexão do pool
+ * volta para outro cliente no COMMIT, então um SET de sessão vazaria.
+ *
+ * Ativação (desligado por padrão):
+ *   DATA_PATH_DATABASE_URL=postgresql://...:6543/postgres?connection_limit=5
+ *   DATA_PATH=direct     actions elegíveis usam a conexão direta
+ * withDataPath() força um caminho num trecho (rotas de benchmark).
+ *
+ * O usuário da URL precisa poder assumir o role authenticated (o postgres do
+ * Supabase pode). Prepared statements ficam no cache por conexão do Prisma;
+ * num PgBouncer sem suporte a eles, acrescentar pgbouncer=true à URL.
+ * ============================================
+ */
+
+import { AsyncLocalStorage } from 'node:async_hooks'
+import type { Prisma, PrismaClient } from '@prisma/client'
+import { createClient } from './server'
+import { traceDatabaseQuery } from './query-trace'
+
+export type DataPath = 'rest' | 'direct'
+
+const DATABASE_URL = process.env.DATA_PATH_DATABASE_URL || null
+const DEFAULT_PATH: DataPath = DATABASE_URL && process.env.DATA_PATH === 'direct' ? 'direct' : 'rest'
+
+// O pool é compartilhado: transação que passa disso é abortada
+const TRANSACTION_TIMEOUT_MS = Number(process.env.DATA_PATH_TIMEOUT_MS) || 15_000
+
+export const isDirectDataPathAvailable = () => DATABASE_URL !== null
+
+const pathScope = new AsyncLocalStorage<DataPath>()
+
+/** Executa `fn` num caminho específico, independente de DATA_PATH. */
+export function withDataPath<T>(path: DataPath, fn: () => Promise<T>): Promise<T> {
+  if (path === 'direct' && !DATABASE_URL) {
+    throw new Error('DATA_PATH_DATABASE_URL não configurada')
+  }
+  return pathScope.run(path, fn)
+}
+
+/** A action deve usar a conexão direta? */
+export const isDirectDataPath = () => (pathScope.getStore() ?? DEFAULT_PATH) === 'direct'
+
+// Um PrismaClient (e um pool) por processo, inclusive entre recargas do HMR
+const state = ((globalThis as any).__directDb ??= { client: null }) as {
+  client: Promise<PrismaClient> | null
+}
+
+function getPrisma(): Promise<PrismaClient> {
+  state.client ??= import('@prisma/client')
+    .then(({ PrismaClient }) => new PrismaClient({ datasourceUrl: DATABASE_URL!, log: ['error'] }))
+    .catch((error) => {
+      state.client = null
+      throw error
+    })
+  return state.client
+}
+
+type SqlTag<T> = (strings: TemplateStringsArray, ...values: unknown[]) => Promise<T>
+
+export interface DirectDb {
+  /** SELECT: numeric e bigint viram number, timestamps viram ISO */
+  query<T = Record<string, unknown>>(table: string): SqlTag<T[]>
+  /** SELECT no formato do PostgREST (json_agg): datas e números idênticos à API */
+  json<T = Record<string, unknown>>(table: string): SqlTag<T[]>
+  /** INSERT/UPDATE/DELETE: quantidade de linhas afetadas */
+  execute(operation: string, table: string): SqlTag<number>
+}
+
+function normalizeValue(value: unknown) {
+  if (typeof value === 'bigint') return Number(value)
+  if (value instanceof Date) return value.toISOString()
+  // Prisma.Decimal
+  if (value && typeof value === 'object' && typeof (value as any).toNumber === 'function') {
+    return (value as any).toNumber()
+  }
+  return value
+}
+
+function createDirectDb(tx: Prisma.TransactionClient): DirectDb {
+  return {
+    query: (table) => (strings, ...values) =>
+      traceDatabaseQuery(`pg:${table}`, 'SELECT', async () => {
+        const rows = await tx.$queryRaw<Record<string, unknown>[]>(strings, ...values)
+        return rows.map(
+          (row) => Object.fromEntries(Object.entries(row).map(([key, value]) => [key, normalizeValue(value)])) as any
+        )
+      }),
+
+    json: (table) => (strings, ...values) =>
+      traceDatabaseQuery(`pg:${table}`, 'SELECT', async () => {
+        // Envolve a consulta: "SELECT json_agg(q) FROM (<consulta>) q"
+        const wrapped = Object.assign([...strings], { raw: [...strings.raw] })
+        wrapped[0] = `SELECT COALESCE(json_agg(q), '[]'::json) AS rows FROM (${wrapped[0]}`
+        wrapped[wrapped.length - 1] = `${wrapped[wrapped.length - 1]}) q`
+        const [result] = await tx.$queryRaw<{ rows: any[] }[]>(wrapped as TemplateStringsArray, ...values)
+        return result?.rows ?? []
+      }),
+
+    execute: (operation, table) => (strings, ...values) =>
+      traceDatabaseQuery(`pg:${table}`, operation, () => tx.$executeRaw(strings, ...values)),
+  }
+}
+
+/**
+ * Abre uma transação com o contexto de RLS do usuário logado e executa `fn`.
+ * Erro dentro de `fn` desfaz tudo (ROLLBACK). BEGIN/COMMIT não entram na
+ * contagem de round trips do trace.
+ */
+export async function withUserDb<T>(fn: (db: DirectDb) => Promise<T>): Promise<T> {
+  const supabase = await createClient()
+  const { data, error } = await supabase.auth.getClaims()
+
+  if (error || !data?.claims) {
+    throw new Error('Usuário não autenticado')
+  }
+
+  // Só sessões de usuário: service_role e anon continuam pelo client Supabase
+  if (data.claims.role !== 'authenticated') {
+    throw new Error('Conexão direta disponível apenas para usuários autenticados')
+  }
+
+  const claims = JSON.stringify(data.claims)
+  const prisma = await getPrisma()
+
+  return prisma.$transaction(
+    async (tx) => {
+      await traceDatabaseQuery('pg:session', 'SET', () =>
+        tx.$executeRaw`SELECT set_config('request.jwt.claims', ${claims}, true), set_config('role', 'authenticated', true)`
+      )
+      return fn(createDirectDb(tx))
+    },
+    { timeout: TRANSACTION_TIMEOUT_MS }
+  )
+}
+
+/** SQLSTATE de um erro do Postgres vindo do Prisma (ex: '23503' para FK) */
+export function databaseErrorCode(error: unknown): string | undefined {
+  const failure = error as { code?: string; meta?: { code?: string } } | null
+  return failure?.meta?.code ?? failure?.code
+}
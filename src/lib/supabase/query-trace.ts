@@ -0,0 +1,602 @@
+/**
+ * ============================================
+ * QUERY TRACE
+ * Instrumentação das chamadas do client Supabase nas server actions.
+ *
+ * Cada round trip (PostgREST, RPC, auth, storage) vira um span compatível
+ * com OpenTelemetry (formato OTLP/JSON) com latência, linhas, bytes e status.
+ * Os spans de uma mesma requisição são agrupados em um trace; ao final da
+ * requisição é emitido um resumo por action e por tabela, com alerta de N+1
+ * quando uma action faz chamadas sequenciais demais à mesma tabela.
+ *
+ * Ativação (desligado por padrão, sem custo quando desligado):
+ *   QUERY_TRACE=console            resumo legível no console
+ *   QUERY_TRACE=json               um JSON por requisição (NDJSON) em QUERY_TRACE_FILE
+ *   QUERY_TRACE_N1_THRESHOLD=5     chamadas sequenciais à mesma tabela antes do alerta
+ *   QUERY_TRACE_SLOW_MS=200        spans acima disso são destacados no console
+ *
+ * measureQueries() coleta os round trips de um trecho mesmo com o trace
+ * desligado (usado pelas rotas de benchmark).
+ * ============================================
+ */
+
+import { AsyncLocalStorage } from 'node:async_hooks'
+import { randomBytes } from 'node:crypto'
+import { appendFile } from 'node:fs/promises'
+import { after } from 'next/server'
+import { cache } from 'react'
+
+type Exporter = 'console' | 'json'
+
+const EXPORTER: Exporter | null =
+  process.env.QUERY_TRACE === 'console' || process.env.QUERY_TRACE === 'json'
+    ? process.env.QUERY_TRACE
+    : null
+const TRACE_FILE = process.env.QUERY_TRACE_FILE || '.query-traces.ndjson'
+const N1_THRESHOLD = Number(process.env.QUERY_TRACE_N1_THRESHOLD) || 5
+const SLOW_MS = Number(process.env.QUERY_TRACE_SLOW_MS) || 200
+
+// Sem after() disponível (scripts, fora de requisição), o resumo sai após este ócio
+const IDLE_FLUSH_MS = 100
+
+export const isQueryTraceEnabled = () => EXPORTER !== null
+
+// ============================================
+// SPANS
+// ============================================
+
+type AttributeValue = string | number | boolean
+
+export interface QuerySpan {
+  traceId: string
+  spanId: string
+  parentSpanId: string
+  name: string
+  kind: 3 // SPAN_KIND_CLIENT
+  startTimeUnixNano: string
+  endTimeUnixNano: string
+  attributes: Record<string, AttributeValue>
+  status: { code: 0 | 1 | 2; message?: string } // UNSET | OK | ERROR
+}
+
+interface QueryRecord {
+  action: string
+  table: string
+  operation: string
+  start: number
+  end: number
+  rows: number
+  bytes: number
+  status: number
+  error: boolean
+}
+
+const hexId = (bytes: number) => randomBytes(bytes).toString('hex')
+const toUnixNano = (ms: number) => (BigInt(Math.round(ms * 1000)) * BigInt(1000)).toString()
+
+// Tabela/recurso e operação a partir da URL do Supabase
+export function describeRequest(url: URL, method: string): { table: string; operation: string } {
+  const path = url.pathname
+  const rest = path.match(/\/rest\/v1\/(rpc\/)?([^/?]+)/)
+
+  if (rest) {
+    if (rest[1]) return { table: `rpc:${rest[2]}`, operation: 'CALL' }
+    const operation =
+      method === 'GET' || method === 'HEAD'
+        ? 'SELECT'
+        : method === 'POST'
+          ? url.searchParams.has('on_conflict') ? 'UPSERT' : 'INSERT'
+          : method === 'PATCH'
+            ? 'UPDATE'
+            : method === 'DELETE'
+              ? 'DELETE'
+              : method
+    return { table: rest[2], operation }
+  }
+
+  // storage: /storage/v1/object/<bucket>/... → bucket; auth/functions: primeiro segmento
+  const service = path.match(/\/(auth|storage|functions)\/v1\/([^/?]+)(?:\/([^/?]+))?/)
+  if (service) {
+    const resource = service[1] === 'storage' && service[3] ? service[3] : service[2]
+    return { table: `${service[1]}:${resource}`, operation: method }
+  }
+
+  return { table: path, operation: method }
+}
+
+// Linhas retornadas: Content-Range do PostgREST ("0-24/*", "*/0") ou tamanho do array JSON
+function countRows(response: Response, body: string | null): number {
+  const range = response.headers.get('content-range')
+  if (range) {
+    const [span] = range.split('/')
+    if (span === '*') return 0 // HEAD/count sem corpo
+    const [from, to] = span.split('-').map(Number)
+    if (Number.isFinite(from) && Number.isFinite(to)) return to - from + 1
+  }
+
+  if (!body) return 0
+  try {
+    const parsed = JSON.parse(body)
+    return Array.isArray(parsed) ? parsed.length : parsed && typeof parsed === 'object' ? 1 : 0
+  } catch {
+    return 0
+  }
+}
+
+// ============================================
+// TRACE POR REQUISIÇÃO
+// ============================================
+
+class RequestTrace {
+  readonly traceId = hexId(16)
+  readonly rootSpanId = hexId(8)
+  readonly startedAt = Date.now()
+  readonly spans: QuerySpan[] = []
+  readonly records: QueryRecord[] = []
+
+  private inFlight = 0
+  private flushed = false
+  private idleTimer: ReturnType<typeof setTimeout> | null = null
+  private scheduled = false
+
+  scheduleFlush() {
+    if (this.scheduled) return
+    this.scheduled = true
+    try {
+      // after() roda depois que a resposta foi enviada, com todas as queries concluídas
+      after(() => this.flush())
+    } catch {
+      this.scheduled = false
+    }
+  }
+
+  begin() {
+    this.inFlight++
+    if (this.idleTimer) {
+      clearTimeout(this.idleTimer)
+      this.idleTimer = null
+    }
+  }
+
+  end(record: QueryRecord, span: QuerySpan) {
+    this.inFlight--
+    this.records.push(record)
+    this.spans.push(span)
+    recordAggregate(record)
+
+    if (!this.scheduled && this.inFlight === 0) {
+      this.idleTimer = setTimeout(() => this.flush(), IDLE_FLUSH_MS)
+    }
+  }
+
+  flush() {
+    if (this.flushed || this.records.length === 0) return
+    this.flushed = true
+    exportTrace(this)
+  }
+}
+
+// Um trace por requisição (React cache é escopado à requisição no servidor)
+const getRequestTrace = cache(() => new RequestTrace())
+
+function currentTrace(): RequestTrace {
+  try {
+    return getRequestTrace()
+  } catch {
+    return new RequestTrace()
+  }
+}
+
+// ============================================
+// NOME DA ACTION
+// ============================================
+
+const actionScope = new AsyncLocalStorage<string>()
+
+// Registros coletados por measureQueries() no escopo atual
+const measureScope = new AsyncLocalStorage<QueryRecord[]>()
+
+/**
+ * Nomeia explicitamente as queries feitas dentro de `fn` (útil em route
+ * handlers e scripts, ou quando o nome inferido pela stack não é suficiente).
+ */
+export function traceAction<T>(name: string, fn: () => Promise<T>): Promise<T> {
+  return actionScope.run(name, fn)
+}
+
+// Primeiro frame em src/ fora deste módulo e de createClient: "arquivo.função"
+function inferActionName(stack: string | undefined): string {
+  if (!stack) return 'unknown'
+
+  for (const line of stack.split('\n').slice(1)) {
+    const frame = line.match(/at (?:async )?(?:([\w$.<>]+) )?\(?(.*?):\d+:\d+\)?$/)
+    if (!frame) continue
+    const [, fn, file] = frame
+    if (!file || !file.includes('/src/') || file.includes('query-trace')) continue
+    if (fn === 'createClient' || fn === 'createServiceClient') continue
+
+    const module = file.split('/').pop()?.replace(/\.[jt]sx?$/, '') || 'unknown'
+    return fn ? `${module}.${fn.split('.').pop()}` : module
+  }
+
+  return 'unknown'
+}
+
+// ============================================
+// FETCH INSTRUMENTADO
+// ============================================
+
+/**
+ * fetch para `global.fetch` do client Supabase. Retorna undefined quando o
+ * trace está desligado, para o client usar o fetch padrão sem overhead.
+ */
+export function createTracedFetch(): typeof fetch | undefined {
+  const collector = measureScope.getStore()
+  if (!EXPORTER && !collector) return undefined
+
+  const trace = currentTrace()
+  const action = actionScope.getStore() || inferActionName(new Error().stack)
+  if (EXPORTER) trace.scheduleFlush()
+
+  return async (input, init) => {
+    const url = new URL(typeof input === 'string' ? input : input instanceof URL ? input.href : input.url)
+    const method = (init?.method || (input instanceof Request ? input.method : 'GET')).toUpperCase()
+    const { table, operation } = describeRequest(url, method)
+    const spanId = hexId(8)
+
+    // Propaga o contexto (W3C traceparent) para correlacionar com logs do servidor
+    const headers = new Headers(init?.headers ?? (input instanceof Request ? input.headers : undefined))
+    headers.set('traceparent', `00-${trace.traceId}-${spanId}-01`)
+
+    if (EXPORTER) trace.begin()
+    const startWall = Date.now()
+    const start = performance.now()
+    let response: Response | undefined
+    let failure: unknown
+
+    try {
+      response = await fetch(input, { ...init, headers })
+      return response
+    } catch (error) {
+      failure = error
+      throw error
+    } finally {
+      let bytes = Number(response?.headers.get('content-length')) || 0
+      let body: string | null = null
+
+      // Sem Content-Length (chunked) ou sem Content-Range, lê uma cópia do corpo
+      if (response && (!bytes || !response.headers.get('content-range')) && method !== 'HEAD') {
+        try {
+          body = await response.clone().text()
+          bytes = bytes || new TextEncoder().encode(body).length
+        } catch {
+          body = null
+        }
+      }
+
+      // Latência inclui o download do corpo quando ele foi lido
+      const duration = performance.now() - start
+      const status = response?.status ?? 0
+      const error = Boolean(failure) || status >= 400
+      const rows = response && !error ? countRows(response, body) : 0
+
+      const record: QueryRecord = {
+        action,
+        table,
+        operation,
+        start: startWall,
+        end: startWall + duration,
+        rows,
+        bytes,
+        status,
+        error,
+      }
+
+      const span: QuerySpan = {
+        traceId: trace.traceId,
+        spanId,
+        parentSpanId: trace.rootSpanId,
+        name: `${operation} ${table}`,
+        kind: 3,
+        startTimeUnixNano: toUnixNano(startWall),
+        endTimeUnixNano: toUnixNano(startWall + duration),
+        attributes: {
+          'code.function': action,
+          'db.system': 'postgresql',
+          'db.operation.name': operation,
+          'db.collection.name': table,
+          'db.response.returned_rows': rows,
+          'http.request.method': method,
+          'http.response.status_code': status,
+          'http.response.body.size': bytes,
+          'server.address': url.host,
+          'url.path': url.pathname,
+        },
+        status: error
+          ? { code: 2, message: failure instanceof Error ? failure.message : `HTTP ${status}` }
+          : { code: 1 },
+      }
+
+      collector?.push(record)
+      if (EXPORTER) trace.end(record, span)
+    }
+  }
+}
+
+/**
+ * Registra um round trip feito fora do client Supabase (conexão direta ao
+ * Postgres em lib/supabase/direct). `table` já vem com o prefixo "pg:";
+ * bytes são estimados pelo resultado decodificado (o protocolo não informa).
+ */
+export async function traceDatabaseQuery<T>(
+  table: string,
+  operation: string,
+  fn: () => Promise<T>
+): Promise<T> {
+  const collector = measureScope.getStore()
+  if (!EXPORTER && !collector) return fn()
+
+  const trace = currentTrace()
+  const action = actionScope.getStore() || inferActionName(new Error().stack)
+  if (EXPORTER) {
+    trace.scheduleFlush()
+    trace.begin()
+  }
+
+  const startWall = Date.now()
+  const start = performance.now()
+  let result: T | undefined
+  let failure: unknown
+
+  try {
+    result = await fn()
+    return result
+  } catch (error) {
+    failure = error
+    throw error
+  } finally {
+    const duration = performance.now() - start
+    const rows = Array.isArray(result) ? result.length : typeof result === 'number' ? result : result ? 1 : 0
+    let bytes = 0
+    try {
+      bytes = Array.isArray(result) ? Buffer.byteLength(JSON.stringify(result)) : 0
+    } catch {
+      bytes = 0
+    }
+
+    const record: QueryRecord = {
+      action,
+      table,
+      operation,
+      start: startWall,
+      end: startWall + duration,
+      rows: failure ? 0 : rows,
+      bytes,
+      status: failure ? 0 : 200,
+      error: Boolean(failure),
+    }
+
+    const span: QuerySpan = {
+      traceId: trace.traceId,
+      spanId: hexId(8),
+      parentSpanId: trace.rootSpanId,
+      name: `${operation} ${table}`,
+      kind: 3,
+      startTimeUnixNano: toUnixNano(startWall),
+      endTimeUnixNano: toUnixNano(startWall + duration),
+      attributes: {
+        'code.function': action,
+        'db.system': 'postgresql',
+        'db.operation.name': operation,
+        'db.collection.name': table,
+        'db.response.returned_rows': record.rows,
+      },
+      status: failure
+        ? { code: 2, message: failure instanceof Error ? failure.message : String(failure) }
+        : { code: 1 },
+    }
+
+    collector?.push(record)
+    if (EXPORTER) trace.end(record, span)
+  }
+}
+
+// ============================================
+// RESUMO E N+1
+// ============================================
+
+export interface QueryBreakdown {
+  action: string
+  table: string
+  calls: number
+  sequentialCalls: number
+  rows: number
+  bytes: number
+  totalMs: number
+  maxMs: number
+  errors: number
+}
+
+export interface TraceSummary {
+  traceId: string
+  roundTrips: number
+  totalMs: number
+  wallMs: number
+  rows: number
+  bytes: number
+  errors: number
+  breakdown: QueryBreakdown[]
+  warnings: string[]
+}
+
+/**
+ * Agrega os registros por action e tabela. Uma chamada é "sequencial" quando
+ * começa depois que a anterior da mesma action/tabela terminou (não estava em
+ * Promise.all); muitas delas seguidas são o padrão clássico de N+1.
+ */
+export function summarizeRecords(traceId: string, records: QueryRecord[]): TraceSummary {
+  const groups = new Map<string, QueryBreakdown & { lastEnd: number }>()
+
+  for (const record of [...records].sort((a, b) => a.start - b.start)) {
+    const key = `${record.action}\u0000${record.table}`
+    let group = groups.get(key)
+    if (!group) {
+      group = {
+        action: record.action,
+        table: record.table,
+        calls: 0,
+        sequentialCalls: 0,
+        rows: 0,
+        bytes: 0,
+        totalMs: 0,
+        maxMs: 0,
+        errors: 0,
+        lastEnd: -Infinity,
+      }
+      groups.set(key, group)
+    }
+
+    const duration = record.end - record.start
+    if (group.calls > 0 && record.start >= group.lastEnd) group.sequentialCalls++
+    group.calls++
+    group.rows += record.rows
+    group.bytes += record.bytes
+    group.totalMs += duration
+    group.maxMs = Math.max(group.maxMs, duration)
+    if (record.error) group.errors++
+    group.lastEnd = Math.max(group.lastEnd, record.end)
+  }
+
+  const breakdown = Array.from(groups.values())
+    .map(({ lastEnd: _lastEnd, ...group }) => ({
+      ...group,
+      totalMs: Math.round(group.totalMs * 10) / 10,
+      maxMs: Math.round(group.maxMs * 10) / 10,
+    }))
+    .sort((a, b) => b.totalMs - a.totalMs)
+
+  const warnings = breakdown
+    .filter((group) => group.sequentialCalls + 1 > N1_THRESHOLD)
+    .map(
+      (group) =>
+        `N+1 detected: ${group.action} made ${group.sequentialCalls + 1} sequential calls to ${group.table}`
+    )
+
+  const starts = records.map((record) => record.start)
+  const ends = records.map((record) => record.end)
+
+  return {
+    traceId,
+    roundTrips: records.length,
+    totalMs: Math.round(breakdown.reduce((acc, group) => acc + group.totalMs, 0) * 10) / 10,
+    wallMs: records.length ? Math.round(Math.max(...ends) - Math.min(...starts)) : 0,
+    rows: breakdown.reduce((acc, group) => acc + group.rows, 0),
+    bytes: breakdown.reduce((acc, group) => acc + group.bytes, 0),
+    errors: breakdown.reduce((acc, group) => acc + group.errors, 0),
+    breakdown,
+    warnings,
+  }
+}
+
+/**
+ * Executa `fn` e resume os round trips que ela fez (clients criados dentro
+ * do escopo). Funciona com QUERY_TRACE desligado.
+ */
+export async function measureQueries<T>(fn: () => Promise<T>): Promise<{ result: T; summary: TraceSummary }> {
+  const records: QueryRecord[] = []
+  const result = await measureScope.run(records, fn)
+  return { result, summary: summarizeRecords(hexId(16), records) }
+}
+
+// ============================================
+// AGREGADO DO PROCESSO
+// ============================================
+
+type AggregateStats = { calls: number; rows: number; bytes: number; totalMs: number; errors: number }
+
+const aggregates = new Map<string, AggregateStats>()
+
+function recordAggregate(record: QueryRecord) {
+  const key = `${record.action} ${record.table}`
+  const stats = aggregates.get(key) || { calls: 0, rows: 0, bytes: 0, totalMs: 0, errors: 0 }
+  stats.calls++
+  stats.rows += record.rows
+  stats.bytes += record.bytes
+  stats.totalMs += record.end - record.start
+  if (record.error) stats.errors++
+  aggregates.set(key, stats)
+}
+
+/**
+ * Totais por action/tabela desde o início do processo, ordenados por tempo total.
+ */
+export function getQueryMetrics() {
+  return Array.from(aggregates.entries())
+    .map(([key, stats]) => {
+      const [action, table] = key.split(' ')
+      return {
+        action,
+        table,
+        ...stats,
+        totalMs: Math.round(stats.totalMs),
+        avgMs: Math.round((stats.totalMs / stats.calls) * 10) / 10,
+      }
+    })
+    .sort((a, b) => b.totalMs - a.totalMs)
+}
+
+// ============================================
+// EXPORTERS
+// ============================================
+
+function exportTrace(trace: RequestTrace) {
+  const summary = summarizeRecords(trace.traceId, trace.records)
+
+  if (EXPORTER === 'json') {
+    const line = JSON.stringify({
+      summary,
+      // Payload no formato OTLP/JSON (resourceSpans), importável por um collector
+      resourceSpans: [
+        {
+          resource: { attributes: [{ key: 'service.name', value: { stringValue: 'zoomingcrm' } }] },
+          scopeSpans: [
+            {
+              scope: { name: 'zoomingcrm.query-trace' },
+              spans: trace.spans.map((span) => ({
+                ...span,
+                attributes: Object.entries(span.attributes).map(([key, value]) => ({
+                  key,
+                  value:
+                    typeof value === 'number'
+                      ? { intValue: value }
+                      : typeof value === 'boolean'
+                        ? { boolValue: value }
+                        : { stringValue: value },
+                })),
+              })),
+            },
+          ],
+        },
+      ],
+    })
+
+    appendFile(TRACE_FILE, line + '\n').catch((error) => {
+      console.error('Error writing query trace:', error)
+    })
+    return
+  }
+
+  const lines = [
+    `[query-trace] ${trace.traceId} · ${summary.roundTrips} round trips · ${summary.wallMs}ms wall · ` +
+      `${summary.rows} rows · ${(summary.bytes / 1024).toFixed(1)}KB` +
+      (summary.errors ? ` · ${summary.errors} errors` : ''),
+    ...summary.breakdown.map(
+      (group) =>
+        `  ${group.maxMs >= SLOW_MS ? '!' : ' '} ${group.action} → ${group.table}: ` +
+        `${group.calls}x, ${group.totalMs}ms (max ${group.maxMs}ms), ${group.rows} rows, ${group.bytes}B`
+    ),
+  ]
+
+  console.log(lines.join('\n'))
+  summary.warnings.forEach((warning) => console.warn(`[query-trace] ${warning}`))
+}
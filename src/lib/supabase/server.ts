@@ -1,6 +1,7 @@
 import { createServerClient } from '@supabase/ssr'
 import { cookies } from 'next/headers'
 import { cache } from 'react'
+import { createTracedFetch } from './query-trace'
 
 export async function createClient() {
   const cookieStore = await cookies()
@@ -23,6 +24,8 @@ export async function createClient() {
           }
         },
       },
+      // Instrumentação de queries (QUERY_TRACE); undefined mantém o fetch padrão
+      global: { fetch: createTracedFetch() },
     }
   )
 }
@@ -36,7 +39,8 @@ export async function createServiceClient() {
 
   return createSupabaseClient(
     process.env.NEXT_PUBLIC_SUPABASE_URL!,
-    process.env.SUPABASE_SERVICE_ROLE_KEY!
+    process.env.SUPABASE_SERVICE_ROLE_KEY!,
+    { global: { fetch: createTracedFetch() } }
   )
 }
 
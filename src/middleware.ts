@@ -12,7 +12,8 @@ export const config = {
      * - _next/static (static files)
      * - _next/image (image optimization files)
      * - favicon.ico (favicon file)
+     * - api/calendar/feed (feed ICS por token, sem sessão)
      */
-    '/((?!_next/static|_next/image|favicon.ico|login|.*\\.(?:svg|png|jpg|jpeg|gif|webp)$).*)',
+    '/((?!_next/static|_next/image|favicon.ico|login|api/calendar/feed|.*\\.(?:svg|png|jpg|jpeg|gif|webp)$).*)',
   ],
 }
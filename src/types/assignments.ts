@@ -71,6 +71,12 @@ export interface FreelancerWorkHistoryItem {
     organization_id: string
 }
 
+// Página do histórico (cursor opaco para a próxima página; null = fim)
+export interface FreelancerWorkHistoryPage {
+    items: FreelancerWorkHistoryItem[]
+    next_cursor: string | null
+}
+
 // ============================================
 // Freelancer Financial Summary (from view)
 // ============================================
@@ -90,6 +96,25 @@ export interface FreelancerFinancialSummary {
     organization_id: string
 }
 
+// ============================================
+// Freelancer Monthly Stats (rollup table)
+// ============================================
+
+export interface FreelancerMonthlyStats {
+    freelancer_id: string
+    organization_id: string
+    month: string // YYYY-MM-01
+    jobs_count: number
+    completed_jobs: number
+    pending_jobs: number
+    estimated_hours: number
+    agreed_fees: number
+    completed_fees: number
+    paid_amount: number
+    pending_amount: number
+    updated_at: string
+}
+
 // ============================================
 // Freelancer Detail Page Types
 // ============================================
@@ -111,12 +136,14 @@ export interface FreelancerWithDetails {
 
     // Agregados
     work_history?: FreelancerWorkHistoryItem[]
+    work_history_cursor?: string | null
     financial_summary?: FreelancerFinancialSummary
     upcoming_assignments?: ItemAssignment[]
     monthly_earnings?: Array<{
         month: string
         amount: number
     }>
+    monthly_stats?: FreelancerMonthlyStats[]
 }
 
 // ============================================
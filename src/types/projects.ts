@@ -2,6 +2,8 @@
 // TYPES: Projects Module
 // ============================================
 
+import type { ProjectProfitability } from '@/actions/profitability'
+
 export type ProjectStatus =
   | 'BRIEFING'
   | 'PRE_PROD'
@@ -150,6 +152,15 @@ export interface ProjectWithRelations extends Project {
   tasks?: ProjectTask[]
 }
 
+// Relações financeiras do detalhe do projeto, carregadas em streaming
+export interface ProjectFinancials {
+  financialSummary: any | null
+  expenses: any[]
+  equipmentBookings: any[]
+  // Cubo de rentabilidade (lançamentos, despesas e contratado do projeto)
+  profitability: ProjectProfitability
+}
+
 export interface ProjectMemberWithFreelancer extends ProjectMember {
   freelancers: {
     id: string
@@ -0,0 +1,441 @@
+-- ==============================================================================
+-- MIGRATION: FREELANCER MONTHLY ROLLUP
+-- Agregado por freelancer/mês (ganhos, trabalhos, horas) mantido por triggers.
+-- Substitui a agregação em JS de getFreelancerMonthlyEarnings e o scan completo
+-- de histórico nas telas de freelancers.
+-- ==============================================================================
+
+-- 1. Tabela de rollup
+CREATE TABLE IF NOT EXISTS public.freelancer_monthly_stats (
+  organization_id TEXT NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+  freelancer_id TEXT NOT NULL REFERENCES public.freelancers(id) ON DELETE CASCADE,
+  month DATE NOT NULL, -- Primeiro dia do mês
+
+  -- Trabalhos (item_assignments vinculados a projetos)
+  jobs_count INTEGER NOT NULL DEFAULT 0,
+  completed_jobs INTEGER NOT NULL DEFAULT 0,
+  pending_jobs INTEGER NOT NULL DEFAULT 0,
+  estimated_hours DECIMAL(10,2) NOT NULL DEFAULT 0,
+  agreed_fees DECIMAL(12,2) NOT NULL DEFAULT 0,
+  completed_fees DECIMAL(12,2) NOT NULL DEFAULT 0,
+  -- Projetos distintos, contados no mês do primeiro trabalho no projeto
+  projects_count INTEGER NOT NULL DEFAULT 0,
+
+  -- Pagamentos (financial_transactions EXPENSE do freelancer)
+  paid_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+  pending_amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+  PRIMARY KEY (freelancer_id, month)
+);
+
+CREATE INDEX IF NOT EXISTS idx_freelancer_monthly_stats_org
+  ON public.freelancer_monthly_stats(organization_id, freelancer_id, month DESC);
+
+-- Índice para o histórico paginado (getFreelancerWorkHistory)
+CREATE INDEX IF NOT EXISTS idx_item_assignments_freelancer_created
+  ON public.item_assignments(freelancer_id, created_at DESC);
+
+COMMENT ON TABLE public.freelancer_monthly_stats IS
+'Rollup incremental por freelancer/mês: trabalhos, horas, cachês, projetos e pagamentos. Mantido por triggers em item_assignments, project_items e financial_transactions.';
+
+-- Trabalhos por freelancer/projeto: contador de referências que decide quando
+-- um projeto entra (+1) ou sai (-1) de projects_count, sem COUNT(DISTINCT) no histórico
+CREATE TABLE IF NOT EXISTS public.freelancer_project_jobs (
+  organization_id TEXT NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+  freelancer_id TEXT NOT NULL REFERENCES public.freelancers(id) ON DELETE CASCADE,
+  -- Sem FK: a exclusão do projeto é descontada pelo trigger de project_items
+  project_id TEXT NOT NULL,
+  month DATE NOT NULL, -- Mês em que o projeto foi contado
+  jobs_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (freelancer_id, project_id)
+);
+
+-- 2. Aplicar delta em um bucket (upsert aditivo)
+CREATE OR REPLACE FUNCTION apply_freelancer_monthly_delta(
+  p_organization_id TEXT,
+  p_freelancer_id TEXT,
+  p_month DATE,
+  p_jobs INTEGER,
+  p_completed_jobs INTEGER,
+  p_pending_jobs INTEGER,
+  p_hours NUMERIC,
+  p_agreed_fees NUMERIC,
+  p_completed_fees NUMERIC,
+  p_paid NUMERIC,
+  p_pending NUMERIC
+) RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  IF p_freelancer_id IS NULL OR p_organization_id IS NULL OR p_month IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO public.freelancer_monthly_stats AS s (
+    organization_id, freelancer_id, month,
+    jobs_count, completed_jobs, pending_jobs, estimated_hours,
+    agreed_fees, completed_fees, paid_amount, pending_amount
+  ) VALUES (
+    p_organization_id, p_freelancer_id, p_month,
+    p_jobs, p_completed_jobs, p_pending_jobs, p_hours,
+    p_agreed_fees, p_completed_fees, p_paid, p_pending
+  )
+  ON CONFLICT (freelancer_id, month) DO UPDATE SET
+    jobs_count = s.jobs_count + EXCLUDED.jobs_count,
+    completed_jobs = s.completed_jobs + EXCLUDED.completed_jobs,
+    pending_jobs = s.pending_jobs + EXCLUDED.pending_jobs,
+    estimated_hours = s.estimated_hours + EXCLUDED.estimated_hours,
+    agreed_fees = s.agreed_fees + EXCLUDED.agreed_fees,
+    completed_fees = s.completed_fees + EXCLUDED.completed_fees,
+    paid_amount = s.paid_amount + EXCLUDED.paid_amount,
+    pending_amount = s.pending_amount + EXCLUDED.pending_amount,
+    updated_at = NOW();
+END;
+$$;
+
+-- Conta/desconta um trabalho no projeto do item; o projeto entra em
+-- projects_count no primeiro trabalho e sai quando não resta nenhum
+CREATE OR REPLACE FUNCTION apply_freelancer_project_delta(
+  p_organization_id TEXT,
+  p_freelancer_id TEXT,
+  p_project_item_id TEXT,
+  p_month DATE,
+  p_delta INTEGER
+) RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  v_project_id TEXT;
+  v_link RECORD;
+BEGIN
+  IF p_freelancer_id IS NULL OR p_project_item_id IS NULL OR COALESCE(p_delta, 0) = 0 THEN
+    RETURN;
+  END IF;
+
+  -- Item já removido: o trigger de project_items descontou antes do cascade
+  SELECT project_id INTO v_project_id FROM public.project_items WHERE id = p_project_item_id;
+  IF v_project_id IS NULL THEN
+    RETURN;
+  END IF;
+
+  IF p_delta > 0 THEN
+    INSERT INTO public.freelancer_project_jobs AS l (organization_id, freelancer_id, project_id, month, jobs_count)
+    VALUES (p_organization_id, p_freelancer_id, v_project_id, COALESCE(p_month, date_trunc('month', NOW())::date), p_delta)
+    ON CONFLICT (freelancer_id, project_id) DO UPDATE SET jobs_count = l.jobs_count + EXCLUDED.jobs_count
+    RETURNING l.organization_id, l.month, l.jobs_count INTO v_link;
+
+    IF v_link.jobs_count = p_delta THEN
+      INSERT INTO public.freelancer_monthly_stats AS s (organization_id, freelancer_id, month, projects_count)
+      VALUES (v_link.organization_id, p_freelancer_id, v_link.month, 1)
+      ON CONFLICT (freelancer_id, month) DO UPDATE SET
+        projects_count = s.projects_count + 1,
+        updated_at = NOW();
+    END IF;
+  ELSE
+    UPDATE public.freelancer_project_jobs
+    SET jobs_count = jobs_count + p_delta
+    WHERE freelancer_id = p_freelancer_id AND project_id = v_project_id
+    RETURNING organization_id, month, jobs_count INTO v_link;
+
+    IF FOUND AND v_link.jobs_count <= 0 THEN
+      DELETE FROM public.freelancer_project_jobs
+      WHERE freelancer_id = p_freelancer_id AND project_id = v_project_id;
+
+      UPDATE public.freelancer_monthly_stats
+      SET projects_count = projects_count - 1, updated_at = NOW()
+      WHERE freelancer_id = p_freelancer_id AND month = v_link.month;
+    END IF;
+  END IF;
+END;
+$$;
+
+-- 3. Trigger: item_assignments
+-- Só contam trabalhos de projeto (project_item_id), evitando contar duas vezes
+-- o assignment da proposta e sua cópia no projeto.
+CREATE OR REPLACE FUNCTION sync_freelancer_monthly_stats_from_assignment()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  -- Projeto só muda de contagem quando o vínculo freelancer/item muda
+  v_relinked BOOLEAN := TG_OP <> 'UPDATE';
+BEGIN
+  IF TG_OP = 'UPDATE' THEN
+    v_relinked := OLD.freelancer_id IS DISTINCT FROM NEW.freelancer_id
+      OR OLD.project_item_id IS DISTINCT FROM NEW.project_item_id;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.project_item_id IS NOT NULL THEN
+    PERFORM apply_freelancer_monthly_delta(
+      OLD.organization_id,
+      OLD.freelancer_id,
+      date_trunc('month', COALESCE(OLD.scheduled_date, OLD.created_at))::date,
+      -1,
+      -(CASE WHEN OLD.status = 'DONE' THEN 1 ELSE 0 END),
+      -(CASE WHEN OLD.status = 'PENDING' THEN 1 ELSE 0 END),
+      -COALESCE(OLD.estimated_hours, 0),
+      -COALESCE(OLD.agreed_fee, 0),
+      -(CASE WHEN OLD.status = 'DONE' THEN COALESCE(OLD.agreed_fee, 0) ELSE 0 END),
+      0,
+      0
+    );
+    IF v_relinked THEN
+      PERFORM apply_freelancer_project_delta(OLD.organization_id, OLD.freelancer_id, OLD.project_item_id, NULL, -1);
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.project_item_id IS NOT NULL THEN
+    PERFORM apply_freelancer_monthly_delta(
+      NEW.organization_id,
+      NEW.freelancer_id,
+      date_trunc('month', COALESCE(NEW.scheduled_date, NEW.created_at, NOW()))::date,
+      1,
+      CASE WHEN NEW.status = 'DONE' THEN 1 ELSE 0 END,
+      CASE WHEN NEW.status = 'PENDING' THEN 1 ELSE 0 END,
+      COALESCE(NEW.estimated_hours, 0),
+      COALESCE(NEW.agreed_fee, 0),
+      CASE WHEN NEW.status = 'DONE' THEN COALESCE(NEW.agreed_fee, 0) ELSE 0 END,
+      0,
+      0
+    );
+    IF v_relinked THEN
+      PERFORM apply_freelancer_project_delta(
+        NEW.organization_id,
+        NEW.freelancer_id,
+        NEW.project_item_id,
+        date_trunc('month', COALESCE(NEW.scheduled_date, NEW.created_at, NOW()))::date,
+        1
+      );
+    END IF;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_freelancer_monthly_stats_assignment ON public.item_assignments;
+CREATE TRIGGER trigger_freelancer_monthly_stats_assignment
+  AFTER INSERT OR UPDATE OR DELETE ON public.item_assignments
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_freelancer_monthly_stats_from_assignment();
+
+-- Item de projeto removido (ou projeto, em cascata): desconta os trabalhos
+-- antes do cascade apagar os assignments, enquanto o project_id ainda é legível
+CREATE OR REPLACE FUNCTION sync_freelancer_project_jobs_from_item()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  v_row RECORD;
+BEGIN
+  FOR v_row IN
+    SELECT organization_id, freelancer_id, COUNT(*)::int AS jobs
+    FROM public.item_assignments
+    WHERE project_item_id = OLD.id
+    GROUP BY organization_id, freelancer_id
+  LOOP
+    PERFORM apply_freelancer_project_delta(v_row.organization_id, v_row.freelancer_id, OLD.id, NULL, -v_row.jobs);
+  END LOOP;
+
+  RETURN OLD;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_freelancer_project_jobs_item ON public.project_items;
+CREATE TRIGGER trigger_freelancer_project_jobs_item
+  BEFORE DELETE ON public.project_items
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_freelancer_project_jobs_from_item();
+
+-- 4. Trigger: financial_transactions
+-- Pagos entram no mês do pagamento; pendentes/agendados no mês do vencimento.
+CREATE OR REPLACE FUNCTION sync_freelancer_monthly_stats_from_transaction()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE')
+     AND OLD.freelancer_id IS NOT NULL
+     AND OLD.type = 'EXPENSE'
+     AND OLD.status IN ('PAID', 'PENDING', 'SCHEDULED') THEN
+    PERFORM apply_freelancer_monthly_delta(
+      OLD.organization_id,
+      OLD.freelancer_id,
+      date_trunc('month', CASE
+        WHEN OLD.status = 'PAID' THEN COALESCE(OLD.payment_date, OLD.due_date, OLD.created_at)
+        ELSE COALESCE(OLD.due_date, OLD.created_at)
+      END)::date,
+      0, 0, 0, 0, 0, 0,
+      -(CASE WHEN OLD.status = 'PAID' THEN OLD.amount ELSE 0 END),
+      -(CASE WHEN OLD.status <> 'PAID' THEN OLD.amount ELSE 0 END)
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE')
+     AND NEW.freelancer_id IS NOT NULL
+     AND NEW.type = 'EXPENSE'
+     AND NEW.status IN ('PAID', 'PENDING', 'SCHEDULED') THEN
+    PERFORM apply_freelancer_monthly_delta(
+      NEW.organization_id,
+      NEW.freelancer_id,
+      date_trunc('month', CASE
+        WHEN NEW.status = 'PAID' THEN COALESCE(NEW.payment_date, NEW.due_date, NEW.created_at, NOW())
+        ELSE COALESCE(NEW.due_date, NEW.created_at, NOW())
+      END)::date,
+      0, 0, 0, 0, 0, 0,
+      CASE WHEN NEW.status = 'PAID' THEN NEW.amount ELSE 0 END,
+      CASE WHEN NEW.status <> 'PAID' THEN NEW.amount ELSE 0 END
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_freelancer_monthly_stats_transaction ON public.financial_transactions;
+CREATE TRIGGER trigger_freelancer_monthly_stats_transaction
+  AFTER INSERT OR UPDATE OR DELETE ON public.financial_transactions
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_freelancer_monthly_stats_from_transaction();
+
+-- 5. Rebuild completo (backfill inicial e correção manual)
+CREATE OR REPLACE FUNCTION refresh_freelancer_monthly_stats(p_organization_id TEXT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  DELETE FROM public.freelancer_monthly_stats
+  WHERE p_organization_id IS NULL OR organization_id = p_organization_id;
+
+  DELETE FROM public.freelancer_project_jobs
+  WHERE p_organization_id IS NULL OR organization_id = p_organization_id;
+
+  INSERT INTO public.freelancer_project_jobs (organization_id, freelancer_id, project_id, month, jobs_count)
+  SELECT
+    ia.organization_id,
+    ia.freelancer_id,
+    pi.project_id,
+    MIN(date_trunc('month', COALESCE(ia.scheduled_date, ia.created_at))::date),
+    COUNT(*)::int
+  FROM public.item_assignments ia
+  JOIN public.project_items pi ON pi.id = ia.project_item_id
+  WHERE (p_organization_id IS NULL OR ia.organization_id = p_organization_id)
+    AND ia.freelancer_id IN (SELECT id FROM public.freelancers)
+  GROUP BY ia.organization_id, ia.freelancer_id, pi.project_id;
+
+  INSERT INTO public.freelancer_monthly_stats (
+    organization_id, freelancer_id, month,
+    jobs_count, completed_jobs, pending_jobs, estimated_hours,
+    agreed_fees, completed_fees, projects_count, paid_amount, pending_amount
+  )
+  SELECT
+    organization_id, freelancer_id, month,
+    SUM(jobs_count), SUM(completed_jobs), SUM(pending_jobs), SUM(estimated_hours),
+    SUM(agreed_fees), SUM(completed_fees), SUM(projects_count), SUM(paid_amount), SUM(pending_amount)
+  FROM (
+    SELECT
+      ia.organization_id,
+      ia.freelancer_id,
+      date_trunc('month', COALESCE(ia.scheduled_date, ia.created_at))::date AS month,
+      COUNT(*)::int AS jobs_count,
+      COUNT(*) FILTER (WHERE ia.status = 'DONE')::int AS completed_jobs,
+      COUNT(*) FILTER (WHERE ia.status = 'PENDING')::int AS pending_jobs,
+      COALESCE(SUM(ia.estimated_hours), 0) AS estimated_hours,
+      COALESCE(SUM(ia.agreed_fee), 0) AS agreed_fees,
+      COALESCE(SUM(ia.agreed_fee) FILTER (WHERE ia.status = 'DONE'), 0) AS completed_fees,
+      0 AS projects_count,
+      0::numeric AS paid_amount,
+      0::numeric AS pending_amount
+    FROM public.item_assignments ia
+    WHERE ia.project_item_id IS NOT NULL
+      AND (p_organization_id IS NULL OR ia.organization_id = p_organization_id)
+    GROUP BY 1, 2, 3
+
+    UNION ALL
+
+    SELECT organization_id, freelancer_id, month, 0, 0, 0, 0, 0, 0, COUNT(*)::int, 0, 0
+    FROM public.freelancer_project_jobs
+    WHERE p_organization_id IS NULL OR organization_id = p_organization_id
+    GROUP BY 1, 2, 3
+
+    UNION ALL
+
+    SELECT
+      ft.organization_id,
+      ft.freelancer_id,
+      date_trunc('month', CASE
+        WHEN ft.status = 'PAID' THEN COALESCE(ft.payment_date, ft.due_date, ft.created_at)
+        ELSE COALESCE(ft.due_date, ft.created_at)
+      END)::date AS month,
+      0, 0, 0, 0, 0, 0, 0,
+      COALESCE(SUM(ft.amount) FILTER (WHERE ft.status = 'PAID'), 0),
+      COALESCE(SUM(ft.amount) FILTER (WHERE ft.status IN ('PENDING', 'SCHEDULED')), 0)
+    FROM public.financial_transactions ft
+    WHERE ft.freelancer_id IS NOT NULL
+      AND ft.type = 'EXPENSE'
+      AND ft.status IN ('PAID', 'PENDING', 'SCHEDULED')
+      AND (p_organization_id IS NULL OR ft.organization_id = p_organization_id)
+    GROUP BY 1, 2, 3
+  ) src
+  WHERE freelancer_id IN (SELECT id FROM public.freelancers)
+  GROUP BY organization_id, freelancer_id, month;
+END;
+$$;
+
+SELECT refresh_freelancer_monthly_stats();
+
+-- 6. View: totais por freelancer (grid e resumo do detalhe)
+-- Lê apenas o rollup (poucas linhas por freelancer) em vez do histórico completo.
+CREATE OR REPLACE VIEW freelancer_rollup_totals AS
+SELECT
+  f.id AS freelancer_id,
+  f.organization_id,
+  f.name,
+  f.email,
+  f.role,
+  f.specialty,
+  f.status,
+  f.rating,
+  f.daily_rate,
+  f.phone,
+  f.portfolio,
+  f.notes,
+  f.created_at,
+  COALESCE(SUM(s.jobs_count), 0)::int AS total_jobs,
+  COALESCE(SUM(s.completed_jobs), 0)::int AS completed_jobs,
+  COALESCE(SUM(s.pending_jobs), 0)::int AS pending_jobs,
+  COALESCE(SUM(s.estimated_hours), 0) AS total_hours,
+  COALESCE(SUM(s.agreed_fees), 0) AS total_agreed_fees,
+  COALESCE(SUM(s.completed_fees), 0) AS completed_fees,
+  COALESCE(SUM(s.paid_amount), 0) AS total_paid,
+  COALESCE(SUM(s.pending_amount), 0) AS pending_payment,
+  MAX(s.month) FILTER (WHERE s.jobs_count > 0) AS last_job_month,
+  COALESCE(SUM(s.projects_count), 0)::int AS projects_count
+FROM public.freelancers f
+LEFT JOIN public.freelancer_monthly_stats s ON s.freelancer_id = f.id
+GROUP BY f.id;
+
+COMMENT ON VIEW freelancer_rollup_totals IS 'Totais por freelancer calculados a partir de freelancer_monthly_stats';
+
+GRANT SELECT ON freelancer_rollup_totals TO authenticated;
+GRANT SELECT ON freelancer_rollup_totals TO service_role;
+
+-- 7. RLS
+ALTER TABLE public.freelancer_monthly_stats ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.freelancer_project_jobs ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_project_jobs" ON public.freelancer_project_jobs;
+CREATE POLICY "Org isolation for freelancer_project_jobs" ON public.freelancer_project_jobs
+FOR SELECT USING (organization_id = auth_org_id());
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_monthly_stats" ON public.freelancer_monthly_stats;
+CREATE POLICY "Org isolation for freelancer_monthly_stats" ON public.freelancer_monthly_stats
+FOR SELECT USING (organization_id = auth_org_id());
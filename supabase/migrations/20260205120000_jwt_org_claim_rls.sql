@@ -0,0 +1,197 @@
+-- ==============================================================================
+-- MIGRATION: RLS VIA CLAIM DO JWT (organization_id)
+-- ==============================================================================
+-- auth_org_id() fazia um SELECT em public.users a cada chamada. Agora o
+-- organization_id viaja no JWT (app_metadata, gravável apenas pelo service
+-- role) e as policies o leem via auth.jwt(), embrulhado em (SELECT ...) para
+-- virar um InitPlan avaliado uma única vez por statement.
+--
+-- Benchmark: database/benchmarks/rls_org_claim_benchmark.sql
+-- ==============================================================================
+
+-- 1. Manter app_metadata.organization_id sincronizado com public.users
+CREATE OR REPLACE FUNCTION sync_user_org_claim()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, auth
+AS $$
+BEGIN
+  UPDATE auth.users
+  SET raw_app_meta_data = COALESCE(raw_app_meta_data, '{}'::jsonb)
+    || jsonb_build_object('organization_id', NEW.organization_id)
+  WHERE id::text = NEW.id;
+
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_sync_user_org_claim ON public.users;
+CREATE TRIGGER trigger_sync_user_org_claim
+AFTER INSERT OR UPDATE OF organization_id ON public.users
+FOR EACH ROW
+EXECUTE FUNCTION sync_user_org_claim();
+
+-- Backfill dos usuários existentes (o claim aparece no próximo refresh do token)
+UPDATE auth.users au
+SET raw_app_meta_data = COALESCE(au.raw_app_meta_data, '{}'::jsonb)
+  || jsonb_build_object('organization_id', u.organization_id)
+FROM public.users u
+WHERE au.id::text = u.id
+  AND u.organization_id IS NOT NULL;
+
+-- 2. auth_org_id(): claim do JWT primeiro, lookup em users só como fallback
+--    (tokens emitidos antes desta migration ainda não carregam o claim)
+CREATE OR REPLACE FUNCTION auth_org_id()
+RETURNS TEXT
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+AS $$
+  SELECT COALESCE(
+    NULLIF(auth.jwt() -> 'app_metadata' ->> 'organization_id', ''),
+    (SELECT organization_id FROM public.users WHERE id = auth.uid()::text LIMIT 1)
+  );
+$$;
+
+-- 3. Recriar policies com (SELECT auth_org_id()) para avaliação única por statement
+
+-- USERS
+DROP POLICY IF EXISTS "Users view self and org members" ON public.users;
+CREATE POLICY "Users view self and org members" ON public.users
+FOR SELECT USING (
+  id = (SELECT auth.uid()::text) OR organization_id = (SELECT auth_org_id())
+);
+
+DROP POLICY IF EXISTS "Users update self" ON public.users;
+CREATE POLICY "Users update self" ON public.users
+FOR UPDATE USING (id = (SELECT auth.uid()::text));
+
+-- ORGANIZATIONS
+DROP POLICY IF EXISTS "View own organization" ON public.organizations;
+CREATE POLICY "View own organization" ON public.organizations
+FOR SELECT USING (id = (SELECT auth_org_id()));
+
+-- CLIENTS
+DROP POLICY IF EXISTS "Org isolation for clients" ON public.clients;
+CREATE POLICY "Org isolation for clients" ON public.clients
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+-- PROJECTS
+DROP POLICY IF EXISTS "Org isolation for projects" ON public.projects;
+CREATE POLICY "Org isolation for projects" ON public.projects
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+-- FINANCIAL TRANSACTIONS
+DROP POLICY IF EXISTS "Org isolation for finances" ON public.financial_transactions;
+CREATE POLICY "Org isolation for finances" ON public.financial_transactions
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+-- FREELANCERS
+DROP POLICY IF EXISTS "Org isolation for freelancers" ON public.freelancers;
+CREATE POLICY "Org isolation for freelancers" ON public.freelancers
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_tags" ON public.freelancer_tags;
+CREATE POLICY "Org isolation for freelancer_tags" ON public.freelancer_tags
+FOR ALL USING (
+  freelancer_id IN (SELECT id FROM public.freelancers WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_allocations" ON public.freelancer_allocations;
+CREATE POLICY "Org isolation for freelancer_allocations" ON public.freelancer_allocations
+FOR ALL USING (
+  freelancer_id IN (SELECT id FROM public.freelancers WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_availability" ON public.freelancer_availability;
+CREATE POLICY "Org isolation for freelancer_availability" ON public.freelancer_availability
+FOR ALL USING (
+  freelancer_id IN (SELECT id FROM public.freelancers WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_monthly_stats" ON public.freelancer_monthly_stats;
+CREATE POLICY "Org isolation for freelancer_monthly_stats" ON public.freelancer_monthly_stats
+FOR SELECT USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for freelancer_project_jobs" ON public.freelancer_project_jobs;
+CREATE POLICY "Org isolation for freelancer_project_jobs" ON public.freelancer_project_jobs
+FOR SELECT USING (organization_id = (SELECT auth_org_id()));
+
+-- EQUIPMENTS
+DROP POLICY IF EXISTS "Org isolation for equipments" ON public.equipments;
+CREATE POLICY "Org isolation for equipments" ON public.equipments
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for bookings" ON public.equipment_bookings;
+CREATE POLICY "Org isolation for bookings" ON public.equipment_bookings
+FOR ALL USING (
+  project_id IN (SELECT id FROM public.projects WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for kits" ON public.equipment_kits;
+CREATE POLICY "Org isolation for kits" ON public.equipment_kits
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+-- PROPOSALS
+DROP POLICY IF EXISTS "Org isolation for proposals" ON public.proposals;
+CREATE POLICY "Org isolation for proposals" ON public.proposals
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for proposal_items" ON public.proposal_items;
+CREATE POLICY "Org isolation for proposal_items" ON public.proposal_items
+FOR ALL USING (
+  proposal_id IN (SELECT id FROM public.proposals WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for proposal_optionals" ON public.proposal_optionals;
+CREATE POLICY "Org isolation for proposal_optionals" ON public.proposal_optionals
+FOR ALL USING (
+  proposal_id IN (SELECT id FROM public.proposals WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for proposal_videos" ON public.proposal_videos;
+CREATE POLICY "Org isolation for proposal_videos" ON public.proposal_videos
+FOR ALL USING (
+  proposal_id IN (SELECT id FROM public.proposals WHERE organization_id = (SELECT auth_org_id()))
+);
+
+-- PROJECT ITEMS / FINANCES / EXPENSES / MEMBERS / TASKS
+DROP POLICY IF EXISTS "Org isolation for project_items" ON public.project_items;
+CREATE POLICY "Org isolation for project_items" ON public.project_items
+FOR ALL USING (
+  project_id IN (SELECT id FROM public.projects WHERE organization_id = (SELECT auth_org_id()))
+);
+
+DROP POLICY IF EXISTS "Org isolation for project_finances" ON public.project_finances;
+CREATE POLICY "Org isolation for project_finances" ON public.project_finances
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for project_expenses" ON public.project_expenses;
+CREATE POLICY "Org isolation for project_expenses" ON public.project_expenses
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for project_members" ON public.project_members;
+CREATE POLICY "Org isolation for project_members" ON public.project_members
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+DROP POLICY IF EXISTS "Org isolation for project_tasks" ON public.project_tasks;
+CREATE POLICY "Org isolation for project_tasks" ON public.project_tasks
+FOR ALL USING (
+  project_id IN (SELECT id FROM public.projects WHERE organization_id = (SELECT auth_org_id()))
+);
+
+-- CALENDAR
+DROP POLICY IF EXISTS "Org isolation for calendar" ON public.calendar_events;
+CREATE POLICY "Org isolation for calendar" ON public.calendar_events
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+-- AUDIT LOGS
+DROP POLICY IF EXISTS "Org isolation for audit_logs" ON public.audit_logs;
+CREATE POLICY "Org isolation for audit_logs" ON public.audit_logs
+FOR ALL USING (organization_id = (SELECT auth_org_id()));
+
+-- NOTIFICATIONS
+DROP POLICY IF EXISTS "Users view own notifications" ON public.notifications;
+CREATE POLICY "Users view own notifications" ON public.notifications
+FOR SELECT USING (recipient_id = (SELECT auth.uid()));
@@ -0,0 +1,255 @@
+-- ==============================================================================
+-- MIGRATION: ACEITE DE PROPOSTA IDEMPOTENTE (accept_proposal_v2)
+-- ==============================================================================
+-- Toda a conversão proposta -> projeto em uma única transação, chaveada pelo
+-- id da proposta: projeto, itens, escalações, finanças, eventos de calendário,
+-- recebíveis (cronograma ou parcelas) e a notificação do aceite público.
+--
+-- Idempotência: a linha da proposta é travada (FOR UPDATE), então aceites
+-- simultâneos (duplo clique, retry de rede) são serializados; quem chega
+-- depois encontra status ACCEPTED e recebe os mesmos ids, sem duplicar nada.
+-- Um índice único parcial em projects(proposal_id) garante o mesmo no banco.
+--
+-- Aceite público: p_token (sem sessão, valida expiração e notifica o admin).
+-- Aceite manual: p_proposal_id (restrito à organização do usuário).
+-- ==============================================================================
+
+-- 1. Um projeto por proposta (só cria se não houver duplicatas antigas)
+DO $$
+BEGIN
+  IF EXISTS (
+    SELECT 1 FROM projects
+    WHERE origin = 'proposal' AND proposal_id IS NOT NULL
+    GROUP BY proposal_id
+    HAVING count(*) > 1
+  ) THEN
+    RAISE NOTICE 'projects com proposal_id duplicado: índice único não criado (a trava na proposta segue garantindo idempotência)';
+  ELSE
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_projects_unique_proposal
+      ON projects (proposal_id)
+      WHERE origin = 'proposal' AND proposal_id IS NOT NULL;
+  END IF;
+END;
+$$;
+
+-- 2. Ids gerados por um aceite (mesmo formato no primeiro aceite e nos repetidos)
+CREATE OR REPLACE FUNCTION proposal_acceptance_result(
+  p_proposal_id TEXT,
+  p_project_id TEXT,
+  p_already_accepted BOOLEAN,
+  p_notification_id UUID DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT jsonb_build_object(
+    'success', true,
+    'already_accepted', p_already_accepted,
+    'proposal_id', p.id,
+    'organization_id', p.organization_id,
+    'project_id', p_project_id,
+    'project_finance_id', (SELECT id FROM project_finances WHERE project_id = p_project_id LIMIT 1),
+    'project_item_ids', (
+      SELECT COALESCE(jsonb_agg(pi.id ORDER BY pi.id), '[]'::jsonb)
+      FROM project_items pi WHERE pi.project_id = p_project_id
+    ),
+    'assignment_ids', (
+      SELECT COALESCE(jsonb_agg(ia.id ORDER BY ia.id), '[]'::jsonb)
+      FROM item_assignments ia
+      JOIN project_items pi ON pi.id = ia.project_item_id
+      WHERE pi.project_id = p_project_id
+    ),
+    'transaction_ids', (
+      SELECT COALESCE(jsonb_agg(ft.id ORDER BY ft.due_date, ft.id), '[]'::jsonb)
+      FROM financial_transactions ft
+      WHERE ft.project_id = p_project_id AND ft.proposal_id = p.id AND ft.type = 'INCOME'
+    ),
+    'calendar_event_ids', (
+      SELECT COALESCE(jsonb_agg(ce.id ORDER BY ce.start_date, ce.id), '[]'::jsonb)
+      FROM calendar_events ce WHERE ce.project_id = p_project_id
+    ),
+    'notification_id', p_notification_id
+  )
+  FROM proposals p
+  WHERE p.id = p_proposal_id;
+$$;
+
+-- 3. Aceite
+CREATE OR REPLACE FUNCTION accept_proposal_v2(
+  p_proposal_id TEXT DEFAULT NULL,
+  p_token TEXT DEFAULT NULL,
+  p_user_id TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public, auth
+AS $$
+DECLARE
+  v_proposal proposals%ROWTYPE;
+  v_project_id TEXT;
+  v_installments INT;
+  v_installment_value NUMERIC;
+  v_first_due_date DATE;
+  v_recipient_id UUID;
+  v_client_name TEXT;
+  v_notification_id UUID;
+BEGIN
+  -- 1. Travar a proposta: aceites concorrentes esperam aqui
+  IF p_token IS NOT NULL THEN
+    SELECT * INTO v_proposal FROM proposals WHERE token = p_token FOR UPDATE;
+  ELSE
+    SELECT * INTO v_proposal FROM proposals WHERE id = p_proposal_id FOR UPDATE;
+
+    -- Pelo id, só a própria organização (o link público usa o token)
+    IF FOUND
+      AND auth.role() IS DISTINCT FROM 'service_role'
+      AND v_proposal.organization_id IS DISTINCT FROM auth_org_id() THEN
+      RAISE EXCEPTION 'Proposta não encontrada';
+    END IF;
+  END IF;
+
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Proposta não encontrada';
+  END IF;
+
+  -- 2. Já aceita: devolver o que foi criado no primeiro aceite
+  IF v_proposal.status = 'ACCEPTED' THEN
+    SELECT id INTO v_project_id
+    FROM projects
+    WHERE proposal_id = v_proposal.id AND origin = 'proposal'
+    ORDER BY created_at
+    LIMIT 1;
+
+    RETURN proposal_acceptance_result(v_proposal.id, v_project_id, true);
+  END IF;
+
+  IF p_token IS NOT NULL AND v_proposal.valid_until IS NOT NULL AND v_proposal.valid_until < NOW() THEN
+    RAISE EXCEPTION 'Esta proposta está expirada';
+  END IF;
+
+  -- 3. Projeto
+  INSERT INTO projects (
+    title, description, client_id, organization_id, assigned_to_id, status, origin,
+    budget, deadline_date, created_at, is_recurring, proposal_id
+  ) VALUES (
+    v_proposal.title, v_proposal.description, v_proposal.client_id, v_proposal.organization_id,
+    p_user_id, 'PRE_PROD', 'proposal', v_proposal.total_value, v_proposal.valid_until, NOW(),
+    COALESCE(v_proposal.is_recurring, false), v_proposal.id
+  )
+  RETURNING id INTO v_project_id;
+
+  -- 4. Itens e escalações (ligados via proposal_item_id)
+  INSERT INTO project_items (project_id, description, quantity, unit_price, total_price, status, proposal_item_id)
+  SELECT v_project_id, description, quantity, unit_price, total, 'PENDING', id
+  FROM proposal_items
+  WHERE proposal_id = v_proposal.id;
+
+  INSERT INTO item_assignments (
+    project_item_id, freelancer_id, role, agreed_fee, estimated_hours, scheduled_date, status, notes, organization_id
+  )
+  SELECT pi.id, ia.freelancer_id, ia.role, ia.agreed_fee, ia.estimated_hours, ia.scheduled_date, 'PENDING',
+         ia.notes, ia.organization_id
+  FROM project_items pi
+  JOIN item_assignments ia ON ia.proposal_item_id = pi.proposal_item_id
+  WHERE pi.project_id = v_project_id;
+
+  -- 5. Finanças do projeto
+  INSERT INTO project_finances (project_id, organization_id, approved_value, target_margin_percent)
+  VALUES (v_project_id, v_proposal.organization_id, v_proposal.total_value, 30);
+
+  -- 6. Calendário (data legada, gravação e entrega de cada item)
+  INSERT INTO calendar_events (title, description, start_date, end_date, project_id, organization_id, type, created_by)
+  SELECT ev.title, ev.description, ev.start_date, ev.end_date, v_project_id, v_proposal.organization_id, ev.type, p_user_id
+  FROM proposal_items pi
+  CROSS JOIN LATERAL (
+    VALUES
+      (pi.description || ' - ' || v_proposal.title, 'Item da proposta: ' || pi.description,
+       pi.date, pi.date + interval '1 hour', 'shooting'),
+      ('GRAVAÇÃO: ' || pi.description, 'Gravação referente ao projeto: ' || v_proposal.title,
+       pi.recording_date, pi.recording_date + interval '4 hours', 'shooting'),
+      ('ENTREGA: ' || pi.description, 'Entrega referente ao projeto: ' || v_proposal.title,
+       pi.delivery_date, pi.delivery_date, 'delivery')
+  ) AS ev(title, description, start_date, end_date, type)
+  WHERE pi.proposal_id = v_proposal.id AND ev.start_date IS NOT NULL;
+
+  -- 7. Recebíveis: cronograma personalizado ou divisão em parcelas
+  IF EXISTS (SELECT 1 FROM payment_schedule WHERE proposal_id = v_proposal.id) THEN
+    INSERT INTO financial_transactions (
+      organization_id, type, category, description, amount, status, project_id, proposal_id, client_id,
+      due_date, created_at
+    )
+    SELECT v_proposal.organization_id, 'INCOME', 'CLIENT_PAYMENT', 'Pagamento Proposta: ' || description, amount,
+           CASE WHEN paid = true THEN 'PAID' ELSE 'PENDING' END, v_project_id, v_proposal.id,
+           v_proposal.client_id, due_date, NOW()
+    FROM payment_schedule
+    WHERE proposal_id = v_proposal.id
+    ORDER BY "order" ASC;
+  ELSE
+    v_installments := GREATEST(COALESCE(v_proposal.installments, 1), 1);
+    v_installment_value := v_proposal.total_value / v_installments;
+    v_first_due_date := COALESCE(v_proposal.payment_date, v_proposal.valid_until, CURRENT_DATE);
+
+    INSERT INTO financial_transactions (
+      organization_id, type, category, description, amount, status, project_id, proposal_id, client_id,
+      due_date, created_at
+    )
+    SELECT v_proposal.organization_id, 'INCOME', 'CLIENT_PAYMENT',
+           'Pagamento Proposta: ' || v_proposal.title || ' (' || s.i || '/' || v_installments || ')',
+           v_installment_value, 'PENDING', v_project_id, v_proposal.id, v_proposal.client_id,
+           v_first_due_date + ((s.i - 1) * interval '1 month'), NOW()
+    FROM generate_series(1, v_installments) AS s(i);
+  END IF;
+
+  -- 8. Status da proposta
+  UPDATE proposals
+  SET status = 'ACCEPTED', accepted_at = NOW()
+  WHERE id = v_proposal.id;
+
+  -- 9. Notificar o admin da organização (aceite público); falha aqui não desfaz o aceite
+  IF p_token IS NOT NULL THEN
+    BEGIN
+      SELECT au.id INTO v_recipient_id
+      FROM users u
+      JOIN auth.users au ON au.id::text = u.id
+      WHERE u.organization_id = v_proposal.organization_id AND u.role = 'ADMIN'
+      ORDER BY u.created_at
+      LIMIT 1;
+
+      IF v_recipient_id IS NOT NULL THEN
+        SELECT name INTO v_client_name FROM clients WHERE id = v_proposal.client_id;
+
+        INSERT INTO notifications (recipient_id, title, message, type, action_link, read)
+        VALUES (
+          v_recipient_id,
+          '🎉 Proposta Aceita!',
+          'O cliente ' || COALESCE(v_client_name, 'Cliente') || ' aceitou a proposta "' || v_proposal.title || '".',
+          'SUCCESS',
+          '/proposals/' || v_proposal.id || '/edit',
+          false
+        )
+        RETURNING id INTO v_notification_id;
+      END IF;
+    EXCEPTION WHEN OTHERS THEN
+      RAISE WARNING 'Notificação do aceite da proposta % não criada: %', v_proposal.id, SQLERRM;
+    END;
+  END IF;
+
+  RETURN proposal_acceptance_result(v_proposal.id, v_project_id, false, v_notification_id);
+END;
+$$;
+
+-- 4. accept_proposal_v1 passa a delegar (mesma idempotência para chamadas antigas)
+CREATE OR REPLACE FUNCTION accept_proposal_v1(
+  p_proposal_id TEXT,
+  p_user_id TEXT DEFAULT NULL
+) RETURNS JSONB
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT accept_proposal_v2(p_proposal_id => p_proposal_id, p_user_id => p_user_id);
+$$;
+
+REVOKE EXECUTE ON FUNCTION proposal_acceptance_result(TEXT, TEXT, BOOLEAN, UUID) FROM PUBLIC, anon, authenticated;
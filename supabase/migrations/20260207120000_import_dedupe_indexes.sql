@@ -0,0 +1,44 @@
+-- ==============================================================================
+-- MIGRATION: ÍNDICES PARA DEDUPLICAÇÃO DA IMPORTAÇÃO CSV
+-- ==============================================================================
+-- A importação em massa (/api/import/*) consulta, a cada lote, quais e-mails
+-- ou números de série já existem na organização. E-mails são comparados sem
+-- diferenciar maiúsculas (o CSV chega normalizado em minúsculas, mas o
+-- cadastro manual grava como digitado):
+--   SELECT lower(email) FROM clients WHERE organization_id = $1 AND lower(email) = ANY($2)
+-- Sem estes índices cada lote faz seq scan da tabela inteira.
+-- ==============================================================================
+
+CREATE INDEX IF NOT EXISTS idx_clients_org_lower_email
+  ON clients (organization_id, lower(email))
+  WHERE email IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_freelancers_org_lower_email
+  ON freelancers (organization_id, lower(email));
+
+CREATE INDEX IF NOT EXISTS idx_equipments_org_serial_number
+  ON equipments (organization_id, serial_number)
+  WHERE serial_number IS NOT NULL;
+
+-- PostgREST não filtra por expressão: a consulta por lower(email) fica numa
+-- função. SECURITY INVOKER, então o RLS da tabela continua valendo.
+CREATE OR REPLACE FUNCTION import_existing_emails(
+  p_table TEXT,
+  p_organization_id TEXT,
+  p_emails TEXT[]
+)
+RETURNS SETOF TEXT
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT lower(email) FROM public.clients
+  WHERE p_table = 'clients'
+    AND organization_id = p_organization_id
+    AND lower(email) = ANY(p_emails)
+  UNION
+  SELECT lower(email) FROM public.freelancers
+  WHERE p_table = 'freelancers'
+    AND organization_id = p_organization_id
+    AND lower(email) = ANY(p_emails);
+$$;
@@ -0,0 +1,171 @@
+-- ==============================================================================
+-- MIGRATION: BUSCA DE DISPONIBILIDADE DE FREELANCERS
+-- ==============================================================================
+-- search_available_freelancers: freelancers da organização por habilidade
+-- (tags, especialidades ou função), período e teto de diária, com os conflitos
+-- de agenda de cada um no período:
+--   - escalações (item_assignments.scheduled_date dentro do período)
+--   - equipe de projetos (project_members) cuja gravação
+--     (shooting_date .. shooting_end_date) cruza o período
+-- Ordena disponíveis primeiro, depois por habilidades atendidas, nota e diária.
+-- p_freelancer_ids + p_only_busy: só os ocupados entre os ids informados
+-- (checagem de conflito de uma lista, sem depender da ordenação e do limite).
+--
+-- SECURITY INVOKER: as policies de RLS continuam valendo para quem chama.
+-- ==============================================================================
+
+-- 1. Índices
+-- Escalações por organização e data (busca por intervalo)
+CREATE INDEX IF NOT EXISTS idx_item_assignments_org_scheduled
+  ON item_assignments (organization_id, scheduled_date)
+  INCLUDE (freelancer_id)
+  WHERE scheduled_date IS NOT NULL;
+
+-- Janela de gravação dos projetos como range (sobreposição via GiST)
+CREATE INDEX IF NOT EXISTS idx_projects_shooting_range
+  ON projects USING gist (
+    tsrange(shooting_date, GREATEST(shooting_end_date, shooting_date), '[]')
+  )
+  WHERE shooting_date IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_project_members_freelancer
+  ON project_members (freelancer_id, project_id);
+
+-- Tags por nome (sem diferenciar maiúsculas) e por freelancer
+CREATE INDEX IF NOT EXISTS idx_freelancer_tags_lower_name
+  ON freelancer_tags (lower(name), freelancer_id);
+
+CREATE INDEX IF NOT EXISTS idx_freelancer_tags_freelancer
+  ON freelancer_tags (freelancer_id);
+
+CREATE INDEX IF NOT EXISTS idx_freelancers_org
+  ON freelancers (organization_id);
+
+-- 2. Busca
+-- p_end é exclusivo: para um único dia, p_start = dia 00:00 e p_end = dia seguinte 00:00
+CREATE OR REPLACE FUNCTION search_available_freelancers(
+  p_organization_id TEXT,
+  p_start TIMESTAMPTZ,
+  p_end TIMESTAMPTZ,
+  p_skills TEXT[] DEFAULT NULL,
+  p_max_rate NUMERIC DEFAULT NULL,
+  p_only_available BOOLEAN DEFAULT false,
+  p_limit INT DEFAULT 50,
+  p_freelancer_ids TEXT[] DEFAULT NULL,
+  p_only_busy BOOLEAN DEFAULT false
+) RETURNS TABLE (
+  freelancer_id TEXT,
+  name TEXT,
+  email TEXT,
+  phone TEXT,
+  role TEXT,
+  specialty TEXT[],
+  tags TEXT[],
+  daily_rate NUMERIC,
+  rating NUMERIC,
+  matched_skills INT,
+  available BOOLEAN,
+  conflicts JSONB
+)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  WITH wanted AS (
+    SELECT array_agg(DISTINCT lower(btrim(s))) AS skills
+    FROM unnest(COALESCE(p_skills, '{}'::text[])) AS s
+    WHERE btrim(s) <> ''
+  ),
+  candidates AS (
+    SELECT f.*
+    FROM freelancers f, wanted w
+    WHERE f.organization_id = p_organization_id
+      AND (p_freelancer_ids IS NULL OR f.id = ANY (p_freelancer_ids))
+      AND COALESCE(f.status, 'AVAILABLE') NOT IN ('INACTIVE', 'BLACKLISTED')
+      AND (p_max_rate IS NULL OR f.daily_rate IS NULL OR f.daily_rate <= p_max_rate)
+      AND (
+        w.skills IS NULL
+        OR f.id IN (SELECT t.freelancer_id FROM freelancer_tags t WHERE lower(t.name) = ANY (w.skills))
+        OR lower(f.role) = ANY (w.skills)
+        OR EXISTS (SELECT 1 FROM unnest(f.specialty) AS sp WHERE lower(sp) = ANY (w.skills))
+      )
+  ),
+  assignment_conflicts AS (
+    SELECT ia.freelancer_id,
+           jsonb_agg(jsonb_build_object(
+             'type', 'assignment',
+             'start', ia.scheduled_date,
+             'end', ia.scheduled_date,
+             'project_id', p.id,
+             'project_title', p.title,
+             'role', ia.role
+           ) ORDER BY ia.scheduled_date) AS items
+    FROM item_assignments ia
+    LEFT JOIN project_items pi ON pi.id = ia.project_item_id
+    LEFT JOIN projects p ON p.id = pi.project_id
+    WHERE ia.organization_id = p_organization_id
+      AND ia.scheduled_date >= p_start
+      AND ia.scheduled_date < p_end
+      AND COALESCE(ia.status, 'PENDING') <> 'CANCELLED'
+      AND ia.freelancer_id IN (SELECT id FROM candidates)
+    GROUP BY ia.freelancer_id
+  ),
+  member_conflicts AS (
+    SELECT pm.freelancer_id,
+           jsonb_agg(jsonb_build_object(
+             'type', 'project',
+             'start', p.shooting_date,
+             'end', GREATEST(p.shooting_end_date, p.shooting_date),
+             'project_id', p.id,
+             'project_title', p.title,
+             'role', pm.role
+           ) ORDER BY p.shooting_date) AS items
+    FROM projects p
+    JOIN project_members pm ON pm.project_id = p.id
+    WHERE p.organization_id = p_organization_id
+      AND p.shooting_date IS NOT NULL
+      AND tsrange(p.shooting_date, GREATEST(p.shooting_end_date, p.shooting_date), '[]')
+          && tsrange(p_start::timestamp, p_end::timestamp, '[)')
+      AND COALESCE(pm.status, 'INVITED') NOT IN ('DECLINED', 'REMOVED')
+      AND pm.freelancer_id IN (SELECT id FROM candidates)
+    GROUP BY pm.freelancer_id
+  ),
+  ranked AS (
+    SELECT
+      c.id AS freelancer_id,
+      c.name::text,
+      c.email::text,
+      c.phone::text,
+      c.role::text,
+      COALESCE(c.specialty, '{}')::text[] AS specialty,
+      COALESCE(
+        (SELECT array_agg(t.name ORDER BY t.name) FROM freelancer_tags t WHERE t.freelancer_id = c.id),
+        '{}'
+      )::text[] AS tags,
+      c.daily_rate::numeric AS daily_rate,
+      c.rating::numeric AS rating,
+      (
+        SELECT count(*)::int
+        FROM unnest(w.skills) AS ws
+        WHERE ws = lower(c.role)
+           OR ws IN (SELECT lower(sp) FROM unnest(c.specialty) AS sp)
+           OR EXISTS (SELECT 1 FROM freelancer_tags t WHERE t.freelancer_id = c.id AND lower(t.name) = ws)
+      ) AS matched_skills,
+      (ac.items IS NULL AND mc.items IS NULL) AS available,
+      COALESCE(ac.items, '[]'::jsonb) || COALESCE(mc.items, '[]'::jsonb) AS conflicts
+    FROM candidates c
+    CROSS JOIN wanted w
+    LEFT JOIN assignment_conflicts ac ON ac.freelancer_id = c.id
+    LEFT JOIN member_conflicts mc ON mc.freelancer_id = c.id
+  )
+  SELECT *
+  FROM ranked
+  WHERE (NOT p_only_available OR ranked.available)
+    AND (NOT p_only_busy OR NOT ranked.available)
+  ORDER BY ranked.available DESC, ranked.matched_skills DESC, ranked.rating DESC NULLS LAST,
+           ranked.daily_rate ASC NULLS LAST, ranked.name
+  LIMIT LEAST(GREATEST(p_limit, 1), 200);
+$$;
+
+COMMENT ON FUNCTION search_available_freelancers IS
+'Freelancers por habilidade, período (p_end exclusivo) e teto de diária, com conflitos de escalação e de equipe de projeto. Disponíveis primeiro. p_freelancer_ids/p_only_busy restringem a ids e a quem tem conflito.';
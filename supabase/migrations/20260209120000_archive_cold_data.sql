@@ -0,0 +1,855 @@
+-- ==============================================================================
+-- MIGRATION: ARQUIVAMENTO DE DADOS FRIOS (HOT/COLD)
+-- ==============================================================================
+-- Projetos concluídos (DONE) há mais que uma idade configurável saem das
+-- tabelas quentes junto com os filhos (itens, escalações, alocações de
+-- freelancers, versões de revisão, tarefas, datas de gravação e de entrega,
+-- equipe, agenda, reservas, finanças do projeto e transações) e vão para tabelas de
+-- mesmo formato no schema "archive". Transações avulsas já liquidadas
+-- (PAID/CANCELLED) seguem a mesma regra.
+--
+-- Leitura transparente: public.<tabela>_all (UNION ALL quente + arquivo, com
+-- security_invoker, então o RLS de quem consulta continua valendo). A coluna
+-- archived_at vem NULL para linhas quentes.
+--
+-- Job em lotes: archive_cold_data_batch() processa um lote por chamada (uma
+-- transação) e devolve o progresso. A execução fica em archive_runs; se o job
+-- cair, a próxima chamada retoma a mesma execução (mesmo corte de data). Um
+-- lote que falha por erro não tratado é desfeito e a execução fica 'failed'
+-- com o erro em last_error.
+-- Projetos/transações que violam alguma constraint ao mover (ex.: FK de uma
+-- tabela fora do conjunto) ficam em archive_run_skips e não travam o lote.
+--
+-- O saldo continua correto via financial_archive_totals (receitas e despesas
+-- pagas que saíram de financial_transactions). O rollup de freelancers não é
+-- recalculado ao mover (app.archiving = 'on').
+--
+-- Driver: scripts/archive-cold-data.mjs (service role).
+-- ==============================================================================
+
+-- 1. Schema de arquivo
+CREATE SCHEMA IF NOT EXISTS archive;
+GRANT USAGE ON SCHEMA archive TO authenticated, service_role;
+
+-- 2. Controle das execuções
+CREATE TABLE IF NOT EXISTS public.archive_runs (
+  id BIGSERIAL PRIMARY KEY,
+  cutoff TIMESTAMP WITH TIME ZONE NOT NULL,
+  older_than_days INTEGER NOT NULL,
+  status TEXT NOT NULL DEFAULT 'running' CHECK (status IN ('running', 'done', 'failed')),
+  projects_total INTEGER NOT NULL DEFAULT 0,
+  projects_archived INTEGER NOT NULL DEFAULT 0,
+  transactions_total INTEGER NOT NULL DEFAULT 0,
+  transactions_archived INTEGER NOT NULL DEFAULT 0,
+  rows_archived JSONB NOT NULL DEFAULT '{}'::jsonb, -- linhas movidas por tabela
+  batches INTEGER NOT NULL DEFAULT 0,
+  last_error TEXT,
+  started_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  finished_at TIMESTAMP WITH TIME ZONE
+);
+
+CREATE TABLE IF NOT EXISTS public.archive_run_skips (
+  run_id BIGINT NOT NULL REFERENCES public.archive_runs(id) ON DELETE CASCADE,
+  entity TEXT NOT NULL CHECK (entity IN ('project', 'transaction')),
+  entity_id TEXT NOT NULL,
+  reason TEXT,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+  PRIMARY KEY (run_id, entity, entity_id)
+);
+
+-- Só o service role (job) enxerga as execuções
+ALTER TABLE public.archive_runs ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.archive_run_skips ENABLE ROW LEVEL SECURITY;
+
+-- 3. Totais financeiros arquivados (carry-forward do saldo)
+CREATE TABLE IF NOT EXISTS public.financial_archive_totals (
+  organization_id TEXT PRIMARY KEY REFERENCES public.organizations(id) ON DELETE CASCADE,
+  income_paid DECIMAL(14,2) NOT NULL DEFAULT 0,
+  expense_paid DECIMAL(14,2) NOT NULL DEFAULT 0,
+  transactions_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+COMMENT ON TABLE public.financial_archive_totals IS
+'Receitas/despesas PAID movidas para archive.financial_transactions. Somadas ao saldo atual (getCurrentBalance).';
+
+ALTER TABLE public.financial_archive_totals ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Org isolation for financial_archive_totals" ON public.financial_archive_totals;
+CREATE POLICY "Org isolation for financial_archive_totals" ON public.financial_archive_totals
+FOR SELECT USING (organization_id = (SELECT auth_org_id()));
+
+GRANT SELECT ON public.financial_archive_totals TO authenticated;
+
+-- Candidatos a arquivamento
+CREATE INDEX IF NOT EXISTS idx_projects_done_updated
+  ON public.projects (updated_at)
+  WHERE status = 'DONE';
+
+CREATE INDEX IF NOT EXISTS idx_financial_transactions_project_status
+  ON public.financial_transactions (project_id, status)
+  WHERE project_id IS NOT NULL;
+
+-- 4. Tabela de arquivo + view _all para uma tabela quente
+-- Idempotente: cria archive.<tabela> no mesmo formato, acompanha colunas novas
+-- da tabela quente e (re)cria public.<tabela>_all quando algo mudou.
+CREATE OR REPLACE FUNCTION archive_ensure_table(p_table TEXT)
+RETURNS BOOLEAN
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_hot REGCLASS := to_regclass(format('public.%I', p_table));
+  v_view TEXT := p_table || '_all';
+  v_changed BOOLEAN := false;
+  v_col RECORD;
+  v_cols TEXT;
+  v_view_sql TEXT;
+BEGIN
+  IF v_hot IS NULL THEN
+    RETURN false;
+  END IF;
+
+  IF to_regclass(format('archive.%I', p_table)) IS NULL THEN
+    EXECUTE format(
+      'CREATE TABLE archive.%I (LIKE public.%I INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)',
+      p_table, p_table
+    );
+    EXECUTE format(
+      'ALTER TABLE archive.%I
+         ADD COLUMN archived_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+         ADD COLUMN archive_run_id BIGINT',
+      p_table
+    );
+    EXECUTE format('CREATE INDEX ON archive.%I (archive_run_id)', p_table);
+    EXECUTE format('ALTER TABLE archive.%I ENABLE ROW LEVEL SECURITY', p_table);
+
+    -- Somente leitura para usuários, isolado por organização
+    IF EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = v_hot AND attname = 'organization_id' AND NOT attisdropped) THEN
+      EXECUTE format(
+        'CREATE POLICY "Org isolation for archived %s" ON archive.%I
+         FOR SELECT USING (organization_id = (SELECT auth_org_id()))',
+        p_table, p_table
+      );
+    ELSIF EXISTS (SELECT 1 FROM pg_attribute WHERE attrelid = v_hot AND attname = 'project_id' AND NOT attisdropped) THEN
+      EXECUTE format(
+        'CREATE POLICY "Org isolation for archived %s" ON archive.%I
+         FOR SELECT USING (
+           project_id IN (SELECT id FROM archive.projects WHERE organization_id = (SELECT auth_org_id()))
+         )',
+        p_table, p_table
+      );
+    END IF;
+
+    EXECUTE format('GRANT SELECT ON archive.%I TO authenticated, service_role', p_table);
+    v_changed := true;
+  END IF;
+
+  -- Colunas adicionadas na tabela quente depois da criação do arquivo
+  FOR v_col IN
+    SELECT a.attname, format_type(a.atttypid, a.atttypmod) AS col_type
+    FROM pg_attribute a
+    WHERE a.attrelid = v_hot
+      AND a.attnum > 0
+      AND NOT a.attisdropped
+      AND NOT EXISTS (
+        SELECT 1 FROM pg_attribute b
+        WHERE b.attrelid = format('archive.%I', p_table)::regclass
+          AND b.attname = a.attname
+          AND NOT b.attisdropped
+      )
+    ORDER BY a.attnum
+  LOOP
+    EXECUTE format('ALTER TABLE archive.%I ADD COLUMN %I %s', p_table, v_col.attname, v_col.col_type);
+    v_changed := true;
+  END LOOP;
+
+  IF v_changed OR to_regclass(format('public.%I', v_view)) IS NULL THEN
+    SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO v_cols
+    FROM pg_attribute
+    WHERE attrelid = v_hot AND attnum > 0 AND NOT attisdropped;
+
+    -- archived_at primeiro: colunas novas entram no fim e o REPLACE continua válido
+    v_view_sql := format(
+      'VIEW public.%I WITH (security_invoker = true) AS
+         SELECT NULL::timestamptz AS archived_at, %s FROM public.%I
+         UNION ALL
+         SELECT archived_at, %s FROM archive.%I',
+      v_view, v_cols, p_table, v_cols, p_table
+    );
+
+    BEGIN
+      EXECUTE 'CREATE OR REPLACE ' || v_view_sql;
+    EXCEPTION WHEN invalid_table_definition THEN
+      -- Coluna removida/renomeada na tabela quente: recria a view
+      EXECUTE format('DROP VIEW public.%I', v_view);
+      EXECUTE 'CREATE ' || v_view_sql;
+    END;
+
+    EXECUTE format('GRANT SELECT ON public.%I TO authenticated, service_role', v_view);
+  END IF;
+
+  RETURN v_changed;
+END;
+$$;
+
+-- Tabelas arquivadas, na ordem em que são movidas (filhos antes dos pais)
+CREATE OR REPLACE FUNCTION archive_prepare_tables()
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_table TEXT;
+BEGIN
+  -- projects primeiro: as policies dos filhos sem organization_id dependem de archive.projects
+  FOREACH v_table IN ARRAY ARRAY[
+    'projects', 'item_assignments', 'freelancer_allocations', 'review_versions', 'project_expenses',
+    'project_tasks', 'shooting_dates', 'delivery_dates', 'project_members', 'calendar_events',
+    'equipment_bookings', 'financial_transactions', 'project_items', 'project_finances'
+  ] LOOP
+    PERFORM archive_ensure_table(v_table);
+  END LOOP;
+END;
+$$;
+
+SELECT archive_prepare_tables();
+
+-- 5. Mover linhas (DELETE ... RETURNING direto para o arquivo)
+-- p_where usa $1 (TEXT[] de ids); $2 é o id da execução.
+CREATE OR REPLACE FUNCTION archive_move_rows(p_table TEXT, p_where TEXT, p_ids TEXT[], p_run_id BIGINT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_cols TEXT;
+  v_count INTEGER;
+BEGIN
+  IF to_regclass(format('public.%I', p_table)) IS NULL THEN
+    RETURN 0;
+  END IF;
+
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO v_cols
+  FROM pg_attribute
+  WHERE attrelid = format('public.%I', p_table)::regclass AND attnum > 0 AND NOT attisdropped;
+
+  EXECUTE format(
+    'WITH moved AS (DELETE FROM public.%I WHERE %s RETURNING *)
+     INSERT INTO archive.%I (%s, archived_at, archive_run_id)
+     SELECT %s, NOW(), $2 FROM moved',
+    p_table, p_where, p_table, v_cols, v_cols
+  ) USING p_ids, p_run_id;
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$;
+
+-- Transações: acumula os totais pagos antes de mover (saldo carry-forward)
+CREATE OR REPLACE FUNCTION archive_move_transactions(p_where TEXT, p_ids TEXT[], p_run_id BIGINT)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  EXECUTE format(
+    'INSERT INTO public.financial_archive_totals AS t (organization_id, income_paid, expense_paid, transactions_count)
+     SELECT organization_id,
+            COALESCE(SUM(amount) FILTER (WHERE type = ''INCOME'' AND status = ''PAID''), 0),
+            COALESCE(SUM(ABS(amount)) FILTER (WHERE type = ''EXPENSE'' AND status = ''PAID''), 0),
+            COUNT(*)
+     FROM public.financial_transactions
+     WHERE %s
+     GROUP BY organization_id
+     ON CONFLICT (organization_id) DO UPDATE SET
+       income_paid = t.income_paid + EXCLUDED.income_paid,
+       expense_paid = t.expense_paid + EXCLUDED.expense_paid,
+       transactions_count = t.transactions_count + EXCLUDED.transactions_count,
+       updated_at = NOW()',
+    p_where
+  ) USING p_ids;
+
+  RETURN archive_move_rows('financial_transactions', p_where, p_ids, p_run_id);
+END;
+$$;
+
+-- Projetos com todos os filhos; devolve linhas movidas por tabela
+CREATE OR REPLACE FUNCTION archive_move_projects(p_ids TEXT[], p_run_id BIGINT)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_counts JSONB := '{}'::jsonb;
+  v_table TEXT;
+BEGIN
+  v_counts := v_counts || jsonb_build_object('item_assignments', archive_move_rows(
+    'item_assignments',
+    'project_item_id IN (SELECT id FROM public.project_items WHERE project_id = ANY ($1))',
+    p_ids, p_run_id
+  ));
+
+  -- Todo filho com FK ON DELETE CASCADE para projects entra aqui: o que ficar
+  -- de fora some junto com o DELETE do projeto e não volta no restore
+  FOREACH v_table IN ARRAY ARRAY[
+    'freelancer_allocations', 'review_versions', 'project_expenses', 'project_tasks', 'shooting_dates',
+    'delivery_dates', 'project_members', 'calendar_events', 'equipment_bookings'
+  ] LOOP
+    v_counts := v_counts || jsonb_build_object(v_table, archive_move_rows(v_table, 'project_id = ANY ($1)', p_ids, p_run_id));
+  END LOOP;
+
+  v_counts := v_counts || jsonb_build_object('financial_transactions',
+    archive_move_transactions('project_id = ANY ($1)', p_ids, p_run_id));
+
+  FOREACH v_table IN ARRAY ARRAY['project_items', 'project_finances'] LOOP
+    v_counts := v_counts || jsonb_build_object(v_table, archive_move_rows(v_table, 'project_id = ANY ($1)', p_ids, p_run_id));
+  END LOOP;
+
+  RETURN v_counts || jsonb_build_object('projects', archive_move_rows('projects', 'id = ANY ($1)', p_ids, p_run_id));
+END;
+$$;
+
+-- 6. Candidatos
+-- Projeto: DONE, sem alteração desde o corte e sem transação em aberto
+CREATE OR REPLACE FUNCTION archive_candidate_projects(p_run_id BIGINT, p_cutoff TIMESTAMPTZ)
+RETURNS TABLE (id TEXT)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT p.id
+  FROM public.projects p
+  WHERE p.status = 'DONE'
+    AND COALESCE(p.updated_at, p.created_at) < p_cutoff
+    AND NOT EXISTS (
+      SELECT 1 FROM public.financial_transactions t
+      WHERE t.project_id = p.id
+        AND COALESCE(t.status, 'PENDING') NOT IN ('PAID', 'CANCELLED')
+    )
+    AND NOT EXISTS (
+      SELECT 1 FROM public.archive_run_skips s
+      WHERE s.run_id = p_run_id AND s.entity = 'project' AND s.entity_id = p.id
+    )
+  ORDER BY p.id;
+$$;
+
+-- Transação avulsa (sem projeto) liquidada antes do corte. Capital inicial fica.
+CREATE OR REPLACE FUNCTION archive_candidate_transactions(p_run_id BIGINT, p_cutoff TIMESTAMPTZ)
+RETURNS TABLE (id TEXT)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT t.id
+  FROM public.financial_transactions t
+  WHERE t.project_id IS NULL
+    AND t.status IN ('PAID', 'CANCELLED')
+    AND t.type <> 'INITIAL_CAPITAL'
+    AND COALESCE(t.payment_date, t.due_date, t.created_at) < p_cutoff
+    AND NOT EXISTS (
+      SELECT 1 FROM public.archive_run_skips s
+      WHERE s.run_id = p_run_id AND s.entity = 'transaction' AND s.entity_id = t.id
+    )
+  ORDER BY t.id;
+$$;
+
+-- Marca uma execução como falha (a próxima chamada começa outra). Chamada pelo
+-- job quando um lote falha; também serve para liberar uma execução travada.
+CREATE OR REPLACE FUNCTION archive_fail_run(p_run_id BIGINT, p_error TEXT)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  UPDATE public.archive_runs
+  SET status = 'failed', last_error = p_error, updated_at = NOW(), finished_at = NOW()
+  WHERE id = p_run_id AND status = 'running';
+$$;
+
+-- 7. Job em lotes (uma chamada = um lote = uma transação)
+-- Projetos primeiro; quando acabam, transações avulsas. Lote que falha em
+-- constraint é refeito item a item e os itens problemáticos vão para skips.
+CREATE OR REPLACE FUNCTION archive_cold_data_batch(
+  p_older_than_days INTEGER DEFAULT 365,
+  p_batch_size INTEGER DEFAULT 100
+) RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_run public.archive_runs%ROWTYPE;
+  v_batch_size INTEGER := LEAST(GREATEST(COALESCE(p_batch_size, 100), 1), 1000);
+  v_ids TEXT[];
+  v_id TEXT;
+  v_counts JSONB := '{}'::jsonb;
+  v_moved JSONB;
+  v_projects INTEGER := 0;
+  v_transactions INTEGER := 0;
+  v_skipped INTEGER := 0;
+  v_phase TEXT := 'projects';
+  v_key TEXT;
+BEGIN
+  IF COALESCE(p_older_than_days, 0) < 1 THEN
+    RAISE EXCEPTION 'p_older_than_days deve ser >= 1';
+  END IF;
+
+  -- Uma execução por vez
+  IF NOT pg_try_advisory_xact_lock(hashtext('archive_cold_data')) THEN
+    RETURN jsonb_build_object('status', 'busy');
+  END IF;
+
+  -- Retoma a execução pendente (mantém o corte original) ou inicia outra
+  SELECT * INTO v_run FROM public.archive_runs WHERE status = 'running' ORDER BY id DESC LIMIT 1;
+
+  IF NOT FOUND THEN
+    INSERT INTO public.archive_runs (cutoff, older_than_days)
+    VALUES (NOW() - make_interval(days => p_older_than_days), p_older_than_days)
+    RETURNING * INTO v_run;
+
+    UPDATE public.archive_runs SET
+      projects_total = (SELECT COUNT(*) FROM archive_candidate_projects(v_run.id, v_run.cutoff)),
+      transactions_total = (SELECT COUNT(*) FROM archive_candidate_transactions(v_run.id, v_run.cutoff))
+    WHERE id = v_run.id
+    RETURNING * INTO v_run;
+  END IF;
+
+  PERFORM archive_prepare_tables();
+
+  -- Triggers de rollup ignoram as linhas movidas
+  PERFORM set_config('app.archiving', 'on', true);
+
+  -- Erro fora dos casos tratados: desfaz o lote e marca a execução como
+  -- falha (a próxima chamada começa outra com os candidatos que sobraram)
+  BEGIN
+    SELECT array_agg(c.id) INTO v_ids
+    FROM (SELECT id FROM archive_candidate_projects(v_run.id, v_run.cutoff) LIMIT v_batch_size) c;
+
+    IF v_ids IS NOT NULL THEN
+      BEGIN
+        v_counts := archive_move_projects(v_ids, v_run.id);
+        v_projects := cardinality(v_ids);
+      EXCEPTION WHEN integrity_constraint_violation THEN
+        FOREACH v_id IN ARRAY v_ids LOOP
+          BEGIN
+            v_moved := archive_move_projects(ARRAY[v_id], v_run.id);
+            FOR v_key IN SELECT jsonb_object_keys(v_moved) LOOP
+              v_counts := v_counts || jsonb_build_object(
+                v_key, COALESCE((v_counts ->> v_key)::int, 0) + (v_moved ->> v_key)::int
+              );
+            END LOOP;
+            v_projects := v_projects + 1;
+          EXCEPTION WHEN integrity_constraint_violation THEN
+            INSERT INTO public.archive_run_skips (run_id, entity, entity_id, reason)
+            VALUES (v_run.id, 'project', v_id, SQLERRM);
+            v_skipped := v_skipped + 1;
+          END;
+        END LOOP;
+      END;
+    ELSE
+      v_phase := 'transactions';
+
+      SELECT array_agg(c.id) INTO v_ids
+      FROM (SELECT id FROM archive_candidate_transactions(v_run.id, v_run.cutoff) LIMIT v_batch_size) c;
+
+      IF v_ids IS NOT NULL THEN
+        BEGIN
+          v_transactions := archive_move_transactions('id = ANY ($1)', v_ids, v_run.id);
+        EXCEPTION WHEN integrity_constraint_violation THEN
+          -- Ex.: transação pai de uma recorrência que ainda está quente
+          FOREACH v_id IN ARRAY v_ids LOOP
+            BEGIN
+              v_transactions := v_transactions + archive_move_transactions('id = ANY ($1)', ARRAY[v_id], v_run.id);
+            EXCEPTION WHEN integrity_constraint_violation THEN
+              INSERT INTO public.archive_run_skips (run_id, entity, entity_id, reason)
+              VALUES (v_run.id, 'transaction', v_id, SQLERRM);
+              v_skipped := v_skipped + 1;
+            END;
+          END LOOP;
+        END;
+        v_counts := jsonb_build_object('financial_transactions', v_transactions);
+      ELSE
+        v_phase := 'done';
+      END IF;
+    END IF;
+  EXCEPTION WHEN OTHERS THEN
+    PERFORM archive_fail_run(v_run.id, SQLERRM);
+    RETURN jsonb_build_object('run_id', v_run.id, 'status', 'failed', 'error', SQLERRM);
+  END;
+
+  -- Acumula contadores da execução
+  SELECT COALESCE(jsonb_object_agg(k, COALESCE((v_run.rows_archived ->> k)::int, 0) + COALESCE((v_counts ->> k)::int, 0)), '{}'::jsonb)
+  INTO v_counts
+  FROM (
+    SELECT jsonb_object_keys(v_run.rows_archived) AS k
+    UNION
+    SELECT jsonb_object_keys(v_counts)
+  ) keys;
+
+  UPDATE public.archive_runs SET
+    projects_archived = projects_archived + v_projects,
+    transactions_archived = transactions_archived + v_transactions,
+    rows_archived = v_counts,
+    batches = batches + 1,
+    status = CASE WHEN v_phase = 'done' THEN 'done' ELSE 'running' END,
+    finished_at = CASE WHEN v_phase = 'done' THEN NOW() ELSE NULL END,
+    updated_at = NOW()
+  WHERE id = v_run.id
+  RETURNING * INTO v_run;
+
+  RETURN jsonb_build_object(
+    'run_id', v_run.id,
+    'status', v_run.status,
+    'phase', v_phase,
+    'cutoff', v_run.cutoff,
+    'batch', jsonb_build_object('projects', v_projects, 'transactions', v_transactions, 'skipped', v_skipped),
+    'projects', jsonb_build_object('archived', v_run.projects_archived, 'total', v_run.projects_total),
+    'transactions', jsonb_build_object('archived', v_run.transactions_archived, 'total', v_run.transactions_total),
+    'skipped', (SELECT COUNT(*) FROM public.archive_run_skips WHERE run_id = v_run.id),
+    'rows', v_run.rows_archived,
+    'batches', v_run.batches
+  );
+END;
+$$;
+
+COMMENT ON FUNCTION archive_cold_data_batch IS
+'Arquiva um lote de projetos DONE (com filhos) e transações liquidadas mais antigos que p_older_than_days. Retomável; devolve o progresso da execução.';
+
+-- 8. Restaurar um projeto arquivado (pais antes dos filhos)
+CREATE OR REPLACE FUNCTION archive_restore_rows(p_table TEXT, p_where TEXT, p_ids TEXT[])
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_cols TEXT;
+  v_count INTEGER;
+BEGIN
+  IF to_regclass(format('archive.%I', p_table)) IS NULL THEN
+    RETURN 0;
+  END IF;
+
+  SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum) INTO v_cols
+  FROM pg_attribute
+  WHERE attrelid = format('public.%I', p_table)::regclass AND attnum > 0 AND NOT attisdropped;
+
+  EXECUTE format(
+    'WITH restored AS (DELETE FROM archive.%I WHERE %s RETURNING *)
+     INSERT INTO public.%I (%s) SELECT %s FROM restored',
+    p_table, p_where, p_table, v_cols, v_cols
+  ) USING p_ids;
+
+  GET DIAGNOSTICS v_count = ROW_COUNT;
+  RETURN v_count;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION archive_restore_project(p_project_id TEXT)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_ids TEXT[] := ARRAY[p_project_id];
+  v_counts JSONB := '{}'::jsonb;
+  v_table TEXT;
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM archive.projects WHERE id = p_project_id) THEN
+    RAISE EXCEPTION 'Projeto % não está arquivado', p_project_id;
+  END IF;
+
+  PERFORM archive_prepare_tables();
+  PERFORM set_config('app.archiving', 'on', true);
+
+  v_counts := jsonb_build_object('projects', archive_restore_rows('projects', 'id = ANY ($1)', v_ids));
+
+  FOREACH v_table IN ARRAY ARRAY['project_finances', 'project_items'] LOOP
+    v_counts := v_counts || jsonb_build_object(v_table, archive_restore_rows(v_table, 'project_id = ANY ($1)', v_ids));
+  END LOOP;
+
+  -- Desfaz o carry-forward das transações que voltam
+  UPDATE public.financial_archive_totals t SET
+    income_paid = t.income_paid - s.income_paid,
+    expense_paid = t.expense_paid - s.expense_paid,
+    transactions_count = t.transactions_count - s.transactions_count,
+    updated_at = NOW()
+  FROM (
+    SELECT organization_id,
+           COALESCE(SUM(amount) FILTER (WHERE type = 'INCOME' AND status = 'PAID'), 0) AS income_paid,
+           COALESCE(SUM(ABS(amount)) FILTER (WHERE type = 'EXPENSE' AND status = 'PAID'), 0) AS expense_paid,
+           COUNT(*) AS transactions_count
+    FROM archive.financial_transactions
+    WHERE project_id = p_project_id
+    GROUP BY organization_id
+  ) s
+  WHERE t.organization_id = s.organization_id;
+
+  FOREACH v_table IN ARRAY ARRAY[
+    'financial_transactions', 'equipment_bookings', 'calendar_events', 'project_members', 'delivery_dates',
+    'shooting_dates', 'project_tasks', 'project_expenses', 'review_versions', 'freelancer_allocations'
+  ] LOOP
+    v_counts := v_counts || jsonb_build_object(v_table, archive_restore_rows(v_table, 'project_id = ANY ($1)', v_ids));
+  END LOOP;
+
+  RETURN v_counts || jsonb_build_object('item_assignments', archive_restore_rows(
+    'item_assignments',
+    'project_item_id IN (SELECT id FROM public.project_items WHERE project_id = ANY ($1))',
+    v_ids
+  ));
+END;
+$$;
+
+-- 9. Permissões: job e restauração só pelo service role
+DO $$
+DECLARE
+  v_fn TEXT;
+BEGIN
+  FOREACH v_fn IN ARRAY ARRAY[
+    'archive_ensure_table(text)',
+    'archive_prepare_tables()',
+    'archive_move_rows(text, text, text[], bigint)',
+    'archive_move_transactions(text, text[], bigint)',
+    'archive_move_projects(text[], bigint)',
+    'archive_cold_data_batch(integer, integer)',
+    'archive_fail_run(bigint, text)',
+    'archive_restore_rows(text, text, text[])',
+    'archive_restore_project(text)'
+  ] LOOP
+    EXECUTE format('REVOKE ALL ON FUNCTION %s FROM PUBLIC, anon, authenticated', v_fn);
+    EXECUTE format('GRANT EXECUTE ON FUNCTION %s TO service_role', v_fn);
+  END LOOP;
+END $$;
+
+-- 10. Rollup de freelancers: mover para o arquivo não é trabalho novo/removido
+-- (projetos arquivados continuam em freelancer_project_jobs e em projects_count)
+CREATE OR REPLACE FUNCTION sync_freelancer_monthly_stats_from_assignment()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  v_relinked BOOLEAN := TG_OP <> 'UPDATE';
+BEGIN
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP = 'UPDATE' THEN
+    v_relinked := OLD.freelancer_id IS DISTINCT FROM NEW.freelancer_id
+      OR OLD.project_item_id IS DISTINCT FROM NEW.project_item_id;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.project_item_id IS NOT NULL THEN
+    PERFORM apply_freelancer_monthly_delta(
+      OLD.organization_id,
+      OLD.freelancer_id,
+      date_trunc('month', COALESCE(OLD.scheduled_date, OLD.created_at))::date,
+      -1,
+      -(CASE WHEN OLD.status = 'DONE' THEN 1 ELSE 0 END),
+      -(CASE WHEN OLD.status = 'PENDING' THEN 1 ELSE 0 END),
+      -COALESCE(OLD.estimated_hours, 0),
+      -COALESCE(OLD.agreed_fee, 0),
+      -(CASE WHEN OLD.status = 'DONE' THEN COALESCE(OLD.agreed_fee, 0) ELSE 0 END),
+      0,
+      0
+    );
+    IF v_relinked THEN
+      PERFORM apply_freelancer_project_delta(OLD.organization_id, OLD.freelancer_id, OLD.project_item_id, NULL, -1);
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.project_item_id IS NOT NULL THEN
+    PERFORM apply_freelancer_monthly_delta(
+      NEW.organization_id,
+      NEW.freelancer_id,
+      date_trunc('month', COALESCE(NEW.scheduled_date, NEW.created_at, NOW()))::date,
+      1,
+      CASE WHEN NEW.status = 'DONE' THEN 1 ELSE 0 END,
+      CASE WHEN NEW.status = 'PENDING' THEN 1 ELSE 0 END,
+      COALESCE(NEW.estimated_hours, 0),
+      COALESCE(NEW.agreed_fee, 0),
+      CASE WHEN NEW.status = 'DONE' THEN COALESCE(NEW.agreed_fee, 0) ELSE 0 END,
+      0,
+      0
+    );
+    IF v_relinked THEN
+      PERFORM apply_freelancer_project_delta(
+        NEW.organization_id,
+        NEW.freelancer_id,
+        NEW.project_item_id,
+        date_trunc('month', COALESCE(NEW.scheduled_date, NEW.created_at, NOW()))::date,
+        1
+      );
+    END IF;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION sync_freelancer_project_jobs_from_item()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+DECLARE
+  v_row RECORD;
+BEGIN
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN OLD;
+  END IF;
+
+  FOR v_row IN
+    SELECT organization_id, freelancer_id, COUNT(*)::int AS jobs
+    FROM public.item_assignments
+    WHERE project_item_id = OLD.id
+    GROUP BY organization_id, freelancer_id
+  LOOP
+    PERFORM apply_freelancer_project_delta(v_row.organization_id, v_row.freelancer_id, OLD.id, NULL, -v_row.jobs);
+  END LOOP;
+
+  RETURN OLD;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION sync_freelancer_monthly_stats_from_transaction()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE')
+     AND OLD.freelancer_id IS NOT NULL
+     AND OLD.type = 'EXPENSE'
+     AND OLD.status IN ('PAID', 'PENDING', 'SCHEDULED') THEN
+    PERFORM apply_freelancer_monthly_delta(
+      OLD.organization_id,
+      OLD.freelancer_id,
+      date_trunc('month', CASE
+        WHEN OLD.status = 'PAID' THEN COALESCE(OLD.payment_date, OLD.due_date, OLD.created_at)
+        ELSE COALESCE(OLD.due_date, OLD.created_at)
+      END)::date,
+      0, 0, 0, 0, 0, 0,
+      -(CASE WHEN OLD.status = 'PAID' THEN OLD.amount ELSE 0 END),
+      -(CASE WHEN OLD.status <> 'PAID' THEN OLD.amount ELSE 0 END)
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE')
+     AND NEW.freelancer_id IS NOT NULL
+     AND NEW.type = 'EXPENSE'
+     AND NEW.status IN ('PAID', 'PENDING', 'SCHEDULED') THEN
+    PERFORM apply_freelancer_monthly_delta(
+      NEW.organization_id,
+      NEW.freelancer_id,
+      date_trunc('month', CASE
+        WHEN NEW.status = 'PAID' THEN COALESCE(NEW.payment_date, NEW.due_date, NEW.created_at, NOW())
+        ELSE COALESCE(NEW.due_date, NEW.created_at, NOW())
+      END)::date,
+      0, 0, 0, 0, 0, 0,
+      CASE WHEN NEW.status = 'PAID' THEN NEW.amount ELSE 0 END,
+      CASE WHEN NEW.status <> 'PAID' THEN NEW.amount ELSE 0 END
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+-- Rebuild considera também o arquivo
+CREATE OR REPLACE FUNCTION refresh_freelancer_monthly_stats(p_organization_id TEXT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+AS $$
+BEGIN
+  DELETE FROM public.freelancer_monthly_stats
+  WHERE p_organization_id IS NULL OR organization_id = p_organization_id;
+
+  DELETE FROM public.freelancer_project_jobs
+  WHERE p_organization_id IS NULL OR organization_id = p_organization_id;
+
+  INSERT INTO public.freelancer_project_jobs (organization_id, freelancer_id, project_id, month, jobs_count)
+  SELECT
+    ia.organization_id,
+    ia.freelancer_id,
+    pi.project_id,
+    MIN(date_trunc('month', COALESCE(ia.scheduled_date, ia.created_at))::date),
+    COUNT(*)::int
+  FROM public.item_assignments_all ia
+  JOIN public.project_items_all pi ON pi.id = ia.project_item_id
+  WHERE (p_organization_id IS NULL OR ia.organization_id = p_organization_id)
+    AND ia.freelancer_id IN (SELECT id FROM public.freelancers)
+  GROUP BY ia.organization_id, ia.freelancer_id, pi.project_id;
+
+  INSERT INTO public.freelancer_monthly_stats (
+    organization_id, freelancer_id, month,
+    jobs_count, completed_jobs, pending_jobs, estimated_hours,
+    agreed_fees, completed_fees, projects_count, paid_amount, pending_amount
+  )
+  SELECT
+    organization_id, freelancer_id, month,
+    SUM(jobs_count), SUM(completed_jobs), SUM(pending_jobs), SUM(estimated_hours),
+    SUM(agreed_fees), SUM(completed_fees), SUM(projects_count), SUM(paid_amount), SUM(pending_amount)
+  FROM (
+    SELECT
+      ia.organization_id,
+      ia.freelancer_id,
+      date_trunc('month', COALESCE(ia.scheduled_date, ia.created_at))::date AS month,
+      COUNT(*)::int AS jobs_count,
+      COUNT(*) FILTER (WHERE ia.status = 'DONE')::int AS completed_jobs,
+      COUNT(*) FILTER (WHERE ia.status = 'PENDING')::int AS pending_jobs,
+      COALESCE(SUM(ia.estimated_hours), 0) AS estimated_hours,
+      COALESCE(SUM(ia.agreed_fee), 0) AS agreed_fees,
+      COALESCE(SUM(ia.agreed_fee) FILTER (WHERE ia.status = 'DONE'), 0) AS completed_fees,
+      0 AS projects_count,
+      0::numeric AS paid_amount,
+      0::numeric AS pending_amount
+    FROM public.item_assignments_all ia
+    WHERE ia.project_item_id IS NOT NULL
+      AND (p_organization_id IS NULL OR ia.organization_id = p_organization_id)
+    GROUP BY 1, 2, 3
+
+    UNION ALL
+
+    SELECT organization_id, freelancer_id, month, 0, 0, 0, 0, 0, 0, COUNT(*)::int, 0, 0
+    FROM public.freelancer_project_jobs
+    WHERE p_organization_id IS NULL OR organization_id = p_organization_id
+    GROUP BY 1, 2, 3
+
+    UNION ALL
+
+    SELECT
+      ft.organization_id,
+      ft.freelancer_id,
+      date_trunc('month', CASE
+        WHEN ft.status = 'PAID' THEN COALESCE(ft.payment_date, ft.due_date, ft.created_at)
+        ELSE COALESCE(ft.due_date, ft.created_at)
+      END)::date AS month,
+      0, 0, 0, 0, 0, 0, 0,
+      COALESCE(SUM(ft.amount) FILTER (WHERE ft.status = 'PAID'), 0),
+      COALESCE(SUM(ft.amount) FILTER (WHERE ft.status IN ('PENDING', 'SCHEDULED')), 0)
+    FROM public.financial_transactions_all ft
+    WHERE ft.freelancer_id IS NOT NULL
+      AND ft.type = 'EXPENSE'
+      AND ft.status IN ('PAID', 'PENDING', 'SCHEDULED')
+      AND (p_organization_id IS NULL OR ft.organization_id = p_organization_id)
+    GROUP BY 1, 2, 3
+  ) src
+  WHERE freelancer_id IN (SELECT id FROM public.freelancers)
+  GROUP BY organization_id, freelancer_id, month;
+END;
+$$;
@@ -0,0 +1,12 @@
+-- ==============================================================================
+-- MIGRATION: BUCKET DE PDFs DE PROPOSTAS
+-- ==============================================================================
+-- Cache persistente dos PDFs gerados no servidor (/api/proposals/pdf).
+-- Caminho: <organization_id>/<proposal_id>/<hash do conteúdo>.pdf
+-- Privado: leitura e escrita só pelo service role (a rota valida o acesso
+-- pelo token público ou pela organização do usuário).
+-- ==============================================================================
+
+INSERT INTO storage.buckets (id, name, public, file_size_limit, allowed_mime_types)
+VALUES ('proposal-pdfs', 'proposal-pdfs', false, 10485760, ARRAY['application/pdf'])
+ON CONFLICT (id) DO NOTHING;
@@ -0,0 +1,549 @@
+-- ==============================================================================
+-- MIGRATION: CUBO DE RENTABILIDADE
+-- ==============================================================================
+-- Agregado por (organização, projeto, cliente, mês, categoria) mantido por
+-- triggers, no mesmo modelo do rollup de freelancers:
+--   - financial_transactions: receitas/custos pagos e em aberto na categoria
+--     da transação (mês do pagamento; em aberto, mês do vencimento)
+--   - project_items: valor contratado na categoria 'CONTRACT' (mês de criação
+--     do projeto)
+--   - project_expenses: custos lançados no projeto, na categoria da despesa
+--     (realizado se houver, senão o estimado; pagos no mês do pagamento, os
+--     demais no mês do lançamento)
+-- O cliente de linhas de projeto é sempre o cliente do projeto (transferir o
+-- projeto de cliente reclassifica as linhas). Transações sem projeto ficam com
+-- project_id NULL e o client_id da própria transação.
+--
+-- Consulta: profitability_query() agrupa pelas dimensões pedidas (ranking
+-- entre projetos/clientes/meses/categorias ou drill-down de um projeto) lendo
+-- só o cubo. SECURITY INVOKER: RLS do cubo isola a organização.
+-- ==============================================================================
+
+-- 1. Cubo
+CREATE TABLE IF NOT EXISTS public.project_profitability_cube (
+  organization_id TEXT NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+  project_id TEXT,
+  client_id TEXT,
+  month DATE NOT NULL, -- Primeiro dia do mês
+  category TEXT NOT NULL,
+
+  revenue_paid DECIMAL(14,2) NOT NULL DEFAULT 0,
+  revenue_open DECIMAL(14,2) NOT NULL DEFAULT 0,
+  cost_paid DECIMAL(14,2) NOT NULL DEFAULT 0,
+  cost_open DECIMAL(14,2) NOT NULL DEFAULT 0,
+  contracted DECIMAL(14,2) NOT NULL DEFAULT 0,
+
+  transactions_count INTEGER NOT NULL DEFAULT 0,
+  items_count INTEGER NOT NULL DEFAULT 0,
+  expenses_count INTEGER NOT NULL DEFAULT 0,
+
+  updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW(),
+
+  CONSTRAINT project_profitability_cube_key
+    UNIQUE NULLS NOT DISTINCT (organization_id, project_id, client_id, month, category)
+);
+
+CREATE INDEX IF NOT EXISTS idx_profitability_cube_org_month
+  ON public.project_profitability_cube (organization_id, month);
+
+CREATE INDEX IF NOT EXISTS idx_profitability_cube_project
+  ON public.project_profitability_cube (project_id, category)
+  WHERE project_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_profitability_cube_org_client
+  ON public.project_profitability_cube (organization_id, client_id, month);
+
+COMMENT ON TABLE public.project_profitability_cube IS
+'Rentabilidade por organização/projeto/cliente/mês/categoria. Mantido por triggers em financial_transactions, project_items, project_expenses e projects.';
+
+ALTER TABLE public.project_profitability_cube ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Org isolation for project_profitability_cube" ON public.project_profitability_cube;
+CREATE POLICY "Org isolation for project_profitability_cube" ON public.project_profitability_cube
+FOR SELECT USING (organization_id = (SELECT auth_org_id()));
+
+GRANT SELECT ON public.project_profitability_cube TO authenticated;
+
+-- 2. Aplicar delta (upsert aditivo; célula zerada sai do cubo)
+CREATE OR REPLACE FUNCTION apply_profitability_delta(
+  p_organization_id TEXT,
+  p_project_id TEXT,
+  p_client_id TEXT,
+  p_month DATE,
+  p_category TEXT,
+  p_revenue_paid NUMERIC,
+  p_revenue_open NUMERIC,
+  p_cost_paid NUMERIC,
+  p_cost_open NUMERIC,
+  p_contracted NUMERIC,
+  p_transactions INTEGER,
+  p_items INTEGER,
+  p_expenses INTEGER DEFAULT 0
+) RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF p_organization_id IS NULL OR p_month IS NULL THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO public.project_profitability_cube AS c (
+    organization_id, project_id, client_id, month, category,
+    revenue_paid, revenue_open, cost_paid, cost_open, contracted,
+    transactions_count, items_count, expenses_count
+  ) VALUES (
+    p_organization_id, p_project_id, p_client_id, p_month, COALESCE(p_category, 'OTHER'),
+    p_revenue_paid, p_revenue_open, p_cost_paid, p_cost_open, p_contracted,
+    p_transactions, p_items, p_expenses
+  )
+  ON CONFLICT ON CONSTRAINT project_profitability_cube_key DO UPDATE SET
+    revenue_paid = c.revenue_paid + EXCLUDED.revenue_paid,
+    revenue_open = c.revenue_open + EXCLUDED.revenue_open,
+    cost_paid = c.cost_paid + EXCLUDED.cost_paid,
+    cost_open = c.cost_open + EXCLUDED.cost_open,
+    contracted = c.contracted + EXCLUDED.contracted,
+    transactions_count = c.transactions_count + EXCLUDED.transactions_count,
+    items_count = c.items_count + EXCLUDED.items_count,
+    expenses_count = c.expenses_count + EXCLUDED.expenses_count,
+    updated_at = NOW();
+
+  DELETE FROM public.project_profitability_cube
+  WHERE organization_id = p_organization_id
+    AND project_id IS NOT DISTINCT FROM p_project_id
+    AND client_id IS NOT DISTINCT FROM p_client_id
+    AND month = p_month
+    AND category = COALESCE(p_category, 'OTHER')
+    AND transactions_count <= 0
+    AND items_count <= 0
+    AND expenses_count <= 0;
+END;
+$$;
+
+-- Cliente de um projeto: o do próprio cubo (estável mesmo se o projeto já foi
+-- apagado na mesma transação), senão o do projeto
+CREATE OR REPLACE FUNCTION profitability_project_client(p_project_id TEXT)
+RETURNS TEXT
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT COALESCE(
+    (SELECT client_id FROM public.project_profitability_cube WHERE project_id = p_project_id LIMIT 1),
+    (SELECT client_id FROM public.projects WHERE id = p_project_id)
+  );
+$$;
+
+-- 3. Trigger: financial_transactions
+-- Pagos no mês do pagamento; em aberto no mês do vencimento; cancelados, capital
+-- inicial e transferências não entram.
+CREATE OR REPLACE FUNCTION sync_profitability_from_transaction()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  -- Arquivamento (archive_cold_data_batch) não altera o histórico
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE')
+     AND OLD.type IN ('INCOME', 'EXPENSE')
+     AND COALESCE(OLD.status, 'PENDING') <> 'CANCELLED' THEN
+    PERFORM apply_profitability_delta(
+      OLD.organization_id,
+      OLD.project_id,
+      CASE WHEN OLD.project_id IS NULL THEN OLD.client_id ELSE profitability_project_client(OLD.project_id) END,
+      date_trunc('month', CASE
+        WHEN OLD.status = 'PAID' THEN COALESCE(OLD.payment_date, OLD.due_date, OLD.created_at)
+        ELSE COALESCE(OLD.due_date, OLD.created_at)
+      END)::date,
+      OLD.category,
+      -(CASE WHEN OLD.type = 'INCOME' AND OLD.status = 'PAID' THEN ABS(OLD.amount) ELSE 0 END),
+      -(CASE WHEN OLD.type = 'INCOME' AND OLD.status IS DISTINCT FROM 'PAID' THEN ABS(OLD.amount) ELSE 0 END),
+      -(CASE WHEN OLD.type = 'EXPENSE' AND OLD.status = 'PAID' THEN ABS(OLD.amount) ELSE 0 END),
+      -(CASE WHEN OLD.type = 'EXPENSE' AND OLD.status IS DISTINCT FROM 'PAID' THEN ABS(OLD.amount) ELSE 0 END),
+      0,
+      -1,
+      0
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE')
+     AND NEW.type IN ('INCOME', 'EXPENSE')
+     AND COALESCE(NEW.status, 'PENDING') <> 'CANCELLED' THEN
+    PERFORM apply_profitability_delta(
+      NEW.organization_id,
+      NEW.project_id,
+      CASE WHEN NEW.project_id IS NULL THEN NEW.client_id ELSE profitability_project_client(NEW.project_id) END,
+      date_trunc('month', CASE
+        WHEN NEW.status = 'PAID' THEN COALESCE(NEW.payment_date, NEW.due_date, NEW.created_at, NOW())
+        ELSE COALESCE(NEW.due_date, NEW.created_at, NOW())
+      END)::date,
+      NEW.category,
+      CASE WHEN NEW.type = 'INCOME' AND NEW.status = 'PAID' THEN ABS(NEW.amount) ELSE 0 END,
+      CASE WHEN NEW.type = 'INCOME' AND NEW.status IS DISTINCT FROM 'PAID' THEN ABS(NEW.amount) ELSE 0 END,
+      CASE WHEN NEW.type = 'EXPENSE' AND NEW.status = 'PAID' THEN ABS(NEW.amount) ELSE 0 END,
+      CASE WHEN NEW.type = 'EXPENSE' AND NEW.status IS DISTINCT FROM 'PAID' THEN ABS(NEW.amount) ELSE 0 END,
+      0,
+      1,
+      0
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_profitability_transaction ON public.financial_transactions;
+CREATE TRIGGER trigger_profitability_transaction
+  AFTER INSERT OR UPDATE OR DELETE ON public.financial_transactions
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_profitability_from_transaction();
+
+-- 4. Trigger: project_items (valor contratado)
+-- Todas as linhas CONTRACT de um projeto ficam no mês de criação do projeto.
+CREATE OR REPLACE FUNCTION sync_profitability_from_project_item()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_key RECORD;
+BEGIN
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.project_id IS NOT NULL THEN
+    SELECT organization_id, client_id, month INTO v_key
+    FROM public.project_profitability_cube
+    WHERE project_id = OLD.project_id AND category = 'CONTRACT'
+    LIMIT 1;
+
+    IF FOUND THEN
+      PERFORM apply_profitability_delta(
+        v_key.organization_id, OLD.project_id, v_key.client_id, v_key.month, 'CONTRACT',
+        0, 0, 0, 0, -COALESCE(OLD.total_price, 0), 0, -1
+      );
+    END IF;
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.project_id IS NOT NULL THEN
+    SELECT p.organization_id,
+           profitability_project_client(p.id) AS client_id,
+           date_trunc('month', COALESCE(p.created_at, NOW()))::date AS month
+    INTO v_key
+    FROM public.projects p
+    WHERE p.id = NEW.project_id;
+
+    IF FOUND THEN
+      PERFORM apply_profitability_delta(
+        v_key.organization_id, NEW.project_id, v_key.client_id, v_key.month, 'CONTRACT',
+        0, 0, 0, 0, COALESCE(NEW.total_price, 0), 0, 1
+      );
+    END IF;
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_profitability_project_item ON public.project_items;
+CREATE TRIGGER trigger_profitability_project_item
+  AFTER INSERT OR UPDATE OR DELETE ON public.project_items
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_profitability_from_project_item();
+
+-- 5. Trigger: project_expenses (custos lançados no projeto)
+-- Mesmo valor exibido na aba financeira do projeto: realizado, senão estimado.
+CREATE OR REPLACE FUNCTION sync_profitability_from_expense()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF current_setting('app.archiving', true) = 'on' THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.project_id IS NOT NULL THEN
+    PERFORM apply_profitability_delta(
+      OLD.organization_id,
+      OLD.project_id,
+      profitability_project_client(OLD.project_id),
+      date_trunc('month', CASE
+        WHEN OLD.payment_status = 'PAID' THEN COALESCE(OLD.payment_date::timestamptz, OLD.created_at)
+        ELSE OLD.created_at
+      END)::date,
+      OLD.category,
+      0,
+      0,
+      -(CASE WHEN OLD.payment_status = 'PAID' THEN COALESCE(NULLIF(OLD.actual_cost, 0), OLD.estimated_cost, 0) ELSE 0 END),
+      -(CASE WHEN OLD.payment_status IS DISTINCT FROM 'PAID' THEN COALESCE(NULLIF(OLD.actual_cost, 0), OLD.estimated_cost, 0) ELSE 0 END),
+      0,
+      0,
+      0,
+      -1
+    );
+  END IF;
+
+  IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.project_id IS NOT NULL THEN
+    PERFORM apply_profitability_delta(
+      NEW.organization_id,
+      NEW.project_id,
+      profitability_project_client(NEW.project_id),
+      date_trunc('month', CASE
+        WHEN NEW.payment_status = 'PAID' THEN COALESCE(NEW.payment_date::timestamptz, NEW.created_at, NOW())
+        ELSE COALESCE(NEW.created_at, NOW())
+      END)::date,
+      NEW.category,
+      0,
+      0,
+      CASE WHEN NEW.payment_status = 'PAID' THEN COALESCE(NULLIF(NEW.actual_cost, 0), NEW.estimated_cost, 0) ELSE 0 END,
+      CASE WHEN NEW.payment_status IS DISTINCT FROM 'PAID' THEN COALESCE(NULLIF(NEW.actual_cost, 0), NEW.estimated_cost, 0) ELSE 0 END,
+      0,
+      0,
+      0,
+      1
+    );
+  END IF;
+
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_profitability_expense ON public.project_expenses;
+CREATE TRIGGER trigger_profitability_expense
+  AFTER INSERT OR UPDATE OR DELETE ON public.project_expenses
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_profitability_from_expense();
+
+-- 6. Trigger: troca de cliente do projeto reclassifica as linhas
+CREATE OR REPLACE FUNCTION sync_profitability_project_client()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF NEW.client_id IS DISTINCT FROM OLD.client_id THEN
+    UPDATE public.project_profitability_cube
+    SET client_id = NEW.client_id, updated_at = NOW()
+    WHERE project_id = NEW.id;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_profitability_project_client ON public.projects;
+CREATE TRIGGER trigger_profitability_project_client
+  AFTER UPDATE OF client_id ON public.projects
+  FOR EACH ROW
+  EXECUTE FUNCTION sync_profitability_project_client();
+
+-- 7. Rebuild completo (backfill e correção manual), incluindo dados arquivados
+CREATE OR REPLACE FUNCTION refresh_project_profitability(p_organization_id TEXT DEFAULT NULL)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  DELETE FROM public.project_profitability_cube
+  WHERE p_organization_id IS NULL OR organization_id = p_organization_id;
+
+  INSERT INTO public.project_profitability_cube (
+    organization_id, project_id, client_id, month, category,
+    revenue_paid, revenue_open, cost_paid, cost_open, contracted,
+    transactions_count, items_count, expenses_count
+  )
+  SELECT
+    organization_id, project_id, client_id, month, category,
+    SUM(revenue_paid), SUM(revenue_open), SUM(cost_paid), SUM(cost_open), SUM(contracted),
+    SUM(transactions_count), SUM(items_count), SUM(expenses_count)
+  FROM (
+    SELECT
+      t.organization_id,
+      t.project_id,
+      CASE WHEN t.project_id IS NULL THEN t.client_id ELSE p.client_id END AS client_id,
+      date_trunc('month', CASE
+        WHEN t.status = 'PAID' THEN COALESCE(t.payment_date, t.due_date, t.created_at)
+        ELSE COALESCE(t.due_date, t.created_at)
+      END)::date AS month,
+      COALESCE(t.category, 'OTHER') AS category,
+      COALESCE(SUM(ABS(t.amount)) FILTER (WHERE t.type = 'INCOME' AND t.status = 'PAID'), 0) AS revenue_paid,
+      COALESCE(SUM(ABS(t.amount)) FILTER (WHERE t.type = 'INCOME' AND t.status IS DISTINCT FROM 'PAID'), 0) AS revenue_open,
+      COALESCE(SUM(ABS(t.amount)) FILTER (WHERE t.type = 'EXPENSE' AND t.status = 'PAID'), 0) AS cost_paid,
+      COALESCE(SUM(ABS(t.amount)) FILTER (WHERE t.type = 'EXPENSE' AND t.status IS DISTINCT FROM 'PAID'), 0) AS cost_open,
+      0::numeric AS contracted,
+      COUNT(*)::int AS transactions_count,
+      0 AS items_count,
+      0 AS expenses_count
+    FROM public.financial_transactions_all t
+    LEFT JOIN public.projects_all p ON p.id = t.project_id
+    WHERE t.type IN ('INCOME', 'EXPENSE')
+      AND COALESCE(t.status, 'PENDING') <> 'CANCELLED'
+      AND (p_organization_id IS NULL OR t.organization_id = p_organization_id)
+    GROUP BY 1, 2, 3, 4, 5
+
+    UNION ALL
+
+    SELECT
+      p.organization_id,
+      p.id,
+      p.client_id,
+      date_trunc('month', p.created_at)::date,
+      'CONTRACT',
+      0, 0, 0, 0,
+      COALESCE(SUM(pi.total_price), 0),
+      0,
+      COUNT(*)::int,
+      0
+    FROM public.project_items_all pi
+    JOIN public.projects_all p ON p.id = pi.project_id
+    WHERE p_organization_id IS NULL OR p.organization_id = p_organization_id
+    GROUP BY 1, 2, 3, 4
+
+    UNION ALL
+
+    SELECT
+      e.organization_id,
+      e.project_id,
+      p.client_id,
+      date_trunc('month', CASE
+        WHEN e.payment_status = 'PAID' THEN COALESCE(e.payment_date::timestamptz, e.created_at)
+        ELSE e.created_at
+      END)::date,
+      COALESCE(e.category, 'OTHER'),
+      0, 0,
+      COALESCE(SUM(COALESCE(NULLIF(e.actual_cost, 0), e.estimated_cost, 0)) FILTER (WHERE e.payment_status = 'PAID'), 0),
+      COALESCE(SUM(COALESCE(NULLIF(e.actual_cost, 0), e.estimated_cost, 0)) FILTER (WHERE e.payment_status IS DISTINCT FROM 'PAID'), 0),
+      0,
+      0,
+      0,
+      COUNT(*)::int
+    FROM public.project_expenses_all e
+    JOIN public.projects_all p ON p.id = e.project_id
+    WHERE p_organization_id IS NULL OR e.organization_id = p_organization_id
+    GROUP BY 1, 2, 3, 4, 5
+  ) src
+  WHERE organization_id IS NOT NULL AND month IS NOT NULL
+  GROUP BY organization_id, project_id, client_id, month, category;
+END;
+$$;
+
+SELECT refresh_project_profitability();
+
+-- 8. Consulta: agrupamento pelas dimensões pedidas
+-- p_group_by: subconjunto de {project, client, month, category} (vazio = total)
+-- p_order_by: profit | margin | revenue | cost | contracted | month
+CREATE OR REPLACE FUNCTION profitability_query(
+  p_organization_id TEXT,
+  p_group_by TEXT[] DEFAULT ARRAY['project'],
+  p_start DATE DEFAULT NULL,
+  p_end DATE DEFAULT NULL,
+  p_project_id TEXT DEFAULT NULL,
+  p_client_id TEXT DEFAULT NULL,
+  p_category TEXT DEFAULT NULL,
+  p_order_by TEXT DEFAULT 'profit',
+  p_ascending BOOLEAN DEFAULT false,
+  p_limit INT DEFAULT 50
+) RETURNS TABLE (
+  project_id TEXT,
+  project_title TEXT,
+  client_id TEXT,
+  client_name TEXT,
+  month DATE,
+  category TEXT,
+  revenue NUMERIC,
+  revenue_paid NUMERIC,
+  cost NUMERIC,
+  cost_paid NUMERIC,
+  contracted NUMERIC,
+  profit NUMERIC,
+  margin_percent NUMERIC,
+  transactions INT
+)
+LANGUAGE plpgsql
+STABLE
+SET search_path = public
+AS $$
+DECLARE
+  v_group TEXT[] := ARRAY(
+    SELECT DISTINCT g FROM unnest(COALESCE(p_group_by, '{}')) AS g
+    WHERE g IN ('project', 'client', 'month', 'category')
+  );
+  v_order TEXT := CASE p_order_by
+    WHEN 'margin' THEN 'margin_percent'
+    WHEN 'revenue' THEN 'revenue'
+    WHEN 'cost' THEN 'cost'
+    WHEN 'contracted' THEN 'contracted'
+    WHEN 'month' THEN 'month'
+    ELSE 'profit'
+  END;
+BEGIN
+  RETURN QUERY EXECUTE format(
+    $q$
+    WITH agg AS (
+      SELECT
+        %1$s AS project_id,
+        %2$s AS client_id,
+        %3$s AS month,
+        %4$s AS category,
+        SUM(c.revenue_paid + c.revenue_open) AS revenue,
+        SUM(c.revenue_paid) AS revenue_paid,
+        SUM(c.cost_paid + c.cost_open) AS cost,
+        SUM(c.cost_paid) AS cost_paid,
+        SUM(c.contracted) AS contracted,
+        SUM(c.transactions_count)::int AS transactions
+      FROM public.project_profitability_cube c
+      WHERE c.organization_id = $1
+        AND ($2::date IS NULL OR c.month >= date_trunc('month', $2::date))
+        AND ($3::date IS NULL OR c.month <= $3::date)
+        AND ($4::text IS NULL OR c.project_id = $4)
+        AND ($5::text IS NULL OR c.client_id = $5)
+        AND ($6::text IS NULL OR c.category = $6)
+      GROUP BY 1, 2, 3, 4
+    )
+    SELECT
+      a.project_id,
+      p.title::text AS project_title,
+      a.client_id,
+      cl.name::text AS client_name,
+      a.month,
+      a.category,
+      a.revenue,
+      a.revenue_paid,
+      a.cost,
+      a.cost_paid,
+      a.contracted,
+      a.revenue - a.cost AS profit,
+      CASE WHEN a.revenue > 0 THEN ROUND((a.revenue - a.cost) / a.revenue * 100, 2) END AS margin_percent,
+      a.transactions
+    FROM agg a
+    LEFT JOIN public.projects_all p ON p.id = a.project_id
+    LEFT JOIN public.clients cl ON cl.id = a.client_id
+    ORDER BY %5$I %6$s NULLS LAST
+    LIMIT $7
+    $q$,
+    CASE WHEN 'project' = ANY (v_group) THEN 'c.project_id' ELSE 'NULL::text' END,
+    CASE WHEN 'client' = ANY (v_group) THEN 'c.client_id' ELSE 'NULL::text' END,
+    CASE WHEN 'month' = ANY (v_group) THEN 'c.month' ELSE 'NULL::date' END,
+    CASE WHEN 'category' = ANY (v_group) THEN 'c.category' ELSE 'NULL::text' END,
+    v_order,
+    CASE WHEN p_ascending THEN 'ASC' ELSE 'DESC' END
+  )
+  USING p_organization_id, p_start, p_end, p_project_id, p_client_id, p_category,
+        LEAST(GREATEST(COALESCE(p_limit, 50), 1), 1000);
+END;
+$$;
+
+COMMENT ON FUNCTION profitability_query IS
+'Rentabilidade agregada do cubo pelas dimensões pedidas (project, client, month, category), com filtros e ranking.';
@@ -0,0 +1,157 @@
+-- ==============================================================================
+-- MIGRATION: FEED ICS DO CALENDÁRIO
+-- ==============================================================================
+-- Assinatura do calendário (Google/Apple/Outlook) por link com token por
+-- usuário. Os apps consultam o link a cada poucos minutos, então o endpoint
+-- precisa responder "nada mudou" sem remontar o calendário:
+--   - calendar_feed_state: última alteração de qualquer fonte do calendário da
+--     organização (projetos, datas de gravação/entrega, itens com prazo,
+--     eventos manuais e nome de clientes), mantida por triggers. Inclui
+--     exclusões, que um MAX(updated_at) das fontes não enxergaria.
+--   - calendar_feed_lookup(token): uma consulta devolve usuário, organização e
+--     a versão do feed → ETag/Last-Modified e 304.
+-- ==============================================================================
+
+-- 1. Tokens (um por usuário; trocar o token invalida o link antigo)
+CREATE TABLE IF NOT EXISTS public.calendar_feed_tokens (
+  user_id TEXT PRIMARY KEY REFERENCES public.users(id) ON DELETE CASCADE,
+  organization_id TEXT NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+  token TEXT NOT NULL UNIQUE,
+  created_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE public.calendar_feed_tokens ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users manage own calendar feed token" ON public.calendar_feed_tokens;
+CREATE POLICY "Users manage own calendar feed token" ON public.calendar_feed_tokens
+FOR ALL
+USING (user_id = auth.uid()::text)
+WITH CHECK (user_id = auth.uid()::text AND organization_id = (SELECT auth_org_id()));
+
+-- 2. Versão do feed por organização
+CREATE TABLE IF NOT EXISTS public.calendar_feed_state (
+  organization_id TEXT PRIMARY KEY REFERENCES public.organizations(id) ON DELETE CASCADE,
+  changed_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE public.calendar_feed_state ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Org isolation for calendar_feed_state" ON public.calendar_feed_state;
+CREATE POLICY "Org isolation for calendar_feed_state" ON public.calendar_feed_state
+FOR SELECT USING (organization_id = (SELECT auth_org_id()));
+
+CREATE OR REPLACE FUNCTION touch_calendar_feed(p_organization_id TEXT)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  -- Várias linhas na mesma transação: só a primeira escreve (NOW() é fixo)
+  INSERT INTO public.calendar_feed_state AS s (organization_id, changed_at)
+  SELECT p_organization_id, NOW()
+  WHERE p_organization_id IS NOT NULL
+  ON CONFLICT (organization_id) DO UPDATE
+    SET changed_at = EXCLUDED.changed_at
+    WHERE s.changed_at < EXCLUDED.changed_at;
+$$;
+
+-- 3. Triggers nas fontes
+-- Tabelas com organization_id (projects, calendar_events, clients)
+CREATE OR REPLACE FUNCTION calendar_feed_touch_org()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM touch_calendar_feed(OLD.organization_id);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.organization_id IS DISTINCT FROM OLD.organization_id) THEN
+    PERFORM touch_calendar_feed(NEW.organization_id);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Tabelas filhas de projeto (shooting_dates, delivery_dates, project_items)
+CREATE OR REPLACE FUNCTION calendar_feed_touch_project()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM touch_calendar_feed((SELECT organization_id FROM public.projects WHERE id = OLD.project_id));
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') AND (TG_OP = 'INSERT' OR NEW.project_id IS DISTINCT FROM OLD.project_id) THEN
+    PERFORM touch_calendar_feed((SELECT organization_id FROM public.projects WHERE id = NEW.project_id));
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Só as colunas que aparecem no feed disparam
+DROP TRIGGER IF EXISTS trigger_calendar_feed_projects ON public.projects;
+CREATE TRIGGER trigger_calendar_feed_projects
+  AFTER INSERT OR DELETE OR UPDATE OF
+    title, shooting_date, shooting_time, deadline, location, client_id, organization_id
+  ON public.projects
+  FOR EACH ROW
+  EXECUTE FUNCTION calendar_feed_touch_org();
+
+DROP TRIGGER IF EXISTS trigger_calendar_feed_calendar_events ON public.calendar_events;
+CREATE TRIGGER trigger_calendar_feed_calendar_events
+  AFTER INSERT OR UPDATE OR DELETE ON public.calendar_events
+  FOR EACH ROW
+  EXECUTE FUNCTION calendar_feed_touch_org();
+
+DROP TRIGGER IF EXISTS trigger_calendar_feed_clients ON public.clients;
+CREATE TRIGGER trigger_calendar_feed_clients
+  AFTER UPDATE OF name ON public.clients
+  FOR EACH ROW
+  EXECUTE FUNCTION calendar_feed_touch_org();
+
+DROP TRIGGER IF EXISTS trigger_calendar_feed_shooting_dates ON public.shooting_dates;
+CREATE TRIGGER trigger_calendar_feed_shooting_dates
+  AFTER INSERT OR UPDATE OR DELETE ON public.shooting_dates
+  FOR EACH ROW
+  EXECUTE FUNCTION calendar_feed_touch_project();
+
+DROP TRIGGER IF EXISTS trigger_calendar_feed_delivery_dates ON public.delivery_dates;
+CREATE TRIGGER trigger_calendar_feed_delivery_dates
+  AFTER INSERT OR UPDATE OR DELETE ON public.delivery_dates
+  FOR EACH ROW
+  EXECUTE FUNCTION calendar_feed_touch_project();
+
+DROP TRIGGER IF EXISTS trigger_calendar_feed_project_items ON public.project_items;
+CREATE TRIGGER trigger_calendar_feed_project_items
+  AFTER INSERT OR DELETE OR UPDATE OF description, due_date, status, project_id
+  ON public.project_items
+  FOR EACH ROW
+  EXECUTE FUNCTION calendar_feed_touch_project();
+
+-- Estado inicial: organizações existentes começam "alteradas agora"
+INSERT INTO public.calendar_feed_state (organization_id)
+SELECT id FROM public.organizations
+ON CONFLICT (organization_id) DO NOTHING;
+
+-- 4. Lookup do endpoint público (service role)
+-- Token válido só enquanto o usuário pertence à organização do token.
+CREATE OR REPLACE FUNCTION calendar_feed_lookup(p_token TEXT)
+RETURNS TABLE (user_id TEXT, organization_id TEXT, changed_at TIMESTAMP WITH TIME ZONE)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT t.user_id, t.organization_id, COALESCE(s.changed_at, t.created_at)
+  FROM public.calendar_feed_tokens t
+  JOIN public.users u ON u.id = t.user_id AND u.organization_id = t.organization_id
+  LEFT JOIN public.calendar_feed_state s ON s.organization_id = t.organization_id
+  WHERE t.token = p_token;
+$$;
+
+REVOKE ALL ON FUNCTION calendar_feed_lookup(TEXT) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION calendar_feed_lookup(TEXT) TO service_role;
@@ -0,0 +1,124 @@
+-- ==============================================================================
+-- MIGRATION: SINCRONIZAÇÃO INCREMENTAL DE DADOS DE REFERÊNCIA
+-- ==============================================================================
+-- Clientes, freelancers e equipamentos ficam numa cópia local (IndexedDB) no
+-- navegador, atualizada por deltas:
+--   - updated_at confiável em toda alteração (trigger BEFORE UPDATE) e índice
+--     (organization_id, updated_at) para "o que mudou desde X"
+--   - reference_tombstones: exclusões, que não aparecem num delta por updated_at
+--   - tabelas na publicação supabase_realtime: mudanças chegam na hora pelo
+--     canal realtime (RLS continua valendo para quem assina)
+-- ==============================================================================
+
+-- 1. updated_at + índice de delta
+DO $$
+DECLARE
+  v_table TEXT;
+BEGIN
+  FOREACH v_table IN ARRAY ARRAY['clients', 'freelancers', 'equipments'] LOOP
+    EXECUTE format(
+      'ALTER TABLE public.%I ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()',
+      v_table
+    );
+    EXECUTE format(
+      'CREATE INDEX IF NOT EXISTS %I ON public.%I (organization_id, updated_at)',
+      'idx_' || v_table || '_org_updated', v_table
+    );
+  END LOOP;
+END $$;
+
+CREATE OR REPLACE FUNCTION reference_touch_updated_at()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+  NEW.updated_at := NOW();
+  RETURN NEW;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_clients_touch_updated_at ON public.clients;
+CREATE TRIGGER trigger_clients_touch_updated_at
+  BEFORE UPDATE ON public.clients
+  FOR EACH ROW
+  EXECUTE FUNCTION reference_touch_updated_at();
+
+DROP TRIGGER IF EXISTS trigger_freelancers_touch_updated_at ON public.freelancers;
+CREATE TRIGGER trigger_freelancers_touch_updated_at
+  BEFORE UPDATE ON public.freelancers
+  FOR EACH ROW
+  EXECUTE FUNCTION reference_touch_updated_at();
+
+DROP TRIGGER IF EXISTS trigger_equipments_touch_updated_at ON public.equipments;
+CREATE TRIGGER trigger_equipments_touch_updated_at
+  BEFORE UPDATE ON public.equipments
+  FOR EACH ROW
+  EXECUTE FUNCTION reference_touch_updated_at();
+
+-- 2. Tombstones
+CREATE TABLE IF NOT EXISTS public.reference_tombstones (
+  id BIGSERIAL PRIMARY KEY,
+  organization_id TEXT NOT NULL REFERENCES public.organizations(id) ON DELETE CASCADE,
+  collection TEXT NOT NULL, -- clients | freelancers | equipments
+  record_id TEXT NOT NULL,
+  deleted_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_reference_tombstones_org_deleted
+  ON public.reference_tombstones (organization_id, collection, deleted_at);
+
+ALTER TABLE public.reference_tombstones ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Org isolation for reference_tombstones" ON public.reference_tombstones;
+CREATE POLICY "Org isolation for reference_tombstones" ON public.reference_tombstones
+FOR SELECT USING (organization_id = (SELECT auth_org_id()));
+
+CREATE OR REPLACE FUNCTION reference_record_tombstone()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO public.reference_tombstones (organization_id, collection, record_id)
+  VALUES (OLD.organization_id, TG_TABLE_NAME, OLD.id);
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS trigger_clients_tombstone ON public.clients;
+CREATE TRIGGER trigger_clients_tombstone
+  AFTER DELETE ON public.clients
+  FOR EACH ROW
+  EXECUTE FUNCTION reference_record_tombstone();
+
+DROP TRIGGER IF EXISTS trigger_freelancers_tombstone ON public.freelancers;
+CREATE TRIGGER trigger_freelancers_tombstone
+  AFTER DELETE ON public.freelancers
+  FOR EACH ROW
+  EXECUTE FUNCTION reference_record_tombstone();
+
+DROP TRIGGER IF EXISTS trigger_equipments_tombstone ON public.equipments;
+CREATE TRIGGER trigger_equipments_tombstone
+  AFTER DELETE ON public.equipments
+  FOR EACH ROW
+  EXECUTE FUNCTION reference_record_tombstone();
+
+-- 3. Realtime
+DO $$
+DECLARE
+  v_table TEXT;
+BEGIN
+  IF NOT EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+    RETURN;
+  END IF;
+
+  FOREACH v_table IN ARRAY ARRAY['clients', 'freelancers', 'equipments'] LOOP
+    IF NOT EXISTS (
+      SELECT 1 FROM pg_publication_tables
+      WHERE pubname = 'supabase_realtime' AND schemaname = 'public' AND tablename = v_table
+    ) THEN
+      EXECUTE format('ALTER PUBLICATION supabase_realtime ADD TABLE public.%I', v_table);
+    END IF;
+  END LOOP;
+END $$;
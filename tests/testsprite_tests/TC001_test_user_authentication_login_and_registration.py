@@ -1,12 +1,11 @@
-import requests
+from runner import current
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
 
 def test_user_authentication_login_and_registration():
+    ctx = current()
     # Data for user registration
     registration_data = {
-        "email": "testuser_auth@test.com",
+        "email": ctx.email("testuser_auth", "test.com"),
         "password": "TestPass123!",
         "initialCapital": 10000,
         "role": "user"
@@ -18,7 +17,7 @@ def test_user_authentication_login_and_registration():
 
     try:
         # Register a new user
-        reg_response = requests.post(f"{BASE_URL}/api/auth/register", json=registration_data, headers=headers, timeout=TIMEOUT)
+        reg_response = ctx.post("/api/auth/register", json=registration_data, headers=headers)
         assert reg_response.status_code == 201, f"Registration failed: {reg_response.text}"
         reg_json = reg_response.json()
         assert "id" in reg_json, "User ID missing in registration response"
@@ -31,7 +30,7 @@ def test_user_authentication_login_and_registration():
             "email": registration_data["email"],
             "password": registration_data["password"]
         }
-        login_response = requests.post(f"{BASE_URL}/api/auth/login", json=login_data, headers=headers, timeout=TIMEOUT)
+        login_response = ctx.post("/api/auth/login", json=login_data, headers=headers)
         assert login_response.status_code == 200, f"Login failed: {login_response.text}"
         login_json = login_response.json()
         assert "token" in login_json, "Authentication token not returned on login"
@@ -42,7 +41,7 @@ def test_user_authentication_login_and_registration():
             "Authorization": f"Bearer {token}"
         }
         # Endpoint that requires authentication and role-check, e.g. user profile
-        profile_response = requests.get(f"{BASE_URL}/api/auth/profile", headers=auth_headers, timeout=TIMEOUT)
+        profile_response = ctx.get("/api/auth/profile", headers=auth_headers)
         assert profile_response.status_code == 200, f"Accessing profile failed: {profile_response.text}"
         profile_json = profile_response.json()
         assert profile_json.get("email") == registration_data["email"], "Profile email mismatch"
@@ -53,11 +52,11 @@ def test_user_authentication_login_and_registration():
             "email": registration_data["email"],
             "password": "WrongPass123!"
         }
-        invalid_login_response = requests.post(f"{BASE_URL}/api/auth/login", json=invalid_login_data, headers=headers, timeout=TIMEOUT)
+        invalid_login_response = ctx.post("/api/auth/login", json=invalid_login_data, headers=headers)
         assert invalid_login_response.status_code == 401 or invalid_login_response.status_code == 400, "Invalid login did not fail properly"
 
         # Verify registration failure with existing email
-        duplicate_reg_response = requests.post(f"{BASE_URL}/api/auth/register", json=registration_data, headers=headers, timeout=TIMEOUT)
+        duplicate_reg_response = ctx.post("/api/auth/register", json=registration_data, headers=headers)
         assert duplicate_reg_response.status_code == 409 or duplicate_reg_response.status_code == 400, "Duplicate registration did not fail properly"
 
     finally:
@@ -67,10 +66,11 @@ def test_user_authentication_login_and_registration():
                 del_headers = {
                     "Authorization": f"Bearer {token}"
                 }
-                del_response = requests.delete(f"{BASE_URL}/api/auth/users/{user_id}", headers=del_headers, timeout=TIMEOUT)
+                del_response = ctx.delete(f"/api/auth/users/{user_id}", headers=del_headers)
                 assert del_response.status_code in [200, 204], f"Failed to delete test user: {del_response.text}"
             except Exception:
                 pass
 
 
-test_user_authentication_login_and_registration()
\ No newline at end of file
+if __name__ == "__main__":
+    test_user_authentication_login_and_registration()
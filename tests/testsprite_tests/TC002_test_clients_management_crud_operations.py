@@ -1,21 +1,19 @@
 import requests
-import uuid
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from runner import current
+
 HEADERS = {
     "Content-Type": "application/json",
-    # Include Authorization header or other headers here if auth is required
-    # "Authorization": "Bearer YOUR_AUTH_TOKEN"
 }
 
 def test_clients_management_crud_operations():
+    ctx = current()
     client_id = None
     created_client = None
     try:
         # --- CREATE a new client ---
         create_payload = {
-            "name": "Test Client " + str(uuid.uuid4()),
+            "name": ctx.unique("Test Client"),
             "company": {
                 "name": "Test Company Inc.",
                 "industry": "Audiovisual",
@@ -30,11 +28,10 @@ def test_clients_management_crud_operations():
             },
             "notes": "Initial test client record for CRUD testing."
         }
-        create_resp = requests.post(
-            f"{BASE_URL}/clients",
+        create_resp = ctx.post(
+            "/clients",
             json=create_payload,
-            headers=HEADERS,
-            timeout=TIMEOUT
+            headers=HEADERS
         )
         assert create_resp.status_code == 201, f"Expected 201 Created, got {create_resp.status_code}"
         try:
@@ -45,10 +42,9 @@ def test_clients_management_crud_operations():
         client_id = created_client["id"]
 
         # --- RETRIEVE the created client ---
-        get_resp = requests.get(
-            f"{BASE_URL}/clients/{client_id}",
-            headers=HEADERS,
-            timeout=TIMEOUT
+        get_resp = ctx.get(
+            f"/clients/{client_id}",
+            headers=HEADERS
         )
         assert get_resp.status_code == 200, f"Expected 200 OK on GET, got {get_resp.status_code}"
         try:
@@ -78,11 +74,10 @@ def test_clients_management_crud_operations():
             },
             "notes": "Updated client record for CRUD testing."
         }
-        update_resp = requests.put(
-            f"{BASE_URL}/clients/{client_id}",
+        update_resp = ctx.put(
+            f"/clients/{client_id}",
             json=update_payload,
-            headers=HEADERS,
-            timeout=TIMEOUT
+            headers=HEADERS
         )
         assert update_resp.status_code == 200, f"Expected 200 OK on update, got {update_resp.status_code}"
         try:
@@ -95,18 +90,16 @@ def test_clients_management_crud_operations():
         assert updated_client["notes"] == update_payload["notes"]
 
         # --- DELETE the client ---
-        delete_resp = requests.delete(
-            f"{BASE_URL}/clients/{client_id}",
-            headers=HEADERS,
-            timeout=TIMEOUT
+        delete_resp = ctx.delete(
+            f"/clients/{client_id}",
+            headers=HEADERS
         )
         assert delete_resp.status_code == 204, f"Expected 204 No Content on delete, got {delete_resp.status_code}"
 
         # --- VERIFY deletion by attempting to GET client ---
-        get_deleted_resp = requests.get(
-            f"{BASE_URL}/clients/{client_id}",
-            headers=HEADERS,
-            timeout=TIMEOUT
+        get_deleted_resp = ctx.get(
+            f"/clients/{client_id}",
+            headers=HEADERS
         )
         assert get_deleted_resp.status_code == 404, f"Expected 404 Not Found after delete, got {get_deleted_resp.status_code}"
 
@@ -116,8 +109,10 @@ def test_clients_management_crud_operations():
         # Clean up in case delete step did not succeed
         if client_id:
             try:
-                requests.delete(f"{BASE_URL}/clients/{client_id}", headers=HEADERS, timeout=TIMEOUT)
+                ctx.delete(f"/clients/{client_id}", headers=HEADERS)
             except Exception:
                 pass
 
-test_clients_management_crud_operations()
+if __name__ == "__main__":
+    test_clients_management_crud_operations()
+
@@ -1,99 +1,22 @@
-import requests
-import uuid
-import time
+from runner import current
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
-
-# For authentication - assuming a login endpoint and token-based auth
-AUTH_EMAIL = "testuser@example.com"
-AUTH_PASSWORD = "TestPass123!"
-
-def authenticate():
-    resp = requests.post(
-        f"{BASE_URL}/api/auth/login",
-        json={"email": AUTH_EMAIL, "password": AUTH_PASSWORD},
-        timeout=TIMEOUT
-    )
-    resp.raise_for_status()
-    token = resp.json().get("access_token")
-    assert token, "Authentication failed: access_token missing"
-    return token
 
 def test_projects_management_lifecycle_and_kanban_board():
-    token = authenticate()
+    ctx = current()
     headers = {
-        "Authorization": f"Bearer {token}",
         "Content-Type": "application/json"
     }
 
-    created_client_id = None
-    created_freelancer_id = None
-    created_equipment_id = None
+    # Cliente, equipamento e freelancers vêm das fixtures compartilhadas da execução
+    created_client_id = ctx.fixture("client")["id"]
+    created_equipment_id = ctx.fixture("camera")["id"]
+    created_freelancer_id = ctx.fixture("freelancer")["id"]
     created_project_id = None
 
-    # Create a client (required for project)
     try:
-        client_payload = {
-            "name": "Test Client " + str(uuid.uuid4()),
-            "contact_email": "client@example.com",
-            "company_name": "Test Company LLC",
-            "notes": "Automated test client"
-        }
-        r_client = requests.post(
-            f"{BASE_URL}/api/clients",
-            headers=headers,
-            json=client_payload,
-            timeout=TIMEOUT
-        )
-        r_client.raise_for_status()
-        client_data = r_client.json()
-        created_client_id = client_data.get("id")
-        assert created_client_id, "Client creation failed, no ID returned"
-
-        # Create equipment
-        equipment_payload = {
-            "name": "Camera Equipment " + str(uuid.uuid4()),
-            "type": "Camera",
-            "serial_number": "SN-" + str(uuid.uuid4()),
-            "maintenance_due": None,
-            "notes": "Automated test equipment"
-        }
-        r_equipment = requests.post(
-            f"{BASE_URL}/api/equipments",
-            headers=headers,
-            json=equipment_payload,
-            timeout=TIMEOUT
-        )
-        r_equipment.raise_for_status()
-        equipment_data = r_equipment.json()
-        created_equipment_id = equipment_data.get("id")
-        assert created_equipment_id, "Equipment creation failed, no ID returned"
-
-        # Create freelancer
-        freelancer_payload = {
-            "name": "Test Freelancer " + str(uuid.uuid4()),
-            "email": "freelance@example.com",
-            "skills": ["Video Editing", "Photography"],
-            "rates": {"hourly": 50},
-            "availability": [],
-            "ratings": 4.5,
-            "notes": "Automated test freelancer"
-        }
-        r_freelancer = requests.post(
-            f"{BASE_URL}/api/freelancers",
-            headers=headers,
-            json=freelancer_payload,
-            timeout=TIMEOUT
-        )
-        r_freelancer.raise_for_status()
-        freelancer_data = r_freelancer.json()
-        created_freelancer_id = freelancer_data.get("id")
-        assert created_freelancer_id, "Freelancer creation failed, no ID returned"
-
         # Create project with multiple shooting and delivery dates, Kanban status, team allocation, equipment booking, freelancer assignment
         project_payload = {
-            "name": "Test Project " + str(uuid.uuid4()),
+            "name": ctx.unique("Test Project"),
             "client_id": created_client_id,
             "description": "Automated test project lifecycle",
             "shooting_dates": [
@@ -119,11 +42,10 @@ def test_projects_management_lifecycle_and_kanban_board():
             ],
             "notes": "Test project with full lifecycle and Kanban management"
         }
-        r_project = requests.post(
-            f"{BASE_URL}/api/projects",
+        r_project = ctx.post(
+            "/api/projects",
             headers=headers,
-            json=project_payload,
-            timeout=TIMEOUT
+            json=project_payload
         )
         r_project.raise_for_status()
         project_data = r_project.json()
@@ -143,11 +65,10 @@ def test_projects_management_lifecycle_and_kanban_board():
 
         # Advance Kanban board stage to "Shooting"
         kanban_update_payload = {"kanban_stage": "Shooting"}
-        r_update_kanban = requests.put(
-            f"{BASE_URL}/api/projects/{created_project_id}/kanban",
+        r_update_kanban = ctx.put(
+            f"/api/projects/{created_project_id}/kanban",
             headers=headers,
-            json=kanban_update_payload,
-            timeout=TIMEOUT
+            json=kanban_update_payload
         )
         r_update_kanban.raise_for_status()
         updated_kanban = r_update_kanban.json()
@@ -158,11 +79,10 @@ def test_projects_management_lifecycle_and_kanban_board():
         add_shooting_payload = {
             "shooting_dates": project_data["shooting_dates"] + [new_shooting_date]
         }
-        r_update_dates = requests.put(
-            f"{BASE_URL}/api/projects/{created_project_id}/dates",
+        r_update_dates = ctx.put(
+            f"/api/projects/{created_project_id}/dates",
             headers=headers,
-            json=add_shooting_payload,
-            timeout=TIMEOUT
+            json=add_shooting_payload
         )
         r_update_dates.raise_for_status()
         updated_dates = r_update_dates.json()
@@ -178,11 +98,10 @@ def test_projects_management_lifecycle_and_kanban_board():
                 }
             ]
         }
-        r_conflict = requests.post(
-            f"{BASE_URL}/api/equipments/{created_equipment_id}/bookings",
+        r_conflict = ctx.post(
+            f"/api/equipments/{created_equipment_id}/bookings",
             headers=headers,
-            json=conflicting_booking_payload["equipment_bookings"][0],
-            timeout=TIMEOUT
+            json=conflicting_booking_payload["equipment_bookings"][0]
         )
         # We expect a conflict error - either HTTP 409 Conflict or 400 with error message
         if r_conflict.status_code == 201 or r_conflict.status_code == 200:
@@ -196,36 +115,17 @@ def test_projects_management_lifecycle_and_kanban_board():
             assert "conflict" in msg.lower() or "overlap" in msg.lower()
 
         # Assign another freelancer with notification validation (simulate notification by checking response)
-        another_freelancer_payload = {
-            "name": "Test Freelancer 2 " + str(uuid.uuid4()),
-            "email": "freelance2@example.com",
-            "skills": ["Sound Engineering"],
-            "rates": {"hourly": 60},
-            "availability": [],
-            "ratings": 4.7,
-            "notes": "Automated test freelancer 2"
-        }
-        r_freelancer2 = requests.post(
-            f"{BASE_URL}/api/freelancers",
-            headers=headers,
-            json=another_freelancer_payload,
-            timeout=TIMEOUT
-        )
-        r_freelancer2.raise_for_status()
-        freelancer2_data = r_freelancer2.json()
-        freelancer2_id = freelancer2_data.get("id")
-        assert freelancer2_id, "Second freelancer creation failed"
+        freelancer2_id = ctx.fixture("freelancer_sound")["id"]
 
         # Allocate second freelancer to project
         allocation_payload = {
             "freelancer_id": freelancer2_id,
             "role": "Sound Engineer"
         }
-        r_allocate = requests.post(
-            f"{BASE_URL}/api/projects/{created_project_id}/team",
+        r_allocate = ctx.post(
+            f"/api/projects/{created_project_id}/team",
             headers=headers,
-            json=allocation_payload,
-            timeout=TIMEOUT
+            json=allocation_payload
         )
         r_allocate.raise_for_status()
         alloc_resp = r_allocate.json()
@@ -236,10 +136,9 @@ def test_projects_management_lifecycle_and_kanban_board():
             assert "freelancer assigned" in notif.get("message", "").lower()
 
         # Fetch Kanban board visualization for this project and assert stages present
-        r_kanban = requests.get(
-            f"{BASE_URL}/api/projects/{created_project_id}/kanban",
-            headers=headers,
-            timeout=TIMEOUT
+        r_kanban = ctx.get(
+            f"/api/projects/{created_project_id}/kanban",
+            headers=headers
         )
         r_kanban.raise_for_status()
         kanban_data = r_kanban.json()
@@ -248,52 +147,16 @@ def test_projects_management_lifecycle_and_kanban_board():
         assert any(stage.get("name") == "Lead" or stage.get("name") == "Shooting" for stage in kanban_data.get("stages"))
 
     finally:
-        # Cleanup created data in reverse order where dependency matters
+        # Só o projeto é deste cenário; as fixtures saem na limpeza em lote
         if created_project_id:
             try:
-                requests.delete(
-                    f"{BASE_URL}/api/projects/{created_project_id}",
-                    headers=headers,
-                    timeout=TIMEOUT
-                )
-            except Exception:
-                pass
-        if created_freelancer_id:
-            try:
-                requests.delete(
-                    f"{BASE_URL}/api/freelancers/{created_freelancer_id}",
-                    headers=headers,
-                    timeout=TIMEOUT
-                )
-            except Exception:
-                pass
-        # The second freelancer created during test also remove if present
-        try:
-            if 'freelancer2_id' in locals():
-                requests.delete(
-                    f"{BASE_URL}/api/freelancers/{freelancer2_id}",
-                    headers=headers,
-                    timeout=TIMEOUT
-                )
-        except Exception:
-            pass
-        if created_equipment_id:
-            try:
-                requests.delete(
-                    f"{BASE_URL}/api/equipments/{created_equipment_id}",
-                    headers=headers,
-                    timeout=TIMEOUT
-                )
-            except Exception:
-                pass
-        if created_client_id:
-            try:
-                requests.delete(
-                    f"{BASE_URL}/api/clients/{created_client_id}",
-                    headers=headers,
-                    timeout=TIMEOUT
+                ctx.delete(
+                    f"/api/projects/{created_project_id}",
+                    headers=headers
                 )
             except Exception:
                 pass
 
-test_projects_management_lifecycle_and_kanban_board()
\ No newline at end of file
+
+if __name__ == "__main__":
+    test_projects_management_lifecycle_and_kanban_board()
@@ -1,23 +1,18 @@
-import requests
-import uuid
-
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
-AUTH_TOKEN = "Bearer eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.fake-token-for-test"  # Replace with valid token if required
+from runner import current
 
+# Autenticação vem da sessão do contexto (login único da execução)
 headers = {
-    "Authorization": AUTH_TOKEN,
     "Content-Type": "application/json",
     "Accept": "application/json"
 }
 
-ORGANIZATION_ID = str(uuid.uuid4())  # Dummy organization ID for multi-tenancy scoping
-
 def test_proposals_builder_and_financial_integration():
+    ctx = current()
+
     # Helper function to create proposal with required data
     def create_proposal(client_id):
         proposal_payload = {
-            "title": "Test Proposal " + str(uuid.uuid4()),
+            "title": ctx.unique("Test Proposal"),
             "client_id": client_id,
             "items": [
                 {"description": "Video Production Service", "quantity": 1, "unit_price": 5000},
@@ -37,37 +32,17 @@ def test_proposals_builder_and_financial_integration():
         }
         return proposal_payload
 
-    # Helper to create a client needed for the proposal
-    client_payload = {
-        "name": "Test Client " + str(uuid.uuid4()),
-        "email": "client+" + str(uuid.uuid4())[:8] + "@example.com",
-        "company": "Test Company",
-        "notes": "Created for proposal builder test"
-    }
-
-    client_id = None
+    # Cliente da proposta: fixture compartilhada da execução
+    client_id = ctx.fixture("client")["id"]
     proposal_id = None
     try:
-        # Create client
-        client_resp = requests.post(
-            f"{BASE_URL}/api/clients",
-            json=client_payload,
-            headers=headers,
-            timeout=TIMEOUT
-        )
-        assert client_resp.status_code == 201, f"Client creation failed: {client_resp.text}"
-        client_data = client_resp.json()
-        client_id = client_data.get("id")
-        assert client_id is not None, "Client ID is missing in response"
-
         # Create proposal with the client_id
         proposal_payload = create_proposal(client_id)
 
-        proposal_resp = requests.post(
-            f"{BASE_URL}/api/proposals",
+        proposal_resp = ctx.post(
+            "/api/proposals",
             json=proposal_payload,
-            headers=headers,
-            timeout=TIMEOUT
+            headers=headers
         )
         assert proposal_resp.status_code == 201, f"Proposal creation failed: {proposal_resp.text}"
         proposal_data = proposal_resp.json()
@@ -76,10 +51,9 @@ def test_proposals_builder_and_financial_integration():
 
         # Verify proposal totals calculation & payment schedule validation
         # Fetch the proposal back to validate saved data & totals
-        get_proposal_resp = requests.get(
-            f"{BASE_URL}/api/proposals/{proposal_id}",
-            headers=headers,
-            timeout=TIMEOUT
+        get_proposal_resp = ctx.get(
+            f"/api/proposals/{proposal_id}",
+            headers=headers
         )
         assert get_proposal_resp.status_code == 200, f"Failed to fetch proposal: {get_proposal_resp.text}"
         fetched_proposal = get_proposal_resp.json()
@@ -103,45 +77,36 @@ def test_proposals_builder_and_financial_integration():
         assert (fetched_proposal.get("public_sharing") is True) and (public_token is not None), "Public sharing or token missing"
 
         # Simulate client accessing public sharing link and accepting proposal
-        public_proposal_resp = requests.get(
-            f"{BASE_URL}/api/proposals/public/{public_token}",
-            headers={"Accept": "application/json"},
-            timeout=TIMEOUT
+        public_proposal_resp = ctx.get(
+            f"/api/proposals/public/{public_token}",
+            headers={"Accept": "application/json"}
         )
         assert public_proposal_resp.status_code == 200, "Accessing public proposal link failed"
 
         # Accept the proposal (simulate client acceptance)
-        accept_resp = requests.post(
-            f"{BASE_URL}/api/proposals/{proposal_id}/accept",
-            headers=headers,
-            timeout=TIMEOUT
+        accept_resp = ctx.post(
+            f"/api/proposals/{proposal_id}/accept",
+            headers=headers
         )
         assert accept_resp.status_code == 200, f"Proposal acceptance failed: {accept_resp.text}"
 
         # Verify financial transaction created after acceptance
-        fin_tx_resp = requests.get(
-            f"{BASE_URL}/api/financeiro/transactions?proposal_id={proposal_id}",
-            headers=headers,
-            timeout=TIMEOUT
+        fin_tx_resp = ctx.get(
+            f"/api/financeiro/transactions?proposal_id={proposal_id}",
+            headers=headers
         )
         assert fin_tx_resp.status_code == 200, "Failed to fetch financial transactions"
         transactions = fin_tx_resp.json()
         assert isinstance(transactions, list) and len(transactions) > 0, "No financial transaction created upon proposal acceptance"
 
     finally:
-        # Cleanup: delete proposal and client if created
+        # Cleanup: delete proposal if created (o cliente sai na limpeza em lote)
         if proposal_id:
-            requests.delete(
-                f"{BASE_URL}/api/proposals/{proposal_id}",
-                headers=headers,
-                timeout=TIMEOUT
-            )
-        if client_id:
-            requests.delete(
-                f"{BASE_URL}/api/clients/{client_id}",
-                headers=headers,
-                timeout=TIMEOUT
+            ctx.delete(
+                f"/api/proposals/{proposal_id}",
+                headers=headers
             )
 
 
-test_proposals_builder_and_financial_integration()
\ No newline at end of file
+if __name__ == "__main__":
+    test_proposals_builder_and_financial_integration()
@@ -1,15 +1,11 @@
-import requests
-import uuid
+from runner import current
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
 HEADERS = {
     "Content-Type": "application/json",
-    # Add Authorization headers here if authentication is needed, e.g.
-    # "Authorization": "Bearer <token>",
 }
 
 def test_freelancers_management_and_payable_integration():
+    ctx = current()
     freelancer_id = None
     project_id = None
     financial_txn_id = None
@@ -17,8 +13,8 @@ def test_freelancers_management_and_payable_integration():
     try:
         # 1. Create a new freelancer with rating, custom rates, and availability calendar
         freelancer_payload = {
-            "name": "Test Freelancer " + str(uuid.uuid4()),
-            "email": f"freelancer_{uuid.uuid4().hex[:8]}@example.com",
+            "name": ctx.unique("Test Freelancer"),
+            "email": ctx.email("freelancer"),
             "rating": 4.5,
             "custom_rate": 150.0,
             "availability": [
@@ -28,7 +24,7 @@ def test_freelancers_management_and_payable_integration():
             ],
             "skills": ["Video Editing", "Color Grading"]
         }
-        resp = requests.post(f"{BASE_URL}/api/freelancers", json=freelancer_payload, headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.post("/api/freelancers", json=freelancer_payload, headers=HEADERS)
         assert resp.status_code == 201, f"Failed to create freelancer: {resp.text}"
         freelancer = resp.json()
         freelancer_id = freelancer.get("id")
@@ -39,14 +35,14 @@ def test_freelancers_management_and_payable_integration():
 
         # 2. Create a new project to allocate freelancer to
         project_payload = {
-            "name": "Test Project " + str(uuid.uuid4()),
+            "name": ctx.unique("Test Project"),
             "description": "Project to test freelancer allocation",
             "shooting_dates": ["2026-03-10", "2026-03-12"],
             "delivery_dates": ["2026-03-20"],
             "teams": [],
             "equipment_bookings": []
         }
-        resp = requests.post(f"{BASE_URL}/api/projects", json=project_payload, headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.post("/api/projects", json=project_payload, headers=HEADERS)
         assert resp.status_code == 201, f"Failed to create project: {resp.text}"
         project = resp.json()
         project_id = project.get("id")
@@ -59,7 +55,7 @@ def test_freelancers_management_and_payable_integration():
             "custom_rate": 160.0,
             "allocation_dates": ["2026-03-10", "2026-03-12"]
         }
-        resp = requests.post(f"{BASE_URL}/api/freelancer-allocations", json=allocation_payload, headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.post("/api/freelancer-allocations", json=allocation_payload, headers=HEADERS)
         assert resp.status_code == 201, f"Failed to allocate freelancer: {resp.text}"
         allocation = resp.json()
         allocation_id = allocation.get("id")
@@ -70,7 +66,7 @@ def test_freelancers_management_and_payable_integration():
 
         # 4. Check freelancer rating can be updated
         update_rating_payload = {"rating": 4.8}
-        resp = requests.put(f"{BASE_URL}/api/freelancers/{freelancer_id}", json=update_rating_payload, headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.put(f"/api/freelancers/{freelancer_id}", json=update_rating_payload, headers=HEADERS)
         assert resp.status_code == 200, f"Failed to update freelancer rating: {resp.text}"
         updated_freelancer = resp.json()
         assert abs(updated_freelancer["rating"] - 4.8) < 0.01
@@ -80,13 +76,13 @@ def test_freelancers_management_and_payable_integration():
             {"date": "2026-02-01", "available": False},
             {"date": "2026-02-02", "available": True}
         ]
-        resp = requests.patch(f"{BASE_URL}/api/freelancers/{freelancer_id}/availability", json=updated_availability, headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.patch(f"/api/freelancers/{freelancer_id}/availability", json=updated_availability, headers=HEADERS)
         assert resp.status_code == 200, f"Failed to update freelancer availability: {resp.text}"
         avail_resp = resp.json()
         assert any(d["available"] is False for d in avail_resp), "Availability update failed"
 
         # 6. Validate automatic payable financial transaction integration triggered by allocation
-        resp = requests.get(f"{BASE_URL}/api/financial-transactions?filter=freelancer_allocation_id:eq:{allocation_id}", headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.get(f"/api/financial-transactions?filter=freelancer_allocation_id:eq:{allocation_id}", headers=HEADERS)
         assert resp.status_code == 200, f"Failed to get financial transactions: {resp.text}"
         transactions = resp.json()
         assert isinstance(transactions, list), "Financial transactions response invalid"
@@ -96,7 +92,7 @@ def test_freelancers_management_and_payable_integration():
         assert abs(float(transactions[0]["amount"])) > 0
 
         # 7. Retrieve freelancer detail including ratings, custom rate, availability, allocations, and linked payables
-        resp = requests.get(f"{BASE_URL}/api/freelancers/{freelancer_id}?include=allocations,payables", headers=HEADERS, timeout=TIMEOUT)
+        resp = ctx.get(f"/api/freelancers/{freelancer_id}?include=allocations,payables", headers=HEADERS)
         assert resp.status_code == 200, f"Failed to retrieve freelancer details: {resp.text}"
         freelancer_detail = resp.json()
         assert "allocations" in freelancer_detail, "Allocations missing in freelancer detail"
@@ -107,11 +103,12 @@ def test_freelancers_management_and_payable_integration():
     finally:
         # Cleanup: Delete allocation, project, freelancer, and financial transaction if exist
         if financial_txn_id:
-            requests.delete(f"{BASE_URL}/api/financial-transactions/{financial_txn_id}", headers=HEADERS, timeout=TIMEOUT)
+            ctx.delete(f"/api/financial-transactions/{financial_txn_id}", headers=HEADERS)
         if project_id:
-            requests.delete(f"{BASE_URL}/api/projects/{project_id}", headers=HEADERS, timeout=TIMEOUT)
+            ctx.delete(f"/api/projects/{project_id}", headers=HEADERS)
         if freelancer_id:
-            requests.delete(f"{BASE_URL}/api/freelancers/{freelancer_id}", headers=HEADERS, timeout=TIMEOUT)
+            ctx.delete(f"/api/freelancers/{freelancer_id}", headers=HEADERS)
         # Assuming deletion of allocations is handled via freelancer or project cleanup or not allowed directly
 
-test_freelancers_management_and_payable_integration()
\ No newline at end of file
+if __name__ == "__main__":
+    test_freelancers_management_and_payable_integration()
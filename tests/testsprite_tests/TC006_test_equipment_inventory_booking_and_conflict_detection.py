@@ -1,24 +1,23 @@
-import requests
 from datetime import datetime, timedelta
 import uuid
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from runner import current
+
+# O token vem da sessão autenticada do contexto
 HEADERS = {
     "Content-Type": "application/json",
-    # Assuming Bearer token needed; replace 'your_token_here' with actual token if required.
-    "Authorization": "Bearer your_token_here"
 }
 
 
 def test_equipment_inventory_booking_and_conflict_detection():
+    ctx = current()
     equipment_id = None
     booking_id_1 = None
     booking_id_2 = None
     try:
         # Step 1: Create Equipment
         equipment_payload = {
-            "name": f"Test Camera {uuid.uuid4()}",
+            "name": ctx.unique("Test Camera"),
             "type": "Camera",
             "brand": "TestBrand",
             "model": "X1000",
@@ -28,11 +27,10 @@ def test_equipment_inventory_booking_and_conflict_detection():
             "status": "Available",
             "notes": "Automated test equipment"
         }
-        r = requests.post(
-            f"{BASE_URL}/api/equipments",
+        r = ctx.post(
+            "/api/equipments",
             json=equipment_payload,
-            headers=HEADERS,
-            timeout=TIMEOUT
+            headers=HEADERS
         )
         assert r.status_code == 201, f"Failed to create equipment: {r.text}"
         equipment = r.json()
@@ -54,11 +52,10 @@ def test_equipment_inventory_booking_and_conflict_detection():
             "end_date": booking_end_1.strftime("%Y-%m-%dT%H:%M:%S"),
             "purpose": "Video shoot test 1"
         }
-        r = requests.post(
-            f"{BASE_URL}/api/equipment-bookings",
+        r = ctx.post(
+            "/api/equipment-bookings",
             json=booking_payload_1,
-            headers=HEADERS,
-            timeout=TIMEOUT
+            headers=HEADERS
         )
         assert r.status_code == 201, f"Failed to create first booking: {r.text}"
         booking_1 = r.json()
@@ -73,11 +70,10 @@ def test_equipment_inventory_booking_and_conflict_detection():
             "end_date": booking_end_2.strftime("%Y-%m-%dT%H:%M:%S"),
             "purpose": "Video shoot test 2 - conflicting"
         }
-        r = requests.post(
-            f"{BASE_URL}/api/equipment-bookings",
+        r = ctx.post(
+            "/api/equipment-bookings",
             json=booking_payload_2,
-            headers=HEADERS,
-            timeout=TIMEOUT
+            headers=HEADERS
         )
         # Expecting a conflict error code, usually 409 Conflict or 400 with conflict message
         assert r.status_code in (400, 409), "Double booking conflict was not detected"
@@ -89,10 +85,9 @@ def test_equipment_inventory_booking_and_conflict_detection():
         assert conflict_detected, f"Conflict message not detected in response: {r.text}"
 
         # Step 4: Check maintenance tracking for equipment
-        r = requests.get(
-            f"{BASE_URL}/api/equipments/{equipment_id}",
-            headers=HEADERS,
-            timeout=TIMEOUT
+        r = ctx.get(
+            f"/api/equipments/{equipment_id}",
+            headers=HEADERS
         )
         assert r.status_code == 200, f"Failed to retrieve equipment for maintenance check: {r.text}"
         equipment_details = r.json()
@@ -103,10 +98,9 @@ def test_equipment_inventory_booking_and_conflict_detection():
 
         # Step 5: ROI analysis and calendar availability visualization endpoint check
         # Assume endpoint /api/equipments/{id}/roi returns ROI and availability data
-        r = requests.get(
-            f"{BASE_URL}/api/equipments/{equipment_id}/roi",
-            headers=HEADERS,
-            timeout=TIMEOUT
+        r = ctx.get(
+            f"/api/equipments/{equipment_id}/roi",
+            headers=HEADERS
         )
         assert r.status_code == 200, f"Failed to retrieve ROI and availability data: {r.text}"
         roi_data = r.json()
@@ -131,31 +125,30 @@ def test_equipment_inventory_booking_and_conflict_detection():
         # Cleanup created bookings
         if booking_id_1:
             try:
-                r = requests.delete(
-                    f"{BASE_URL}/api/equipment-bookings/{booking_id_1}",
-                    headers=HEADERS,
-                    timeout=TIMEOUT
+                r = ctx.delete(
+                    f"/api/equipment-bookings/{booking_id_1}",
+                    headers=HEADERS
                 )
             except Exception:
                 pass
         if booking_id_2:
             try:
-                requests.delete(
-                    f"{BASE_URL}/api/equipment-bookings/{booking_id_2}",
-                    headers=HEADERS,
-                    timeout=TIMEOUT
+                ctx.delete(
+                    f"/api/equipment-bookings/{booking_id_2}",
+                    headers=HEADERS
                 )
             except Exception:
                 pass
         # Cleanup created equipment
         if equipment_id:
             try:
-                r = requests.delete(
-                    f"{BASE_URL}/api/equipments/{equipment_id}",
-                    headers=HEADERS,
-                    timeout=TIMEOUT
+                r = ctx.delete(
+                    f"/api/equipments/{equipment_id}",
+                    headers=HEADERS
                 )
             except Exception:
                 pass
 
-test_equipment_inventory_booking_and_conflict_detection()
+if __name__ == "__main__":
+    test_equipment_inventory_booking_and_conflict_detection()
+
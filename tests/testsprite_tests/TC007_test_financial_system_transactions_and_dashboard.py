@@ -1,24 +1,20 @@
-import requests
-
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
-AUTH_TOKEN = None  # Set this to a valid token if authentication is required
+from runner import current
 
 
 def get_headers():
+    # Authorization já vai na sessão do contexto
     headers = {
         "Content-Type": "application/json",
     }
-    if AUTH_TOKEN:
-        headers["Authorization"] = f"Bearer {AUTH_TOKEN}"
     return headers
 
 
 def create_proposal():
-    url = f"{BASE_URL}/proposals"
+    ctx = current()
+    url = "/proposals"
     payload = {
-        "title": "Test Proposal for Financial System",
-        "clientId": 1,
+        "title": ctx.unique("Test Proposal for Financial System"),
+        "clientId": ctx.fixture("client")["id"],
         "items": [
             {"description": "Video Editing", "quantity": 1, "unitPrice": 1000},
             {"description": "Sound Mixing", "quantity": 1, "unitPrice": 500}
@@ -33,75 +29,66 @@ def create_proposal():
         "portfolioVideos": ["https://portfolio.example.com/video1"],
         "status": "draft"
     }
-    resp = requests.post(url, json=payload, headers=get_headers(), timeout=TIMEOUT)
+    resp = ctx.post(url, json=payload, headers=get_headers())
     resp.raise_for_status()
     return resp.json()["id"]
 
 
 def accept_proposal(proposal_id):
-    url = f"{BASE_URL}/proposals/{proposal_id}/accept"
-    resp = requests.post(url, headers=get_headers(), timeout=TIMEOUT)
+    url = f"/proposals/{proposal_id}/accept"
+    resp = current().post(url, headers=get_headers())
     resp.raise_for_status()
     return resp.json()
 
 
 def create_freelancer():
-    url = f"{BASE_URL}/freelancers"
-    payload = {
-        "name": "Test Freelancer",
-        "email": "freelancer@example.com",
-        "rate": 100,
-        "availability": ["2026-02-01", "2026-02-15"],
-        "rating": 4.5
-    }
-    resp = requests.post(url, json=payload, headers=get_headers(), timeout=TIMEOUT)
-    resp.raise_for_status()
-    return resp.json()["id"]
+    # Pré-requisito da alocação: fixture compartilhada da execução
+    return current().fixture("freelancer")["id"]
 
 
 def allocate_freelancer(proposal_id, freelancer_id):
-    url = f"{BASE_URL}/freelancer_allocations"
+    url = "/freelancer_allocations"
     payload = {
         "proposalId": proposal_id,
         "freelancerId": freelancer_id,
         "rate": 100
     }
-    resp = requests.post(url, json=payload, headers=get_headers(), timeout=TIMEOUT)
+    resp = current().post(url, json=payload, headers=get_headers())
     resp.raise_for_status()
     return resp.json()["id"]
 
 
 def get_transactions():
-    url = f"{BASE_URL}/financial/transactions"
-    resp = requests.get(url, headers=get_headers(), timeout=TIMEOUT)
+    url = "/financial/transactions"
+    resp = current().get(url, headers=get_headers())
     resp.raise_for_status()
     return resp.json()
 
 
 def get_accounts_receivable():
-    url = f"{BASE_URL}/financial/accounts_receivable"
-    resp = requests.get(url, headers=get_headers(), timeout=TIMEOUT)
+    url = "/financial/accounts_receivable"
+    resp = current().get(url, headers=get_headers())
     resp.raise_for_status()
     return resp.json()
 
 
 def get_accounts_payable():
-    url = f"{BASE_URL}/financial/accounts_payable"
-    resp = requests.get(url, headers=get_headers(), timeout=TIMEOUT)
+    url = "/financial/accounts_payable"
+    resp = current().get(url, headers=get_headers())
     resp.raise_for_status()
     return resp.json()
 
 
 def get_cashflow_dashboard():
-    url = f"{BASE_URL}/financial/cashflow_dashboard"
-    resp = requests.get(url, headers=get_headers(), timeout=TIMEOUT)
+    url = "/financial/cashflow_dashboard"
+    resp = current().get(url, headers=get_headers())
     resp.raise_for_status()
     return resp.json()
 
 
 def delete_resource(endpoint, resource_id):
-    url = f"{BASE_URL}/{endpoint}/{resource_id}"
-    resp = requests.delete(url, headers=get_headers(), timeout=TIMEOUT)
+    url = f"/{endpoint}/{resource_id}"
+    resp = current().delete(url, headers=get_headers())
     # It's okay if deletion fails in cleanup, so no raise_for_status here
 
 
@@ -140,10 +127,10 @@ def test_financial_system_transactions_and_dashboard():
         # Cleanup resources
         if 'allocation_id' in locals():
             delete_resource("freelancer_allocations", allocation_id)
-        if 'freelancer_id' in locals():
-            delete_resource("freelancers", freelancer_id)
         if 'proposal_id' in locals():
             delete_resource("proposals", proposal_id)
 
 
-test_financial_system_transactions_and_dashboard()
+if __name__ == "__main__":
+    test_financial_system_transactions_and_dashboard()
+
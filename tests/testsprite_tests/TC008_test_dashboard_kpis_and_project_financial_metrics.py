@@ -1,15 +1,15 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from runner import current
 
 def test_dashboard_kpis_and_project_financial_metrics():
-    url = f"{BASE_URL}/dashboard"
+    ctx = current()
+    url = "/dashboard"
     headers = {
         "Accept": "application/json"
     }
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = ctx.get(url, headers=headers)
         response.raise_for_status()
     except requests.RequestException as e:
         assert False, f"Request to dashboard endpoint failed: {e}"
@@ -67,4 +67,6 @@ def test_dashboard_kpis_and_project_financial_metrics():
         assert metric in financial_metrics, f"Missing financial metric: {metric}"
         assert isinstance(financial_metrics[metric], (int, float)), f"Financial metric {metric} should be a number"
 
-test_dashboard_kpis_and_project_financial_metrics()
+
+if __name__ == "__main__":
+    test_dashboard_kpis_and_project_financial_metrics()
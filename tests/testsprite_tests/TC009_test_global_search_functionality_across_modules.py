@@ -1,13 +1,13 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from runner import current
 
 def test_global_search_functionality_across_modules():
     """
     Test the unified global search feature to ensure it covers all modules and provides quick navigation results
     relevant to the search queries.
     """
+    ctx = current()
     search_queries = [
         "client",       # Expect to find clients
         "project",      # Expect to find projects
@@ -24,11 +24,10 @@ def test_global_search_functionality_across_modules():
 
     for query in search_queries:
         try:
-            response = requests.get(
-                f"{BASE_URL}/api/search",
+            response = ctx.get(
+                "/api/search",
                 params={"q": query},
-                headers=headers,
-                timeout=TIMEOUT
+                headers=headers
             )
             response.raise_for_status()
             data = response.json()
@@ -67,4 +66,5 @@ def test_global_search_functionality_across_modules():
             assert False, f"HTTP request failed for query '{query}': {e}"
 
 
-test_global_search_functionality_across_modules()
\ No newline at end of file
+if __name__ == "__main__":
+    test_global_search_functionality_across_modules()
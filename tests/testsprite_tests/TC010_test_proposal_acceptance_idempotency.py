@@ -0,0 +1,118 @@
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from runner import current
+
+SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "http://127.0.0.1:54321")
+ANON_KEY = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", "")
+SERVICE_ROLE_KEY = os.environ.get("SUPABASE_SERVICE_ROLE_KEY", "")
+TIMEOUT = 30
+PARALLEL_ACCEPTS = 8
+
+service_headers = {
+    "apikey": SERVICE_ROLE_KEY,
+    "Authorization": f"Bearer {SERVICE_ROLE_KEY}",
+    "Content-Type": "application/json",
+    "Prefer": "return=representation",
+}
+
+anon_headers = {
+    "apikey": ANON_KEY,
+    "Authorization": f"Bearer {ANON_KEY}",
+    "Content-Type": "application/json",
+}
+
+
+def rest(method, table, **kwargs):
+    # Sessão do contexto (pool de conexões); os headers do Supabase substituem o Authorization dela
+    response = current().session.request(method, f"{SUPABASE_URL}/rest/v1/{table}", headers=service_headers,
+                                         timeout=TIMEOUT, **kwargs)
+    assert response.status_code in (200, 201, 204), f"{method} {table} failed: {response.text}"
+    return response.json() if response.text else None
+
+
+def test_proposal_acceptance_is_idempotent_under_concurrency():
+    suffix = uuid.uuid4().hex[:12]
+    organization_id = f"tc010_org_{suffix}"
+    client_id = f"tc010_cli_{suffix}"
+    proposal_id = f"tc010_prp_{suffix}"
+    token = f"tc010{suffix}"
+    now = datetime.now(timezone.utc)
+
+    try:
+        rest("POST", "organizations", json={"id": organization_id, "name": "TC010 Org", "slug": organization_id})
+        rest("POST", "clients", json={"id": client_id, "name": "TC010 Client", "organization_id": organization_id})
+        rest("POST", "proposals", json={
+            "id": proposal_id,
+            "token": token,
+            "title": "TC010 Proposal",
+            "client_id": client_id,
+            "organization_id": organization_id,
+            "status": "SENT",
+            "base_value": 7000,
+            "total_value": 7000,
+            "valid_until": (now + timedelta(days=30)).isoformat(),
+        })
+        rest("POST", "proposal_items", json=[
+            {"id": f"{proposal_id}_i1", "proposal_id": proposal_id, "description": "Diária de gravação",
+             "quantity": 1, "unit_price": 5000, "total": 5000, "order": 1,
+             "recording_date": (now + timedelta(days=10)).isoformat()},
+            {"id": f"{proposal_id}_i2", "proposal_id": proposal_id, "description": "Edição",
+             "quantity": 1, "unit_price": 2000, "total": 2000, "order": 2,
+             "delivery_date": (now + timedelta(days=20)).isoformat()},
+        ])
+        rest("POST", "payment_schedule", json=[
+            {"id": f"{proposal_id}_p1", "proposal_id": proposal_id, "description": "Entrada (50%)",
+             "amount": 3500, "percentage": 50, "order": 1, "due_date": now.isoformat()},
+            {"id": f"{proposal_id}_p2", "proposal_id": proposal_id, "description": "Entrega (50%)",
+             "amount": 3500, "percentage": 50, "order": 2, "due_date": (now + timedelta(days=30)).isoformat()},
+        ])
+
+        # Todos os aceites saem juntos (duplo clique / retries simultâneos)
+        barrier = threading.Barrier(PARALLEL_ACCEPTS)
+
+        def accept(_):
+            barrier.wait()
+            return current().session.post(f"{SUPABASE_URL}/rest/v1/rpc/accept_proposal_v2", json={"p_token": token},
+                                          headers=anon_headers, timeout=TIMEOUT)
+
+        with ThreadPoolExecutor(max_workers=PARALLEL_ACCEPTS) as pool:
+            responses = list(pool.map(accept, range(PARALLEL_ACCEPTS)))
+
+        for response in responses:
+            assert response.status_code == 200, f"Acceptance failed: {response.text}"
+        results = [response.json() for response in responses]
+
+        # Exatamente um aceite criou os registros; os demais devolvem os mesmos ids
+        assert sum(1 for r in results if not r["already_accepted"]) == 1, "More than one acceptance created data"
+        assert len({r["project_id"] for r in results}) == 1, "Different project ids returned"
+        assert len({tuple(r["transaction_ids"]) for r in results}) == 1, "Different transaction ids returned"
+        assert len({tuple(r["calendar_event_ids"]) for r in results}) == 1, "Different calendar event ids returned"
+
+        first = results[0]
+        assert first["project_id"], "Project id missing"
+        assert len(first["project_item_ids"]) == 2, "Project items not copied"
+        assert len(first["transaction_ids"]) == 2, "Receivables not generated from the payment schedule"
+        assert len(first["calendar_event_ids"]) == 2, "Recording/delivery events not created"
+
+        projects = rest("GET", "projects", params={"proposal_id": f"eq.{proposal_id}", "select": "id"})
+        assert len(projects) == 1, f"Expected 1 project, found {len(projects)}"
+
+        transactions = rest("GET", "financial_transactions",
+                            params={"proposal_id": f"eq.{proposal_id}", "select": "id"})
+        assert len(transactions) == 2, f"Expected 2 receivables, found {len(transactions)}"
+
+        proposal = rest("GET", "proposals", params={"id": f"eq.{proposal_id}", "select": "status"})
+        assert proposal[0]["status"] == "ACCEPTED", "Proposal status not updated"
+
+    finally:
+        # Filhos caem em cascata a partir da organização
+        current().session.delete(f"{SUPABASE_URL}/rest/v1/organizations", params={"id": f"eq.{organization_id}"},
+                                 headers=service_headers, timeout=TIMEOUT)
+
+
+if __name__ == "__main__":
+    test_proposal_acceptance_is_idempotent_under_concurrency()
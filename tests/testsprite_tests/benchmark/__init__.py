@@ -0,0 +1,21 @@
+"""Benchmark suite for the CRM hot paths.
+
+Drives the /api/bench/<target> routes (enabled with BENCHMARK_ROUTES=1) for
+getDashboardStats, getProjectsForKanban, getCalendarEvents, /api/search,
+getProposalByToken, getCashFlowData, the equipment ROI reports and
+toggleProjectItemStatus against a dataset loaded by the seed package, recording
+wall time, database round trips and transferred bytes. Results are JSON
+baselines; a run fails when any target regresses beyond the configured
+percentage. Targets that also have a direct-Postgres implementation can be
+measured on both data paths side by side with --data-path both.
+
+Usage (from tests/testsprite_tests):
+    python -m seed --profile medium --dsn "$DATABASE_URL" --reset --auth-password BenchPass123!
+    python -m benchmark --profile medium --out benchmark/baselines/medium.json
+    python -m benchmark --profile medium --baseline benchmark/baselines/medium.json --max-regression 15
+    python -m benchmark --profile medium --data-path both --target cashflow --target roi
+"""
+
+from .suite import TARGETS, BenchConfig, BenchRunner, compare_paths, compare_results
+
+__all__ = ["TARGETS", "BenchConfig", "BenchRunner", "compare_paths", "compare_results"]
@@ -0,0 +1,88 @@
+import argparse
+import json
+import sys
+
+from seed import PROFILES
+
+from .suite import DATA_PATHS, TARGETS, BenchConfig, BenchRunner, compare_paths, compare_results, write_results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="benchmark", description="Benchmark dos hot paths do CRM")
+    parser.add_argument("--base-url", default=BenchConfig.base_url)
+    parser.add_argument("--profile", choices=list(PROFILES), default="small",
+                        help="perfil carregado com python -m seed")
+    parser.add_argument("--seed", type=int, default=42, help="seed usada na carga")
+    parser.add_argument("--iterations", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--warm-cache", action="store_true",
+                        help="mede com o data cache aquecido (padrão: cache descartado a cada execução)")
+    parser.add_argument("--target", action="append", default=[],
+                        choices=[t.name for t in TARGETS], help="restringe aos alvos informados")
+    parser.add_argument("--data-path", choices=[*DATA_PATHS, "both"], default="rest",
+                        help="PostgREST, conexão direta ao Postgres ou os dois lado a lado "
+                             "(direct exige DATA_PATH_DATABASE_URL no app)")
+    parser.add_argument("--out", help="arquivo JSON dos resultados (padrão: benchmark_<perfil>.json)")
+    parser.add_argument("--baseline", help="resultado anterior para comparação")
+    parser.add_argument("--max-regression", type=float, default=15.0,
+                        help="aumento máximo (%%) de latência p50 e bytes antes de falhar")
+    return parser.parse_args(argv)
+
+
+def print_summary(results):
+    print(f"{'alvo':<20}{'p50':>9}{'p95':>9}{'db p50':>9}{'trips':>7}{'linhas':>9}{'KB db':>9}{'KB resp':>9}")
+    for name, t in results["targets"].items():
+        print(f"{name:<20}{t['p50_ms']:>9.1f}{t['p95_ms']:>9.1f}{t['db_ms_p50']:>9.1f}{t['round_trips']:>7}"
+              f"{t['rows']:>9}{t['bytes'] / 1024:>9.1f}{t['payload_bytes'] / 1024:>9.1f}")
+        for warning in t["warnings"]:
+            print(f"    ! {warning}")
+
+    paths = results.get("path_comparison")
+    if paths:
+        print(f"\n{'REST x direto':<20}{'p50 rest':>10}{'p50 dir':>10}{'ganho':>8}{'trips':>10}{'KB db':>14}")
+        for row in paths:
+            speedup = f"{row['speedup']:.2f}x" if row["speedup"] else "-"
+            print(f"{row['target']:<20}{row['rest_p50_ms']:>10.1f}{row['direct_p50_ms']:>10.1f}{speedup:>8}"
+                  f"{row['rest_round_trips']:>5}/{row['direct_round_trips']:<4}"
+                  f"{row['rest_bytes'] / 1024:>8.1f}/{row['direct_bytes'] / 1024:<5.1f}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = BenchConfig(
+        base_url=args.base_url.rstrip("/"),
+        profile=args.profile,
+        seed=args.seed,
+        iterations=args.iterations,
+        warmup=args.warmup,
+        timeout=args.timeout,
+        cold=not args.warm_cache,
+        targets=args.target,
+        data_path=args.data_path,
+    )
+    results = BenchRunner(config).run()
+    results["path_comparison"] = compare_paths(results)
+    print_summary(results)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare_results(results, baseline, args.max_regression)
+        results["regressions"] = regressions
+
+    out = args.out or f"benchmark_{args.profile}.json"
+    write_results(results, out)
+    print(f"Resultados salvos em {out}")
+
+    if regressions:
+        print("\nRegressões em relação ao baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,205 @@
+import json
+import os
+import platform
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import requests
+
+from loadtest.harness import BASE_URL, percentile, supabase_session_cookies
+from seed import Dataset, SeedConfig
+from seed.dataset import seed_id
+
+BENCH_PASSWORD = os.environ.get("BENCHMARK_PASSWORD", "BenchPass123!")
+
+# Caminhos de dados do /api/bench (?path=): PostgREST ou conexão direta ao Postgres
+DATA_PATHS = ("rest", "direct")
+
+# Métricas comparadas com o baseline: (campo, tolerância mínima absoluta)
+COMPARED_METRICS = [("p50_ms", 5.0), ("round_trips", 0), ("bytes", 1024), ("payload_bytes", 1024)]
+
+
+@dataclass
+class BenchConfig:
+    base_url: str = BASE_URL
+    profile: str = "small"
+    seed: int = 42
+    iterations: int = 10
+    warmup: int = 2
+    timeout: float = 60.0
+    cold: bool = True  # descarta o data cache antes de cada execução
+    targets: list = field(default_factory=list)  # vazio = todos
+    data_path: str = "rest"  # rest | direct | both
+
+
+@dataclass
+class Target:
+    name: str
+    # Monta a query string a partir do dataset seed (datas e tokens determinísticos)
+    params: object = None
+    # Tem implementação pela conexão direta (DATA_PATH_DATABASE_URL no app)
+    direct: bool = False
+
+
+def month_window(dataset, before, after):
+    anchor = dataset.config.anchor
+    return {"start": (anchor - timedelta(days=before)).isoformat(),
+            "end": (anchor + timedelta(days=after)).isoformat()}
+
+
+TARGETS = [
+    Target("dashboard", lambda d: month_window(d, 180, 0)),
+    Target("kanban"),
+    Target("calendar", lambda d: month_window(d, 30, 60)),
+    Target("search", lambda d: {"q": "Silva"}),
+    # Primeira proposta da maior organização
+    Target("proposal", lambda d: {"token": d.proposal_token(0)}),
+    Target("cashflow", lambda d: month_window(d, 365, 0), direct=True),
+    Target("roi", direct=True),
+    # Regrava o status atual do primeiro item do primeiro projeto: escrita sem mudar o dataset
+    Target("item-status", lambda d: {"item": d.project_item_id(0, 0), "project": seed_id("prj", 0),
+                                     "status": "DONE" if d.project_status(0) == "DONE" else "PENDING"},
+           direct=True),
+]
+
+
+def summarize(samples):
+    """Estatísticas de uma série de respostas do /api/bench/<target>."""
+    walls = sorted(s["client_ms"] for s in samples)
+    server = sorted(s["wallMs"] for s in samples)
+    last = samples[-1]
+    return {
+        "iterations": len(samples),
+        "p50_ms": round(percentile(walls, 50), 2),
+        "p95_ms": round(percentile(walls, 95), 2),
+        "mean_ms": round(sum(walls) / len(walls), 2),
+        "server_p50_ms": round(percentile(server, 50), 2),
+        "db_ms_p50": round(percentile(sorted(s["dbMs"] for s in samples), 50), 2),
+        # Round trips e bytes são determinísticos para o mesmo dataset: vale a última execução
+        "round_trips": last["roundTrips"],
+        "rows": last["rows"],
+        "bytes": last["bytes"],
+        "payload_bytes": last["payloadBytes"],
+        "errors": sum(s["errors"] for s in samples),
+        "warnings": last["warnings"],
+        "breakdown": last["breakdown"],
+    }
+
+
+class BenchRunner:
+    def __init__(self, config):
+        self.config = config
+        self.dataset = Dataset(SeedConfig.from_profile(config.profile, seed=config.seed))
+        self.session = requests.Session()
+        self.paths = list(DATA_PATHS) if config.data_path == "both" else [config.data_path]
+        self.targets = [t for t in TARGETS if (not config.targets or t.name in config.targets)
+                        and (t.direct or "rest" in self.paths)]
+        if not self.targets:
+            raise ValueError("Nenhum alvo selecionado")
+
+    def authenticate(self):
+        email = self.dataset.admin_email(0)
+        self.session.cookies.update(supabase_session_cookies(email, BENCH_PASSWORD, self.config.timeout))
+        return email
+
+    def call(self, target, path="rest"):
+        params = dict(target.params(self.dataset)) if target.params else {}
+        if self.config.cold:
+            params["cold"] = "1"
+        params["path"] = path
+        url = f"{self.config.base_url}/api/bench/{target.name}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        started = time.perf_counter()
+        response = self.session.get(url, timeout=self.config.timeout)
+        client_ms = (time.perf_counter() - started) * 1000
+        if response.status_code == 404 and "Not found" in response.text:
+            raise RuntimeError("Rotas de benchmark desligadas: inicie o app com BENCHMARK_ROUTES=1")
+        if response.status_code == 400 and path == "direct":
+            raise RuntimeError("Conexão direta indisponível: configure DATA_PATH_DATABASE_URL no app")
+        response.raise_for_status()
+        sample = response.json()
+        sample["client_ms"] = client_ms
+        return sample
+
+    def run(self):
+        email = self.authenticate()
+        results = {}
+        for target in self.targets:
+            for path in self.paths:
+                if path == "direct" and not target.direct:
+                    continue
+                for _ in range(self.config.warmup):
+                    self.call(target, path)
+                samples = [self.call(target, path) for _ in range(self.config.iterations)]
+                results[result_key(target.name, path)] = summarize(samples)
+        return {
+            "profile": self.config.profile,
+            "dataset": self.dataset.config.to_dict(),
+            "user": email,
+            "config": {"base_url": self.config.base_url, "iterations": self.config.iterations,
+                       "warmup": self.config.warmup, "cold": self.config.cold,
+                       "data_path": self.config.data_path},
+            "machine": {"python": platform.python_version(), "platform": platform.platform()},
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "targets": results,
+        }
+
+
+def result_key(name, path):
+    """Chave do alvo nos resultados: o caminho REST mantém o nome (baselines antigos continuam válidos)."""
+    return name if path == "rest" else f"{name}@{path}"
+
+
+def compare_paths(results):
+    """Lado a lado REST x conexão direta para os alvos medidos nos dois caminhos."""
+    targets = results.get("targets", {})
+    rows = []
+    for name, rest in targets.items():
+        direct = targets.get(result_key(name, "direct"))
+        if "@" in name or not direct:
+            continue
+        rows.append({
+            "target": name,
+            "rest_p50_ms": rest["p50_ms"],
+            "direct_p50_ms": direct["p50_ms"],
+            "speedup": round(rest["p50_ms"] / direct["p50_ms"], 2) if direct["p50_ms"] else None,
+            "rest_round_trips": rest["round_trips"],
+            "direct_round_trips": direct["round_trips"],
+            "rest_bytes": rest["bytes"],
+            "direct_bytes": direct["bytes"],
+        })
+    return rows
+
+
+def compare_results(current, baseline, max_regression_pct=15.0):
+    """Compare each target's latency, round trips and bytes against a baseline.
+
+    A metric regresses when it grows more than ``max_regression_pct`` percent
+    and more than its absolute floor (so 2ms -> 3ms is not flagged). Round
+    trips have no floor: any extra query is a regression. Returns a list of
+    human-readable regressions (empty when within thresholds).
+    """
+    regressions = []
+    if baseline.get("profile") != current.get("profile"):
+        return [f"baseline do perfil {baseline.get('profile')} comparado com {current.get('profile')}"]
+    for name, base in baseline.get("targets", {}).items():
+        cur = current.get("targets", {}).get(name)
+        if not cur:
+            continue
+        for metric, floor in COMPARED_METRICS:
+            before, after = base[metric], cur[metric]
+            if after - before <= floor:
+                continue
+            change = (after - before) / before * 100 if before else float("inf")
+            if metric == "round_trips" or change > max_regression_pct:
+                regressions.append(f"{name}: {metric} {before} -> {after} (+{change:.1f}%)")
+    return regressions
+
+
+def write_results(results, path):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(results, fh, indent=2, sort_keys=True)
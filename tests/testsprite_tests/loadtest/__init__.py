@@ -0,0 +1,15 @@
+"""Load-testing harness built on the testsprite scenarios (TC001-TC009).
+
+Runs weighted user scenarios on a thread pool that shares one pooled HTTP
+connection pool and a single Supabase login (the run aborts if it fails),
+and reports per-endpoint p50/p95/p99 latency and error rate as JSON.
+
+Usage (from tests/testsprite_tests):
+    python -m loadtest --users 20 --duration 60 --out load_report.json
+    python -m loadtest --baseline load_report.json --max-regression 20
+"""
+
+from .harness import AuthenticationFailed, LoadConfig, LoadRunner, Stats, compare_reports
+from .scenarios import SCENARIOS, scenario
+
+__all__ = ["AuthenticationFailed", "LoadConfig", "LoadRunner", "Stats", "compare_reports", "SCENARIOS", "scenario"]
@@ -0,0 +1,77 @@
+import argparse
+import json
+import sys
+
+from .harness import AuthenticationFailed, LoadConfig, LoadRunner, compare_reports, write_report
+from .scenarios import SCENARIOS
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="loadtest", description="Teste de carga dos fluxos testsprite")
+    parser.add_argument("--base-url", default=LoadConfig.base_url)
+    parser.add_argument("--users", type=int, default=10, help="usuários virtuais simultâneos")
+    parser.add_argument("--duration", type=float, default=30.0, help="duração em segundos")
+    parser.add_argument("--spawn-rate", type=float, default=5.0, help="usuários iniciados por segundo")
+    parser.add_argument("--timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--scenario", action="append", default=[],
+                        choices=[s.name for s in SCENARIOS], help="restringe aos cenários informados")
+    parser.add_argument("--out", default="load_report.json", help="arquivo JSON do relatório")
+    parser.add_argument("--baseline", help="relatório anterior para comparação")
+    parser.add_argument("--max-regression", type=float, default=20.0,
+                        help="aumento máximo de p95 (%%) antes de falhar")
+    parser.add_argument("--max-error-increase", type=float, default=0.01,
+                        help="aumento máximo absoluto da taxa de erro")
+    parser.add_argument("--min-requests", type=int, default=20,
+                        help="amostras mínimas por endpoint para entrar na comparação")
+    return parser.parse_args(argv)
+
+
+def print_summary(report):
+    print(f"{'endpoint':<48}{'reqs':>7}{'err%':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, e in report["endpoints"].items():
+        print(f"{name:<48}{e['requests']:>7}{e['error_rate'] * 100:>7.1f}%"
+              f"{e['p50_ms']:>9.1f}{e['p95_ms']:>9.1f}{e['p99_ms']:>9.1f}")
+    print(f"\nTotal: {report['total_requests']} reqs, {report['rps']} req/s, "
+          f"erro {report['error_rate']:.2%}")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = LoadConfig(
+        base_url=args.base_url.rstrip("/"),
+        users=args.users,
+        duration=args.duration,
+        spawn_rate=args.spawn_rate,
+        timeout=args.timeout,
+        seed=args.seed,
+        scenarios=args.scenario,
+    )
+    try:
+        report = LoadRunner(config, SCENARIOS).run()
+    except AuthenticationFailed as error:
+        print(f"Execução abortada, login falhou: {error}", file=sys.stderr)
+        return 2
+    print_summary(report)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare_reports(report, baseline, args.max_regression,
+                                      args.max_error_increase, args.min_requests)
+        report["regressions"] = regressions
+
+    write_report(report, args.out)
+    print(f"Relatório salvo em {args.out}")
+
+    if regressions:
+        print("\nRegressões em relação ao baseline:")
+        for line in regressions:
+            print(f"  - {line}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
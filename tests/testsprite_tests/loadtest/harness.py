@@ -0,0 +1,305 @@
+import base64
+import json
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3000")
+AUTH_EMAIL = os.environ.get("TESTSPRITE_AUTH_EMAIL", "testuser@example.com")
+AUTH_PASSWORD = os.environ.get("TESTSPRITE_AUTH_PASSWORD", "TestPass123!")
+SUPABASE_URL = os.environ.get("NEXT_PUBLIC_SUPABASE_URL", "http://127.0.0.1:54321")
+SUPABASE_ANON_KEY = os.environ.get("NEXT_PUBLIC_SUPABASE_ANON_KEY", "")
+
+# Tamanho máximo de cada cookie do @supabase/ssr antes de dividir em .0, .1, ...
+COOKIE_CHUNK_SIZE = 3180
+
+# Importação em dryRun: exige sessão (401 sem ela) e não grava nada
+AUTH_PROBE_PATH = "/api/import/clients?dryRun=1"
+
+ID_SEGMENT = re.compile(r"/([0-9a-f]{8}-[0-9a-f-]{27,}|c[a-z0-9]{20,}|\d+)(?=/|$)", re.IGNORECASE)
+
+
+@dataclass
+class LoadConfig:
+    base_url: str = BASE_URL
+    users: int = 10
+    duration: float = 30.0
+    spawn_rate: float = 5.0  # usuários iniciados por segundo
+    timeout: float = 10.0
+    think_time: tuple = (0.1, 0.5)
+    seed: int = 42
+    scenarios: list = field(default_factory=list)  # vazio = todos
+
+
+def supabase_session_cookies(email, password, timeout=10.0):
+    """Login no GoTrue e cookies no formato do @supabase/ssr (base64url + chunks)."""
+    response = requests.post(
+        f"{SUPABASE_URL}/auth/v1/token?grant_type=password",
+        json={"email": email, "password": password},
+        headers={"apikey": SUPABASE_ANON_KEY},
+        timeout=timeout,
+    )
+    response.raise_for_status()
+    session = response.json()
+    session.setdefault("expires_at", int(time.time()) + int(session.get("expires_in", 3600)))
+
+    ref = urlparse(SUPABASE_URL).hostname.split(".")[0]
+    name = f"sb-{ref}-auth-token"
+    encoded = base64.urlsafe_b64encode(json.dumps(session).encode()).decode().rstrip("=")
+    value = f"base64-{encoded}"
+    if len(value) <= COOKIE_CHUNK_SIZE:
+        return {name: value}
+    chunks = [value[i:i + COOKIE_CHUNK_SIZE] for i in range(0, len(value), COOKIE_CHUNK_SIZE)]
+    return {f"{name}.{i}": chunk for i, chunk in enumerate(chunks)}
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * (p / 100.0)
+    lower = int(k)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (k - lower)
+
+
+class Stats:
+    """Thread-safe latency/error collector keyed by endpoint name."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._errors = {}
+        self._statuses = {}
+        self._scenario_runs = {}
+        self.started_at = time.time()
+        self.finished_at = None
+
+    def record(self, name, latency_ms, ok, status=None):
+        with self._lock:
+            self._latencies.setdefault(name, []).append(latency_ms)
+            if not ok:
+                self._errors[name] = self._errors.get(name, 0) + 1
+            key = str(status) if status is not None else "exception"
+            statuses = self._statuses.setdefault(name, {})
+            statuses[key] = statuses.get(key, 0) + 1
+
+    def record_scenario(self, name, ok):
+        with self._lock:
+            runs = self._scenario_runs.setdefault(name, {"runs": 0, "failures": 0})
+            runs["runs"] += 1
+            if not ok:
+                runs["failures"] += 1
+
+    def report(self):
+        finished = self.finished_at or time.time()
+        elapsed = max(finished - self.started_at, 1e-9)
+        endpoints = {}
+        with self._lock:
+            for name, values in sorted(self._latencies.items()):
+                ordered = sorted(values)
+                errors = self._errors.get(name, 0)
+                endpoints[name] = {
+                    "requests": len(ordered),
+                    "errors": errors,
+                    "error_rate": round(errors / len(ordered), 4),
+                    "rps": round(len(ordered) / elapsed, 2),
+                    "min_ms": round(ordered[0], 2),
+                    "mean_ms": round(sum(ordered) / len(ordered), 2),
+                    "p50_ms": round(percentile(ordered, 50), 2),
+                    "p95_ms": round(percentile(ordered, 95), 2),
+                    "p99_ms": round(percentile(ordered, 99), 2),
+                    "max_ms": round(ordered[-1], 2),
+                    "statuses": dict(self._statuses.get(name, {})),
+                }
+            scenarios = {name: dict(runs) for name, runs in self._scenario_runs.items()}
+
+        total = sum(e["requests"] for e in endpoints.values())
+        total_errors = sum(e["errors"] for e in endpoints.values())
+        return {
+            "duration_s": round(elapsed, 2),
+            "total_requests": total,
+            "total_errors": total_errors,
+            "error_rate": round(total_errors / total, 4) if total else 0.0,
+            "rps": round(total / elapsed, 2),
+            "endpoints": endpoints,
+            "scenarios": scenarios,
+        }
+
+
+class ScenarioFailed(Exception):
+    pass
+
+
+class AuthenticationFailed(Exception):
+    """Login failed: the run is aborted instead of measuring 401 responses."""
+
+
+class UserContext:
+    """Per-virtual-user handle passed to scenarios.
+
+    Wraps a requests.Session whose adapter (connection pool) is shared by all
+    users, so connections are reused across the whole run.
+    """
+
+    def __init__(self, runner, rng):
+        self.runner = runner
+        self.config = runner.config
+        self.rng = rng
+        self.session = requests.Session()
+        self.session.mount("http://", runner.adapter)
+        self.session.mount("https://", runner.adapter)
+        self.session.cookies.update(runner.auth_cookies)
+
+    def unique(self, prefix):
+        return f"{prefix} {uuid.uuid4()}"
+
+    def request(self, method, path, name=None, expect=(200, 201, 204), **kwargs):
+        name = name or f"{method} {ID_SEGMENT.sub('/{id}', path.split('?')[0])}"
+        kwargs.setdefault("timeout", self.config.timeout)
+        # Redirecionamento (ex.: para /login) conta como erro, não como a página de destino
+        kwargs.setdefault("allow_redirects", False)
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, f"{self.config.base_url}{path}", **kwargs)
+        except requests.RequestException:
+            self.runner.stats.record(name, (time.perf_counter() - started) * 1000, False)
+            raise ScenarioFailed(f"{name}: request failed")
+        latency = (time.perf_counter() - started) * 1000
+        ok = response.status_code in expect
+        self.runner.stats.record(name, latency, ok, response.status_code)
+        if not ok:
+            raise ScenarioFailed(f"{name}: unexpected status {response.status_code}")
+        return response
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    def think(self):
+        low, high = self.config.think_time
+        time.sleep(self.rng.uniform(low, high))
+
+
+class LoadRunner:
+    def __init__(self, config, scenarios):
+        self.config = config
+        self.stats = Stats()
+        self.adapter = HTTPAdapter(pool_connections=config.users, pool_maxsize=config.users)
+        self.auth_cookies = {}
+        selected = [s for s in scenarios if not config.scenarios or s.name in config.scenarios]
+        if not selected:
+            raise ValueError("Nenhum cenário selecionado")
+        self.scenarios = selected
+        self.weights = [s.weight for s in selected]
+
+    def authenticate(self):
+        """Log in once for the whole run and share the Supabase session cookies.
+
+        Raises AuthenticationFailed when GoTrue rejects the credentials or the
+        app still answers the probe route as anonymous.
+        """
+        try:
+            self.auth_cookies = supabase_session_cookies(AUTH_EMAIL, AUTH_PASSWORD, self.config.timeout)
+        except (requests.RequestException, ValueError) as error:
+            raise AuthenticationFailed(f"login de {AUTH_EMAIL} no Supabase falhou: {error}")
+
+        session = requests.Session()
+        session.mount("http://", self.adapter)
+        session.mount("https://", self.adapter)
+        session.cookies.update(self.auth_cookies)
+        try:
+            resp = session.post(
+                f"{self.config.base_url}{AUTH_PROBE_PATH}",
+                data=b"nome,email\n",
+                headers={"Content-Type": "text/csv"},
+                timeout=self.config.timeout,
+                allow_redirects=False,
+            )
+        except requests.RequestException as error:
+            raise AuthenticationFailed(f"app indisponível em {self.config.base_url}: {error}")
+        if resp.status_code != 200:
+            raise AuthenticationFailed(
+                f"sessão não aceita pelo app ({AUTH_PROBE_PATH} respondeu {resp.status_code})"
+            )
+        return AUTH_EMAIL
+
+    def _user_loop(self, index, deadline):
+        start_delay = index / self.config.spawn_rate if self.config.spawn_rate > 0 else 0
+        time.sleep(min(start_delay, max(deadline - time.time(), 0)))
+        rng = random.Random(self.config.seed + index)
+        user = UserContext(self, rng)
+        while time.time() < deadline:
+            chosen = rng.choices(self.scenarios, weights=self.weights, k=1)[0]
+            try:
+                chosen.func(user)
+                self.stats.record_scenario(chosen.name, True)
+            except ScenarioFailed:
+                self.stats.record_scenario(chosen.name, False)
+            user.think()
+
+    def run(self):
+        self.authenticate()
+        self.stats = Stats()
+        deadline = time.time() + self.config.duration
+        with ThreadPoolExecutor(max_workers=self.config.users) as pool:
+            futures = [pool.submit(self._user_loop, i, deadline) for i in range(self.config.users)]
+            for future in futures:
+                future.result()
+        self.stats.finished_at = time.time()
+        report = self.stats.report()
+        report["config"] = {
+            "base_url": self.config.base_url,
+            "users": self.config.users,
+            "duration": self.config.duration,
+            "seed": self.config.seed,
+            "scenarios": [s.name for s in self.scenarios],
+        }
+        return report
+
+
+def compare_reports(current, baseline, max_regression_pct=20.0, max_error_rate_increase=0.01,
+                    min_requests=20):
+    """Compare per-endpoint p95 and error rate against a baseline report.
+
+    Endpoints with fewer than ``min_requests`` samples on either side are
+    skipped, since their percentiles are too noisy to compare. Returns a list
+    of human-readable regressions (empty when within thresholds).
+    """
+    regressions = []
+    for name, base in baseline.get("endpoints", {}).items():
+        cur = current.get("endpoints", {}).get(name)
+        if not cur or min(cur["requests"], base["requests"]) < min_requests:
+            continue
+        if base["p95_ms"] > 0:
+            change = (cur["p95_ms"] - base["p95_ms"]) / base["p95_ms"] * 100
+            if change > max_regression_pct:
+                regressions.append(
+                    f"{name}: p95 {base['p95_ms']}ms -> {cur['p95_ms']}ms (+{change:.1f}%)"
+                )
+        if cur["error_rate"] - base["error_rate"] > max_error_rate_increase:
+            regressions.append(
+                f"{name}: error rate {base['error_rate']:.2%} -> {cur['error_rate']:.2%}"
+            )
+    return regressions
+
+
+def write_report(report, path):
+    with open(path, "w", encoding="utf-8") as fh:
+        json.dump(report, fh, indent=2, sort_keys=True)
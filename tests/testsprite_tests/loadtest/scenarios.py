@@ -0,0 +1,107 @@
+"""Weighted user scenarios derived from the testsprite flows.
+
+Each scenario receives a UserContext and issues named requests through it;
+raising ScenarioFailed (done by the context on unexpected status) marks the
+run as failed without stopping the virtual user.
+
+The app has no REST CRUD: mutations are server actions. Scenarios therefore
+load the dashboard pages (whose server components run the same reads the
+actions serve) and the route handlers that do exist under src/app/api.
+"""
+
+import json
+from collections import namedtuple
+
+from .harness import ScenarioFailed
+
+Scenario = namedtuple("Scenario", ["name", "weight", "func"])
+
+SCENARIOS = []
+
+# /api/search ignora termos com menos de 2 caracteres
+SEARCH_TERMS = ["pro", "cliente", "video", "camera", "joão", "studio", "silva", "2026"]
+
+LIST_PAGES = ["/projects", "/clients", "/freelancers", "/inventory", "/proposals", "/financeiro", "/calendar"]
+
+# Tipo do resultado de /api/search -> página de detalhe (src/app/(dashboard)/<rota>/[id])
+DETAIL_PAGES = {
+    "project": "/projects",
+    "client": "/clients",
+    "freelancer": "/freelancers",
+    "proposal": "/proposals",
+}
+
+
+def scenario(weight):
+    def register(func):
+        SCENARIOS.append(Scenario(func.__name__, weight, func))
+        return func
+
+    return register
+
+
+def _search(user, types):
+    """Search results of the given types, used to pick real record ids."""
+    term = user.rng.choice(SEARCH_TERMS)
+    response = user.get(f"/api/search?q={term}", name="GET /api/search")
+    return [r for r in response.json().get("results", []) if r.get("type") in types]
+
+
+@scenario(weight=5)
+def global_search(user):
+    """TC009 - busca global com termos variados."""
+    term = user.rng.choice(SEARCH_TERMS)
+    user.get(f"/api/search?q={term}", name="GET /api/search")
+
+
+@scenario(weight=4)
+def dashboard_kpis(user):
+    """TC008 - carregamento do dashboard com KPIs."""
+    user.get("/dashboard", name="GET /dashboard")
+
+
+@scenario(weight=4)
+def list_pages(user):
+    """TC002/TC003/TC005/TC006/TC007 - listagens renderizadas no servidor."""
+    path = user.rng.choice(LIST_PAGES)
+    user.get(path, name=f"GET {path}")
+
+
+@scenario(weight=2)
+def record_detail(user):
+    """TC003/TC004 - abrir um registro encontrado pela busca (projeto, cliente, ...)."""
+    results = _search(user, DETAIL_PAGES)
+    if not results:
+        return
+    result = user.rng.choice(results)
+    base = DETAIL_PAGES[result["type"]]
+    user.get(f"{base}/{result['id']}", name=f"GET {base}/{{id}}")
+
+
+@scenario(weight=1)
+def proposal_pdf(user):
+    """TC004 - PDF de uma proposta da organização (cache por hash no servidor)."""
+    results = _search(user, {"proposal"})
+    if not results:
+        return
+    proposal_id = user.rng.choice(results)["id"]
+    user.get(f"/api/proposals/pdf?id={proposal_id}", name="GET /api/proposals/pdf", expect=(200, 304))
+
+
+@scenario(weight=1)
+def client_import_dry_run(user):
+    """TC002 - importação de clientes por CSV em dryRun (valida e deduplica sem gravar)."""
+    rows = ["nome,email"]
+    for _ in range(user.rng.randint(5, 50)):
+        rows.append(f"{user.unique('Load Client')},load-{user.rng.randrange(10**9)}@example.com")
+    response = user.post(
+        "/api/import/clients?dryRun=1",
+        data="\n".join(rows).encode(),
+        headers={"Content-Type": "text/csv"},
+        name="POST /api/import/clients (dryRun)",
+    )
+    # Erro fatal chega como evento NDJSON com status 200
+    lines = [line for line in response.text.splitlines() if line.strip()]
+    last = json.loads(lines[-1]) if lines else {}
+    if last.get("type") != "done":
+        raise ScenarioFailed(f"POST /api/import/clients (dryRun): {last.get('message', 'sem evento done')}")
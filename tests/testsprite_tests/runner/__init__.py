@@ -0,0 +1,21 @@
+"""Parallel, fixture-pooled runner for the testsprite scenarios (TC001-TC010).
+
+Logs in once, creates the shared fixtures (client, freelancers, equipment) in
+bulk under a per-run namespace, runs the TC scripts across worker processes
+that share that session state, and drops everything the run created in one
+batch at the end. ``--stub`` serves the /api/* contract from an in-memory
+stand-in, so the suite needs neither the Next.js app nor Supabase.
+
+Each TC script still runs on its own (``python TC002_...py``): ``current()``
+then builds a standalone context and cleans up the fixtures it created.
+
+Usage (from tests/testsprite_tests):
+    python -m runner --stub --workers 4 --out suite_report.json
+    python -m runner --base-url http://localhost:3000 --scenario TC002 --scenario TC004
+"""
+
+from .context import SuiteContext, activate, current
+from .fixtures import FIXTURES
+from .stub import start_stub
+
+__all__ = ["SuiteContext", "activate", "current", "FIXTURES", "start_stub"]
@@ -0,0 +1,132 @@
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .context import BASE_URL, TIMEOUT, SuiteContext, activate
+from .stub import start_stub
+
+SUITE_DIR = Path(__file__).resolve().parent.parent
+
+
+def discover(selected=()):
+    """Arquivos TC*.py em ordem; --scenario filtra pelo prefixo (TC002) ou nome completo."""
+    paths = sorted(SUITE_DIR.glob("TC*.py"))
+    if selected:
+        paths = [path for path in paths if any(path.stem.startswith(name) for name in selected)]
+    return paths
+
+
+def init_worker(state):
+    # Cada processo reaproveita o token e as fixtures da execução
+    activate(SuiteContext.from_state(state))
+
+
+def run_scenario(path):
+    """Importa o script e executa suas funções test_*."""
+    path = Path(path)
+    started = time.perf_counter()
+    error = None
+    try:
+        spec = importlib.util.spec_from_file_location(path.stem, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        for name in sorted(dir(module)):
+            func = getattr(module, name)
+            if name.startswith("test_") and callable(func):
+                func()
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}" if str(exc) else type(exc).__name__
+        frames = traceback.extract_tb(exc.__traceback__)
+        where = next((frame for frame in reversed(frames) if frame.filename == str(path)), None)
+        if where:
+            error = f"{error} ({path.name}:{where.lineno})"
+    return {
+        "scenario": path.stem,
+        "ok": error is None,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 1),
+        "error": error,
+    }
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="runner", description="Execução paralela dos cenários testsprite")
+    parser.add_argument("--base-url", default=BASE_URL)
+    parser.add_argument("--stub", action="store_true", help="sobe o stub local da API (sem Next.js/Supabase)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processos simultâneos")
+    parser.add_argument("--scenario", action="append", default=[], help="restringe aos cenários informados")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT)
+    parser.add_argument("--out", help="arquivo JSON do relatório")
+    return parser.parse_args(argv)
+
+
+def print_summary(report):
+    print(f"{'cenário':<66}{'status':>8}{'ms':>10}")
+    for result in report["scenarios"]:
+        print(f"{result['scenario']:<66}{'ok' if result['ok'] else 'FALHOU':>8}{result['duration_ms']:>10.1f}")
+    for result in report["scenarios"]:
+        if not result["ok"]:
+            print(f"  - {result['scenario']}: {result['error']}")
+    print(f"\nTotal: {report['passed']}/{len(report['scenarios'])} ok em {report['duration_s']}s "
+          f"({report['workers']} workers, fixtures em {report['setup_ms']} ms)")
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    paths = discover(args.scenario)
+    if not paths:
+        print("Nenhum cenário encontrado")
+        return 1
+
+    server = None
+    base_url = args.base_url
+    if args.stub:
+        server, base_url = start_stub()
+        # TC010 fala PostgREST direto: aponta para o mesmo stub
+        os.environ["NEXT_PUBLIC_SUPABASE_URL"] = base_url
+        os.environ["TESTSPRITE_BASE_URL"] = base_url
+
+    started = time.perf_counter()
+    workers = max(1, min(args.workers, len(paths)))
+    context = SuiteContext(base_url=base_url, pool_size=max(10, workers), timeout=args.timeout)
+    try:
+        context.authenticate()
+        context.create_fixtures()
+        setup_ms = round((time.perf_counter() - started) * 1000, 1)
+
+        if workers == 1:
+            init_worker(context.state())
+            results = [run_scenario(path) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                     initargs=(context.state(),)) as pool:
+                results = list(pool.map(run_scenario, [str(path) for path in paths]))
+    finally:
+        context.cleanup()
+        if server:
+            server.shutdown()
+
+    report = {
+        "base_url": base_url,
+        "namespace": context.namespace,
+        "workers": workers,
+        "setup_ms": setup_ms,
+        "duration_s": round(time.perf_counter() - started, 2),
+        "passed": sum(1 for result in results if result["ok"]),
+        "scenarios": results,
+    }
+    print_summary(report)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+        print(f"Relatório salvo em {args.out}")
+    return 0 if report["passed"] == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import atexit
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .fixtures import FIXTURES
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3000")
+AUTH_EMAIL = os.environ.get("TESTSPRITE_AUTH_EMAIL", "testuser@example.com")
+AUTH_PASSWORD = os.environ.get("TESTSPRITE_AUTH_PASSWORD", "TestPass123!")
+TIMEOUT = 30
+
+# Cabeçalho que escopa os dados no stub (ignorado pelo app real)
+NAMESPACE_HEADER = "X-Testsprite-Namespace"
+
+
+def new_namespace():
+    return f"ts{uuid.uuid4().hex[:10]}"
+
+
+class SuiteContext:
+    """Session-scoped state shared by every scenario of a run.
+
+    Holds one pooled requests.Session (authenticated once), the run
+    namespace used to tag every record the scenarios create, and the
+    manifest of shared fixtures. Worker processes rebuild it from
+    ``state()``, so login and fixture creation happen once per run.
+    """
+
+    def __init__(self, base_url=BASE_URL, namespace=None, token=None, fixtures=None,
+                 pool_size=10, timeout=TIMEOUT, batch=None):
+        self.base_url = base_url.rstrip("/")
+        self.namespace = namespace or new_namespace()
+        self.token = token
+        self.fixtures = dict(fixtures or {})
+        self.pool_size = pool_size
+        self.timeout = timeout
+        # Fixtures criadas por este processo fora do manifesto (modo avulso)
+        self.owned = {}
+        self._batch = batch
+
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Accept": "application/json", NAMESPACE_HEADER: self.namespace})
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    # ---- estado entre processos ----
+
+    def state(self):
+        return {"base_url": self.base_url, "namespace": self.namespace, "token": self.token,
+                "fixtures": self.fixtures, "pool_size": self.pool_size, "timeout": self.timeout,
+                "batch": self.batch}
+
+    @classmethod
+    def from_state(cls, state):
+        return cls(**state)
+
+    # ---- HTTP ----
+
+    def url(self, path):
+        return f"{self.base_url}{path}" if path.startswith("/") else f"{self.base_url}/{path}"
+
+    def request(self, method, path, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return self.session.request(method, self.url(path), **kwargs)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def put(self, path, **kwargs):
+        return self.request("PUT", path, **kwargs)
+
+    def patch(self, path, **kwargs):
+        return self.request("PATCH", path, **kwargs)
+
+    def delete(self, path, **kwargs):
+        return self.request("DELETE", path, **kwargs)
+
+    # ---- nomes isolados por execução ----
+
+    def unique(self, prefix):
+        return f"{prefix} {self.namespace}-{uuid.uuid4().hex[:8]}"
+
+    def email(self, local, domain="example.com"):
+        return f"{local}+{self.namespace}@{domain}"
+
+    # ---- autenticação ----
+
+    def authenticate(self, email=AUTH_EMAIL, password=AUTH_PASSWORD):
+        """Login único da execução; sem endpoint de login a suíte segue sem token."""
+        try:
+            response = self.post("/api/auth/login", json={"email": email, "password": password})
+            body = response.json() if response.ok else {}
+            token = body.get("access_token") or body.get("token")
+        except (requests.RequestException, ValueError):
+            token = None
+        if token:
+            self.token = token
+            self.session.headers["Authorization"] = f"Bearer {token}"
+        return token
+
+    # ---- fixtures ----
+
+    @property
+    def batch(self):
+        """O servidor aceita criação em lote e limpeza por namespace (stub local)?"""
+        if self._batch is None:
+            try:
+                response = self.get("/api/_stub")
+                self._batch = response.ok and bool(response.json().get("batch"))
+            except (requests.RequestException, ValueError):
+                self._batch = False
+        return self._batch
+
+    def create_fixtures(self, keys=None):
+        """Cria as fixtures compartilhadas de uma vez, agrupadas por coleção."""
+        keys = [key for key in (keys or FIXTURES) if key not in self.fixtures]
+        by_collection = {}
+        for key in keys:
+            collection, build = FIXTURES[key]
+            by_collection.setdefault(collection, []).append((key, build(self)))
+
+        def create(collection, rows):
+            payloads = [payload for _, payload in rows]
+            if self.batch:
+                response = self.post(f"/api/{collection}", json=payloads)
+                response.raise_for_status()
+                created = response.json()
+            else:
+                created = []
+                for payload in payloads:
+                    response = self.post(f"/api/{collection}", json=payload)
+                    response.raise_for_status()
+                    created.append(response.json())
+            return {key: {**row, "collection": collection} for (key, _), row in zip(rows, created)}
+
+        with ThreadPoolExecutor(max_workers=max(len(by_collection), 1)) as pool:
+            for created in pool.map(lambda item: create(*item), by_collection.items()):
+                self.fixtures.update(created)
+        return self.fixtures
+
+    def fixture(self, key):
+        """Registro compartilhado; fora do runner é criado na hora e removido na saída."""
+        if key not in self.fixtures:
+            self.create_fixtures([key])
+            self.owned[key] = self.fixtures[key]
+        return self.fixtures[key]
+
+    def cleanup(self, fixtures=None):
+        """Remove em um lote tudo o que a execução criou."""
+        fixtures = self.fixtures if fixtures is None else fixtures
+        if self.batch:
+            self.delete(f"/api/_namespaces/{self.namespace}")
+            return
+
+        def remove(row):
+            try:
+                self.delete(f"/api/{row['collection']}/{row['id']}")
+            except requests.RequestException:
+                pass
+
+        with ThreadPoolExecutor(max_workers=self.pool_size) as pool:
+            list(pool.map(remove, fixtures.values()))
+
+
+_current = None
+
+
+def activate(context):
+    global _current
+    _current = context
+    return context
+
+
+def current():
+    """Contexto ativo; num script avulso (python TC00x_...py) cria um próprio."""
+    global _current
+    if _current is None:
+        context = activate(SuiteContext())
+        context.authenticate()
+        atexit.register(lambda: context.owned and context.cleanup(context.owned))
+    return _current
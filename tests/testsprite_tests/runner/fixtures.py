@@ -0,0 +1,41 @@
+"""Shared fixtures: created once per run, referenced by key from the scenarios.
+
+Each entry maps a key to (collection under /api, payload builder). Scenarios
+that only need a record as a prerequisite (the client of a proposal, the
+freelancer of an allocation) use these instead of creating and deleting
+their own; scenarios whose subject is the creation itself still create it.
+"""
+
+FIXTURES = {
+    "client": ("clients", lambda ctx: {
+        "name": ctx.unique("Fixture Client"),
+        "email": ctx.email("fixture-client"),
+        "company": "Testsprite Fixtures",
+        "notes": "Fixture compartilhada da suíte",
+    }),
+    "freelancer": ("freelancers", lambda ctx: {
+        "name": ctx.unique("Fixture Freelancer"),
+        "email": ctx.email("fixture-editor"),
+        "skills": ["Video Editing", "Photography"],
+        "rates": {"hourly": 50},
+        "rating": 4.5,
+        "availability": [],
+    }),
+    "freelancer_sound": ("freelancers", lambda ctx: {
+        "name": ctx.unique("Fixture Sound"),
+        "email": ctx.email("fixture-sound"),
+        "skills": ["Sound Engineering"],
+        "rates": {"hourly": 60},
+        "rating": 4.7,
+        "availability": [],
+    }),
+    # Reservado só pelo TC003: reservas de outros cenários mudariam o conflito esperado
+    "camera": ("equipments", lambda ctx: {
+        "name": ctx.unique("Fixture Camera"),
+        "type": "Camera",
+        "category": "CAMERA",
+        "serial_number": f"SN-{ctx.namespace}",
+        "daily_rate": 100,
+        "notes": "Fixture compartilhada da suíte",
+    }),
+}
@@ -0,0 +1,696 @@
+"""In-memory stand-in for the HTTP API exercised by the testsprite scenarios.
+
+Implements the /api/* contract the TC scripts were written against (auth,
+clients, projects and kanban, proposals and acceptance, freelancers and
+allocations, equipment bookings with conflict detection, the financial
+listings, dashboard and search), plus the small PostgREST/RPC subset used by
+TC010, so the whole suite runs with no Next.js app and no Supabase.
+
+Data is scoped by the X-Testsprite-Namespace header: concurrent runs never
+see each other's records, and DELETE /api/_namespaces/<ns> drops a run's
+data in one call. POST /api/<collection> also accepts a JSON list (bulk
+create). GET /api/_stub advertises both extensions to the runner.
+
+Usage (from tests/testsprite_tests):
+    python -m runner.stub --port 3001
+"""
+
+import argparse
+import json
+import math
+import re
+import secrets
+import threading
+import uuid
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from .context import AUTH_EMAIL, AUTH_PASSWORD, NAMESPACE_HEADER
+
+KANBAN_STAGES = ["Lead", "Briefing", "Pre-production", "Shooting", "Post-production", "Delivered"]
+
+# Caminhos equivalentes usados pelos cenários -> coleção canônica
+ALIASES = {
+    "financeiro/transactions": "financial-transactions",
+    "financial/transactions": "financial-transactions",
+    "freelancer_allocations": "freelancer-allocations",
+}
+
+# Coleção -> módulo no resultado da busca
+SEARCH_MODULES = {
+    "clients": "clients",
+    "projects": "projects",
+    "freelancers": "freelancers",
+    "equipments": "equipment",
+    "proposals": "proposals",
+}
+
+FILTER_IGNORED = {"select", "order", "limit", "offset", "include"}
+
+
+def now_iso():
+    return datetime.now(timezone.utc).isoformat()
+
+
+def parse_time(value):
+    """Datas dos cenários em UTC ingênuo: '2026-02-01', '...T09:00:00' ou '...Z'."""
+    parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    return parsed.astimezone(timezone.utc).replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def first(row, *keys, default=None):
+    """Primeiro campo presente: os cenários misturam snake_case e camelCase."""
+    for key in keys:
+        if row.get(key) is not None:
+            return row[key]
+    return default
+
+
+class HttpError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Scope:
+    """Dados de um namespace."""
+
+    def __init__(self):
+        self.tables = {}
+        self.users = {AUTH_EMAIL: {"id": str(uuid.uuid4()), "email": AUTH_EMAIL, "role": "admin",
+                                   "password": AUTH_PASSWORD}}
+        self.tokens = {}
+        self.acceptances = {}
+
+    def table(self, name):
+        return self.tables.setdefault(name, {})
+
+    def insert(self, name, payload):
+        row = {**payload, "id": payload.get("id") or str(uuid.uuid4()), "created_at": now_iso()}
+        self.table(name)[row["id"]] = row
+        return row
+
+    def get(self, name, record_id):
+        row = self.table(name).get(record_id)
+        if row is None:
+            raise HttpError(404, f"{name} {record_id} not found")
+        return row
+
+    def rows(self, name, **match):
+        return [row for row in self.table(name).values()
+                if all(str(row.get(key)) == str(value) for key, value in match.items())]
+
+    def remove(self, name, **match):
+        removed = self.rows(name, **match)
+        for row in removed:
+            del self.table(name)[row["id"]]
+        return removed
+
+
+ROUTES = []
+
+
+def route(method, pattern):
+    def register(func):
+        ROUTES.append((method, re.compile(f"^{pattern}$"), func))
+        return func
+
+    return register
+
+
+class StubApp:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.scopes = {}
+
+    def handle(self, method, path, query, body, namespace, token):
+        path = self.normalize(path)
+        for route_method, pattern, func in ROUTES:
+            match = pattern.match(path)
+            if match and route_method == method:
+                with self.lock:
+                    scope = self.scopes.get(namespace) or self.scopes.setdefault(namespace, Scope())
+                    try:
+                        return func(self, scope, body=body, query=query, token=token, **match.groupdict())
+                    except HttpError as error:
+                        return error.status, {"error": error.message, "message": error.message}
+        return 404, {"error": f"No stub route for {method} {path}"}
+
+    @staticmethod
+    def normalize(path):
+        path = path.rstrip("/") or "/"
+        if path.startswith("/rest/v1/"):
+            return path
+        # /clients, /dashboard... (cenários antigos sem o prefixo /api)
+        rest = path[len("/api"):] if path == "/api" or path.startswith("/api/") else path
+        for alias, target in ALIASES.items():
+            if rest == f"/{alias}" or rest.startswith(f"/{alias}/"):
+                rest = f"/{target}{rest[len(alias) + 1:]}"
+        return rest
+
+
+# ============================================
+# EXTENSÕES DO STUB
+# ============================================
+
+@route("GET", r"/_stub")
+def stub_info(app, scope, **_):
+    return 200, {"stub": True, "batch": True}
+
+
+@route("DELETE", r"/_namespaces/(?P<namespace>[^/]+)")
+def drop_namespace(app, scope, namespace, **_):
+    dropped = app.scopes.pop(namespace, None)
+    return 200, {"deleted": sum(len(rows) for rows in dropped.tables.values()) if dropped else 0}
+
+
+# ============================================
+# AUTH
+# ============================================
+
+def public_user(user):
+    return {key: value for key, value in user.items() if key != "password"}
+
+
+def session_user(scope, token):
+    user = scope.tokens.get(token)
+    if not user:
+        raise HttpError(401, "Unauthorized")
+    return user
+
+
+@route("POST", r"/auth/register")
+def register(app, scope, body, **_):
+    email, password = (body or {}).get("email"), (body or {}).get("password")
+    if not email or not password:
+        raise HttpError(400, "email and password are required")
+    if email in scope.users:
+        raise HttpError(409, "Email already registered")
+    user = {"id": str(uuid.uuid4()), "email": email, "role": body.get("role", "user"), "password": password}
+    scope.users[email] = user
+    return 201, public_user(user)
+
+
+@route("POST", r"/auth/login")
+def login(app, scope, body, **_):
+    user = scope.users.get((body or {}).get("email"))
+    if not user or user["password"] != body.get("password"):
+        raise HttpError(401, "Invalid credentials")
+    token = secrets.token_hex(16)
+    scope.tokens[token] = user
+    return 200, {"token": token, "access_token": token, "user": public_user(user)}
+
+
+@route("GET", r"/auth/profile")
+def profile(app, scope, token, **_):
+    return 200, public_user(session_user(scope, token))
+
+
+@route("DELETE", r"/auth/users/(?P<user_id>[^/]+)")
+def delete_user(app, scope, user_id, token, **_):
+    session_user(scope, token)
+    for email, user in list(scope.users.items()):
+        if user["id"] == user_id and email != AUTH_EMAIL:
+            del scope.users[email]
+            scope.tokens = {t: u for t, u in scope.tokens.items() if u["id"] != user_id}
+            return 204, None
+    raise HttpError(404, "User not found")
+
+
+# ============================================
+# PROJETOS E KANBAN
+# ============================================
+
+def overlapping_booking(scope, equipment_id, start, end, ignore=None):
+    start, end = parse_time(start), parse_time(end)
+    for booking in scope.rows("equipment-bookings", equipment_id=equipment_id):
+        if booking["id"] != ignore and start < parse_time(booking["end_date"]) and parse_time(booking["start_date"]) < end:
+            return booking
+    return None
+
+
+def book_equipment(scope, payload):
+    for field in ("equipment_id", "start_date", "end_date"):
+        if not payload.get(field):
+            raise HttpError(400, f"{field} is required")
+    scope.get("equipments", payload["equipment_id"])
+    if parse_time(payload["end_date"]) <= parse_time(payload["start_date"]):
+        raise HttpError(400, "end_date must be after start_date")
+    conflict = overlapping_booking(scope, payload["equipment_id"], payload["start_date"], payload["end_date"])
+    if conflict:
+        raise HttpError(409, f"Booking conflict: equipment already booked from {conflict['start_date']} "
+                             f"to {conflict['end_date']} (double booking)")
+    return scope.insert("equipment-bookings", payload)
+
+
+def create_project(scope, payload):
+    project = scope.insert("projects", {
+        "kanban_stage": KANBAN_STAGES[0], "shooting_dates": [], "delivery_dates": [],
+        "team_allocation": [], **payload, "equipment_bookings": [],
+    })
+    try:
+        for booking in payload.get("equipment_bookings") or []:
+            book_equipment(scope, {**booking, "project_id": project["id"]})
+            project["equipment_bookings"].append(booking)
+    except HttpError:
+        # Reserva recusada: o projeto não fica pela metade
+        scope.remove("equipment-bookings", project_id=project["id"])
+        del scope.table("projects")[project["id"]]
+        raise
+    return project
+
+
+@route("PUT", r"/projects/(?P<project_id>[^/]+)/kanban")
+def move_project(app, scope, project_id, body, **_):
+    stage = (body or {}).get("kanban_stage")
+    if stage not in KANBAN_STAGES:
+        raise HttpError(400, f"Unknown kanban stage: {stage}")
+    project = scope.get("projects", project_id)
+    project["kanban_stage"] = stage
+    return 200, project
+
+
+@route("GET", r"/projects/(?P<project_id>[^/]+)/kanban")
+def project_kanban(app, scope, project_id, **_):
+    scope.get("projects", project_id)
+    projects = scope.table("projects").values()
+    return 200, {"project_id": project_id, "stages": [
+        {"name": stage, "projects": [p["id"] for p in projects if p.get("kanban_stage") == stage]}
+        for stage in KANBAN_STAGES
+    ]}
+
+
+@route("PUT", r"/projects/(?P<project_id>[^/]+)/dates")
+def update_project_dates(app, scope, project_id, body, **_):
+    project = scope.get("projects", project_id)
+    for field in ("shooting_dates", "delivery_dates"):
+        if field in (body or {}):
+            project[field] = list(body[field])
+    return 200, project
+
+
+@route("POST", r"/projects/(?P<project_id>[^/]+)/team")
+def allocate_team(app, scope, project_id, body, **_):
+    project = scope.get("projects", project_id)
+    freelancer = scope.get("freelancers", (body or {}).get("freelancer_id"))
+    member = {"freelancer_id": freelancer["id"], "role": body.get("role")}
+    project["team_allocation"].append(member)
+    return 201, {**member, "project_id": project_id,
+                 "notification": {"message": f"Freelancer assigned to {project.get('name') or project_id}"}}
+
+
+# ============================================
+# EQUIPAMENTOS
+# ============================================
+
+@route("POST", r"/equipment-bookings")
+def create_booking(app, scope, body, **_):
+    return 201, book_equipment(scope, body or {})
+
+
+@route("POST", r"/equipments/(?P<equipment_id>[^/]+)/bookings")
+def create_equipment_booking(app, scope, equipment_id, body, **_):
+    return 201, book_equipment(scope, {**(body or {}), "equipment_id": equipment_id})
+
+
+@route("GET", r"/equipments/(?P<equipment_id>[^/]+)/roi")
+def equipment_roi(app, scope, equipment_id, **_):
+    equipment = scope.get("equipments", equipment_id)
+    bookings = sorted(scope.rows("equipment-bookings", equipment_id=equipment_id), key=lambda b: parse_time(b["start_date"]))
+    days = sum(math.ceil((parse_time(b["end_date"]) - parse_time(b["start_date"])).total_seconds() / 86400)
+               for b in bookings)
+    revenue = days * float(equipment.get("daily_rate") or 0)
+    price = float(equipment.get("purchase_price") or 0)
+    return 200, {
+        "equipment_id": equipment_id,
+        "booked_days": days,
+        "revenue": revenue,
+        "roi": round(revenue / price * 100, 2) if price else 0.0,
+        "calendar_availability": [{"booking_id": b["id"], "start_date": b["start_date"],
+                                   "end_date": b["end_date"], "booked": True} for b in bookings],
+    }
+
+
+# ============================================
+# PROPOSTAS
+# ============================================
+
+def line_total(line):
+    return float(line.get("quantity") or 1) * float(first(line, "unit_price", "unitPrice", default=0))
+
+
+def create_proposal(scope, payload):
+    lines = (payload.get("items") or []) + (payload.get("optionals") or [])
+    return scope.insert("proposals", {
+        "status": "draft", "public_sharing": False, **payload,
+        "total": round(sum(line_total(line) for line in lines), 2),
+        "public_token": secrets.token_hex(12),
+    })
+
+
+@route("GET", r"/proposals/public/(?P<public_token>[^/]+)")
+def public_proposal(app, scope, public_token, **_):
+    for proposal in scope.table("proposals").values():
+        if proposal["public_token"] == public_token and proposal.get("public_sharing", True):
+            return 200, proposal
+    raise HttpError(404, "Proposal not found")
+
+
+@route("POST", r"/proposals/(?P<proposal_id>[^/]+)/accept")
+def accept_proposal(app, scope, proposal_id, **_):
+    proposal = scope.get("proposals", proposal_id)
+    if proposal["status"] == "accepted":
+        return 200, proposal
+    proposal["status"] = "accepted"
+    proposal["accepted_at"] = now_iso()
+    schedules = first(proposal, "payment_schedules", "paymentSchedules") or [{"percentage": 100}]
+    for installment, schedule in enumerate(schedules, start=1):
+        scope.insert("financial-transactions", {
+            "type": "receivable", "status": "pending",
+            "amount": round(proposal["total"] * float(schedule.get("percentage") or 0) / 100, 2),
+            "installment": installment, "due_date": first(schedule, "due_date", "dueDate"),
+            "proposal_id": proposal_id, "proposalId": proposal_id,
+            "client_id": first(proposal, "client_id", "clientId"),
+        })
+    return 200, proposal
+
+
+# ============================================
+# FREELANCERS E FINANCEIRO
+# ============================================
+
+@route("POST", r"/freelancer-allocations")
+def allocate_freelancer(app, scope, body, **_):
+    body = body or {}
+    freelancer = scope.get("freelancers", first(body, "freelancer_id", "freelancerId"))
+    rate = float(first(body, "custom_rate", "rate", default=first(freelancer, "custom_rate", "rate", default=0)))
+    days = max(len(body.get("allocation_dates") or []), 1)
+    allocation = scope.insert("freelancer-allocations", {**body, "freelancer_id": freelancer["id"]})
+    proposal_id = first(body, "proposal_id", "proposalId")
+    scope.insert("financial-transactions", {
+        "type": "payable", "status": "pending", "amount": -round(rate * days, 2),
+        "freelancer_allocation_id": allocation["id"],
+        "freelancer_id": freelancer["id"], "freelancerId": freelancer["id"],
+        "project_id": body.get("project_id"), "proposal_id": proposal_id, "proposalId": proposal_id,
+    })
+    return 201, allocation
+
+
+@route("PATCH", r"/freelancers/(?P<freelancer_id>[^/]+)/availability")
+def update_availability(app, scope, freelancer_id, body, **_):
+    if not isinstance(body, list):
+        raise HttpError(400, "availability must be a list")
+    scope.get("freelancers", freelancer_id)["availability"] = body
+    return 200, body
+
+
+@route("GET", r"/freelancers/(?P<freelancer_id>[^/]+)")
+def get_freelancer(app, scope, freelancer_id, query, **_):
+    freelancer = dict(scope.get("freelancers", freelancer_id))
+    include = ",".join(query.get("include", [])).split(",")
+    if "allocations" in include:
+        freelancer["allocations"] = scope.rows("freelancer-allocations", freelancer_id=freelancer_id)
+    if "payables" in include:
+        freelancer["payables"] = scope.rows("financial-transactions", type="payable", freelancer_id=freelancer_id)
+    return 200, freelancer
+
+
+def ledger(scope, kind):
+    return scope.rows("financial-transactions", type=kind)
+
+
+@route("GET", r"/financial/accounts_receivable")
+def accounts_receivable(app, scope, **_):
+    return 200, ledger(scope, "receivable")
+
+
+@route("GET", r"/financial/accounts_payable")
+def accounts_payable(app, scope, **_):
+    return 200, ledger(scope, "payable")
+
+
+@route("GET", r"/financial/cashflow_dashboard")
+def cashflow_dashboard(app, scope, **_):
+    inflow = sum(float(t["amount"]) for t in ledger(scope, "receivable"))
+    outflow = sum(abs(float(t["amount"])) for t in ledger(scope, "payable"))
+    return 200, {"total_inflow": inflow, "total_outflow": outflow, "cash_balance": inflow - outflow}
+
+
+# ============================================
+# DASHBOARD E BUSCA
+# ============================================
+
+@route("GET", r"/dashboard")
+def dashboard(app, scope, **_):
+    projects = sorted(scope.table("projects").values(), key=lambda p: p["created_at"], reverse=True)
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    done = [p for p in projects if p.get("kanban_stage") == KANBAN_STAGES[-1]]
+    overdue = [p for p in projects if p not in done and p.get("delivery_dates")
+               and max(parse_time(d) for d in p["delivery_dates"]) < now]
+    revenue = sum(float(t["amount"]) for t in ledger(scope, "receivable"))
+    expenses = sum(abs(float(t["amount"])) for t in ledger(scope, "payable"))
+    pending = lambda kind: sum(abs(float(t["amount"])) for t in ledger(scope, kind) if t.get("status") == "pending")
+    return 200, {
+        "kpis": {"totalProjects": len(projects), "activeProjects": len(projects) - len(done),
+                 "completedProjects": len(done), "overdueProjects": len(overdue)},
+        "recentProjects": [{"id": p["id"], "name": first(p, "name", "title", default=""),
+                            "status": p.get("kanban_stage"), "shootingDates": p.get("shooting_dates") or []}
+                           for p in projects[:5]],
+        "shootingSchedules": [{"projectId": p["id"], "date": date, "location": p.get("location") or ""}
+                              for p in projects for date in p.get("shooting_dates") or []],
+        "financialMetrics": {"totalRevenue": revenue, "totalExpenses": expenses, "netProfit": revenue - expenses,
+                             "outstandingReceivables": pending("receivable"),
+                             "outstandingPayables": pending("payable")},
+    }
+
+
+@route("GET", r"/search")
+def search(app, scope, query, **_):
+    term = (query.get("q") or [""])[0].strip().lower()
+    results = []
+    for collection, module in SEARCH_MODULES.items():
+        for row in scope.table(collection).values():
+            title = str(first(row, "name", "title", default="")).strip()
+            if term and title and term in title.lower():
+                results.append({"id": row["id"], "module": module, "title": title})
+    return 200, {"query": term, "results": results[:50]}
+
+
+# ============================================
+# CRUD GENÉRICO
+# ============================================
+
+CREATE_HOOKS = {"projects": create_project, "proposals": create_proposal}
+
+
+def matches(row, query):
+    for key, values in query.items():
+        if key in FILTER_IGNORED:
+            continue
+        for value in values:
+            # ?filter=campo:eq:valor (TC005) ou ?campo=valor
+            field, expected = value.split(":eq:", 1) if key == "filter" else (key, value)
+            if str(row.get(field)) != expected:
+                return False
+    return True
+
+
+@route("POST", r"/(?P<collection>[a-z_-]+)")
+def create(app, scope, collection, body, **_):
+    hook = CREATE_HOOKS.get(collection, lambda s, payload: s.insert(collection, payload))
+    if isinstance(body, list):
+        return 201, [hook(scope, payload) for payload in body]
+    if not isinstance(body, dict):
+        raise HttpError(400, "JSON object expected")
+    return 201, hook(scope, body)
+
+
+@route("GET", r"/(?P<collection>[a-z_-]+)")
+def list_rows(app, scope, collection, query, **_):
+    return 200, [row for row in scope.table(collection).values() if matches(row, query)]
+
+
+@route("GET", r"/(?P<collection>[a-z_-]+)/(?P<record_id>[^/]+)")
+def get_row(app, scope, collection, record_id, **_):
+    return 200, scope.get(collection, record_id)
+
+
+def update_row(app, scope, collection, record_id, body, **_):
+    if not isinstance(body, dict):
+        raise HttpError(400, "JSON object expected")
+    row = scope.get(collection, record_id)
+    row.update({key: value for key, value in body.items() if key not in ("id", "created_at")})
+    row["updated_at"] = now_iso()
+    return 200, row
+
+
+route("PUT", r"/(?P<collection>[a-z_-]+)/(?P<record_id>[^/]+)")(update_row)
+route("PATCH", r"/(?P<collection>[a-z_-]+)/(?P<record_id>[^/]+)")(update_row)
+
+
+@route("DELETE", r"/(?P<collection>[a-z_-]+)/(?P<record_id>[^/]+)")
+def delete_row(app, scope, collection, record_id, **_):
+    scope.get(collection, record_id)
+    del scope.table(collection)[record_id]
+    # Reservas não sobrevivem ao projeto nem ao equipamento
+    if collection == "projects":
+        scope.remove("equipment-bookings", project_id=record_id)
+    elif collection == "equipments":
+        scope.remove("equipment-bookings", equipment_id=record_id)
+    return 204, None
+
+
+# ============================================
+# POSTGREST (TC010)
+# ============================================
+
+def rest_filters(query):
+    """?coluna=eq.valor -> {coluna: valor}"""
+    return {key: values[0][3:] for key, values in query.items()
+            if key not in FILTER_IGNORED and values and values[0].startswith("eq.")}
+
+
+def rest_delete(scope, table, ids):
+    """Cascata como as FKs: linhas com <tabela no singular>_id apontando para as removidas."""
+    reference = f"{table[:-1]}_id"
+    for name in [n[len("rest:"):] for n in list(scope.tables) if n.startswith("rest:")]:
+        children = [row for row in scope.table(f"rest:{name}").values() if row.get(reference) in ids]
+        for row in children:
+            del scope.table(f"rest:{name}")[row["id"]]
+        if children:
+            rest_delete(scope, name, {row["id"] for row in children})
+
+
+@route("POST", r"/rest/v1/rpc/accept_proposal_v2")
+def rpc_accept_proposal(app, scope, body, **_):
+    token = (body or {}).get("p_token")
+    proposal = next((p for p in scope.table("rest:proposals").values() if p.get("token") == token), None)
+    if not proposal:
+        raise HttpError(400, "Proposta não encontrada")
+    if token in scope.acceptances:
+        return 200, {**scope.acceptances[token], "already_accepted": True}
+
+    base = {"organization_id": proposal.get("organization_id"), "proposal_id": proposal["id"]}
+    project = scope.insert("rest:projects", {**base, "title": proposal.get("title"),
+                                             "client_id": proposal.get("client_id")})
+    items = sorted(scope.rows("rest:proposal_items", proposal_id=proposal["id"]), key=lambda i: i.get("order") or 0)
+    item_ids = [scope.insert("rest:project_items", {"project_id": project["id"], "proposal_item_id": item["id"],
+                                                    "description": item.get("description")})["id"]
+                for item in items]
+    transaction_ids = [scope.insert("rest:financial_transactions", {**base, "type": "INCOME", "status": "PENDING",
+                                                                    "amount": schedule.get("amount"),
+                                                                    "due_date": schedule.get("due_date")})["id"]
+                       for schedule in scope.rows("rest:payment_schedule", proposal_id=proposal["id"])]
+    event_ids = [scope.insert("rest:calendar_events", {**base, "project_id": project["id"],
+                                                       "start_date": first(item, "recording_date", "delivery_date")})["id"]
+                 for item in items if first(item, "recording_date", "delivery_date")]
+    proposal["status"] = "ACCEPTED"
+
+    scope.acceptances[token] = {"project_id": project["id"], "project_item_ids": item_ids, "assignment_ids": [],
+                                "transaction_ids": transaction_ids, "calendar_event_ids": event_ids}
+    return 200, {**scope.acceptances[token], "already_accepted": False}
+
+
+@route("POST", r"/rest/v1/(?P<table>[a-z_]+)")
+def rest_insert(app, scope, table, body, **_):
+    rows = body if isinstance(body, list) else [body or {}]
+    return 201, [scope.insert(f"rest:{table}", row) for row in rows]
+
+
+@route("GET", r"/rest/v1/(?P<table>[a-z_]+)")
+def rest_select(app, scope, table, query, **_):
+    return 200, scope.rows(f"rest:{table}", **rest_filters(query))
+
+
+@route("DELETE", r"/rest/v1/(?P<table>[a-z_]+)")
+def rest_remove(app, scope, table, query, **_):
+    removed = scope.remove(f"rest:{table}", **rest_filters(query))
+    rest_delete(scope, table, {row["id"] for row in removed})
+    return 204, None
+
+
+# ============================================
+# SERVIDOR
+# ============================================
+
+class StubHandler(BaseHTTPRequestHandler):
+    server_version = "TestspriteStub/1.0"
+    # Keep-alive: o pool de conexões dos cenários reaproveita os sockets
+    protocol_version = "HTTP/1.1"
+    # Cabeçalho e corpo saem em escritas separadas: sem Nagle não há espera do ACK atrasado
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def dispatch(self, method):
+        parsed = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        authorization = self.headers.get("Authorization") or ""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            status, payload = 400, {"error": "Invalid JSON body"}
+        else:
+            try:
+                status, payload = self.server.app.handle(
+                    method, parsed.path, parse_qs(parsed.query), body,
+                    self.headers.get(NAMESPACE_HEADER) or "default",
+                    authorization[len("Bearer "):] if authorization.startswith("Bearer ") else None,
+                )
+            except Exception as error:
+                # Bug no stub vira 500 visível no cenário, sem derrubar a conexão
+                status, payload = 500, {"error": f"{type(error).__name__}: {error}"}
+
+        data = b"" if payload is None else json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.dispatch("GET")
+
+    def do_POST(self):
+        self.dispatch("POST")
+
+    def do_PUT(self):
+        self.dispatch("PUT")
+
+    def do_PATCH(self):
+        self.dispatch("PATCH")
+
+    def do_DELETE(self):
+        self.dispatch("DELETE")
+
+
+def start_stub(host="127.0.0.1", port=0):
+    """Sobe o stub numa thread daemon; devolve o servidor e a URL base."""
+    server = ThreadingHTTPServer((host, port), StubHandler)
+    server.daemon_threads = True
+    server.app = StubApp()
+    threading.Thread(target=server.serve_forever, name="testsprite-stub", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="runner.stub", description="Stub local da API dos cenários testsprite")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3001)
+    args = parser.parse_args(argv)
+    server = ThreadingHTTPServer((args.host, args.port), StubHandler)
+    server.app = StubApp()
+    print(f"Stub em http://{args.host}:{args.port} (Ctrl+C para sair)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,18 @@
+"""Deterministic synthetic dataset for performance tests.
+
+Generates every CRM table (organizations, clients, proposals, projects and
+their children, crew, equipment, calendar and the financial ledger) from a
+seed and bulk-loads it into a local Postgres with COPY through psql. The same
+seed and profile always produce the same rows, so benchmark numbers are
+comparable across runs and machines.
+
+Usage (from tests/testsprite_tests):
+    python -m seed --profile medium --dsn "$DATABASE_URL" --reset --auth-password BenchPass123!
+    python -m seed --profile large --transactions 2000000 --dsn "$DATABASE_URL"
+    python -m seed --profile small --dump seed_small.sql
+"""
+
+from .dataset import PROFILES, Dataset, SeedConfig
+from .loader import PsqlLoader, write_script
+
+__all__ = ["PROFILES", "Dataset", "SeedConfig", "PsqlLoader", "write_script"]
@@ -0,0 +1,64 @@
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date
+
+from .dataset import PROFILES, Dataset, SeedConfig
+from .loader import Progress, PsqlLoader, write_script
+
+VOLUMES = list(PROFILES["small"])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(prog="seed", description="Carga de dados sintéticos para testes de desempenho")
+    parser.add_argument("--profile", choices=list(PROFILES), default="small")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--anchor", type=date.fromisoformat, default=SeedConfig.anchor,
+                        help="data de referência do dataset (AAAA-MM-DD)")
+    for name in VOLUMES:
+        parser.add_argument(f"--{name.replace('_', '-')}", type=int, dest=name,
+                            help=f"sobrescreve o volume total de {name} do perfil")
+    parser.add_argument("--dsn", default=os.environ.get("DATABASE_URL"), help="conexão Postgres (psql)")
+    parser.add_argument("--psql", default="psql", help="binário do psql")
+    parser.add_argument("--reset", action="store_true", help="remove o dataset seed_ anterior antes da carga")
+    parser.add_argument("--auth-password", help="cria o login dos administradores seed com esta senha")
+    parser.add_argument("--dump", help="escreve o script SQL em vez de carregar no banco")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    config = SeedConfig.from_profile(args.profile, seed=args.seed, anchor=args.anchor,
+                                     **{name: getattr(args, name) for name in VOLUMES})
+    dataset = Dataset(config)
+    print(f"Perfil {args.profile}: {json.dumps(config.to_dict())}", file=sys.stderr)
+
+    started = time.monotonic()
+    if args.dump:
+        with open(args.dump, "w", encoding="utf-8") as fh:
+            counts = write_script(fh, dataset, progress=Progress())
+        print(f"Script salvo em {args.dump}", file=sys.stderr)
+    else:
+        if not args.dsn:
+            print("Informe --dsn ou DATABASE_URL (ou use --dump)", file=sys.stderr)
+            return 2
+        loader = PsqlLoader(args.dsn, args.psql)
+        if args.reset:
+            loader.reset()
+        counts = loader.load(dataset, Progress())
+        loader.finalize(counts)
+        if args.auth_password:
+            loader.create_auth_users(args.auth_password)
+            print(f"Login: {dataset.admin_email(0)} (maior organização)", file=sys.stderr)
+
+    total = sum(counts.values())
+    elapsed = time.monotonic() - started
+    print(f"\nTotal: {total} linhas em {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} linhas/s)",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,655 @@
+import hashlib
+import random
+import uuid
+from bisect import bisect_right
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, time, timedelta, timezone
+
+# Prefixo de todos os ids gerados: permite reset cirúrgico e localizar o dataset nos benchmarks
+ID_PREFIX = "seed_"
+UUID_NAMESPACE = uuid.UUID("5eed0000-0000-4000-8000-000000000000")
+
+# Volumes totais (distribuídos entre as organizações com cauda longa)
+PROFILES = {
+    "small": dict(orgs=3, users=12, clients=150, freelancers=90, equipments=120,
+                  proposals=400, projects=600, transactions=10_000, calendar_events=1_500),
+    "medium": dict(orgs=10, users=60, clients=1_000, freelancers=500, equipments=800,
+                   proposals=3_000, projects=4_000, transactions=100_000, calendar_events=12_000),
+    "large": dict(orgs=50, users=300, clients=5_000, freelancers=2_500, equipments=5_000,
+                  proposals=15_000, projects=20_000, transactions=1_000_000, calendar_events=60_000),
+}
+
+
+@dataclass
+class SeedConfig:
+    orgs: int = 3
+    users: int = 12
+    clients: int = 150
+    freelancers: int = 90
+    equipments: int = 120
+    proposals: int = 400
+    projects: int = 600
+    transactions: int = 10_000
+    calendar_events: int = 1_500
+    seed: int = 42
+    # Datas são relativas a uma âncora fixa (não a "hoje") para o dataset ser idêntico entre execuções
+    anchor: date = date(2026, 6, 30)
+    history_days: int = 730
+    future_days: int = 180
+    skew: float = 1.1  # expoente Zipf da distribuição entre organizações
+
+    @classmethod
+    def from_profile(cls, name, **overrides):
+        values = dict(PROFILES[name])
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+    def to_dict(self):
+        data = asdict(self)
+        data["anchor"] = self.anchor.isoformat()
+        return data
+
+
+# ============================================
+# HELPERS DETERMINÍSTICOS
+# ============================================
+
+def mix(*parts):
+    """Inteiro de 64 bits estável derivado das partes (independe de ordem de geração)."""
+    digest = hashlib.blake2b("\x1f".join(map(str, parts)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+
+def seed_id(kind, index):
+    return f"{ID_PREFIX}{kind}_{index:07d}"
+
+
+def seed_uuid(kind, index):
+    return str(uuid.uuid5(UUID_NAMESPACE, f"{kind}:{index}"))
+
+
+def allocate(total, weights):
+    """Reparte `total` proporcionalmente aos pesos (maiores restos), no mínimo 1 por peso."""
+    n = len(weights)
+    if total < n:
+        raise ValueError(f"volume {total} menor que o número de organizações ({n})")
+    remaining = total - n
+    scale = sum(weights)
+    raw = [remaining * w / scale for w in weights]
+    counts = [int(r) for r in raw]
+    order = sorted(range(n), key=lambda i: raw[i] - counts[i], reverse=True)
+    for i in order[: remaining - sum(counts)]:
+        counts[i] += 1
+    return [c + 1 for c in counts]
+
+
+class Ranges:
+    """Faixas contíguas de índices globais por organização (clientes 0..k da org 0, etc)."""
+
+    def __init__(self, counts):
+        self.counts = counts
+        self.starts = []
+        acc = 0
+        for count in counts:
+            self.starts.append(acc)
+            acc += count
+        self.total = acc
+
+    def org_of(self, index):
+        return bisect_right(self.starts, index) - 1
+
+    def pick(self, org, key, bias=1.0):
+        """Índice global de um registro da org; bias > 1 concentra nos primeiros (clientes recorrentes)."""
+        count = self.counts[org]
+        u = (mix(*key) % 1_000_003) / 1_000_003
+        return self.starts[org] + min(int(count * (u ** bias)), count - 1)
+
+
+def at(day, hour=9, minute=0):
+    return datetime.combine(day, time(hour, minute), tzinfo=timezone.utc)
+
+
+def money(value):
+    return round(value, 2)
+
+
+FIRST_NAMES = ["Ana", "Bruno", "Carla", "Diego", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela",
+               "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago",
+               "Vanessa", "Lucas", "Mariana", "Pedro", "Juliana", "Caio", "Beatriz"]
+LAST_NAMES = ["Silva", "Souza", "Oliveira", "Santos", "Pereira", "Costa", "Rodrigues", "Almeida",
+              "Nascimento", "Lima", "Araújo", "Fernandes", "Carvalho", "Gomes", "Martins", "Rocha"]
+COMPANY_WORDS = ["Tech", "Moda", "Alimentos", "Saúde", "Educação", "Imóveis", "Varejo", "Energia",
+                 "Logística", "Turismo", "Esportes", "Beleza", "Finanças", "Agro", "Música"]
+COMPANY_SUFFIXES = ["Ltda", "S.A.", "ME", "Group", "Brasil", "Digital"]
+PROJECT_KINDS = ["Vídeo institucional", "Campanha de lançamento", "Reels mensais", "Documentário",
+                 "Cobertura de evento", "Comercial 30s", "Série para YouTube", "Videocase",
+                 "Treinamento interno", "Aftermovie"]
+ROLES = ["Câmera", "Diretor de Fotografia", "Diretor", "Editor de Vídeo", "Produtor", "Assistente de Câmera",
+         "Técnico de Som", "Colorista", "Motion Designer", "Gaffer", "Roteirista", "Piloto de Drone"]
+EQUIPMENT_MODELS = {
+    "CAMERA": [("Sony", "FX3"), ("Sony", "FX6"), ("Canon", "R5"), ("Blackmagic", "Pocket 6K"), ("RED", "Komodo")],
+    "LENS": [("Sigma", "18-35 f/1.8"), ("Canon", "24-70 f/2.8"), ("Sony", "GM 85mm"), ("Zeiss", "CP.3 50mm")],
+    "AUDIO": [("Rode", "NTG5"), ("Sennheiser", "EW 112P"), ("Zoom", "F6"), ("DJI", "Mic 2")],
+    "LIGHTING": [("Aputure", "600d"), ("Aputure", "300x"), ("Godox", "SL150"), ("Nanlite", "Forza 500")],
+    "GRIP": [("Manfrotto", "504X"), ("DJI", "RS 3 Pro"), ("Edelkrone", "SliderPLUS")],
+    "DRONE": [("DJI", "Mavic 3 Cine"), ("DJI", "Inspire 3"), ("DJI", "Avata 2")],
+    "ACCESSORY": [("SmallRig", "Cage"), ("Atomos", "Ninja V"), ("SanDisk", "CFexpress 512GB")],
+}
+
+# Pipeline do kanban: projetos antigos tendem a estar concluídos
+PROJECT_STATUSES = ["BRIEFING", "PRE_PROD", "SHOOTING", "POST_PROD", "REVIEW", "DONE"]
+PROPOSAL_STATUSES = [("DRAFT", 15), ("SENT", 20), ("VIEWED", 15), ("ACCEPTED", 35), ("REJECTED", 10), ("EXPIRED", 5)]
+EXPENSE_CATEGORIES = [("CREW_TALENT", 30), ("EQUIPMENT_RENTAL", 12), ("LOCATION", 6), ("LOGISTICS", 8),
+                      ("POST_PRODUCTION", 6), ("PRODUCTION", 6), ("OFFICE_RENT", 6), ("UTILITIES", 5),
+                      ("SOFTWARE", 6), ("SALARY", 8), ("INSURANCE", 2), ("MARKETING", 3), ("MAINTENANCE", 2)]
+INCOME_CATEGORIES = [("CLIENT_PAYMENT", 85), ("ADDITIVE", 10), ("OTHER_INCOME", 5)]
+EVENT_TYPES = [("shooting", 40), ("delivery", 30), ("meeting", 25), ("other", 5)]
+
+
+def weighted(rng, pairs):
+    return rng.choices([v for v, _ in pairs], weights=[w for _, w in pairs])[0]
+
+
+# ============================================
+# DATASET
+# ============================================
+
+class Dataset:
+    """
+    Gera as linhas de cada tabela como iteradores (memória constante).
+
+    Ids são derivados do índice global (seed_cli_0000042) e relações entre
+    tabelas são funções determinísticas dos índices, então nenhuma tabela
+    precisa manter as anteriores em memória. Cada tabela usa o próprio RNG,
+    semeado por (seed, tabela).
+    """
+
+    def __init__(self, config: SeedConfig):
+        self.config = config
+        weights = [1.0 / (i + 1) ** config.skew for i in range(config.orgs)]
+        self.org_ids = [seed_id("org", i) for i in range(config.orgs)]
+        self.users = Ranges(allocate(config.users, weights))
+        self.clients = Ranges(allocate(config.clients, weights))
+        self.freelancers = Ranges(allocate(config.freelancers, weights))
+        self.equipments = Ranges(allocate(config.equipments, weights))
+        self.proposals = Ranges(allocate(config.proposals, weights))
+        self.projects = Ranges(allocate(config.projects, weights))
+        self.transactions = Ranges(allocate(config.transactions, weights))
+        self.events = Ranges(allocate(config.calendar_events, weights))
+        self.start = config.anchor - timedelta(days=config.history_days)
+        self.span = config.history_days + config.future_days
+
+    def rng(self, table):
+        return random.Random(f"{self.config.seed}:{table}")
+
+    def day(self, *key, lo=0, hi=None):
+        hi = self.span if hi is None else hi
+        return self.start + timedelta(days=lo + mix(self.config.seed, *key) % max(hi - lo, 1))
+
+    # ---- relações determinísticas ----
+
+    def project_client(self, p):
+        org = self.projects.org_of(p)
+        return self.clients.pick(org, (self.config.seed, "project-client", p), bias=1.8)
+
+    def project_created(self, p):
+        # Criados até a âncora; o resto do calendário (futuro) vem de prazos e gravações
+        return self.day("project-created", p, hi=self.config.history_days)
+
+    def project_status(self, p):
+        age = (self.config.anchor - self.project_created(p)).days
+        u = mix(self.config.seed, "project-status", p) % 100
+        if age > 120:
+            return "DONE" if u < 85 else PROJECT_STATUSES[u % 5]
+        return PROJECT_STATUSES[u % 6]
+
+    def user_email(self, u):
+        return f"user{u}@{self.org_ids[self.users.org_of(u)]}.seed.test"
+
+    def admin_email(self, org):
+        """Login do administrador da org (criado no auth com --auth-password)."""
+        return self.user_email(self.users.starts[org])
+
+    def proposal_token(self, p):
+        return hashlib.sha1(f"{self.config.seed}:{p}".encode()).hexdigest()[:24]
+
+    def user_of_org(self, org, *key):
+        return seed_uuid("user", self.users.pick(org, (self.config.seed, "user", *key)))
+
+    # ---- tabelas ----
+
+    def tables(self):
+        """Ordem de carga respeitando as FKs."""
+        return [
+            ("organizations", self.gen_organizations),
+            ("users", self.gen_users),
+            ("clients", self.gen_clients),
+            ("freelancers", self.gen_freelancers),
+            ("freelancer_tags", self.gen_freelancer_tags),
+            ("equipments", self.gen_equipments),
+            ("equipment_kits", self.gen_equipment_kits),
+            ("equipment_kit_items", self.gen_equipment_kit_items),
+            ("maintenance_logs", self.gen_maintenance_logs),
+            ("proposals", self.gen_proposals),
+            ("proposal_items", self.gen_proposal_items),
+            ("proposal_optionals", self.gen_proposal_optionals),
+            ("proposal_videos", self.gen_proposal_videos),
+            ("payment_schedule", self.gen_payment_schedule),
+            ("projects", self.gen_projects),
+            ("project_finances", self.gen_project_finances),
+            ("project_items", self.gen_project_items),
+            ("project_tasks", self.gen_project_tasks),
+            ("project_members", self.gen_project_members),
+            ("project_expenses", self.gen_project_expenses),
+            ("item_assignments", self.gen_item_assignments),
+            ("equipment_bookings", self.gen_equipment_bookings),
+            ("calendar_events", self.gen_calendar_events),
+            ("financial_transactions", self.gen_financial_transactions),
+        ]
+
+    def initial_capital(self, org):
+        return money(10_000 + mix(self.config.seed, "initial-capital", org) % 240_000)
+
+    def gen_organizations(self):
+        rng = self.rng("organizations")
+        for o, org_id in enumerate(self.org_ids):
+            name = f"Produtora {rng.choice(LAST_NAMES)} {o:03d}"
+            created = at(self.start)
+            yield {
+                "id": org_id, "name": name, "slug": org_id, "email": f"contato@{org_id}.seed.test",
+                "phone": f"11{rng.randint(900000000, 999999999)}", "max_discount": 15, "max_revisions": 2,
+                "primary_color": "#%06x" % rng.randint(0, 0xFFFFFF), "show_bank_info": True,
+                "initial_capital": self.initial_capital(o), "initial_capital_set_at": created,
+                "created_at": created, "updated_at": created,
+            }
+
+    def gen_users(self):
+        rng = self.rng("users")
+        for u in range(self.users.total):
+            org = self.users.org_of(u)
+            first = self.users.starts[org] == u
+            name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            yield {
+                "id": seed_uuid("user", u), "email": self.user_email(u), "name": name,
+                "role": "ADMIN" if first else rng.choice(["PRODUCER", "COORDINATOR", "EDITOR"]),
+                "organization_id": self.org_ids[org], "created_at": at(self.start), "updated_at": at(self.start),
+            }
+
+    def gen_clients(self):
+        rng = self.rng("clients")
+        for c in range(self.clients.total):
+            org = self.clients.org_of(c)
+            company = f"{rng.choice(COMPANY_WORDS)} {rng.choice(LAST_NAMES)} {rng.choice(COMPANY_SUFFIXES)}"
+            contact = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+            created = at(self.day("client-created", c, hi=self.config.history_days))
+            yield {
+                "id": seed_id("cli", c), "name": contact, "email": f"cliente{c}@seed.test",
+                "phone": f"11{rng.randint(900000000, 999999999)}", "company": company,
+                "notes": None if rng.random() < 0.7 else "Prefere contato por WhatsApp",
+                "organization_id": self.org_ids[org], "created_at": created, "updated_at": created,
+            }
+
+    def freelancer_role(self, f):
+        return ROLES[mix(self.config.seed, "freelancer-role", f) % len(ROLES)]
+
+    def gen_freelancers(self):
+        rng = self.rng("freelancers")
+        for f in range(self.freelancers.total):
+            org = self.freelancers.org_of(f)
+            role = self.freelancer_role(f)
+            extra = rng.sample(ROLES, rng.randint(0, 2))
+            created = at(self.day("freelancer-created", f, hi=self.config.history_days))
+            yield {
+                "id": seed_id("frl", f), "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                "email": f"freela{f}@seed.test", "phone": f"21{rng.randint(900000000, 999999999)}",
+                "role": role, "specialty": sorted({role, *extra}),
+                "daily_rate": money(rng.lognormvariate(6.5, 0.45)), "rating": rng.choice([0, 3, 4, 4, 5, 5]),
+                "status": "AVAILABLE" if rng.random() < 0.85 else "INACTIVE",
+                "organization_id": self.org_ids[org], "created_at": created, "updated_at": created,
+            }
+
+    def gen_freelancer_tags(self):
+        rng = self.rng("freelancer_tags")
+        n = 0
+        for f in range(self.freelancers.total):
+            for tag in sorted({self.freelancer_role(f), *rng.sample(ROLES, rng.randint(0, 2))}):
+                yield {"id": seed_id("ftg", n), "name": tag, "freelancer_id": seed_id("frl", f)}
+                n += 1
+
+    def gen_equipments(self):
+        rng = self.rng("equipments")
+        categories = list(EQUIPMENT_MODELS)
+        for e in range(self.equipments.total):
+            org = self.equipments.org_of(e)
+            category = categories[mix(self.config.seed, "equipment-category", e) % len(categories)]
+            brand, model = rng.choice(EQUIPMENT_MODELS[category])
+            price = rng.lognormvariate(8.5, 0.9)
+            purchased = self.day("equipment-purchase", e, hi=self.config.history_days)
+            yield {
+                "id": seed_id("eqp", e), "name": f"{brand} {model}", "brand": brand, "model": model,
+                "category": category, "serial_number": f"SEED-{e:07d}",
+                "status": weighted(rng, [("AVAILABLE", 80), ("IN_USE", 10), ("MAINTENANCE", 7), ("RETIRED", 3)]),
+                "purchase_date": purchased, "purchase_price": money(price), "daily_rate": money(price * 0.03),
+                "organization_id": self.org_ids[self.equipments.org_of(e)],
+                "created_at": at(purchased), "updated_at": at(purchased),
+            }
+
+    def kits_of_org(self, org):
+        return max(self.equipments.counts[org] // 10, 0)
+
+    def gen_equipment_kits(self):
+        n = 0
+        for org, org_id in enumerate(self.org_ids):
+            for k in range(self.kits_of_org(org)):
+                yield {"id": seed_id("kit", n), "name": f"Kit {k + 1}", "description": "Kit padrão de gravação",
+                       "organization_id": org_id, "created_at": at(self.start), "updated_at": at(self.start)}
+                n += 1
+
+    def gen_equipment_kit_items(self):
+        rng = self.rng("equipment_kit_items")
+        kit = n = 0
+        for org in range(self.config.orgs):
+            count = self.equipments.counts[org]
+            for _ in range(self.kits_of_org(org)):
+                for offset in rng.sample(range(count), min(count, rng.randint(3, 5))):
+                    yield {"id": seed_id("kti", n), "quantity": 1, "kit_id": seed_id("kit", kit),
+                           "equipment_id": seed_id("eqp", self.equipments.starts[org] + offset)}
+                    n += 1
+                kit += 1
+
+    def gen_maintenance_logs(self):
+        rng = self.rng("maintenance_logs")
+        n = 0
+        for e in range(self.equipments.total):
+            if rng.random() >= 0.12:
+                continue
+            start = self.day("maintenance", e, hi=self.config.history_days)
+            done = rng.random() < 0.8
+            yield {
+                "id": seed_id("mnt", n), "equipment_id": seed_id("eqp", e),
+                "organization_id": self.org_ids[self.equipments.org_of(e)],
+                "description": rng.choice(["Limpeza de sensor", "Troca de bateria", "Revisão geral", "Reparo de conector"]),
+                "cost": money(rng.lognormvariate(5.5, 0.7)), "date_start": start,
+                "date_end": start + timedelta(days=rng.randint(1, 15)) if done else None,
+                "status": "COMPLETED" if done else "IN_PROGRESS", "external_service": rng.random() < 0.4,
+                "created_at": at(start), "updated_at": at(start),
+            }
+            n += 1
+
+    # ---- propostas ----
+
+    def proposal_status(self, p):
+        return weighted(random.Random(mix(self.config.seed, "proposal-status", p)), PROPOSAL_STATUSES)
+
+    def proposal_items_count(self, p):
+        return 2 + mix(self.config.seed, "proposal-items", p) % 5
+
+    def proposal_item_price(self, p, i):
+        return money(300 + mix(self.config.seed, "proposal-item-price", p, i) % 9_700)
+
+    def gen_proposals(self):
+        rng = self.rng("proposals")
+        for p in range(self.proposals.total):
+            org = self.proposals.org_of(p)
+            created = self.day("proposal-created", p, hi=self.config.history_days)
+            status = self.proposal_status(p)
+            base = sum(self.proposal_item_price(p, i) for i in range(self.proposal_items_count(p)))
+            discount = rng.choice([0, 0, 0, 5, 10])
+            sent = at(created + timedelta(days=rng.randint(0, 5))) if status != "DRAFT" else None
+            yield {
+                "id": seed_id("prp", p), "token": self.proposal_token(p),
+                "title": f"{rng.choice(PROJECT_KINDS)} #{p}", "description": "Proposta gerada pelo seeder",
+                "base_value": money(base), "discount": discount, "total_value": money(base * (1 - discount / 100)),
+                "status": status, "version": 1,
+                "valid_until": at(created + timedelta(days=30)),
+                "accepted_at": at(created + timedelta(days=rng.randint(3, 20))) if status == "ACCEPTED" else None,
+                "sent_at": sent, "viewed_at": sent if status in ("VIEWED", "ACCEPTED", "REJECTED") else None,
+                "installments": rng.choice([1, 1, 2, 3]), "is_recurring": rng.random() < 0.08,
+                "client_id": seed_id("cli", self.clients.pick(org, (self.config.seed, "proposal-client", p), bias=1.8)),
+                "organization_id": self.org_ids[org], "created_at": at(created), "updated_at": at(created),
+            }
+
+    def gen_proposal_items(self):
+        n = 0
+        for p in range(self.proposals.total):
+            for i in range(self.proposal_items_count(p)):
+                price = self.proposal_item_price(p, i)
+                yield {"id": seed_id("pri", n), "description": f"{ROLES[(p + i) % len(ROLES)]} - diária",
+                       "quantity": 1, "unit_price": price, "total": price, "order": i + 1,
+                       "proposal_id": seed_id("prp", p)}
+                n += 1
+
+    def gen_proposal_optionals(self):
+        rng = self.rng("proposal_optionals")
+        n = 0
+        for p in range(self.proposals.total):
+            for i in range(rng.randint(0, 3)):
+                yield {"id": seed_id("pro", n), "title": rng.choice(["Drone", "Legendas", "Versão vertical", "Trilha exclusiva"]),
+                       "price": money(rng.uniform(200, 3_000)), "is_selected": False, "order": i + 1,
+                       "proposal_id": seed_id("prp", p)}
+                n += 1
+
+    def gen_proposal_videos(self):
+        rng = self.rng("proposal_videos")
+        n = 0
+        for p in range(self.proposals.total):
+            for i in range(rng.randint(0, 2)):
+                yield {"id": seed_id("prv", n), "title": f"Portfólio {i + 1}",
+                       "video_url": f"https://vimeo.com/{100000000 + n}", "order": i + 1,
+                       "proposal_id": seed_id("prp", p)}
+                n += 1
+
+    def gen_payment_schedule(self):
+        rng = self.rng("payment_schedule")
+        n = 0
+        for p in range(self.proposals.total):
+            if self.proposal_status(p) != "ACCEPTED":
+                continue
+            created = self.day("proposal-created", p, hi=self.config.history_days)
+            parts = rng.choice([[100], [50, 50], [50, 25, 25]])
+            base = sum(self.proposal_item_price(p, i) for i in range(self.proposal_items_count(p)))
+            for order, pct in enumerate(parts, start=1):
+                due = created + timedelta(days=30 * (order - 1) + 7)
+                paid = due < self.config.anchor
+                yield {"id": seed_id("pay", n), "description": f"Parcela {order} ({pct}%)", "due_date": at(due),
+                       "amount": money(base * pct / 100), "percentage": pct, "order": order, "paid": paid,
+                       "paid_at": at(due) if paid else None, "proposal_id": seed_id("prp", p),
+                       "created_at": at(created), "updated_at": at(created)}
+                n += 1
+
+    # ---- projetos ----
+
+    def project_items_count(self, p):
+        return 1 + mix(self.config.seed, "project-items", p) % 4
+
+    def gen_projects(self):
+        rng = self.rng("projects")
+        for p in range(self.projects.total):
+            org = self.projects.org_of(p)
+            created = self.project_created(p)
+            from_proposal = rng.random() < 0.55
+            shooting = created + timedelta(days=rng.randint(7, 60))
+            yield {
+                "id": seed_id("prj", p), "title": f"{rng.choice(PROJECT_KINDS)} - {rng.choice(COMPANY_WORDS)} #{p}",
+                "description": "Projeto gerado pelo seeder", "status": self.project_status(p),
+                "origin": "proposal" if from_proposal else "manual",
+                "proposal_id": seed_id("prp", self.proposals.pick(org, (self.config.seed, "project-proposal", p)))
+                if from_proposal else None,
+                "deadline_date": at(shooting + timedelta(days=rng.randint(10, 45))),
+                "shooting_date": at(shooting), "shooting_end_date": at(shooting + timedelta(days=rng.randint(0, 3))),
+                "shooting_time": rng.choice(["08:00", "09:00", "13:00", "18:00"]),
+                "location": rng.choice(["São Paulo - SP", "Rio de Janeiro - RJ", "Estúdio", "Belo Horizonte - MG"]),
+                "video_format": rng.choice(["16:9", "9:16", "1:1", "4:5"]), "resolution": rng.choice(["1080p", "4K"]),
+                "budget": money(rng.lognormvariate(9.3, 0.8)),
+                "client_id": seed_id("cli", self.project_client(p)),
+                "assigned_to_id": self.user_of_org(org, "project", p),
+                "organization_id": self.org_ids[org], "created_at": at(created), "updated_at": at(created),
+            }
+
+    def gen_project_finances(self):
+        rng = self.rng("project_finances")
+        for p in range(self.projects.total):
+            created = at(self.project_created(p))
+            yield {"id": seed_id("pfn", p), "project_id": seed_id("prj", p),
+                   "organization_id": self.org_ids[self.projects.org_of(p)],
+                   "approved_value": money(rng.lognormvariate(9.3, 0.8)), "additives": 0,
+                   "target_margin_percent": 30, "created_at": created, "updated_at": created}
+
+    def project_item_id(self, p, i):
+        # Índice estável: no máximo 4 itens por projeto
+        return seed_id("pit", p * 4 + i)
+
+    def gen_project_items(self):
+        rng = self.rng("project_items")
+        for p in range(self.projects.total):
+            created = self.project_created(p)
+            done = self.project_status(p) == "DONE"
+            for i in range(self.project_items_count(p)):
+                price = money(rng.uniform(500, 12_000))
+                yield {"id": self.project_item_id(p, i), "project_id": seed_id("prj", p),
+                       "description": f"{ROLES[(p + i) % len(ROLES)]} - entrega {i + 1}", "quantity": 1,
+                       "unit_price": price, "total_price": price, "status": "DONE" if done else "PENDING",
+                       "due_date": at(created + timedelta(days=rng.randint(15, 60))), "order": i,
+                       "created_at": at(created), "updated_at": at(created)}
+
+    def gen_project_tasks(self):
+        rng = self.rng("project_tasks")
+        n = 0
+        for p in range(self.projects.total):
+            done = self.project_status(p) == "DONE"
+            for i in range(rng.randint(0, 6)):
+                yield {"id": seed_uuid("task", n), "project_id": seed_id("prj", p),
+                       "title": rng.choice(["Roteiro", "Decupagem", "Reservar locação", "Enviar corte 1", "Color", "Mix de áudio"]),
+                       "completed": done or rng.random() < 0.4, "order": i,
+                       "created_at": at(self.project_created(p))}
+                n += 1
+
+    def project_crew(self, p):
+        """Freelancers distintos da org alocados ao projeto (0 a 4)."""
+        org = self.projects.org_of(p)
+        count = self.freelancers.counts[org]
+        size = min(mix(self.config.seed, "crew-size", p) % 5, count)
+        offsets = random.Random(mix(self.config.seed, "crew", p)).sample(range(count), size)
+        return [self.freelancers.starts[org] + o for o in offsets]
+
+    def gen_project_members(self):
+        rng = self.rng("project_members")
+        n = 0
+        for p in range(self.projects.total):
+            created = at(self.project_created(p))
+            for f in self.project_crew(p):
+                confirmed = rng.random() < 0.8
+                yield {"id": seed_id("pmb", n), "project_id": seed_id("prj", p), "freelancer_id": seed_id("frl", f),
+                       "role": self.freelancer_role(f), "agreed_fee": money(rng.uniform(400, 2_500)),
+                       "status": "CONFIRMED" if confirmed else "INVITED", "invited_at": created,
+                       "confirmed_at": created if confirmed else None,
+                       "organization_id": self.org_ids[self.projects.org_of(p)],
+                       "created_at": created, "updated_at": created}
+                n += 1
+
+    def gen_project_expenses(self):
+        rng = self.rng("project_expenses")
+        n = 0
+        for p in range(self.projects.total):
+            created = self.project_created(p)
+            crew = self.project_crew(p)
+            for _ in range(rng.randint(0, 3)):
+                category = rng.choice(["CREW_TALENT", "EQUIPMENT", "LOGISTICS", "FOOD", "OTHER"])
+                estimated = money(rng.uniform(150, 4_000))
+                paid = rng.random() < 0.6
+                yield {"id": seed_id("pex", n), "project_id": seed_id("prj", p), "project_finance_id": seed_id("pfn", p),
+                       "organization_id": self.org_ids[self.projects.org_of(p)], "category": category,
+                       "description": f"Despesa {category.lower()}", "estimated_cost": estimated,
+                       "actual_cost": money(estimated * rng.uniform(0.8, 1.2)) if paid else 0,
+                       "freelancer_id": seed_id("frl", rng.choice(crew)) if category == "CREW_TALENT" and crew else None,
+                       "payment_status": "PAID" if paid else "TO_PAY",
+                       "payment_date": created + timedelta(days=rng.randint(5, 40)) if paid else None,
+                       "created_at": at(created), "updated_at": at(created)}
+                n += 1
+
+    def gen_item_assignments(self):
+        rng = self.rng("item_assignments")
+        n = 0
+        for p in range(self.projects.total):
+            crew = self.project_crew(p)
+            if not crew:
+                continue
+            created = self.project_created(p)
+            done = self.project_status(p) == "DONE"
+            for i in range(self.project_items_count(p)):
+                for f in rng.sample(crew, min(len(crew), rng.randint(0, 2))):
+                    scheduled = created + timedelta(days=rng.randint(7, 60))
+                    yield {"id": seed_id("ias", n), "freelancer_id": seed_id("frl", f),
+                           "project_item_id": self.project_item_id(p, i), "role": self.freelancer_role(f),
+                           "agreed_fee": money(rng.uniform(400, 2_500)), "estimated_hours": rng.choice([4, 8, 10, 12]),
+                           "scheduled_date": at(scheduled), "status": "DONE" if done else rng.choice(["PENDING", "IN_PROGRESS"]),
+                           "organization_id": self.org_ids[self.projects.org_of(p)],
+                           "created_at": at(created), "updated_at": at(created)}
+                    n += 1
+
+    def gen_equipment_bookings(self):
+        rng = self.rng("equipment_bookings")
+        n = 0
+        for p in range(self.projects.total):
+            org = self.projects.org_of(p)
+            count = self.equipments.counts[org]
+            shooting = self.project_created(p) + timedelta(days=7 + mix(self.config.seed, "booking-day", p) % 53)
+            for offset in rng.sample(range(count), min(count, rng.randint(0, 3))):
+                end = shooting + timedelta(days=rng.randint(0, 3))
+                yield {"id": seed_id("bkg", n), "start_date": at(shooting, 7), "end_date": at(end, 20),
+                       "return_date": at(end, 21) if end < self.config.anchor else None,
+                       "project_id": seed_id("prj", p), "equipment_id": seed_id("eqp", self.equipments.starts[org] + offset),
+                       "created_at": at(self.project_created(p)), "updated_at": at(self.project_created(p))}
+                n += 1
+
+    def gen_calendar_events(self):
+        rng = self.rng("calendar_events")
+        for e in range(self.events.total):
+            org = self.events.org_of(e)
+            start = self.day("event", e)
+            all_day = rng.random() < 0.4
+            project = self.projects.pick(org, (self.config.seed, "event-project", e)) if rng.random() < 0.7 else None
+            yield {"id": seed_id("evt", e), "organization_id": self.org_ids[org],
+                   "title": rng.choice(["Gravação", "Entrega", "Reunião de briefing", "Aprovação", "Visita técnica"]),
+                   "start_date": at(start, rng.randint(8, 18)), "end_date": at(start, 19), "all_day": all_day,
+                   "type": weighted(rng, EVENT_TYPES), "location": rng.choice([None, "Estúdio", "Cliente", "Online"]),
+                   "project_id": seed_id("prj", project) if project is not None else None,
+                   "created_by": self.user_of_org(org, "event", e),
+                   "created_at": at(start - timedelta(days=7)), "updated_at": at(start - timedelta(days=7))}
+
+    def gen_financial_transactions(self):
+        rng = self.rng("financial_transactions")
+        n = 0
+        for org, org_id in enumerate(self.org_ids):
+            yield {"id": seed_id("trx", n), "organization_id": org_id, "type": "INITIAL_CAPITAL",
+                   "category": "REGISTRATION", "status": "PAID", "amount": self.initial_capital(org),
+                   "description": "Capital inicial informado no cadastro", "payment_date": self.start,
+                   "due_date": self.start, "created_at": at(self.start), "updated_at": at(self.start)}
+            n += 1
+            # O capital inicial conta dentro do volume da org
+            for t in range(self.transactions.counts[org] - 1):
+                income = rng.random() < 0.4
+                due = self.day("transaction-due", org, t)
+                p = self.projects.pick(org, (self.config.seed, "transaction-project", org, t)) if rng.random() < 0.75 else None
+                category = weighted(rng, INCOME_CATEGORIES if income else EXPENSE_CATEGORIES)
+                roll = rng.random()
+                if due <= self.config.anchor:
+                    status = "PAID" if roll < 0.86 else "CANCELLED" if roll < 0.9 else "PENDING"
+                else:
+                    status = "SCHEDULED" if roll < 0.3 else "PENDING"
+                amount = money(rng.lognormvariate(8.2 if income else 6.9, 0.9))
+                crew = self.project_crew(p) if p is not None and category == "CREW_TALENT" else []
+                yield {
+                    "id": seed_id("trx", n), "organization_id": org_id,
+                    "project_id": seed_id("prj", p) if p is not None else None,
+                    "client_id": seed_id("cli", self.project_client(p)) if p is not None and income else None,
+                    "freelancer_id": seed_id("frl", crew[t % len(crew)]) if crew else None,
+                    "type": "INCOME" if income else "EXPENSE", "category": category, "status": status,
+                    "amount": amount, "description": f"{category.replace('_', ' ').title()} #{t}",
+                    "due_date": due, "payment_date": due + timedelta(days=rng.randint(-3, 10)) if status == "PAID" else None,
+                    "payment_method": rng.choice(["PIX", "PIX", "BOLETO", "TRANSFER", "CARD"]) if status == "PAID" else None,
+                    "is_recurring": category in ("OFFICE_RENT", "SOFTWARE", "SALARY"),
+                    "recurrence_period": "MONTHLY" if category in ("OFFICE_RENT", "SOFTWARE", "SALARY") else None,
+                    "created_at": at(due - timedelta(days=15)), "updated_at": at(due - timedelta(days=15)),
+                }
+                n += 1
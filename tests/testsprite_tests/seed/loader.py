@@ -0,0 +1,163 @@
+import json
+import subprocess
+import sys
+import time
+from datetime import date, datetime
+from itertools import chain
+
+from .dataset import ID_PREFIX
+
+# '_' é curinga no LIKE
+LIKE_PREFIX = ID_PREFIX.replace("_", "\\_")
+
+
+def copy_value(value):
+    """Serializa um valor no formato texto do COPY."""
+    if value is None:
+        return r"\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (list, tuple)):
+        items = ('"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in value)
+        value = "{" + ",".join(items) + "}"
+    elif isinstance(value, dict):
+        value = json.dumps(value, ensure_ascii=False)
+    else:
+        value = str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+def quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+
+class Progress:
+    def __init__(self, stream=sys.stderr):
+        self.stream = stream
+
+    def table(self, name, rows, elapsed):
+        rate = rows / elapsed if elapsed else 0
+        self.stream.write(f"  {name:<26}{rows:>10} linhas {elapsed:>7.1f}s {rate:>10.0f} linhas/s\n")
+        self.stream.flush()
+
+
+def write_script(out, dataset, columns=None, progress=None):
+    """
+    Escreve o script de carga (um COPY ... FROM STDIN por tabela) em `out`.
+
+    `columns` mapeia tabela -> colunas existentes no banco; sem ele, todas as
+    colunas geradas são usadas (modo --dump). Tabelas ausentes são puladas e
+    colunas geradas que o banco não tem são descartadas, já que o schema em
+    produção diverge do prisma e das migrations.
+    """
+    counts = {}
+    out.write("\\set ON_ERROR_STOP on\nBEGIN;\n")
+    # Sem triggers nem checagem de FK durante a carga; agregados são recalculados no final
+    out.write("SET LOCAL session_replication_role = replica;\n")
+    for table, generate in dataset.tables():
+        available = None if columns is None else columns.get(table)
+        if columns is not None and not available:
+            continue
+        started = time.monotonic()
+        rows = generate()
+        first = next(rows, None)
+        if first is None:
+            continue
+        names = [c for c in first if available is None or c in available]
+        out.write(f"COPY public.{quote_ident(table)} ({', '.join(map(quote_ident, names))}) FROM STDIN;\n")
+        n = 0
+        for row in chain((first,), rows):
+            out.write("\t".join(copy_value(row.get(c)) for c in names))
+            out.write("\n")
+            n += 1
+        out.write("\\.\n")
+        counts[table] = n
+        if progress:
+            progress.table(table, n, time.monotonic() - started)
+    out.write("COMMIT;\n")
+    return counts
+
+
+class PsqlLoader:
+    """Carga via psql (COPY FROM STDIN), sem dependência de driver Python."""
+
+    def __init__(self, dsn, psql="psql"):
+        self.dsn = dsn
+        self.psql = psql
+
+    def run(self, sql):
+        result = subprocess.run([self.psql, self.dsn, "-X", "-At", "-v", "ON_ERROR_STOP=1", "-c", sql],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr.strip())
+        return result.stdout
+
+    def columns(self):
+        out = self.run("SELECT table_name, column_name FROM information_schema.columns "
+                       "WHERE table_schema = 'public'")
+        tables = {}
+        for line in out.splitlines():
+            table, _, column = line.partition("|")
+            tables.setdefault(table, set()).add(column)
+        return tables
+
+    def has_auth(self):
+        return self.run("SELECT to_regclass('auth.users') IS NOT NULL").strip() == "t"
+
+    def reset(self):
+        # Tabelas filhas caem em cascata a partir das organizações
+        self.run(f"DELETE FROM organizations WHERE id LIKE '{LIKE_PREFIX}%'; "
+                 f"DELETE FROM users WHERE email LIKE '%.seed.test';")
+        if self.has_auth():
+            self.run("DELETE FROM auth.users WHERE email LIKE '%.seed.test'")
+
+    def create_auth_users(self, password):
+        """
+        Cria no GoTrue local o login dos administradores seed (um por org),
+        com o claim organization_id usado pelas policies de RLS.
+        """
+        if not self.has_auth():
+            raise RuntimeError("schema auth não encontrado (use o Postgres do supabase start)")
+        secret = password.replace("'", "''")
+        self.run(f"""
+            INSERT INTO auth.users (instance_id, id, aud, role, email, encrypted_password, email_confirmed_at,
+                                    raw_app_meta_data, raw_user_meta_data, created_at, updated_at,
+                                    confirmation_token, recovery_token, email_change, email_change_token_new)
+            SELECT '00000000-0000-0000-0000-000000000000', id::uuid, 'authenticated', 'authenticated', email,
+                   crypt('{secret}', gen_salt('bf')), now(),
+                   jsonb_build_object('provider', 'email', 'providers', jsonb_build_array('email'),
+                                      'organization_id', organization_id),
+                   jsonb_build_object('name', name), now(), now(), '', '', '', ''
+            FROM public.users
+            WHERE email LIKE '%.seed.test' AND role = 'ADMIN'
+            ON CONFLICT (id) DO NOTHING;
+
+            INSERT INTO auth.identities (id, user_id, provider_id, identity_data, provider, last_sign_in_at,
+                                         created_at, updated_at)
+            SELECT gen_random_uuid(), u.id, u.id::text, jsonb_build_object('sub', u.id::text, 'email', u.email),
+                   'email', now(), now(), now()
+            FROM auth.users u
+            WHERE u.email LIKE '%.seed.test'
+            ON CONFLICT DO NOTHING;
+        """)
+
+    def load(self, dataset, progress=None):
+        proc = subprocess.Popen([self.psql, self.dsn, "-X", "-q"], stdin=subprocess.PIPE, text=True,
+                                encoding="utf-8")
+        try:
+            counts = write_script(proc.stdin, dataset, self.columns(), progress)
+        finally:
+            proc.stdin.close()
+        if proc.wait() != 0:
+            raise RuntimeError("psql falhou durante a carga")
+        return counts
+
+    def finalize(self, counts):
+        self.run("ANALYZE " + ", ".join(f"public.{quote_ident(t)}" for t in counts))
+        # Rollups mantidos por trigger (desligados na carga)
+        for refresh in ("refresh_freelancer_monthly_stats", "refresh_project_profitability"):
+            exists = self.run(f"SELECT 1 FROM pg_proc WHERE proname = '{refresh}'")
+            if exists.strip():
+                self.run(f"SELECT {refresh}(id) FROM organizations WHERE id LIKE '{LIKE_PREFIX}%'")